@@ -5,7 +5,7 @@ block_cipher = None
 
 
 a = Analysis(
-    ['src\\main.py'],
+    ['src\\launcher.py'],
     pathex=[],
     binaries=[],
     datas=[('src', 'src')],
@@ -13,7 +13,8 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # numpy is optional (interval schedules fall back to the random module) and large
+    excludes=['numpy'],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -32,7 +33,8 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    # UPX-packed binaries are decompressed on every launch and slow cold start
+    upx=False,
     upx_exclude=[],
     runtime_tmpdir=None,
     console=False,
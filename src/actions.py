@@ -0,0 +1,106 @@
+"""Mouse and keyboard actions for MC Clicker's click loop."""
+
+import argparse
+import time
+from typing import Literal, NamedTuple
+
+
+class Action(NamedTuple):
+    """One repeated input: a mouse button or a key, clicked/tapped or held."""
+
+    device: Literal["mouse", "key"]
+    target: str  # "left"/"right" for the mouse, a keyboard library key name for keys
+    mode: Literal["click", "hold"] = "click"  # "click" taps a key
+    interval: float = 0.1  # Seconds between clicks/taps; unused for holds
+    offset: float = 0.0  # Seconds after the start of the first click/tap
+
+
+def validate_action(action: Action) -> None:
+    """
+    Check an action's fields.
+
+    Args:
+        action (Action): Action to check.
+
+    Raises:
+        ValueError: If any field is invalid.
+    """
+    if action.device not in ("mouse", "key"):
+        raise ValueError(f"Invalid device: {action.device}")
+    if action.device == "mouse" and action.target not in ("left", "right"):
+        raise ValueError(f"Invalid button type: {action.target}")
+    if action.device == "key" and not action.target:
+        raise ValueError("Key must not be empty")
+    if action.mode not in ("click", "hold"):
+        raise ValueError(f"Invalid mode: {action.mode}")
+    if action.mode == "click" and action.interval <= 0:
+        raise ValueError("Interval must be greater than 0")
+    if action.offset < 0:
+        raise ValueError("Offset must not be negative")
+
+
+def parse_action(text: str, device: Literal["mouse", "key"], mode: Literal["click", "hold"]) -> Action:
+    """
+    Parse a command-line action such as 'space:0.5' or 'left:0.1:0.05'.
+
+    Args:
+        text (str): TARGET[:INTERVAL[:OFFSET]].
+        device (Literal["mouse", "key"]): Device the target belongs to.
+        mode (Literal["click", "hold"]): Click/tap or hold.
+
+    Returns:
+        Action: The parsed action.
+
+    Raises:
+        ValueError: If the text is malformed.
+    """
+    parts = text.split(":")
+    if len(parts) > 3:
+        raise ValueError(f"Invalid action: {text}")
+    interval = float(parts[1]) if len(parts) > 1 else 0.1
+    offset = float(parts[2]) if len(parts) > 2 else 0.0
+    return Action(device, parts[0].lower(), mode, interval, offset)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point: run a mix of clicks, taps and holds."""
+    parser = argparse.ArgumentParser(description="Repeat mouse clicks and key presses on one schedule.")
+    parser.add_argument("--click", action="append", default=[], metavar="BUTTON[:INTERVAL[:OFFSET]]")
+    parser.add_argument("--tap", action="append", default=[], metavar="KEY[:INTERVAL[:OFFSET]]")
+    parser.add_argument("--hold", action="append", default=[], metavar="BUTTON", help="hold a mouse button")
+    parser.add_argument("--hold-key", action="append", default=[], metavar="KEY")
+    parser.add_argument("--seconds", type=float, default=None, help="stop after this long")
+    args = parser.parse_args(argv)
+
+    from src.clicker import PRIMARY_ACTION, AutoClicker
+
+    clicker = AutoClicker()
+    clicker.remove_action(PRIMARY_ACTION)  # Only the given actions, not the default left click
+    try:
+        for specs, device, mode in (
+            (args.click, "mouse", "click"),
+            (args.tap, "key", "click"),
+            (args.hold, "mouse", "hold"),
+            (args.hold_key, "key", "hold"),
+        ):
+            for spec in specs:
+                clicker.add_action(parse_action(spec, device, mode))
+    except ValueError as e:
+        parser.error(str(e))
+    if not clicker.actions:
+        parser.error("no actions given")
+
+    clicker.set_duration(args.seconds)
+    clicker.start()
+    try:
+        while clicker.is_running:
+            time.sleep(0.1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        clicker.stop()
+    print(f"Performed {clicker.click_count} actions")
+
+
+if __name__ == "__main__":
+    main()
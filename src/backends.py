@@ -0,0 +1,130 @@
+"""Mouse backends for MC Clicker's AutoClicker."""
+
+from typing import Any
+
+
+class NullMouse:
+    """Mouse backend that only counts calls; used for tests and benchmarks."""
+
+    buttons = {"left": "left", "right": "right"}  # No pynput needed to name buttons
+
+    def __init__(self) -> None:
+        """Initialize the NullMouse."""
+        self.clicks: int = 0
+        self.presses: int = 0
+        self.releases: int = 0
+
+    def press(self, button: Any) -> None:
+        """Count a button press."""
+        self.presses += 1
+
+    def release(self, button: Any) -> None:
+        """Count a button release."""
+        self.releases += 1
+
+    def click(self, button: Any, count: int = 1) -> None:
+        """Count `count` clicks."""
+        self.clicks += count
+
+
+class NullKeyboard:
+    """Keyboard backend that only counts calls; used for tests and benchmarks."""
+
+    def __init__(self) -> None:
+        """Initialize the NullKeyboard."""
+        self.presses: int = 0
+        self.releases: int = 0
+
+    def validate(self, key: str) -> None:
+        """Accept any key name."""
+
+    def press(self, key: str) -> None:
+        """Count a key press."""
+        self.presses += 1
+
+    def release(self, key: str) -> None:
+        """Count a key release."""
+        self.releases += 1
+
+
+class KeyboardBackend:
+    """Injects key events through the keyboard library."""
+
+    def __init__(self) -> None:
+        """
+        Initialize the KeyboardBackend.
+
+        The keyboard library is imported here, once, rather than on every
+        press and release on the click thread.
+        """
+        import keyboard
+
+        self._keyboard = keyboard
+
+    def validate(self, key: str) -> None:
+        """
+        Check that the keyboard library knows a key.
+
+        Args:
+            key (str): Key name, e.g. 'space' or 'e'.
+
+        Raises:
+            ValueError: If the key is unknown.
+        """
+        self._keyboard.key_to_scan_codes(key)
+
+    def press(self, key: str) -> None:
+        """Press a key."""
+        self._keyboard.press(key)
+
+    def release(self, key: str) -> None:
+        """Release a key."""
+        self._keyboard.release(key)
+
+
+def resolve_button(mouse: Any, button_type: str) -> Any:
+    """
+    Map a button name to the object a mouse backend expects.
+
+    Args:
+        mouse (Any): Mouse backend.
+        button_type (str): "left" or "right".
+
+    Returns:
+        Any: Entry from the backend's `buttons` mapping, or a pynput Button.
+    """
+    buttons = getattr(mouse, "buttons", None)
+    if buttons is not None:
+        return buttons[button_type]
+    from pynput.mouse import Button
+
+    return getattr(Button, button_type)
+
+
+BACKEND_NAMES = ("pynput", "uinput", "null")
+
+
+def create_backend(name: str) -> Any:
+    """
+    Create a mouse backend by name.
+
+    Args:
+        name (str): One of BACKEND_NAMES.
+
+    Returns:
+        Any: Object with pynput's press/release/click interface.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    if name == "pynput":
+        from pynput.mouse import Controller
+
+        return Controller()
+    if name == "uinput":
+        from src.uinput import UinputMouse
+
+        return UinputMouse.create()
+    if name == "null":
+        return NullMouse()
+    raise ValueError(f"Unknown backend: {name}")
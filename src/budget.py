@@ -0,0 +1,351 @@
+"""Host-wide click-rate ceiling shared by all local MC Clicker instances."""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from typing import Any
+
+BUDGET_FILE_ENV_VAR = "MCCLICKER_BUDGET_FILE"  # Set to share a different budget file
+MAGIC = b"MCTB"
+VERSION = 1
+MAX_SLOTS = 64  # Instances that can share one budget
+HEADER = struct.Struct("<4sII")  # magic, version, slots
+SLOT = struct.Struct("<qddd")  # pid, expires (monotonic), demand CPS, ceiling CPS
+SLOTS_OFFSET = 16
+FILE_SIZE = SLOTS_OFFSET + MAX_SLOTS * SLOT.size
+REFRESH_PERIOD = 0.02  # Seconds between re-reading the other instances' slots
+ACTIVE_FOR = 0.25  # Seconds a published slot counts as clicking without another refresh
+RECLAIM_AFTER = 5.0  # Seconds after expiry that a slot of a vanished process can be reused
+BURST = 2.0  # Tokens an instance can bank, so brief hiccups do not waste its share
+# From the Windows SDK, for checking whether a slot's process still runs
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+ERROR_ACCESS_DENIED = 5
+STILL_ACTIVE = 259
+
+
+def default_budget_path() -> str:
+    """
+    Get the file the budget lives in.
+
+    Returns:
+        str: $MCCLICKER_BUDGET_FILE, or mcclicker-budget in /dev/shm (or the temp directory).
+    """
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.environ.get(BUDGET_FILE_ENV_VAR) or os.path.join(directory, "mcclicker-budget")
+
+
+def fair_shares(demands: list[float], ceiling: float) -> list[float]:
+    """
+    Split a rate ceiling max-min fairly.
+
+    Instances asking for less than an equal share get what they ask for;
+    the rest is split equally among the others.
+
+    Args:
+        demands (list[float]): Rate each instance wants (inf for "as fast as allowed").
+        ceiling (float): Total rate to split.
+
+    Returns:
+        list[float]: Rate granted to each instance, in the same order.
+    """
+    shares = [0.0] * len(demands)
+    remaining = ceiling
+    pending = sorted(range(len(demands)), key=lambda i: demands[i])
+    while pending:
+        equal = remaining / len(pending)
+        i = pending[0]
+        if demands[i] > equal:
+            for j in pending:
+                shares[j] = equal
+            break
+        shares[i] = demands[i]
+        remaining -= demands[i]
+        pending.pop(0)
+    return shares
+
+
+def _lock_file(fd: int, locked: bool) -> None:
+    """Take or drop a blocking exclusive lock on an open file."""
+    if os.name == "nt":
+        import msvcrt
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_LOCK if locked else msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(fd, fcntl.LOCK_EX if locked else fcntl.LOCK_UN)
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process exists."""
+    if os.name == "nt":
+        return _pid_alive_windows(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # Exists but belongs to someone else
+    return True
+
+
+def _pid_alive_windows(pid: int) -> bool:
+    """
+    Check whether a process exists on Windows.
+
+    os.kill(pid, 0) there sends CTRL_C_EVENT instead of probing, so ask
+    the kernel for the process's exit code instead.
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    kernel32.GetExitCodeProcess.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD)]
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # Access denied means it exists but belongs to someone else; anything else means it is gone
+        return ctypes.get_last_error() == ERROR_ACCESS_DENIED
+    try:
+        code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+            return True  # Cannot tell: keep the slot rather than steal a live one
+        return code.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+class SharedBudget:
+    """
+    Token bucket whose refill rate is this instance's fair share of a host-wide ceiling.
+
+    Every instance owns one slot in a small shared-memory file and is its
+    only writer. A slot publishes the instance's wanted rate, its ceiling
+    and until when it counts as clicking. Every REFRESH_PERIOD an instance
+    reads all slots. It then computes the same max-min fair split as every
+    other instance and refills its private bucket at its own share. The
+    effective ceiling is the lowest one published.
+
+    try_acquire() only touches the private bucket, plus its own slot and
+    plain reads on refresh. It never locks, waits or makes a system call. A
+    file lock is taken only once, to claim a slot. Instances that start,
+    stop or pause are seen within one refresh, so the total can overshoot
+    by at most about REFRESH_PERIOD's worth of clicks while shares settle.
+    """
+
+    def __init__(self, ceiling: float, path: str | None = None) -> None:
+        """
+        Initialize the SharedBudget and claim a slot.
+
+        Args:
+            ceiling (float): Host-wide clicks per second this instance agrees to.
+            path (str | None): Budget file; defaults to default_budget_path().
+
+        Raises:
+            ValueError: If the ceiling is not positive.
+            OSError: If the file cannot be mapped, is incompatible, or all slots are taken.
+        """
+        if ceiling <= 0:
+            raise ValueError("Budget ceiling must be greater than 0")
+        self.ceiling = ceiling
+        self.path = path or default_budget_path()
+        self.rate = ceiling  # Current share, clicks per second
+        self.active_instances = 1
+        self.granted = 0
+        self.denied = 0
+        self._tokens = 1.0
+        self._last = time.perf_counter()
+        self._next_refresh = 0.0
+        self._demand = float("inf")
+        self._pid = os.getpid()
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            _lock_file(fd, True)
+            try:
+                if os.fstat(fd).st_size < FILE_SIZE:
+                    os.ftruncate(fd, FILE_SIZE)
+                self._map = mmap.mmap(fd, FILE_SIZE)
+                self.slot = self._claim()
+            finally:
+                _lock_file(fd, False)
+        finally:
+            os.close(fd)  # The mapping stays valid
+
+    def _claim(self) -> int:
+        """Initialize the file if new and take a free slot; call with the file locked."""
+        magic, version, slots = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            HEADER.pack_into(self._map, 0, MAGIC, VERSION, MAX_SLOTS)
+        elif version != VERSION or slots != MAX_SLOTS:
+            self._map.close()
+            raise OSError(f"Incompatible budget file {self.path}")
+        now = time.monotonic()
+        for index in range(MAX_SLOTS):
+            pid, expires, _, _ = SLOT.unpack_from(self._map, SLOTS_OFFSET + index * SLOT.size)
+            if pid == 0 or (now > expires + RECLAIM_AFTER and not _pid_alive(pid)):
+                SLOT.pack_into(self._map, SLOTS_OFFSET + index * SLOT.size, self._pid, 0.0, 0.0, self.ceiling)
+                return index
+        self._map.close()
+        raise OSError(f"All {MAX_SLOTS} budget slots are in use")
+
+    def try_acquire(self, now: float, interval: float | None = None) -> bool:
+        """
+        Take one click token if one is available, without blocking.
+
+        Args:
+            now (float): perf_counter() of the click.
+            interval (float | None): Seconds until this instance's next click,
+                from which its wanted rate is published; None for "as fast as allowed".
+
+        Returns:
+            bool: True if the click may go out now.
+        """
+        if interval is not None:
+            self._demand = 1.0 / interval if interval > 0 else float("inf")
+        if now >= self._next_refresh:
+            self._refresh(now, interval)
+        tokens = min(BURST, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+        if tokens >= 1.0:
+            self._tokens = tokens - 1.0
+            self.granted += 1
+            return True
+        self._tokens = tokens
+        self.denied += 1
+        return False
+
+    def next_token_at(self) -> float:
+        """
+        Get when the next token will be available.
+
+        Returns:
+            float: perf_counter() value.
+        """
+        return self._last + max(0.0, 1.0 - self._tokens) / self.rate
+
+    def _refresh(self, now: float, interval: float | None) -> None:
+        """Publish this instance's slot and recompute its share from all active slots."""
+        mono = time.monotonic()
+        active_for = max(ACTIVE_FOR, 2 * interval) if interval is not None else ACTIVE_FOR
+        try:
+            SLOT.pack_into(
+                self._map,
+                SLOTS_OFFSET + self.slot * SLOT.size,
+                self._pid,
+                mono + active_for,
+                self._demand,
+                self.ceiling,
+            )
+            slots = self._map[SLOTS_OFFSET:FILE_SIZE]
+        except ValueError:
+            return  # Closed by set_budget() while the click loop was using it
+        demands, mine = [], 0
+        ceiling = self.ceiling
+        for index, (pid, expires, demand, their_ceiling) in enumerate(SLOT.iter_unpack(slots)):
+            if pid == 0 or expires < mono or their_ceiling <= 0:
+                continue  # Free, idle, or caught mid-write; the next refresh sees it
+            if index == self.slot:
+                mine = len(demands)
+            demands.append(demand)
+            ceiling = min(ceiling, their_ceiling)
+        self.active_instances = len(demands)
+        self.rate = max(fair_shares(demands, ceiling)[mine], 1e-3)
+        self._next_refresh = now + REFRESH_PERIOD
+
+    def close(self) -> None:
+        """Free the slot for other instances."""
+        if self._map.closed:
+            return
+        SLOT.pack_into(self._map, SLOTS_OFFSET + self.slot * SLOT.size, 0, 0.0, 0.0, 0.0)
+        self._map.close()
+
+
+def _instance(
+    path: str,
+    ceiling: float,
+    cps: float,
+    seconds: float,
+    ready: Any,
+    go: Any,
+    results: Any,
+) -> None:
+    """Run one clicking instance for measure_sharing(); runs in a child process."""
+    from src.backends import NullMouse
+    from src.clicker import AutoClicker
+
+    mouse = NullMouse()
+    clicker = AutoClicker(mouse=mouse)
+    clicker.set_interval(1.0 / cps)
+    budget = SharedBudget(ceiling, path)
+    clicker.set_budget(budget)
+    ready.release()
+    go.wait()
+    clicker.start()
+    time.sleep(seconds)
+    clicker.stop()
+    budget.close()
+    results.put((cps, mouse.clicks))
+
+
+def measure_sharing(demands: list[float], ceiling: float, seconds: float = 2.0) -> dict[str, Any]:
+    """
+    Run one clicking process per demand against a private budget and count their clicks.
+
+    Args:
+        demands (list[float]): Configured CPS of each instance.
+        ceiling (float): Host-wide ceiling.
+        seconds (float): How long all instances click together.
+
+    Returns:
+        dict[str, Any]: Achieved CPS per instance with its fair share, and the total.
+    """
+    import multiprocessing
+
+    context = multiprocessing.get_context("spawn")
+    ready, go, results = context.Semaphore(0), context.Event(), context.Queue()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "budget")
+        processes = [
+            context.Process(target=_instance, args=(path, ceiling, cps, seconds, ready, go, results))
+            for cps in demands
+        ]
+        for process in processes:
+            process.start()
+        for _ in processes:
+            ready.acquire()
+        go.set()
+        counts = sorted(results.get(timeout=seconds + 30) for _ in processes)
+        for process in processes:
+            process.join()
+    shares = dict(zip(sorted(demands), fair_shares(sorted(demands), ceiling)))
+    return {
+        "ceiling": ceiling,
+        "seconds": seconds,
+        "total_cps": sum(clicks for _, clicks in counts) / seconds,
+        "instances": [
+            {"demand_cps": cps, "fair_share_cps": shares[cps], "achieved_cps": clicks / seconds}
+            for cps, clicks in counts
+        ],
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point: show how instances share a ceiling, as JSON."""
+    parser = argparse.ArgumentParser(description="Measure how clicker processes share a host-wide CPS budget.")
+    parser.add_argument("--ceiling", type=float, default=60.0)
+    parser.add_argument("--demands", type=float, nargs="+", default=[100.0, 100.0, 100.0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args(argv)
+    sys.stdout.write(json.dumps(measure_sharing(args.demands, args.ceiling, args.seconds), indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+"""Click-rate tester and cadence profiler for MC Clicker."""
+
+import argparse
+import math
+import random
+import time
+from array import array
+from bisect import bisect_right
+from typing import Any, NamedTuple
+
+# Quantiles tracked for a cadence profile
+PROFILE_PROBS = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+RATE_WINDOW = 16  # Recent clicks used for the live CPS figure
+DEFAULT_MAX_GAP = 1.0  # Seconds; longer pauses start a new burst instead of counting as an interval
+
+
+class StreamingStats:
+    """Running mean and variance via Welford's algorithm."""
+
+    def __init__(self) -> None:
+        """Initialize the StreamingStats."""
+        self.count: int = 0
+        self.mean: float = 0.0
+        self.m2: float = 0.0
+        self.min: float = math.inf
+        self.max: float = -math.inf
+
+    def update(self, x: float) -> None:
+        """
+        Add one sample.
+
+        Args:
+            x (float): Sample value.
+        """
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0.0 with fewer than two samples)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation."""
+        return math.sqrt(self.variance)
+
+
+class P2Quantile:
+    """Streaming estimate of one quantile in constant memory (Jain & Chlamtac's P-squared)."""
+
+    def __init__(self, p: float) -> None:
+        """
+        Initialize the P2Quantile.
+
+        Args:
+            p (float): Quantile to track, between 0 and 1 exclusive.
+        """
+        if not 0 < p < 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        self.p = p
+        self.heights: list[float] = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def update(self, x: float) -> None:
+        """
+        Add one sample.
+
+        Args:
+            x (float): Sample value.
+        """
+        q = self.heights
+        if len(q) < 5:
+            q.append(x)
+            if len(q) == 5:
+                q.sort()
+            return
+
+        n = self.positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Nudge the three middle markers toward their desired positions
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = q[i] + step / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = candidate
+                n[i] += step
+
+    def value(self) -> float | None:
+        """
+        Get the current estimate.
+
+        Returns:
+            float | None: Estimated quantile, or None before any samples.
+        """
+        q = self.heights
+        if not q:
+            return None
+        if len(q) < 5:
+            ordered = sorted(q)
+            return ordered[min(len(ordered) - 1, int(self.p * len(ordered)))]
+        return q[2]
+
+
+class Cadence(NamedTuple):
+    """Empirical interval distribution as a piecewise-linear inverse CDF."""
+
+    probs: tuple[float, ...]  # Ascending, starting at 0.0 and ending at 1.0
+    intervals: tuple[float, ...]  # Interval in seconds at each probability
+
+    def sample(self, u: float | None = None) -> float:
+        """
+        Draw one interval.
+
+        Args:
+            u (float | None): Uniform [0, 1) variate; drawn if None.
+
+        Returns:
+            float: Interval in seconds.
+        """
+        if u is None:
+            u = random.random()
+        i = min(bisect_right(self.probs, u), len(self.probs) - 1)
+        p0, p1 = self.probs[i - 1], self.probs[i]
+        v0, v1 = self.intervals[i - 1], self.intervals[i]
+        return v0 + (v1 - v0) * (u - p0) / (p1 - p0)
+
+    def mean(self) -> float:
+        """Mean interval of the piecewise-linear distribution."""
+        return sum(
+            (p1 - p0) * (v0 + v1) / 2
+            for p0, p1, v0, v1 in zip(self.probs, self.probs[1:], self.intervals, self.intervals[1:])
+        )
+
+
+def cadence_from_dict(data: Any) -> Cadence:
+    """
+    Build a Cadence from its stored form.
+
+    Args:
+        data (Any): Dict with "probs" and "intervals" lists.
+
+    Returns:
+        Cadence: The validated cadence.
+
+    Raises:
+        ValueError: If the data is not a valid distribution.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Cadence must be an object")
+    probs = data.get("probs")
+    intervals = data.get("intervals")
+    if not isinstance(probs, list) or not isinstance(intervals, list) or len(probs) != len(intervals):
+        raise ValueError("Cadence needs equal-length probs and intervals lists")
+    if len(probs) < 2 or probs[0] != 0 or probs[-1] != 1:
+        raise ValueError("Cadence probs must run from 0 to 1")
+    for values in (probs, intervals):
+        if any(isinstance(v, bool) or not isinstance(v, (int, float)) for v in values):
+            raise ValueError("Cadence values must be numbers")
+    if any(b <= a for a, b in zip(probs, probs[1:])):
+        raise ValueError("Cadence probs must be strictly increasing")
+    if any(b < a for a, b in zip(intervals, intervals[1:])) or intervals[0] <= 0:
+        raise ValueError("Cadence intervals must be positive and non-decreasing")
+    return Cadence(tuple(float(p) for p in probs), tuple(float(v) for v in intervals))
+
+
+def cadence_to_dict(cadence: Cadence) -> dict[str, list[float]]:
+    """
+    Convert a Cadence to its stored form.
+
+    Args:
+        cadence (Cadence): Cadence to convert.
+
+    Returns:
+        dict[str, list[float]]: JSON-serializable cadence data.
+    """
+    return {"probs": list(cadence.probs), "intervals": list(cadence.intervals)}
+
+
+class CadenceMeter:
+    """Measures click cadence with constant work and memory per click."""
+
+    def __init__(self, max_gap: float = DEFAULT_MAX_GAP) -> None:
+        """
+        Initialize the CadenceMeter.
+
+        Args:
+            max_gap (float): Pauses longer than this are not counted as intervals.
+        """
+        self.max_gap = max_gap
+        self.clicks: int = 0
+        self.last_click: float | None = None
+        self.intervals = StreamingStats()
+        self.quantiles = [P2Quantile(p) for p in PROFILE_PROBS]
+        self._recent = array("d", bytes(8 * RATE_WINDOW))  # Ring of recent click times
+
+    def on_click(self, t: float) -> None:
+        """
+        Record a click. Safe to call from an input listener callback.
+
+        Args:
+            t (float): time.perf_counter() of the click.
+        """
+        self._recent[self.clicks % RATE_WINDOW] = t
+        self.clicks += 1
+        if self.last_click is not None:
+            interval = t - self.last_click
+            if 0 < interval <= self.max_gap:
+                self.intervals.update(interval)
+                for quantile in self.quantiles:
+                    quantile.update(interval)
+        self.last_click = t
+
+    def live_cps(self, now: float | None = None) -> float:
+        """
+        Get the click rate over the most recent clicks.
+
+        Args:
+            now (float | None): Current perf_counter(); the rate drops to 0.0
+                once no click has arrived for max_gap seconds.
+
+        Returns:
+            float: Clicks per second.
+        """
+        n = min(self.clicks, RATE_WINDOW)
+        if n < 2 or self.last_click is None:
+            return 0.0
+        if now is not None and now - self.last_click > self.max_gap:
+            return 0.0
+        oldest = self._recent[(self.clicks - n) % RATE_WINDOW]
+        span = self.last_click - oldest
+        return (n - 1) / span if span > 0 else 0.0
+
+    def cadence(self) -> Cadence | None:
+        """
+        Get the measured interval distribution.
+
+        Returns:
+            Cadence | None: Distribution anchored at the observed min and max,
+            or None with too few intervals.
+        """
+        if self.intervals.count < len(PROFILE_PROBS):
+            return None
+        values = [self.intervals.min]
+        for quantile in self.quantiles:
+            values.append(quantile.value())
+        values.append(self.intervals.max)
+        # Independent estimates can cross slightly; keep the inverse CDF monotonic
+        for i in range(1, len(values)):
+            values[i] = max(values[i], values[i - 1])
+        return Cadence((0.0, *PROFILE_PROBS, 1.0), tuple(values))
+
+    def to_profile(self, button: str = "left") -> dict[str, Any]:
+        """
+        Build a stored click profile that reproduces the measured cadence.
+
+        Args:
+            button (str): Button the profile clicks with.
+
+        Returns:
+            dict[str, Any]: Profile data for ProfileManager.
+
+        Raises:
+            ValueError: If too few clicks were measured.
+        """
+        cadence = self.cadence()
+        if cadence is None:
+            raise ValueError("Not enough clicks measured for a profile")
+        return {
+            "cps": round(1.0 / cadence.mean(), 2),
+            "mode": "click",
+            "button": button,
+            "duration": None,
+            "hotkey": None,
+            "cadence": cadence_to_dict(cadence),
+        }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point: measure clicks and optionally save a profile."""
+    from pynput import mouse
+
+    from src.config import DEFAULT_CONFIG_FILE, ConfigStore
+
+    parser = argparse.ArgumentParser(description="Measure click cadence.")
+    parser.add_argument("--seconds", type=float, default=10.0, help="how long to listen")
+    parser.add_argument("--save", metavar="NAME", help="save the cadence as a click profile")
+    parser.add_argument("--button", choices=("left", "right"), default="left")
+    args = parser.parse_args(argv)
+
+    meter = CadenceMeter()
+
+    def on_click(x: int, y: int, button: Any, pressed: bool) -> None:
+        if pressed and button.name == args.button:
+            meter.on_click(time.perf_counter())
+
+    listener = mouse.Listener(on_click=on_click)
+    listener.start()
+    print(f"Click the {args.button} button for {args.seconds:g} seconds...")
+    end = time.perf_counter() + args.seconds
+    try:
+        while (now := time.perf_counter()) < end:
+            time.sleep(min(1.0, end - now))
+            stats = meter.intervals
+            print(
+                f"clicks={meter.clicks} cps={meter.live_cps(time.perf_counter()):.1f} "
+                f"mean={stats.mean * 1000:.1f}ms stdev={stats.stdev * 1000:.1f}ms"
+            )
+    finally:
+        listener.stop()
+
+    cadence = meter.cadence()
+    if cadence is None:
+        print("Not enough clicks measured.")
+        return
+    print("Interval quantiles: " + ", ".join(
+        f"p{int(p * 100)}={v * 1000:.1f}ms" for p, v in zip(cadence.probs, cadence.intervals)
+    ))
+
+    if args.save:
+        store = ConfigStore(DEFAULT_CONFIG_FILE)
+        store.load()
+        profiles = dict(store.get("profiles"))
+        profiles[args.save] = meter.to_profile(args.button)
+        store.update(profiles=profiles)
+        store.flush()
+        print(f"Saved profile '{args.save}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""CPS calibration sweep for MC Clicker."""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import sys
+import time
+from typing import Any
+
+from src.clicker import AutoClicker
+from src.config import write_json_atomic
+from src.loopback import RecordingMouse
+from src.utils import cps_to_seconds
+
+DEFAULT_CAPABILITY_FILE = os.path.join(os.path.dirname(__file__), "capability.json")
+DEFAULT_RATES = (5.0, 10.0, 20.0, 30.0, 50.0, 75.0, 100.0)
+DEFAULT_BUDGET = 15.0  # Seconds of clicking for the whole sweep
+
+RATE_TOLERANCE = 0.05  # Achieved rate may fall this far below target and still count as reliable
+JITTER_TOLERANCE = 0.2  # Interval stdev allowed, as a fraction of the target interval
+MISSED_TOLERANCE = 0.01  # Fraction of clicks allowed to miss their slot
+GIVE_UP_AFTER = 2  # Consecutive unreliable rates that end the sweep early
+
+
+def measure_rate(backend: Any, cps: float, seconds: float) -> dict[str, Any]:
+    """
+    Click at one target rate and measure what was achieved.
+
+    Args:
+        backend (Any): Mouse backend to click with.
+        cps (float): Target clicks per second.
+        seconds (float): How long to click.
+
+    Returns:
+        dict[str, Any]: Target and achieved CPS, interval jitter in ms, missed
+        deadlines, and whether the rate counts as reliable.
+    """
+    recorder = RecordingMouse(backend)
+    clicker = AutoClicker(mouse=recorder)
+    clicker.set_interval(cps_to_seconds(cps))
+    clicker.start()
+    time.sleep(seconds)
+    clicker.stop()
+
+    times = recorder.injected
+    intervals = [b - a for a, b in zip(times, times[1:])]
+    achieved = len(intervals) / (times[-1] - times[0]) if len(intervals) > 0 and times[-1] > times[0] else 0.0
+    jitter = statistics.stdev(intervals) if len(intervals) > 1 else 0.0
+    missed = clicker.stats.missed_deadlines
+    reliable = (
+        len(intervals) > 1
+        and achieved >= cps * (1 - RATE_TOLERANCE)
+        and jitter <= cps_to_seconds(cps) * JITTER_TOLERANCE
+        and missed <= max(1, len(times) * MISSED_TOLERANCE)
+    )
+    return {
+        "target_cps": cps,
+        "achieved_cps": achieved,
+        "jitter_ms": jitter * 1000,
+        "clicks": len(times),
+        "missed": missed,
+        "reliable": reliable,
+    }
+
+
+def sweep(backend: Any, rates: list[float], budget: float = DEFAULT_BUDGET) -> dict[str, Any]:
+    """
+    Measure ascending target rates within a time budget.
+
+    Every rate gets an equal share of the budget. The sweep stops early once
+    GIVE_UP_AFTER rates in a row are unreliable, since higher ones will be too.
+
+    Args:
+        backend (Any): Mouse backend to click with.
+        rates (list[float]): Target CPS values.
+        budget (float): Total clicking time in seconds.
+
+    Returns:
+        dict[str, Any]: Capability curve: measured points and the highest reliable CPS.
+    """
+    rates = sorted(rates)
+    seconds = budget / len(rates)
+    points = []
+    max_reliable = None
+    failures = 0
+    for cps in rates:
+        point = measure_rate(backend, cps, seconds)
+        points.append(point)
+        if point["reliable"]:
+            max_reliable = cps
+            failures = 0
+        else:
+            failures += 1
+            if failures >= GIVE_UP_AFTER:
+                break
+    return {
+        "measured_at": time.time(),
+        "seconds_per_rate": seconds,
+        "points": points,
+        "max_reliable_cps": max_reliable,
+    }
+
+
+def capability_key(backend_name: str, host: str | None = None) -> str:
+    """
+    Build the key a host's curve is stored under.
+
+    Args:
+        backend_name (str): Backend the curve was measured with.
+        host (str | None): Host name; defaults to this machine's.
+
+    Returns:
+        str: "host/backend".
+    """
+    return f"{host or socket.gethostname()}/{backend_name}"
+
+
+def load_capabilities(path: str = DEFAULT_CAPABILITY_FILE) -> dict[str, Any]:
+    """
+    Load all stored capability curves.
+
+    Args:
+        path (str): Capability file.
+
+    Returns:
+        dict[str, Any]: Curves by capability_key(); empty if the file is missing or unreadable.
+    """
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_capability(curve: dict[str, Any], backend_name: str, path: str = DEFAULT_CAPABILITY_FILE) -> None:
+    """
+    Store this host's curve for a backend, keeping other hosts' curves.
+
+    Args:
+        curve (dict[str, Any]): Output of sweep().
+        backend_name (str): Backend the curve was measured with.
+        path (str): Capability file.
+    """
+    data = load_capabilities(path)
+    data[capability_key(backend_name)] = curve
+    write_json_atomic(path, data)
+
+
+def reliable_cps(backend_name: str = "pynput", path: str = DEFAULT_CAPABILITY_FILE) -> float | None:
+    """
+    Get this host's highest reliably achievable CPS.
+
+    Args:
+        backend_name (str): Backend to look up.
+        path (str): Capability file.
+
+    Returns:
+        float | None: Highest reliable CPS, or None if not calibrated.
+    """
+    curve = load_capabilities(path).get(capability_key(backend_name))
+    if not isinstance(curve, dict):
+        return None
+    value = curve.get("max_reliable_cps")
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point: run a sweep, store it and print it as JSON."""
+    from src.backends import BACKEND_NAMES, create_backend
+
+    parser = argparse.ArgumentParser(description="Find the highest click rate this host sustains reliably.")
+    parser.add_argument("--backend", choices=BACKEND_NAMES, default="pynput")
+    parser.add_argument("--rates", type=float, nargs="+", default=list(DEFAULT_RATES))
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="total seconds of clicking")
+    parser.add_argument("--output", default=DEFAULT_CAPABILITY_FILE, help="capability file to update")
+    args = parser.parse_args(argv)
+
+    if args.backend == "pynput":
+        print("Clicking for real: point the mouse somewhere harmless.", file=sys.stderr)
+    curve = sweep(create_backend(args.backend), args.rates, args.budget)
+    save_capability(curve, args.backend, args.output)
+    sys.stdout.write(json.dumps(curve, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
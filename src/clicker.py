@@ -1,27 +1,175 @@
 
 """Mouse clicking logic for MC Clicker."""
 
+import errno
+import heapq
+import itertools
 import threading
 import time
-from typing import Literal
+from typing import Any, Callable, Literal
 
-from pynput.mouse import Button, Controller
+from src.actions import Action, validate_action
+from src.backends import resolve_button
+from src.budget import SharedBudget
+from src.session_log import SessionLog
+from src.stats import ClickStats
+from src.tracing import SPAN_BOOKKEEPING, SPAN_INJECT, SPAN_WAIT, ClickTracer
+
+# OS errors worth retrying: the input device or display was momentarily busy
+TRANSIENT_ERRNOS = frozenset({errno.EAGAIN, errno.EINTR, errno.EBUSY, errno.ENOBUFS, errno.ETIMEDOUT})
+RETRY_BUDGET = 10  # Retries a run can bank; each one spends a token
+RETRY_REFILL = 0.1  # Tokens earned back per successful click (one retry per ten clicks)
+RETRY_BACKOFF = 0.001  # Seconds before the first retry of a click, doubling per attempt
+PRIMARY_ACTION = 0  # Id of the action made from the click settings (button, mode, interval)
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Classify a backend error as worth retrying or not.
+
+    Backends can decide for their own exceptions with a `transient`
+    attribute. Otherwise timeouts, interrupted calls and busy or
+    would-block OS errors are transient; anything else (a missing window,
+    no permission, a bug) is fatal.
+
+    Args:
+        error (BaseException): Exception raised by the mouse backend.
+
+    Returns:
+        bool: True if the click may succeed when retried.
+    """
+    marked = getattr(error, "transient", None)
+    if marked is not None:
+        return bool(marked)
+    if isinstance(error, (TimeoutError, BlockingIOError, InterruptedError)):
+        return True
+    return isinstance(error, OSError) and error.errno in TRANSIENT_ERRNOS
+
+
+class _Stream:
+    """Schedule of one click or tap action inside the click loop."""
+
+    def __init__(self, action: Action, backend: Any, target: Any, start: float) -> None:
+        self.action = action
+        self.backend = backend
+        self.target = target
+        self.step = action.interval  # Seconds from the current slot to the next
+        self.attempts = 0  # Failed tries of the current slot
+        self.reset(start)
+
+    def reset(self, now: float) -> None:
+        """Schedule the first click after a start or resume."""
+        # `deadline` is when to act next: the slot itself, or a retry of it
+        self.slot = self.deadline = now + self.action.offset
+        self.attempts = 0
 
 
 class AutoClicker:
-    """Handles automated mouse clicking."""
+    """
+    Handles automated mouse clicking, and any other mouse or key actions.
+
+    The click settings (button, mode, interval) form the primary action.
+    add_action() puts more clicks, key taps and holds on the same click
+    thread. Clicks and taps share one deadline heap, so each extra stream
+    costs a heap entry rather than a thread. Duration, click limit, pause,
+    retries and the shared budget apply to every action.
+    """
 
-    def __init__(self) -> None:
-        """Initialize the AutoClicker."""
-        self.mouse = Controller()
+    def __init__(self, mouse: Any = None, keyboard: Any = None) -> None:
+        """
+        Initialize the AutoClicker.
+
+        Args:
+            mouse (Any): Mouse backend with pynput's press/release/click interface.
+                Defaults to a pynput Controller, created on first use so that
+                pynput is not imported at startup.
+            keyboard (Any): Keyboard backend with validate/press/release, for key
+                actions. Defaults to a KeyboardBackend, created on first use.
+        """
+        self._mouse = mouse
+        self._keyboard = keyboard
+        self._backend_lock = threading.Lock()
         self.is_running: bool = False
-        self.is_holding: bool = False  # Track if button is currently held
+        self.actions: dict[int, Action] = {PRIMARY_ACTION: Action("mouse", "left", "click", 0.1)}
+        self._action_ids = itertools.count(PRIMARY_ACTION + 1)
+        self._actions_lock = threading.Lock()  # Guards `actions` against the loop's sync
+        self._actions_changed = True  # Actions changed since the loop last synced
+        self._held: dict[int, tuple[Any, Any]] = {}  # Action id -> (backend, target) pressed down
         self.click_thread: threading.Thread | None = None
         self.interval: float = 0.1  # Default 10 CPS
-        self.button: Button = Button.left
+        self.interval_sampler: Callable[[], float] | None = None  # Overrides interval when set
+        self._owns_sampler: bool = True  # Close interval_sampler when it is replaced
+        self.button_type: Literal["left", "right"] = "left"
+        self.button: Any = None  # Backend's button object, resolved with the backend
         self.mode: Literal["click", "hold"] = "click"  # "click" or "hold"
         self.duration: float | None = None  # Duration in seconds, None = infinite
+        self.click_limit: int | None = None  # Clicks per run, None = unlimited
         self.start_time: float | None = None
+        self.click_count: int = 0  # Clicks and taps performed in the current session
+        self.session_log: SessionLog | None = None
+        self.tracer: ClickTracer | None = None
+        self.budget: SharedBudget | None = None  # Host-wide rate ceiling shared with other instances
+        self.stop_reason: str | None = None  # Why the last run ended; None while running
+        self.stop_callback: Callable[[str], None] | None = None
+        self.stats = ClickStats()
+        self.is_paused: bool = False  # Whether any pause reason is in effect
+        self.pause_reasons: set[str] = set()  # Who asked for the current pause, e.g. "focus" and "trigger"
+        self._pause_lock = threading.Lock()  # pause()/resume() come from several listener threads
+        self.resume_requested_at: float | None = None  # perf_counter() of the pending resume()
+        self.pause_requested_at: float | None = None
+        self._wake = threading.Event()  # Cuts the loop's current wait short
+        self._generation: int = 0  # Bumped by start(); a loop from an older run exits at its next check
+
+    @property
+    def mouse(self) -> Any:
+        """The mouse backend, created on first access."""
+        if self._mouse is None:
+            self.ensure_backend()
+        return self._mouse
+
+    @property
+    def keyboard(self) -> Any:
+        """The keyboard backend, created on first access."""
+        if self._keyboard is None:
+            from src.backends import KeyboardBackend
+
+            self._keyboard = KeyboardBackend()
+        return self._keyboard
+
+    @property
+    def is_holding(self) -> bool:
+        """Whether a hold action currently has its button or key pressed."""
+        return bool(self._held)
+
+    def ensure_backend(self) -> None:
+        """
+        Create the default backend and resolve the button, if not done yet.
+
+        Safe to call from a background thread to warm up after the GUI is shown.
+        """
+        with self._backend_lock:
+            if self._mouse is None:
+                from pynput.mouse import Controller
+
+                self._mouse = Controller()
+            if self.button is None:
+                self.button = resolve_button(self._mouse, self.button_type)
+
+    def set_mouse(self, mouse: Any) -> None:
+        """
+        Replace the mouse backend, e.g. to click into a specific window.
+
+        Call while stopped. The replaced backend's close() is called if it has one.
+
+        Args:
+            mouse (Any): New backend; None to go back to the default pynput Controller.
+        """
+        with self._backend_lock:
+            old, self._mouse = self._mouse, mouse
+            self.button = resolve_button(mouse, self.button_type) if mouse is not None else None
+        close = getattr(old, "close", None)
+        if old is not mouse and close is not None:
+            close()
 
     def set_interval(self, interval: float) -> None:
         """
@@ -33,6 +181,25 @@ class AutoClicker:
         if interval <= 0:
             raise ValueError("Interval must be greater than 0")
         self.interval = interval
+        self._set_primary(interval=interval)
+
+    def set_interval_sampler(self, sampler: Callable[[], float] | None, owned: bool = True) -> None:
+        """
+        Set a function that draws each interval, e.g. to reproduce a human cadence.
+
+        Args:
+            sampler (Callable[[], float] | None): Returns seconds until the next click;
+                None to use the fixed interval. A replaced sampler's close() is
+                called if it has one and the clicker owned it, e.g. to stop an
+                IntervalSchedule's refill thread.
+            owned (bool): Whether the clicker closes the sampler once it is replaced.
+                False for samplers their creator keeps reusing, such as profiles'.
+        """
+        old, self.interval_sampler = self.interval_sampler, sampler
+        old_owned, self._owns_sampler = self._owns_sampler, owned
+        close = getattr(old, "close", None)
+        if old is not sampler and old_owned and close is not None:
+            close()
 
     def set_button(self, button_type: Literal["left", "right"]) -> None:
         """
@@ -44,12 +211,12 @@ class AutoClicker:
         Raises:
             ValueError: If button_type is not 'left' or 'right'.
         """
-        if button_type == "left":
-            self.button = Button.left
-        elif button_type == "right":
-            self.button = Button.right
-        else:
+        if button_type not in ("left", "right"):
             raise ValueError(f"Invalid button type: {button_type}")
+        self.button_type = button_type
+        if self._mouse is not None:
+            self.button = resolve_button(self._mouse, button_type)
+        self._set_primary(target=button_type)
 
     def set_mode(self, mode: Literal["click", "hold"]) -> None:
         """
@@ -61,6 +228,7 @@ class AutoClicker:
         if mode not in ["click", "hold"]:
             raise ValueError(f"Invalid mode: {mode}")
         self.mode = mode
+        self._set_primary(mode=mode)
 
     def set_duration(self, duration: float | None) -> None:
         """
@@ -72,37 +240,465 @@ class AutoClicker:
         if duration is not None and duration <= 0:
             raise ValueError("Duration must be greater than 0")
         self.duration = duration
+        self._wake.set()  # A hold-only run waits for changes rather than polling
+
+    def set_click_limit(self, click_limit: int | None) -> None:
+        """
+        Set how many clicks a run makes before stopping by itself.
+
+        Key taps count as clicks. Combined with a duration, the run stops
+        at whichever comes first.
+
+        Args:
+            click_limit (int | None): Number of clicks, None for unlimited.
+        """
+        if click_limit is not None and click_limit <= 0:
+            raise ValueError("Click limit must be greater than 0")
+        self.click_limit = click_limit
+        self._wake.set()
+
+    def add_action(self, action: Action) -> int:
+        """
+        Add an action; a running clicker picks it up immediately.
+
+        Args:
+            action (Action): Action to add.
+
+        Returns:
+            int: Id for remove_action().
+
+        Raises:
+            ValueError: If the action is invalid or names an unknown key.
+        """
+        validate_action(action)
+        if action.device == "key":
+            self.keyboard.validate(action.target)
+        with self._actions_lock:
+            action_id = next(self._action_ids)
+            self.actions[action_id] = action
+            self._actions_changed = True
+        self._wake.set()
+        return action_id
+
+    def remove_action(self, action_id: int) -> None:
+        """
+        Remove an action, releasing it if held.
+
+        Removing PRIMARY_ACTION leaves only the added actions; the click
+        settings are then still stored but no longer clicked.
+
+        Args:
+            action_id (int): Id returned by add_action(), or PRIMARY_ACTION;
+                unknown ids are ignored.
+        """
+        with self._actions_lock:
+            if self.actions.pop(action_id, None) is None:
+                return
+            self._actions_changed = True
+        self._wake.set()
+
+    def _set_primary(self, **fields: Any) -> None:
+        """Copy changed click settings into the primary action, if it is still there."""
+        with self._actions_lock:
+            primary = self.actions.get(PRIMARY_ACTION)
+            if primary is None:
+                return
+            updated = primary._replace(**fields)
+            self.actions[PRIMARY_ACTION] = updated
+            # A new interval applies from the next click; a new button or mode needs a resync
+            changed = (updated.target, updated.mode) != (primary.target, primary.mode)
+            if changed:
+                self._actions_changed = True
+        if changed:
+            self._wake.set()
+
+    def apply_settings(
+        self,
+        interval: float,
+        button_type: Literal["left", "right"],
+        mode: Literal["click", "hold"],
+        duration: float | None,
+        interval_sampler: Callable[[], float] | None = None,
+        sampler_owned: bool = True,
+    ) -> None:
+        """
+        Swap all click settings at once, e.g. when switching profiles.
+
+        A running click loop picks the new settings up on its next iteration
+        without being restarted.
+
+        Args:
+            interval (float): Seconds between clicks.
+            button_type (Literal["left", "right"]): Button type to use.
+            mode (Literal["click", "hold"]): Clicking mode.
+            duration (float | None): Duration in seconds, None for infinite.
+            interval_sampler (Callable[[], float] | None): Per-click interval source, if any.
+            sampler_owned (bool): Whether the clicker closes the sampler once it is replaced.
+        """
+        self.set_interval(interval)
+        self.set_button(button_type)
+        self.set_mode(mode)
+        self.set_duration(duration)
+        self.set_interval_sampler(interval_sampler, sampler_owned)
+
+    def set_session_log(self, session_log: SessionLog | None) -> None:
+        """
+        Set the log that finished sessions are recorded to.
+
+        Args:
+            session_log (SessionLog | None): Session log, None to disable recording.
+        """
+        self.session_log = session_log
+
+    def set_tracer(self, tracer: ClickTracer | None) -> None:
+        """
+        Set the tracer that records click-loop spans.
+
+        Args:
+            tracer (ClickTracer | None): Tracer, None to disable tracing.
+        """
+        self.tracer = tracer
+
+    def set_budget(self, budget: SharedBudget | None) -> None:
+        """
+        Share a host-wide click-rate ceiling with other instances.
+
+        The replaced budget is closed, freeing its slot.
+
+        Args:
+            budget (SharedBudget | None): Budget to draw click tokens from, None for no ceiling.
+        """
+        old, self.budget = self.budget, budget
+        if old is not None and old is not budget:
+            old.close()
 
-    def _click_loop(self) -> None:
-        """Internal loop for continuous clicking."""
+    def set_stop_callback(self, callback: Callable[[str], None] | None) -> None:
+        """
+        Set the function told when a run ends by itself.
+
+        It is called on the click thread with the stop reason ("duration",
+        "click_limit" or "error") as soon as the run has ended and
+        is_running is False. Runs ended by stop() are not reported.
+
+        Args:
+            callback (Callable[[str], None] | None): Callback, None to remove it.
+        """
+        self.stop_callback = callback
+
+    def _click_loop(self, generation: int) -> None:
+        """
+        Internal loop performing every action.
+
+        Args:
+            generation (int): Run this loop belongs to. If stop() gave up
+                waiting for it (e.g. a backend call hung) and start() began a
+                new run, the old loop leaves without touching the new run's state.
+        """
+        try:
+            if any(action.device == "mouse" for action in self.actions.values()):
+                self.ensure_backend()
+        except Exception as e:
+            print(f"Mouse backend error: {e}")
+            self.stats.record_error(e, fatal=True)
+            self._end_run(generation, "error")
+            return
         self.start_time = time.time()
+        self.click_count = 0
+        session_start = time.perf_counter()
+        stats = self.stats
+        stats.start_run()
+        if self.tracer is not None:
+            self.tracer.thread_id = threading.get_ident()
+
+        # Clicks are scheduled on absolute slots, so sleep overshoot does not accumulate
+        streams: dict[int, _Stream] = {}  # Click and tap actions by id
+        holds: dict[int, tuple[Any, Any]] = {}  # Hold actions to keep pressed: id -> (backend, target)
+        heap: list[tuple[float, int]] = []  # (deadline, id); entries whose deadline moved are skipped
+        self._actions_changed = True
+        retry_tokens = float(RETRY_BUDGET)
+        hold_attempts = 0  # Failed tries of the pending hold presses
+        press_at = 0.0  # When a hold press may be retried
+        reason = "stopped"
+
+        while self.is_running and generation == self._generation:
+            # Disabled tracing costs one attribute load and a few None checks
+            tracer = self.tracer
+            if tracer is not None:
+                t_bookkeeping = time.perf_counter()
+
+            # Stop at the deadline or once the click budget is spent, whichever comes first.
+            # Both use the monotonic clock and a counter only this thread writes: no locks.
+            duration = self.duration
+            end = session_start + duration if duration is not None else None
+            limit = self.click_limit
+            if (limit is not None and self.click_count >= limit) or (
+                end is not None and time.perf_counter() >= end
+            ):
+                reason = "click_limit" if limit is not None and self.click_count >= limit else "duration"
+                self.is_running = False
+                break
+
+            if self.is_paused:
+                self._park(end)
+                now = time.perf_counter()
+                for stream in streams.values():
+                    stream.reset(now)  # First clicks right after resuming
+                heap[:] = [(stream.deadline, action_id) for action_id, stream in streams.items()]
+                heapq.heapify(heap)
+                continue
+
+            stream = None  # The stream being acted on, for the retry path
+            try:
+                if self._actions_changed:
+                    self._sync_actions(streams, holds, heap)
+                pressing = len(self._held) < len(holds)
+                if pressing and time.perf_counter() >= press_at:
+                    for action_id, (backend, target) in holds.items():
+                        if action_id not in self._held:
+                            backend.press(target)
+                            self._held[action_id] = (backend, target)
+                    pressing = False
+                    hold_attempts = 0
+                    self._note_resume_latency(time.perf_counter())
+
+                while heap and (heap[0][1] not in streams or heap[0][0] != streams[heap[0][1]].deadline):
+                    heapq.heappop(heap)  # Removed action, or a deadline moved by a retry
+                now = time.perf_counter()
+                deadline = heap[0][0] if heap else None
+                if deadline is None or now < deadline:
+                    # Nothing due, or woken early by pause/stop/changes: re-check before acting
+                    wake_at = deadline
+                    if end is not None and (wake_at is None or end < wake_at):
+                        wake_at = end
+                    if pressing and (wake_at is None or press_at < wake_at):
+                        wake_at = press_at  # Backing off after a failed press
+                    self._wait(None if wake_at is None else wake_at - now)
+                    if tracer is not None:
+                        tracer.span(SPAN_WAIT, now, time.perf_counter())
+                    continue
+
+                action_id = heap[0][1]
+                stream = streams[action_id]
+                mouse = stream.action.device == "mouse"
+                budget = self.budget
+                if mouse and budget is not None and not stream.attempts and not budget.try_acquire(now, stream.step):
+                    # Over the host-wide ceiling: this instance's next token sets the next slot
+                    stream.slot = stream.deadline = budget.next_token_at()
+                    heapq.heapreplace(heap, (stream.deadline, action_id))
+                    continue
+
+                t_click = now
+                if tracer is not None:
+                    tracer.span(SPAN_BOOKKEEPING, t_bookkeeping, t_click)
+                if mouse:
+                    stream.backend.click(stream.target, 1)
+                else:
+                    stream.backend.press(stream.target)
+                    stream.backend.release(stream.target)
+                self.click_count += 1
+                stats.record_click(t_click, stream.slot)
+                stream.attempts = 0
+                if retry_tokens < RETRY_BUDGET:
+                    retry_tokens += RETRY_REFILL
+                if self.resume_requested_at is not None:
+                    self._note_resume_latency(t_click)
+                if tracer is not None:
+                    tracer.span(SPAN_INJECT, t_click, time.perf_counter())
 
-        while self.is_running:
-            # Check if duration exceeded
-            if self.duration is not None:
-                elapsed = time.time() - self.start_time
-                if elapsed >= self.duration:
+                stream.step = self._next_step(action_id, stream.action)
+                stream.slot += stream.step
+                stream.deadline = stream.slot
+                now = time.perf_counter()
+                if now > stream.deadline:
+                    # Already past the next slot: count it and restart this stream's schedule
+                    stats.record_missed()
+                    stream.slot = stream.deadline = now
+                heapq.heapreplace(heap, (stream.deadline, action_id))
+            except Exception as e:
+                if not is_transient(e) or retry_tokens < 1:
+                    stats.record_error(e, fatal=True)
+                    print(f"Click error: {e!r}")
+                    reason = "error"
                     self.is_running = False
-                    # Release button if in hold mode
-                    if self.is_holding:
-                        self.mouse.release(self.button)
-                        self.is_holding = False
                     break
+                retry_tokens -= 1
+                stats.record_error(e, fatal=False)
+                if stream is None:
+                    hold_attempts += 1
+                    press_at = time.perf_counter() + RETRY_BACKOFF * 2 ** (hold_attempts - 1)
+                    continue
+                stream.attempts += 1
+                retry_at = time.perf_counter() + RETRY_BACKOFF * 2 ** (stream.attempts - 1)
+                if retry_at < stream.slot + stream.step:
+                    stream.deadline = retry_at  # Retry this slot; later slots keep their phase
+                else:
+                    # No time left before the next slot: give this one up, stay in phase
+                    stats.record_missed()
+                    stream.slot += stream.step
+                    stream.deadline = stream.slot
+                    stream.attempts = 0
+                heapq.heappush(heap, (stream.deadline, action_id))
 
-            try:
-                if self.mode == "hold":
-                    # For hold mode: press and stay held
-                    if not self.is_holding:
-                        self.mouse.press(self.button)
-                        self.is_holding = True
-                    time.sleep(0.01)  # Small sleep to prevent CPU spinning
+        if generation != self._generation:
+            return  # Superseded: the counters and session now belong to the new run
+        self._release_quietly()
+        stats.stop_run()
+        self._record_session(time.perf_counter() - session_start)
+        self._end_run(generation, reason)
+
+    def _next_step(self, action_id: int, action: Action) -> float:
+        """Seconds from an action's click to its next one; the primary follows the live settings."""
+        if action_id != PRIMARY_ACTION:
+            return action.interval
+        sampler = self.interval_sampler
+        return sampler() if sampler is not None else self.interval
+
+    def _sync_actions(
+        self,
+        streams: dict[int, _Stream],
+        holds: dict[int, tuple[Any, Any]],
+        heap: list[tuple[float, int]],
+    ) -> None:
+        """
+        Bring the loop's streams and holds in line with the current actions.
+
+        Streams whose action only changed its interval or button keep their
+        schedule; new streams start now (plus their offset). Holds that were
+        removed or changed are released here and the rest are pressed by the loop.
+
+        Args:
+            streams (dict[int, _Stream]): Click and tap schedules by action id.
+            holds (dict[int, tuple[Any, Any]]): Hold actions to keep pressed.
+            heap (list[tuple[float, int]]): Deadline heap of the streams.
+        """
+        with self._actions_lock:
+            actions = dict(self.actions)
+            self._actions_changed = False
+        try:
+            now = time.perf_counter()
+            for action_id in list(streams):
+                action = actions.get(action_id)
+                if action is None or action.mode != "click" or action.device != streams[action_id].action.device:
+                    del streams[action_id]  # Its heap entries are skipped when popped
+            for action_id, action in actions.items():
+                backend, target = self._device(action)
+                if action.mode == "hold":
+                    streams.pop(action_id, None)
+                    if holds.get(action_id) != (backend, target):
+                        holds[action_id] = (backend, target)
+                        self._release(action_id)  # Switched button or key mid-hold
+                elif action_id in streams:
+                    stream = streams[action_id]
+                    stream.action, stream.backend, stream.target = action, backend, target
                 else:
-                    # Regular click mode
-                    self.mouse.click(self.button, 1)
-                    time.sleep(self.interval)
+                    stream = _Stream(action, backend, target, now)
+                    streams[action_id] = stream
+                    heapq.heappush(heap, (stream.deadline, action_id))
+            for action_id in [i for i in holds if i not in actions or actions[i].mode != "hold"]:
+                del holds[action_id]
+                self._release(action_id)
+        except Exception:
+            self._actions_changed = True  # Try again on the next iteration
+            raise
+
+    def _device(self, action: Action) -> tuple[Any, Any]:
+        """
+        Get the backend and backend-specific target for an action.
+
+        Returns:
+            tuple[Any, Any]: (backend, button or key).
+        """
+        if action.device == "mouse":
+            mouse = self.mouse
+            return mouse, resolve_button(mouse, action.target)
+        return self.keyboard, action.target
+
+    def _end_run(self, generation: int, reason: str) -> None:
+        """
+        Mark the run as over and report it if it ended by itself.
+
+        Args:
+            generation (int): Run that ended.
+            reason (str): "stopped" (by stop()), "duration", "click_limit" or "error".
+        """
+        if generation != self._generation:
+            return
+        self.stop_reason = reason
+        self.is_running = False
+        callback = self.stop_callback
+        if reason != "stopped" and callback is not None:
+            try:
+                callback(reason)
             except Exception as e:
-                print(f"Click error: {e}")
-                break
+                print(f"Stop callback error: {e}")
+
+    def _wait(self, timeout: float | None) -> None:
+        """Sleep up to `timeout` seconds (None: until woken), returning early if woken by pause/resume/stop."""
+        if self._wake.wait(timeout):
+            self._wake.clear()
+
+    def _park(self, end: float | None = None) -> None:
+        """
+        Release everything held and block until resumed or stopped.
+
+        Args:
+            end (float | None): perf_counter() at which the run's duration ends.
+        """
+        self._release_held()
+        stats = self.stats
+        if self.pause_requested_at is not None:
+            # Positive when a click still went out after pause() was called
+            stats.last_pause_overrun = max(0.0, (stats.last_click_time or 0.0) - self.pause_requested_at)
+            self.pause_requested_at = None
+        while self.is_paused and self.is_running:
+            if end is not None and time.perf_counter() >= end:
+                return  # The loop ends the run
+            if self._wake.wait(None if end is None else end - time.perf_counter()):
+                self._wake.clear()
+
+    def _note_resume_latency(self, t_effect: float) -> None:
+        """Record the time from resume() to the first click (or press) it caused."""
+        if self.resume_requested_at is not None:
+            self.stats.last_resume_latency = t_effect - self.resume_requested_at
+            self.resume_requested_at = None
+
+    def _release_quietly(self) -> None:
+        """Release everything held at the end of a run, reporting instead of raising errors."""
+        for action_id in list(self._held):
+            try:
+                self._release(action_id)
+            except Exception as e:
+                print(f"Release error: {e}")
+
+    def _release_held(self) -> None:
+        """Release every held button and key."""
+        for action_id in list(self._held):
+            self._release(action_id)
+
+    def _release(self, action_id: int) -> None:
+        """Release one held button or key, if it is down."""
+        entry = self._held.pop(action_id, None)  # Atomic, so stop() and the loop never both release
+        if entry is not None:
+            backend, target = entry
+            backend.release(target)
+
+    def _record_session(self, duration: float) -> None:
+        """
+        Queue the session that just ended to the session log.
+
+        Args:
+            duration (float): Measured session length in seconds.
+        """
+        if self.session_log is None or self.start_time is None:
+            return
+        cps = 1.0 / self.interval if self.mode == "click" else 0.0
+        self.session_log.record(
+            self.start_time,
+            self.start_time + duration,
+            duration,
+            cps,
+            self.click_count,
+        )
 
     def start(self) -> None:
         """Start the auto-clicker."""
@@ -110,22 +706,72 @@ class AutoClicker:
             return  # Already running
 
         self.is_running = True
-        self.click_thread = threading.Thread(target=self._click_loop, daemon=True)
+        self.stop_reason = None
+        self._wake.clear()
+        self._generation += 1
+        self.click_thread = threading.Thread(target=self._click_loop, args=(self._generation,), daemon=True)
         self.click_thread.start()
 
+    def pause(self, reason: str = "user") -> None:
+        """
+        Suspend clicking without ending the session or the click thread.
+
+        Returns immediately; the loop releases any held button and parks.
+        Pauses are counted per reason, so e.g. the focus guard and a hold
+        trigger each only lift their own.
+
+        Args:
+            reason (str): Who is pausing; resume() with the same reason lifts it.
+        """
+        with self._pause_lock:
+            if reason in self.pause_reasons:
+                return
+            self.pause_reasons.add(reason)
+            if self.is_paused:
+                return
+            self.pause_requested_at = time.perf_counter()
+            self.resume_requested_at = None
+            self.is_paused = True
+        self._wake.set()
+
+    def resume(self, reason: str = "user") -> None:
+        """
+        Lift one reason's pause; once none is left the first click follows immediately.
+
+        Args:
+            reason (str): The reason given to pause(); unknown reasons are ignored.
+        """
+        with self._pause_lock:
+            if reason not in self.pause_reasons:
+                return
+            self.pause_reasons.discard(reason)
+            if self.pause_reasons:
+                return
+            self.resume_requested_at = time.perf_counter()
+            self.is_paused = False
+        self._wake.set()
+
     def stop(self) -> None:
         """Stop the auto-clicker."""
         self.is_running = False
-        # Release button if it's held
-        if self.is_holding:
-            try:
-                self.mouse.release(self.button)
-                self.is_holding = False
-            except Exception as e:
-                print(f"Release error: {e}")
+        self._wake.set()
+        # Release held buttons and keys now rather than when the loop notices
+        self._release_quietly()
         if self.click_thread:
             self.click_thread.join(timeout=1) 
 
+    def get_remaining_clicks(self) -> int | None:
+        """
+        Get the clicks left in the current run's budget.
+
+        Returns:
+            int | None: Remaining clicks, or None if not running or no limit set.
+        """
+        limit = self.click_limit
+        if not self.is_running or limit is None:
+            return None
+        return max(0, limit - self.click_count)
+
     def get_remaining_time(self) -> float | None:
         """
         Get remaining time in seconds.
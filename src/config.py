@@ -0,0 +1,306 @@
+"""Settings persistence for MC Clicker."""
+
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any
+
+from src.hotkey import HotkeyManager
+from src.scheduler import parse_rule
+from src.utils import validate_cps
+
+CONFIG_VERSION = 1
+DEFAULT_CONFIG_FILE = os.path.join(os.path.dirname(__file__), "config.json")
+
+DEFAULT_SETTINGS: dict[str, Any] = {
+    "hotkey": "f6",
+    "cps": 1.6,
+    "mode": "click",
+    "button": "left",
+    "timer_enabled": False,
+    "timer_hours": 0,
+    "timer_minutes": 0,
+    "timer_seconds": 0,
+    "trigger": "toggle",
+    "click_limit": 0,  # Stop after this many clicks; 0 = unlimited
+    "profiles": {},
+    "schedule": [],  # Session rules such as "02:00-06:00 every 60m for 20m"
+    "cps_budget": 0,  # Host-wide CPS ceiling shared with other local instances; 0 = none
+    "focus_pause": False,  # Pause while the window clicking was started in does not have focus (X11)
+}
+
+DEFAULT_WRITE_DELAY = 0.5  # Seconds of quiet before pending changes are written
+
+
+def _valid_setting(key: str, value: Any) -> bool:
+    """
+    Check whether a single setting value is acceptable.
+
+    Args:
+        key (str): Setting name.
+        value (Any): Value loaded from disk.
+
+    Returns:
+        bool: True if the value can be used as-is.
+    """
+    if key == "hotkey":
+        return isinstance(value, str) and bool(value)
+    if key == "cps":
+        return isinstance(value, (int, float)) and not isinstance(value, bool) and validate_cps(value)
+    if key == "cps_budget":
+        return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+    if key == "mode":
+        return value in ("click", "hold")
+    if key == "button":
+        return value in ("left", "right")
+    if key in ("timer_enabled", "focus_pause"):
+        return isinstance(value, bool)
+    if key in ("timer_hours", "timer_minutes", "timer_seconds", "click_limit"):
+        return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+    if key == "trigger":
+        # "toggle", a mouse button from TRIGGER_NAMES, or a key name to hold
+        return isinstance(value, str) and bool(value)
+    if key == "schedule":
+        if not isinstance(value, list) or not all(isinstance(rule, str) for rule in value):
+            return False
+        try:
+            for rule in value:
+                parse_rule(rule)
+        except ValueError:
+            return False
+        return True
+    if key == "profiles":
+        # Individual profiles are validated by ProfileManager when it loads them
+        return isinstance(value, dict) and all(isinstance(name, str) for name in value)
+    return False
+
+
+def validate_settings(data: Any) -> dict[str, Any]:
+    """
+    Build a complete settings dict from loaded data.
+
+    Unknown keys are dropped and invalid values fall back to their defaults, so a
+    partly damaged file still restores everything that is readable.
+
+    Args:
+        data (Any): Parsed JSON content.
+
+    Returns:
+        dict[str, Any]: Settings with every key from DEFAULT_SETTINGS present.
+    """
+    settings = copy.deepcopy(DEFAULT_SETTINGS)
+    if not isinstance(data, dict):
+        return settings
+
+    # Version 0 files only held the display form of the hotkey ("CTRL + F6")
+    if "version" not in data and isinstance(data.get("hotkey"), str):
+        data = {"hotkey": HotkeyManager.parse_hotkey_input(data["hotkey"])}
+
+    for key in DEFAULT_SETTINGS:
+        if key in data and _valid_setting(key, data[key]):
+            settings[key] = data[key]
+    return settings
+
+
+class ConfigStore:
+    """Loads settings and writes changes behind the caller's back."""
+
+    def __init__(self, path: str, write_delay: float = DEFAULT_WRITE_DELAY) -> None:
+        """
+        Initialize the ConfigStore.
+
+        Args:
+            path (str): Path of the JSON config file.
+            write_delay (float): Seconds to wait after the last change before writing.
+        """
+        self.path = path
+        self.write_delay = write_delay
+        self.settings: dict[str, Any] = copy.deepcopy(DEFAULT_SETTINGS)
+        self._dirty = False
+        self._writing = False  # A snapshot has been taken but is not on disk yet
+        self._writes = 0  # Snapshots taken so far
+        self._write_at = 0.0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._writer_thread: threading.Thread | None = None
+
+    def load(self) -> dict[str, Any]:
+        """
+        Load settings from disk.
+
+        A missing, unreadable or corrupt file yields defaults instead of raising.
+
+        Returns:
+            dict[str, Any]: A copy of the loaded settings.
+        """
+        settings = validate_settings(self._read())
+        with self._cond:
+            self.settings = settings
+            return dict(self.settings)
+
+    def reload(self) -> dict[str, Any]:
+        """
+        Re-read the file and report which settings differ from memory.
+
+        Skipped while changes made here are pending or being written: the file
+        is about to be replaced with them, and reading it now would undo them.
+
+        Returns:
+            dict[str, Any]: Changed settings and their new values; empty if
+            the file matches (e.g. after our own write) or was not read.
+        """
+        with self._cond:
+            if self._dirty or self._writing:
+                return {}
+            writes = self._writes
+        new = validate_settings(self._read())
+        with self._cond:
+            if self._dirty or self._writing or self._writes != writes:
+                return {}  # Changed here while the file was read
+            changes = diff_settings(self.settings, new)
+            self.settings = new
+            return changes
+
+    def _read(self) -> Any:
+        """Parse the file, reporting failures and returning None instead of raising."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            print(f"Error decoding JSON from {self.path}, using defaults")
+        except OSError as e:
+            print(f"Error loading settings from {self.path}: {e}")
+        return None
+
+    def get(self, key: str) -> Any:
+        """
+        Get a single setting.
+
+        Args:
+            key (str): Setting name.
+
+        Returns:
+            Any: Current value.
+        """
+        return self.settings[key]
+
+    def update(self, **changes: Any) -> None:
+        """
+        Change settings and schedule a debounced write.
+
+        Returns immediately; the file is written by a background thread once
+        no further changes have arrived for `write_delay` seconds.
+
+        Args:
+            **changes (Any): Setting names and their new values.
+
+        Raises:
+            KeyError: If a setting name is unknown.
+        """
+        for key in changes:
+            if key not in DEFAULT_SETTINGS:
+                raise KeyError(f"Unknown setting: {key}")
+
+        with self._cond:
+            if all(self.settings.get(k) == v for k, v in changes.items()):
+                return
+            self.settings.update(changes)
+            self._dirty = True
+            self._write_at = time.monotonic() + self.write_delay
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+                self._writer_thread.start()
+            self._cond.notify()
+
+    def flush(self) -> None:
+        """Write pending changes now and stop the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._writer_thread
+        if thread is not None:
+            thread.join()
+        with self._cond:
+            self._writer_thread = None
+            self._closed = False
+            snapshot = self._take_snapshot() if self._dirty else None
+        if snapshot is not None:
+            self._write(snapshot)
+
+    def _writer_loop(self) -> None:
+        """Wait for the debounce deadline, then write the latest snapshot."""
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        return
+                    if not self._dirty:
+                        self._cond.wait()
+                        continue
+                    remaining = self._write_at - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                snapshot = self._take_snapshot()
+            # Disk I/O happens outside the lock so update() never waits on it
+            self._write(snapshot)
+
+    def _take_snapshot(self) -> dict[str, Any]:
+        """Copy the settings for writing and clear the dirty flag. Caller holds the lock."""
+        self._dirty = False
+        self._writing = True
+        self._writes += 1
+        return {"version": CONFIG_VERSION, **self.settings}
+
+    def _write(self, data: dict[str, Any]) -> None:
+        """Write a settings snapshot, reporting failures instead of raising."""
+        try:
+            write_json_atomic(self.path, data)
+        except OSError as e:
+            print(f"Error saving settings to {self.path}: {e}")
+        finally:
+            with self._cond:
+                self._writing = False
+
+
+def diff_settings(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """
+    Find settings whose value changed.
+
+    Args:
+        old (dict[str, Any]): Previous settings.
+        new (dict[str, Any]): Current settings.
+
+    Returns:
+        dict[str, Any]: Keys from `new` whose value differs from `old`.
+    """
+    return {key: value for key, value in new.items() if old.get(key) != value}
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """
+    Write JSON so readers only ever see the old or the new file.
+
+    Args:
+        path (str): Destination path.
+        data (Any): JSON-serializable data.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".config-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
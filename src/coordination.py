@@ -0,0 +1,520 @@
+"""Clock-synchronized start/stop of clickers on several hosts."""
+
+import argparse
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import secrets
+import socket
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+from src.clicker import AutoClicker
+
+DEFAULT_HOST = "127.0.0.1"  # Pass --host 0.0.0.0 to accept a coordinator on another machine
+DEFAULT_PORT = 9478
+SECRET_ENV_VAR = "MCCLICKER_COORD_SECRET"  # Shared secret every agent and its coordinator must know
+CONTROL_COMMANDS = ("start", "stop")  # Commands that change what an agent does
+TAG_SIZE = hashlib.sha256().digest_size
+SYNC_ROUNDS = 8  # Round trips per agent; the fastest one gives the offset estimate
+REPLY_TIMEOUT = 0.5
+RETRIES = 3
+SPIN_WINDOW = 0.002  # Seconds before the start time spent spinning instead of sleeping
+MAX_DATAGRAM = 4096
+PAUSE_REASON = "coordination"  # Holds a started agent until the scheduled start time
+
+
+def seal(secret: bytes, message: dict[str, Any]) -> bytes:
+    """
+    Encode a message and prefix it with its HMAC-SHA256 tag.
+
+    Args:
+        secret (bytes): Shared secret.
+        message (dict[str, Any]): JSON-serializable message.
+
+    Returns:
+        bytes: Datagram payload.
+    """
+    body = json.dumps(message).encode()
+    return hmac.new(secret, body, hashlib.sha256).digest() + body
+
+
+def unseal(secret: bytes, data: bytes) -> dict[str, Any] | None:
+    """
+    Check a datagram's tag and decode it.
+
+    Args:
+        secret (bytes): Shared secret.
+        data (bytes): Datagram payload.
+
+    Returns:
+        dict[str, Any] | None: The message, or None if it is not authentic or not a JSON object.
+    """
+    tag, body = data[:TAG_SIZE], data[TAG_SIZE:]
+    if not hmac.compare_digest(tag, hmac.new(secret, body, hashlib.sha256).digest()):
+        return None
+    try:
+        message = json.loads(body)
+    except ValueError:
+        return None
+    return message if isinstance(message, dict) else None
+
+
+def _wait_until(deadline: float) -> None:
+    """
+    Sleep until a perf_counter() deadline, spinning for the last moment.
+
+    Args:
+        deadline (float): perf_counter() value to wait for.
+    """
+    remaining = deadline - time.perf_counter()
+    if remaining > SPIN_WINDOW:
+        time.sleep(remaining - SPIN_WINDOW)
+    while time.perf_counter() < deadline:
+        pass
+
+
+class ClickAgent:
+    """
+    Runs one AutoClicker on commands from a coordinator over UDP.
+
+    Every datagram carries an HMAC of the shared secret; anything else is
+    dropped without a reply. A start or stop must also carry the agent's
+    current nonce, which changes each time one is carried out, so a
+    recorded command cannot be replayed. A retransmitted command (same
+    session and sequence number) gets the original reply back instead of
+    being carried out twice.
+    """
+
+    def __init__(
+        self,
+        clicker: AutoClicker,
+        secret: bytes,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the ClickAgent.
+
+        Args:
+            clicker (AutoClicker): Clicker to drive.
+            secret (bytes): Secret shared with the coordinator.
+            host (str): Address to bind; localhost by default.
+            port (int): UDP port to bind; 0 picks a free port.
+            clock (Callable[[], float]): This host's wall clock, in seconds.
+        """
+        if not secret:
+            raise ValueError("A shared secret is required")
+        self.clicker = clicker
+        self.secret = secret
+        self.host = host
+        self.port = port
+        self.clock = clock
+        self.nonce = secrets.token_hex(16)  # Replaced after every start or stop
+        self.rejected = 0  # Datagrams dropped for a bad tag
+        self.duplicates = 0  # Retransmitted commands answered from the cache
+        self._last_control: tuple[tuple[Any, Any], dict[str, Any]] | None = None  # (session, seq), reply
+        self.is_serving: bool = False
+        self.serve_thread: threading.Thread | None = None
+        self.started_at: float | None = None  # Agent clock when resume() was called
+        self._sock: socket.socket | None = None
+        self._timers: list[threading.Thread] = []
+
+    def start(self) -> None:
+        """Bind the socket and serve commands; `port` is updated to the bound port."""
+        if self.is_serving:
+            return
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind((self.host, self.port))
+        self.port = self._sock.getsockname()[1]
+        self.is_serving = True
+        self.serve_thread = threading.Thread(target=self._serve, daemon=True)
+        self.serve_thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and stop the clicker."""
+        if not self.is_serving:
+            return
+        self.is_serving = False
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)  # Unblocks recvfrom(); close() alone does not
+        except OSError:
+            pass
+        if self.serve_thread:
+            self.serve_thread.join(timeout=1)
+        self._sock.close()
+        for timer in self._timers:
+            timer.join(timeout=1)
+        self._timers = []
+        self.clicker.stop()
+
+    def first_click_time(self) -> float | None:
+        """
+        Get when the first click after the scheduled start was made.
+
+        Returns:
+            float | None: Agent clock time, or None before that click.
+        """
+        latency = self.clicker.stats.last_resume_latency
+        if self.started_at is None or latency is None:
+            return None
+        return self.started_at + latency
+
+    def _serve(self) -> None:
+        """Answer datagrams until stopped."""
+        while self.is_serving:
+            try:
+                data, address = self._sock.recvfrom(MAX_DATAGRAM)
+            except OSError:
+                return  # Socket shut down by stop()
+            if not self.is_serving:
+                return
+            t_receive = self.clock()
+            request = unseal(self.secret, data)
+            if request is None:
+                self.rejected += 1
+                continue  # Not from our coordinator; stay silent
+            try:
+                reply = self._dispatch(request, t_receive)
+            except (ValueError, KeyError, TypeError) as e:
+                reply = {"error": str(e)}
+            reply["session"] = request.get("session")
+            reply["seq"] = request.get("seq")
+            reply["nonce"] = self.nonce
+            if "t1" in reply:
+                reply["t2"] = self.clock()  # As late as possible, to exclude our own processing
+            try:
+                self._sock.sendto(seal(self.secret, reply), address)
+            except OSError:
+                return
+
+    def _dispatch(self, request: dict[str, Any], t_receive: float) -> dict[str, Any]:
+        """
+        Check a start or stop for replays and duplicates, then execute the command.
+
+        Args:
+            request (dict[str, Any]): Authenticated command.
+            t_receive (float): Agent clock when the datagram arrived.
+
+        Returns:
+            dict[str, Any]: Reply payload.
+        """
+        if request.get("cmd") not in CONTROL_COMMANDS:
+            return self._handle(request, t_receive)
+        key = (request["session"], request["seq"])
+        if self._last_control is not None and self._last_control[0] == key:
+            self.duplicates += 1
+            return dict(self._last_control[1])
+        if request.get("nonce") != self.nonce:
+            raise ValueError("Stale nonce; ask for a new one")
+        reply = self._handle(request, t_receive)
+        self.nonce = secrets.token_hex(16)
+        self._last_control = (key, reply)
+        return dict(reply)
+
+    def _handle(self, request: dict[str, Any], t_receive: float) -> dict[str, Any]:
+        """
+        Execute one command.
+
+        Args:
+            request (dict[str, Any]): Decoded command.
+            t_receive (float): Agent clock when the datagram arrived.
+
+        Returns:
+            dict[str, Any]: Reply payload.
+        """
+        cmd = request["cmd"]
+        if cmd == "hello":
+            return {}  # Only fetches the nonce
+        if cmd == "sync":
+            return {"t1": t_receive}
+        if cmd == "start":
+            # Park the click thread now so the start itself is only a resume()
+            self.clicker.pause(PAUSE_REASON)
+            self.clicker.start()
+            self.started_at = None
+            self._schedule(float(request["at"]), self._begin)
+            return {"ok": True}
+        if cmd == "stop":
+            self._schedule(float(request["at"]), self.clicker.stop)
+            return {"ok": True}
+        if cmd == "report":
+            return {
+                "first_click": self.first_click_time(),
+                "clicks": self.clicker.stats.clicks_total,
+                "running": self.clicker.is_running,
+            }
+        raise ValueError(f"Unknown command: {cmd}")
+
+    def _schedule(self, at: float, action: Callable[[], None]) -> None:
+        """
+        Run an action when this host's clock reaches `at`.
+
+        Args:
+            at (float): Agent clock time.
+            action (Callable[[], None]): Called on a timer thread.
+        """
+        # perf_counter() is monotonic; converting once avoids wall-clock steps mid-wait
+        deadline = time.perf_counter() + (at - self.clock())
+
+        def run() -> None:
+            _wait_until(deadline)
+            action()
+
+        self._timers = [t for t in self._timers if t.is_alive()]
+        timer = threading.Thread(target=run, daemon=True)
+        self._timers.append(timer)
+        timer.start()
+
+    def _begin(self) -> None:
+        """Start clicking at the scheduled time."""
+        self.started_at = self.clock()
+        self.clicker.resume(PAUSE_REASON)
+
+
+class Coordinator:
+    """Aligns agent clocks and schedules simultaneous starts and stops."""
+
+    def __init__(
+        self,
+        agents: list[tuple[str, int]],
+        secret: bytes,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the Coordinator.
+
+        Args:
+            agents (list[tuple[str, int]]): (host, port) of every agent.
+            secret (bytes): Secret shared with the agents.
+            clock (Callable[[], float]): This host's wall clock, in seconds.
+        """
+        if not secret:
+            raise ValueError("A shared secret is required")
+        self.agents = agents
+        self.secret = secret
+        self.clock = clock
+        self.offsets: dict[tuple[str, int], float] = {}  # Agent clock minus our clock
+        self.round_trips: dict[tuple[str, int], float] = {}
+        self.nonces: dict[tuple[str, int], str] = {}  # Latest nonce each agent sent
+        self.session = secrets.token_hex(8)
+        self._seqs = itertools.count()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.settimeout(REPLY_TIMEOUT)
+
+    def close(self) -> None:
+        """Close the socket."""
+        self._sock.close()
+
+    def _request(self, agent: tuple[str, int], payload: dict[str, Any]) -> tuple[dict[str, Any], float, float]:
+        """
+        Send a command and wait for its reply, retrying on timeout.
+
+        A start or stop is retried under the same sequence number, so the
+        agent carries it out once however many copies arrive; other
+        commands get a fresh number per attempt, so each reply is matched to
+        the send time it answers.
+
+        Args:
+            agent (tuple[str, int]): Agent address.
+            payload (dict[str, Any]): Command.
+
+        Returns:
+            tuple[dict[str, Any], float, float]: Reply and our clock at send and receive.
+
+        Raises:
+            TimeoutError: If the agent does not answer.
+            RuntimeError: If the agent reports an error.
+        """
+        control = payload["cmd"] in CONTROL_COMMANDS
+        if control:
+            if agent not in self.nonces:
+                self._request(agent, {"cmd": "hello"})
+            payload = {**payload, "nonce": self.nonces[agent]}
+        seq = next(self._seqs)
+        for _ in range(RETRIES):
+            if not control:
+                seq = next(self._seqs)
+            data = seal(self.secret, {**payload, "session": self.session, "seq": seq})
+            t_send = self.clock()
+            self._sock.sendto(data, agent)
+            try:
+                while True:
+                    reply_data, _ = self._sock.recvfrom(MAX_DATAGRAM)
+                    t_receive = self.clock()
+                    reply = unseal(self.secret, reply_data)
+                    if reply is not None and reply.get("session") == self.session and reply.get("seq") == seq:
+                        break  # Forged replies and late replies to earlier attempts are dropped
+            except socket.timeout:
+                continue
+            if "nonce" in reply:
+                self.nonces[agent] = reply["nonce"]
+            if "error" in reply:
+                raise RuntimeError(f"Agent {agent[0]}:{agent[1]}: {reply['error']}")
+            return reply, t_send, t_receive
+        raise TimeoutError(f"Agent {agent[0]}:{agent[1]} did not answer")
+
+    def sync(self, rounds: int = SYNC_ROUNDS) -> dict[tuple[str, int], float]:
+        """
+        Estimate every agent's clock offset from NTP-style round trips.
+
+        The round trip with the smallest network delay is trusted, since its
+        request and reply were least likely to be queued asymmetrically.
+
+        Args:
+            rounds (int): Round trips per agent.
+
+        Returns:
+            dict[tuple[str, int], float]: Agent clock minus coordinator clock, in seconds.
+        """
+        for agent in self.agents:
+            best_delay = float("inf")
+            for _ in range(rounds):
+                reply, t0, t3 = self._request(agent, {"cmd": "sync"})
+                t1, t2 = reply["t1"], reply["t2"]
+                delay = (t3 - t0) - (t2 - t1)
+                if delay < best_delay:
+                    best_delay = delay
+                    self.offsets[agent] = ((t1 - t0) + (t2 - t3)) / 2
+            self.round_trips[agent] = best_delay
+        return dict(self.offsets)
+
+    def start_at(self, at: float) -> None:
+        """
+        Tell every agent to start clicking at a coordinator clock time.
+
+        Args:
+            at (float): Coordinator clock time; leave enough lead for the commands to arrive.
+        """
+        for agent in self.agents:
+            self._request(agent, {"cmd": "start", "at": at + self.offsets.get(agent, 0.0)})
+
+    def stop_at(self, at: float) -> None:
+        """
+        Tell every agent to stop clicking at a coordinator clock time.
+
+        Args:
+            at (float): Coordinator clock time.
+        """
+        for agent in self.agents:
+            self._request(agent, {"cmd": "stop", "at": at + self.offsets.get(agent, 0.0)})
+
+    def report(self) -> dict[str, Any]:
+        """
+        Collect first-click times and compute the start skew.
+
+        Returns:
+            dict[str, Any]: Per-agent first click (coordinator clock) and click
+            counts, and the spread between the earliest and latest start in ms.
+        """
+        agents = []
+        starts = []
+        for agent in self.agents:
+            reply, _, _ = self._request(agent, {"cmd": "report"})
+            first_click = reply["first_click"]
+            if first_click is not None:
+                first_click -= self.offsets.get(agent, 0.0)
+                starts.append(first_click)
+            agents.append({
+                "agent": f"{agent[0]}:{agent[1]}",
+                "offset_ms": self.offsets.get(agent, 0.0) * 1000,
+                "round_trip_ms": self.round_trips.get(agent, 0.0) * 1000,
+                "first_click": first_click,
+                "clicks": reply["clicks"],
+            })
+        skew = (max(starts) - min(starts)) * 1000 if len(starts) == len(self.agents) and starts else None
+        return {"agents": agents, "start_skew_ms": skew}
+
+
+def run_session(coordinator: Coordinator, lead: float, seconds: float) -> dict[str, Any]:
+    """
+    Sync, start all agents together, let them click, stop them and report.
+
+    Args:
+        coordinator (Coordinator): Coordinator for the agents.
+        lead (float): Seconds between sending the start command and the start time.
+        seconds (float): How long the agents click.
+
+    Returns:
+        dict[str, Any]: Coordinator.report() output.
+    """
+    coordinator.sync()
+    start = coordinator.clock() + lead
+    coordinator.start_at(start)
+    coordinator.stop_at(start + seconds)
+    time.sleep(max(0.0, start + seconds - coordinator.clock()) + 0.05)
+    return coordinator.report()
+
+
+def _parse_address(text: str) -> tuple[str, int]:
+    """Parse 'host:port' (host defaults to localhost)."""
+    host, _, port = text.rpartition(":")
+    return (host or DEFAULT_HOST, int(port))
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point: run an agent, or coordinate agents and print a JSON report."""
+    from src.backends import BACKEND_NAMES, create_backend
+    from src.utils import cps_to_seconds
+
+    parser = argparse.ArgumentParser(description="Start clickers on several hosts at the same moment.")
+    sub = parser.add_subparsers(dest="role", required=True)
+    agent_parser = sub.add_parser("agent", help="run a clicker that waits for a coordinator")
+    agent_parser.add_argument("--host", default=DEFAULT_HOST)
+    agent_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    agent_parser.add_argument("--backend", choices=BACKEND_NAMES, default="pynput")
+    agent_parser.add_argument("--cps", type=float, default=10.0)
+    coord_parser = sub.add_parser("coordinator", help="start agents together and report the skew")
+    coord_parser.add_argument("agents", nargs="*", help="host:port of each agent")
+    coord_parser.add_argument("--local", type=int, default=0, help="also run this many null-backend agents here")
+    coord_parser.add_argument("--lead", type=float, default=0.5)
+    coord_parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    secret = os.environ.get(SECRET_ENV_VAR, "").encode()
+    if args.role == "agent":
+        if not secret:
+            parser.error(f"set {SECRET_ENV_VAR} to the secret shared with the coordinator")
+        clicker = AutoClicker(mouse=create_backend(args.backend))
+        clicker.set_interval(cps_to_seconds(args.cps))
+        agent = ClickAgent(clicker, secret, args.host, args.port)
+        agent.start()
+        print(f"Agent listening on {agent.host}:{agent.port}")
+        try:
+            agent.serve_thread.join()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            agent.stop()
+        return
+
+    if not secret:
+        if args.agents:
+            parser.error(f"set {SECRET_ENV_VAR} to the secret shared with the agents")
+        secret = secrets.token_bytes(32)  # Only our own local agents need to know it
+    local_agents = []
+    for _ in range(args.local):
+        agent = ClickAgent(AutoClicker(mouse=create_backend("null")), secret, port=0)
+        agent.start()
+        local_agents.append(agent)
+    addresses = [_parse_address(a) for a in args.agents] + [(a.host, a.port) for a in local_agents]
+    if not addresses:
+        parser.error("no agents given")
+
+    coordinator = Coordinator(addresses, secret)
+    try:
+        report = run_session(coordinator, args.lead, args.seconds)
+    finally:
+        coordinator.close()
+        for agent in local_agents:
+            agent.stop()
+    sys.stdout.write(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
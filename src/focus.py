@@ -0,0 +1,280 @@
+"""Pause the clicker while its target window does not have focus (X11)."""
+
+import argparse
+import ctypes
+import json
+import os
+import select
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+from src.backends import NullMouse
+from src.clicker import AutoClicker
+from src.loopback import latency_summary, start_xvfb
+from src.xwindow import (
+    PROP_MODE_REPLACE,
+    PROPERTY_CHANGE_MASK,
+    PROPERTY_NOTIFY,
+    XA_WINDOW,
+    XEvent,
+    active_window,
+    close_display,
+    load_xlib,
+    open_display,
+)
+
+DEFAULT_SWITCHES = 50
+SWITCH_GAP = 0.02  # Seconds between focus switches in the benchmark
+PAUSE_REASON = "focus"  # Pauses the clicker while the target window is unfocused
+
+
+class FocusGuard:
+    """
+    Pauses an AutoClicker while its target window does not have focus.
+
+    EWMH window managers update _NET_ACTIVE_WINDOW on the root window at
+    every focus change. The guard subscribes to PropertyNotify on the root
+    and its thread blocks on the X connection, so nothing polls the
+    foreground window and a switch is acted on as soon as the event arrives.
+
+    The guard only resumes pauses it made itself; a clicker that was
+    already paused (e.g. by a released hold trigger) is left alone. Without
+    a target, or without an EWMH window manager, it never pauses.
+    """
+
+    def __init__(
+        self,
+        clicker: AutoClicker,
+        display_name: str | None = None,
+        on_change: Callable[[bool], None] | None = None,
+    ) -> None:
+        """
+        Initialize the FocusGuard.
+
+        Args:
+            clicker (AutoClicker): Clicker to pause and resume.
+            display_name (str | None): Display to watch; defaults to $DISPLAY.
+            on_change (Callable[[bool], None] | None): Called with the target's
+                focus state whenever it changes, on the thread that noticed it.
+        """
+        self.clicker = clicker
+        self.display_name = display_name
+        self.on_change = on_change
+        self.active: int | None = None  # Focused window as last reported
+        self.target: int | None = None
+        self.focused = True
+        self.paused_clicker = False  # Whether the current pause is ours to undo
+        self.focus_changes = 0
+        self.changed_at: float | None = None  # perf_counter() of the latest pause or resume by the guard
+        self.xlib: Any = None
+        self.display: int | None = None
+        self._atom = 0
+        self._lock = threading.Lock()
+        self._wake: tuple[int, int] | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """
+        Connect to the display and start listening for focus changes.
+
+        Raises:
+            OSError: If libX11 is missing or the display cannot be opened.
+        """
+        if self._thread is not None:
+            return
+        self.xlib = load_xlib()
+        self.display = open_display(self.display_name)
+        root = self.xlib.XDefaultRootWindow(self.display)
+        self._atom = self.xlib.XInternAtom(self.display, b"_NET_ACTIVE_WINDOW", False)
+        self.xlib.XSelectInput(self.display, root, PROPERTY_CHANGE_MASK)
+        # Reading after subscribing (a round trip) means no change can fall in between
+        self.set_active(active_window(self.display, self._atom))
+        self._wake = os.pipe()
+        self._thread = threading.Thread(target=self._listen, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop listening, disconnect, and undo the guard's own pause."""
+        if self._thread is not None:
+            os.write(self._wake[1], b"x")
+            self._thread.join(timeout=1)
+            self._thread = None
+        if self._wake is not None:
+            for fd in self._wake:
+                os.close(fd)
+            self._wake = None
+        if self.display:
+            close_display(self.display)
+            self.display = None
+        with self._lock:
+            self.target = None
+            self._apply()
+
+    def track(self, window: int | None = None) -> None:
+        """
+        Set the window the clicker is meant for.
+
+        Args:
+            window (int | None): Window id; defaults to the window focused
+                right now, e.g. the game when clicking is started by hotkey.
+        """
+        with self._lock:
+            self.target = window if window is not None else self.active
+            self._apply()
+
+    def set_active(self, window: int | None) -> None:
+        """
+        Record which window has focus (called by the listener thread).
+
+        Args:
+            window (int | None): The focused window, or None if unknown.
+        """
+        with self._lock:
+            self.active = window
+            self._apply()
+
+    def _apply(self) -> None:
+        """Pause or resume the clicker to match the target's focus; call with the lock held."""
+        focused = self.target is None or self.active is None or self.active == self.target
+        if focused == self.focused:
+            return
+        self.focused = focused
+        self.focus_changes += 1
+        if not focused:
+            self.clicker.pause(PAUSE_REASON)
+            self.paused_clicker = True
+            self.changed_at = time.perf_counter()
+        elif self.paused_clicker:
+            self.paused_clicker = False
+            self.clicker.resume(PAUSE_REASON)  # Clicks again only if nothing else paused it
+            self.changed_at = time.perf_counter()
+        if self.on_change is not None:
+            self.on_change(focused)
+
+    def _listen(self) -> None:
+        """Wait on the X connection and act on _NET_ACTIVE_WINDOW changes until stopped."""
+        xlib, display = self.xlib, self.display
+        connection = xlib.XConnectionNumber(display)
+        event = XEvent()
+        while True:
+            # Drain what Xlib has already read; select() cannot see its queue
+            changed = False
+            while xlib.XPending(display):
+                xlib.XNextEvent(display, event)
+                if event.type == PROPERTY_NOTIFY and event.xproperty.atom == self._atom:
+                    changed = True
+            if changed:
+                self.set_active(active_window(display, self._atom))
+                continue  # The read was a round trip that may have queued more events
+            ready, _, _ = select.select([connection, self._wake[0]], [], [])
+            if self._wake[0] in ready:
+                return
+
+
+def set_active_window(display: int, window: int) -> None:
+    """
+    Set _NET_ACTIVE_WINDOW the way a window manager does on a focus switch.
+
+    Args:
+        display (int): Display pointer.
+        window (int): Window to report as focused.
+    """
+    xlib = load_xlib()
+    atom = xlib.XInternAtom(display, b"_NET_ACTIVE_WINDOW", False)
+    value = ctypes.c_ulong(window)
+    root = xlib.XDefaultRootWindow(display)
+    xlib.XChangeProperty(display, root, atom, XA_WINDOW, 32, PROP_MODE_REPLACE, ctypes.byref(value), 1)
+    xlib.XFlush(display)
+
+
+def measure_switch_latency(
+    switches: int = DEFAULT_SWITCHES,
+    display_name: str | None = None,
+    interval: float = 0.01,
+) -> dict[str, Any]:
+    """
+    Time how fast focus switches pause and resume a clicking AutoClicker.
+
+    A second connection plays the window manager and flips
+    _NET_ACTIVE_WINDOW between a game window and another one while the
+    clicker runs.
+
+    Args:
+        switches (int): Number of away-and-back switches.
+        display_name (str | None): Display to use; defaults to $DISPLAY.
+        interval (float): Click interval while measuring.
+
+    Returns:
+        dict[str, Any]: Switch-to-pause and switch-to-first-click latency
+        distributions, and how many clicks landed after a switch away.
+    """
+    game, other = 0x1000001, 0x2000001  # Only compared, so they need not be real windows
+    wm = open_display(display_name)
+    changed = threading.Event()
+    mouse = NullMouse()
+    clicker = AutoClicker(mouse=mouse)
+    clicker.set_interval(interval)
+    guard = FocusGuard(clicker, display_name, on_change=lambda focused: changed.set())
+    to_pause: list[float] = []
+    to_click: list[float] = []
+    late_clicks = 0
+    try:
+        set_active_window(wm, game)
+        load_xlib().XSync(wm, False)
+        guard.start()
+        guard.track()
+        clicker.start()
+        for _ in range(switches):
+            time.sleep(SWITCH_GAP)
+            changed.clear()
+            switched = time.perf_counter()
+            set_active_window(wm, other)
+            if changed.wait(1):
+                to_pause.append(guard.changed_at - switched)
+            time.sleep(SWITCH_GAP)
+            if (clicker.stats.last_click_time or 0.0) > switched:
+                late_clicks += 1  # Went out between the switch and the pause taking effect
+
+            changed.clear()
+            clicker.stats.last_resume_latency = None
+            switched = time.perf_counter()
+            set_active_window(wm, game)
+            if changed.wait(1):
+                time.sleep(interval)  # The first click follows the resume immediately
+                if clicker.stats.last_resume_latency is not None:
+                    to_click.append(guard.changed_at - switched + clicker.stats.last_resume_latency)
+    finally:
+        clicker.stop()
+        guard.stop()
+        close_display(wm)
+    return {
+        "switches": switches,
+        "missed": switches - len(to_pause),
+        "switch_to_pause_ms": latency_summary(to_pause),
+        "switch_to_first_click_ms": latency_summary(to_click),
+        "switches_with_late_click": late_clicks,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point: print a JSON focus-switch latency report."""
+    parser = argparse.ArgumentParser(description="Measure focus-switch to pause latency.")
+    parser.add_argument("--switches", type=int, default=DEFAULT_SWITCHES)
+    parser.add_argument("--display", default=None, help="X display, default $DISPLAY")
+    parser.add_argument("--xvfb", action="store_true", help="start a private Xvfb display")
+    args = parser.parse_args(argv)
+
+    xvfb = start_xvfb() if args.xvfb else None
+    try:
+        report = measure_switch_latency(args.switches, args.display)
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+    sys.stdout.write(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Live achieved-CPS graph for MC Clicker."""
+
+import time
+from collections import deque
+from typing import Any, Callable
+
+from src.stats import ClickStats
+
+DEFAULT_BUCKETS = 60  # Samples shown across the graph
+DEFAULT_PERIOD = 0.25  # Seconds per sample; the graph spans DEFAULT_BUCKETS * DEFAULT_PERIOD
+MIN_ERROR_SCALE = 5.0  # Milliseconds at the top of the graph before it grows
+
+CPS_COLOR = "#51cf66"
+ERROR_COLOR = "#ff9900"
+TARGET_COLOR = "#3d3d3d"
+
+
+class RateSampler:
+    """
+    Downsamples click counters into fixed-length buckets.
+
+    Each sample() turns the clicks and interval error accumulated in
+    ClickStats since the previous call into one bucket, so the cost per
+    sample is the same at 1 CPS and at 1000 CPS and the click thread is
+    never touched: counters are read as plain attributes.
+    """
+
+    def __init__(
+        self,
+        stats: ClickStats,
+        buckets: int = DEFAULT_BUCKETS,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """
+        Initialize the RateSampler.
+
+        Args:
+            stats (ClickStats): Counters of the engine to sample.
+            buckets (int): Number of most recent samples kept.
+            clock (Callable[[], float]): Monotonic clock in seconds.
+        """
+        if buckets < 2:
+            raise ValueError("Need at least 2 buckets")
+        self.stats = stats
+        self.clock = clock
+        self.samples: deque[tuple[float, float]] = deque(maxlen=buckets)  # (CPS, mean error in ms)
+        self._last_time = clock()
+        self._last_clicks = stats.clicks_total
+        self._last_error = stats.error_sum
+
+    def set_stats(self, stats: ClickStats) -> None:
+        """
+        Sample a different engine's counters from the next sample on.
+
+        Args:
+            stats (ClickStats): Counters to sample.
+        """
+        self.stats = stats
+        self._last_clicks = stats.clicks_total
+        self._last_error = stats.error_sum
+
+    def sample(self) -> tuple[float, float]:
+        """
+        Close the current bucket.
+
+        Returns:
+            tuple[float, float]: Achieved CPS and mean interval error in
+            milliseconds since the previous sample.
+        """
+        now = self.clock()
+        clicks = self.stats.clicks_total
+        error_sum = self.stats.error_sum
+        elapsed = now - self._last_time
+        count = clicks - self._last_clicks
+        cps = count / elapsed if elapsed > 0 else 0.0
+        error = (error_sum - self._last_error) / count * 1000 if count > 0 else 0.0
+        self._last_time = now
+        self._last_clicks = clicks
+        self._last_error = error_sum
+        self.samples.append((cps, error))
+        return cps, error
+
+
+class RateGraph:
+    """
+    Rolling graph of achieved CPS and interval error on a tkinter Canvas.
+
+    Only the newest segment is created per sample; older segments are
+    shifted left with one canvas move and the oldest is deleted, so a frame
+    costs the same however full the graph is. A full redraw happens only
+    when a scale changes or the graph becomes visible again. While hidden,
+    samples are still collected but nothing is drawn.
+    """
+
+    def __init__(self, canvas: Any, sampler: RateSampler, width: int, height: int) -> None:
+        """
+        Initialize the RateGraph.
+
+        Args:
+            canvas (Any): tkinter Canvas (or anything with its item methods).
+            sampler (RateSampler): Source of the samples to plot.
+            width (int): Drawing width in pixels.
+            height (int): Drawing height in pixels.
+        """
+        self.canvas = canvas
+        self.sampler = sampler
+        self.width = width
+        self.height = height
+        self.step = width / (sampler.samples.maxlen - 1)
+        self.target_cps: float | None = None
+        self.cps_scale = 1.0
+        self.error_scale = MIN_ERROR_SCALE
+        self.visible = True
+        self.redraws = 0  # Full redraws, for monitoring the incremental path
+        self._cps_items: deque[int] = deque()
+        self._error_items: deque[int] = deque()
+        self._target_item: int | None = None
+        self._label = canvas.create_text(4, 2, anchor="nw", text="", fill="#aaaaaa", font=("Arial", 8))
+
+    def set_target(self, cps: float | None) -> None:
+        """
+        Set the configured rate, drawn as a reference line.
+
+        Args:
+            cps (float | None): Target clicks per second, None to hide the line.
+        """
+        self.target_cps = cps
+        self.cps_scale = max(1.0, cps * 1.5) if cps else 1.0
+        self.redraw()
+
+    def set_visible(self, visible: bool) -> None:
+        """
+        Pause or resume drawing.
+
+        Args:
+            visible (bool): Whether the window is shown.
+        """
+        if visible and not self.visible:
+            self.visible = True
+            self.redraw()  # Catch up on the samples collected while hidden
+        else:
+            self.visible = visible
+
+    def update(self) -> None:
+        """Take one sample and draw its segment."""
+        cps, error = self.sampler.sample()
+        if not self.visible:
+            return
+        self.canvas.itemconfigure(self._label, text=f"{cps:.1f} CPS   {error:.1f} ms late")
+        if self._grow_scales(cps, error):
+            self.redraw()
+            return
+
+        samples = self.sampler.samples
+        if len(samples) < 2:
+            return
+        prev_cps, prev_error = samples[-2]
+        if self._cps_items:
+            self.canvas.move("rate_series", -self.step, 0)  # One call shifts every drawn segment
+        x0, x1 = self.width - self.step, self.width
+        self._append(self._cps_items, x0, self._cps_y(prev_cps), x1, self._cps_y(cps), CPS_COLOR)
+        self._append(self._error_items, x0, self._error_y(prev_error), x1, self._error_y(error), ERROR_COLOR)
+
+    def redraw(self) -> None:
+        """Draw every sample from scratch."""
+        self.redraws += 1
+        canvas = self.canvas
+        canvas.delete("rate_series")
+        if self._target_item is not None:
+            canvas.delete(self._target_item)
+            self._target_item = None
+        self._cps_items.clear()
+        self._error_items.clear()
+        if not self.visible:
+            return
+
+        samples = list(self.sampler.samples)
+        for value in samples:
+            self._grow_scales(*value)
+
+        if self.target_cps:
+            y = self._cps_y(self.target_cps)
+            self._target_item = canvas.create_line(0, y, self.width, y, fill=TARGET_COLOR, dash=(2, 2))
+            canvas.tag_lower(self._target_item)
+        x = self.width - (len(samples) - 1) * self.step
+        for (prev_cps, prev_error), (cps, error) in zip(samples, samples[1:]):
+            self._append(self._cps_items, x, self._cps_y(prev_cps), x + self.step, self._cps_y(cps), CPS_COLOR)
+            self._append(
+                self._error_items, x, self._error_y(prev_error), x + self.step, self._error_y(error), ERROR_COLOR
+            )
+            x += self.step
+
+    def _append(self, items: deque[int], x0: float, y0: float, x1: float, y1: float, color: str) -> None:
+        """Create one segment and drop the one that scrolled off the left edge."""
+        items.append(self.canvas.create_line(x0, y0, x1, y1, fill=color, tags=("rate_series",)))
+        if len(items) > self.sampler.samples.maxlen - 1:
+            self.canvas.delete(items.popleft())
+
+    def _grow_scales(self, cps: float, error: float) -> bool:
+        """
+        Enlarge a scale that a value no longer fits in.
+
+        Returns:
+            bool: True if a scale changed, so everything must be redrawn.
+        """
+        changed = False
+        while cps > self.cps_scale:
+            self.cps_scale *= 2
+            changed = True
+        while error > self.error_scale:
+            self.error_scale *= 2
+            changed = True
+        return changed
+
+    def _cps_y(self, cps: float) -> float:
+        """Map a rate to a y coordinate."""
+        return self.height - cps / self.cps_scale * (self.height - 1)
+
+    def _error_y(self, error: float) -> float:
+        """Map an error in milliseconds to a y coordinate; early clicks sit on the baseline."""
+        return self.height - max(0.0, error) / self.error_scale * (self.height - 1)
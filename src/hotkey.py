@@ -2,9 +2,11 @@
 """Hotkey management for MC Clicker."""
 
 import threading
+import time
 from typing import Callable
 
-import keyboard
+# `keyboard` is imported by the methods that use it: importing it starts the
+# platform hook machinery, which should not delay the first window paint.
 
 
 class HotkeyManager:
@@ -16,6 +18,10 @@ class HotkeyManager:
         self.callback: Callable[[], None] | None = None
         self.is_listening: bool = False
         self.listener_thread: threading.Thread | None = None
+        self.bindings: dict[str, Callable[[], None]] = {}  # Extra hotkeys, e.g. profiles
+        self.dispatch_count: int = 0
+        self.dispatch_seconds_total: float = 0.0
+        self.last_dispatch_latency: float | None = None
 
     def set_hotkey(self, hotkey: str) -> None:
         """
@@ -39,8 +45,60 @@ class HotkeyManager:
         """
         self.callback = callback
 
+    def change_hotkey(self, hotkey: str) -> None:
+        """
+        Replace the toggle hotkey, re-registering only that one hotkey if listening.
+
+        Args:
+            hotkey (str): New hotkey string.
+        """
+        import keyboard
+
+        hotkey = hotkey.lower()
+        if hotkey == self.hotkey:
+            return
+        if not self.is_listening:
+            self.hotkey = hotkey
+            return
+
+        self._remove_binding(self.hotkey)
+        old_hotkey, self.hotkey = self.hotkey, hotkey
+        try:
+            keyboard.add_hotkey(self.hotkey, self._on_hotkey_press)
+        except ValueError as e:
+            print(f"Invalid hotkey '{self.hotkey}': {e}")
+            self.hotkey = old_hotkey
+            keyboard.add_hotkey(self.hotkey, self._on_hotkey_press)
+
+    def bind(self, hotkey: str, callback: Callable[[], None]) -> None:
+        """
+        Register an additional hotkey alongside the toggle hotkey.
+
+        Args:
+            hotkey (str): Hotkey string (e.g., 'ctrl+1').
+            callback (Callable[[], None]): Function to call on hotkey press.
+        """
+        hotkey = hotkey.lower()
+        self.unbind(hotkey)
+        self.bindings[hotkey] = callback
+        if self.is_listening:
+            self._add_binding(hotkey, callback)
+
+    def unbind(self, hotkey: str) -> None:
+        """
+        Remove an additional hotkey.
+
+        Args:
+            hotkey (str): Hotkey string; unknown hotkeys are ignored.
+        """
+        hotkey = hotkey.lower()
+        if self.bindings.pop(hotkey, None) is not None and self.is_listening:
+            self._remove_binding(hotkey)
+
     def start_listening(self) -> None:
         """Start listening for hotkey presses."""
+        import keyboard
+
         if self.is_listening:
             return  # Already listening
 
@@ -49,22 +107,57 @@ class HotkeyManager:
             self.is_listening = True
         except ValueError as e:
             print(f"Invalid hotkey '{self.hotkey}': {e}")
+            return
+
+        for hotkey, callback in self.bindings.items():
+            self._add_binding(hotkey, callback)
 
     def stop_listening(self) -> None:
         """Stop listening for hotkey presses."""
+        import keyboard
+
         if not self.is_listening:
             return
 
+        for hotkey in self.bindings:
+            self._remove_binding(hotkey)
+
         try:
             keyboard.remove_hotkey(self.hotkey)
             self.is_listening = False
         except ValueError:
             pass  # Hotkey might not be registered
 
+    @staticmethod
+    def _add_binding(hotkey: str, callback: Callable[[], None]) -> None:
+        """Register one extra hotkey with the keyboard library."""
+        import keyboard
+
+        try:
+            keyboard.add_hotkey(hotkey, callback)
+        except ValueError as e:
+            print(f"Invalid hotkey '{hotkey}': {e}")
+
+    @staticmethod
+    def _remove_binding(hotkey: str) -> None:
+        """Unregister one extra hotkey from the keyboard library."""
+        import keyboard
+
+        try:
+            keyboard.remove_hotkey(hotkey)
+        except (KeyError, ValueError):
+            pass  # Hotkey might not be registered
+
     def _on_hotkey_press(self) -> None:
         """Internal callback when hotkey is pressed."""
         if self.callback:
+            start = time.perf_counter()
             self.callback()
+            # Time from the keyboard hook handing us the press to the callback finishing
+            latency = time.perf_counter() - start
+            self.last_dispatch_latency = latency
+            self.dispatch_seconds_total += latency
+            self.dispatch_count += 1
 
     def get_hotkey_display(self) -> str:
         """
@@ -0,0 +1,342 @@
+"""Single-instance lock and command forwarding for MC Clicker."""
+
+# Standard library only: the launcher imports this before deciding whether to load the GUI
+import argparse
+import hmac
+import json
+import os
+import secrets
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable
+
+INSTANCE_DIR_ENV_VAR = "MCCLICKER_INSTANCE_DIR"  # Set to keep the lock and port file elsewhere
+LOCK_FILE_NAME = "instance.lock"
+INFO_FILE_NAME = "instance.json"  # Port and token of the running instance
+COMMANDS = ("show", "toggle", "start", "stop", "profile")
+DEFAULT_FORWARD_TIMEOUT = 2.0  # Seconds to keep retrying while the first instance starts up
+REQUEST_TIMEOUT = 1.0  # Seconds a connected client gets to send its command
+
+
+def instance_dir() -> str:
+    """
+    Get the directory holding the lock and port files, creating the default one if needed.
+
+    Every launch must find the same directory, and the onefile EXE unpacks
+    itself into a new temporary directory each time. The default is therefore a
+    fixed per-user directory, not one next to this module.
+
+    Returns:
+        str: $MCCLICKER_INSTANCE_DIR, or MCClicker in %LOCALAPPDATA% on Windows,
+        or mcclicker in $XDG_RUNTIME_DIR (or ~/.cache) elsewhere.
+    """
+    directory = os.environ.get(INSTANCE_DIR_ENV_VAR)
+    if directory:
+        return directory
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(os.path.join("~", "AppData", "Local"))
+        directory = os.path.join(base, "MCClicker")
+    else:
+        base = os.environ.get("XDG_RUNTIME_DIR") or os.path.expanduser(os.path.join("~", ".cache"))
+        directory = os.path.join(base, "mcclicker")
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    return directory
+
+
+class InstanceLock:
+    """
+    Exclusive lock held by the running instance for its whole lifetime.
+
+    The operating system drops the lock when the process exits, so a
+    crashed instance never blocks the next launch.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        """
+        Initialize the InstanceLock.
+
+        Args:
+            path (str | None): Lock file; defaults to instance.lock in instance_dir().
+        """
+        self.path = path or os.path.join(instance_dir(), LOCK_FILE_NAME)
+        self._fd: int | None = None
+
+    def acquire(self) -> bool:
+        """
+        Take the lock without blocking.
+
+        Returns:
+            bool: True if this process now holds it, False if another instance does.
+        """
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.name == "nt":
+                import msvcrt
+
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        """Give the lock up."""
+        if self._fd is not None:
+            os.close(self._fd)  # Closing the descriptor releases the lock
+            self._fd = None
+
+
+class CommandServer:
+    """
+    Receives commands forwarded by later launches.
+
+    Listens on a random localhost port. The port and a random token are
+    published in the info file; the file is readable only by this user, so
+    other local users cannot send commands.
+    """
+
+    def __init__(self, handler: Callable[[str, str | None], None], info_path: str | None = None) -> None:
+        """
+        Initialize the CommandServer.
+
+        Args:
+            handler (Callable[[str, str | None], None]): Called with (command, argument)
+                on the server thread; exceptions are reported back to the sender.
+            info_path (str | None): Port file; defaults to instance.json in instance_dir().
+        """
+        self.handler = handler
+        self.info_path = info_path or os.path.join(instance_dir(), INFO_FILE_NAME)
+        self.token = secrets.token_hex(16)
+        self.commands_handled: int = 0
+        self._socket: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def port(self) -> int | None:
+        """Port being listened on, or None when stopped."""
+        return self._socket.getsockname()[1] if self._socket is not None else None
+
+    def start(self) -> None:
+        """Start listening and publish the port."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(8)
+        self._socket = sock
+        _write_private_json(self.info_path, {"port": self.port, "token": self.token, "pid": os.getpid()})
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop listening and withdraw the port file."""
+        sock, self._socket = self._socket, None
+        if sock is None:
+            return
+        try:
+            sock.shutdown(socket.SHUT_RDWR)  # Unblocks accept()
+        except OSError:
+            pass
+        sock.close()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        try:
+            os.remove(self.info_path)
+        except OSError:
+            pass
+
+    def _serve(self) -> None:
+        """Accept loop: one command per connection."""
+        while self._socket is not None:
+            try:
+                conn, _ = self._socket.accept()
+            except OSError:
+                return  # Stopped
+            with conn:
+                conn.settimeout(REQUEST_TIMEOUT)
+                try:
+                    reply = self._handle(conn.makefile("rb").readline())
+                    conn.sendall(reply.encode() + b"\n")
+                except OSError:
+                    pass
+
+    def _handle(self, line: bytes) -> str:
+        """
+        Check and run one request.
+
+        Returns:
+            str: 'ok' or 'error: <reason>'.
+        """
+        try:
+            request = json.loads(line)
+            token, command, argument = request["token"], request["command"], request.get("argument")
+        except (ValueError, KeyError, TypeError):
+            return "error: malformed request"
+        if not isinstance(token, str) or not hmac.compare_digest(token, self.token):
+            return "error: bad token"
+        if command not in COMMANDS:
+            return f"error: unknown command {command!r}"
+        try:
+            self.handler(command, argument)
+        except Exception as e:
+            return f"error: {e!r}"
+        self.commands_handled += 1
+        return "ok"
+
+
+def _write_private_json(path: str, data: dict[str, Any]) -> None:
+    """Atomically write a JSON file only this user can read."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".instance-", suffix=".tmp")  # Created 0600
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def forward(
+    command: str,
+    argument: str | None = None,
+    info_path: str | None = None,
+    timeout: float = DEFAULT_FORWARD_TIMEOUT,
+) -> None:
+    """
+    Send a command to the running instance and wait for it to take effect.
+
+    Retries until `timeout` while the running instance has not published
+    its port yet (it may still be starting up).
+
+    Args:
+        command (str): One of COMMANDS.
+        argument (str | None): Profile name for 'profile'.
+        info_path (str | None): Port file; defaults to instance.json in instance_dir().
+        timeout (float): Seconds to keep retrying.
+
+    Raises:
+        ConnectionError: If no instance answered in time.
+        RuntimeError: If the instance rejected or failed the command.
+    """
+    info_path = info_path or os.path.join(instance_dir(), INFO_FILE_NAME)
+    deadline = time.monotonic() + timeout
+    last_error: Exception | None = None
+    while True:
+        try:
+            with open(info_path, "r") as f:
+                info = json.load(f)
+            with socket.create_connection(("127.0.0.1", info["port"]), timeout=REQUEST_TIMEOUT) as sock:
+                request = {"token": info["token"], "command": command, "argument": argument}
+                sock.sendall(json.dumps(request).encode() + b"\n")
+                reply = sock.makefile("rb").readline().decode().strip()
+            break
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            last_error = e
+            if time.monotonic() >= deadline:
+                raise ConnectionError(f"No running instance answered: {last_error}") from None
+            time.sleep(0.02)
+    if reply != "ok":
+        raise RuntimeError(reply or "error: no reply")
+
+
+def parse_command(argv: list[str] | None = None) -> tuple[str, str | None]:
+    """
+    Parse the app's command line into the command it asks for.
+
+    Args:
+        argv (list[str] | None): Arguments; defaults to sys.argv[1:].
+
+    Returns:
+        tuple[str, str | None]: (command, argument); ('show', None) without options.
+    """
+    parser = argparse.ArgumentParser(prog="MCClicker", description="Start MC Clicker, or control the running one.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--toggle", action="store_const", const="toggle", dest="command", help="start or stop clicking")
+    group.add_argument("--start", action="store_const", const="start", dest="command", help="start clicking")
+    group.add_argument("--stop", action="store_const", const="stop", dest="command", help="stop clicking")
+    group.add_argument("--profile", metavar="NAME", help="switch to a saved profile")
+    args = parser.parse_args(argv)
+    if args.profile is not None:
+        return "profile", args.profile
+    return args.command or "show", None
+
+
+def benchmark(runs: int, python: str = sys.executable) -> dict[str, Any]:
+    """
+    Measure time-to-effect of forwarded commands.
+
+    Runs a CommandServer in this process, with its files in a temporary
+    directory, and times how long commands take from being sent until the
+    handler runs. Each command is sent two ways: in-process with
+    forward(), and by launching `python -m src.launcher --toggle` as a
+    second instance. The second way includes interpreter startup.
+
+    Args:
+        runs (int): Commands per measurement.
+        python (str): Interpreter for the launcher runs.
+
+    Returns:
+        dict[str, Any]: Median and worst times in milliseconds for both.
+    """
+    effects: list[float] = []
+    handled = threading.Event()
+
+    def handler(command: str, argument: str | None) -> None:
+        effects.append(time.perf_counter())
+        handled.set()
+
+    with tempfile.TemporaryDirectory() as directory:
+        lock = InstanceLock(os.path.join(directory, LOCK_FILE_NAME))
+        lock.acquire()
+        server = CommandServer(handler, os.path.join(directory, INFO_FILE_NAME))
+        server.start()
+        env = {**os.environ, INSTANCE_DIR_ENV_VAR: directory}
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        try:
+            in_process = []
+            for _ in range(runs):
+                sent = time.perf_counter()
+                forward("toggle", info_path=server.info_path)
+                in_process.append(effects[-1] - sent)
+
+            launches = []
+            for _ in range(runs):
+                handled.clear()
+                sent = time.perf_counter()
+                subprocess.run([python, "-m", "src.launcher", "--toggle"], cwd=root, env=env, check=True)
+                if handled.wait(5):
+                    launches.append(effects[-1] - sent)
+        finally:
+            server.stop()
+            lock.release()
+
+    def summary(times: list[float]) -> dict[str, float]:
+        return {"median_ms": statistics.median(times) * 1000, "max_ms": max(times) * 1000} if times else {}
+
+    return {"runs": runs, "forward": summary(in_process), "second_launch": summary(launches)}
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point: benchmark command forwarding and print JSON."""
+    parser = argparse.ArgumentParser(description="Benchmark forwarding commands to a running instance.")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args(argv)
+    sys.stdout.write(json.dumps(benchmark(args.runs), indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
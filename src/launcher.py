@@ -0,0 +1,31 @@
+"""Launcher for MC Clicker: forwards to a running instance or starts the app."""
+
+import sys
+
+# Nothing heavy here: a second launch exits in milliseconds, and only the
+# first one imports the GUI stack (tkinter, pynput, keyboard)
+from src.instance import InstanceLock, forward, parse_command
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Entry point: hand the command to the running instance, or become it."""
+    command, argument = parse_command(argv)
+    lock = InstanceLock()
+    if not lock.acquire():
+        try:
+            forward(command, argument)
+        except (ConnectionError, RuntimeError) as e:
+            print(f"Error forwarding to the running MC Clicker: {e}")
+            sys.exit(1)
+        return
+
+    from src.main import main as run_app
+
+    try:
+        run_app(command, argument)
+    finally:
+        lock.release()
+
+
+if __name__ == "__main__":
+    main()
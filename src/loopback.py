@@ -0,0 +1,306 @@
+"""End-to-end click delivery benchmark for MC Clicker (run under Xvfb)."""
+
+import argparse
+import json
+import os
+import select
+import shutil
+import subprocess
+import sys
+import time
+from typing import Any
+
+DEFAULT_RATES = (10.0, 20.0, 50.0, 100.0)
+DEFAULT_SECONDS = 2.0
+MATCH_WINDOW = 0.5  # Deliveries later than this after injection count as lost
+
+
+class RecordingMouse:
+    """Wraps a mouse backend and timestamps every injected click."""
+
+    def __init__(self, inner: Any) -> None:
+        """
+        Initialize the RecordingMouse.
+
+        Args:
+            inner (Any): Backend that actually injects the clicks.
+        """
+        self.inner = inner
+        self.buttons = getattr(inner, "buttons", None)  # Let AutoClicker name buttons the inner way
+        self.injected: list[float] = []
+
+    def press(self, button: Any) -> None:
+        """Forward a button press."""
+        self.inner.press(button)
+
+    def release(self, button: Any) -> None:
+        """Forward a button release."""
+        self.inner.release(button)
+
+    def click(self, button: Any, count: int = 1) -> None:
+        """Record the injection time, then forward the click."""
+        now = time.perf_counter()
+        self.injected.extend([now] * count)
+        self.inner.click(button, count)
+
+
+def match_clicks(
+    injected: list[float],
+    delivered: list[float],
+    window: float = MATCH_WINDOW,
+) -> tuple[list[float], int]:
+    """
+    Pair each delivered click with the injection that caused it.
+
+    Clicks are delivered in injection order, so pairing walks both lists once.
+    A delivery without an injection in the preceding `window` seconds is
+    ignored (e.g. a stray real click), and an injection never delivered within
+    `window` counts as lost.
+
+    Args:
+        injected (list[float]): Injection timestamps, ascending.
+        delivered (list[float]): Delivery timestamps on the same clock, ascending.
+        window (float): Maximum latency considered a match.
+
+    Returns:
+        tuple[list[float], int]: Latencies of matched clicks, and the number lost.
+    """
+    latencies = []
+    lost = 0
+    i = 0
+    for t_delivered in delivered:
+        # Injections too old to explain this delivery were lost
+        while i < len(injected) and t_delivered - injected[i] > window:
+            lost += 1
+            i += 1
+        if i < len(injected) and injected[i] <= t_delivered:
+            latencies.append(t_delivered - injected[i])
+            i += 1
+    lost += len(injected) - i
+    return latencies, lost
+
+
+def latency_summary(latencies: list[float]) -> dict[str, float | None]:
+    """
+    Summarize a latency distribution in milliseconds.
+
+    Args:
+        latencies (list[float]): Latencies in seconds.
+
+    Returns:
+        dict[str, float | None]: mean, p50, p90, p99 and max in ms (None if empty).
+    """
+    if not latencies:
+        return {"mean": None, "p50": None, "p90": None, "p99": None, "max": None}
+    ordered = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000
+
+    return {
+        "mean": sum(ordered) / len(ordered) * 1000,
+        "p50": percentile(50),
+        "p90": percentile(90),
+        "p99": percentile(99),
+        "max": ordered[-1] * 1000,
+    }
+
+
+def run_rate(backend: Any, cps: float, seconds: float) -> dict[str, Any]:
+    """
+    Click at one target rate and measure delivery through a mouse listener.
+
+    Args:
+        backend (Any): Mouse backend to inject with.
+        cps (float): Target clicks per second.
+        seconds (float): How long to click.
+
+    Returns:
+        dict[str, Any]: Counts, delivered CPS and latency distribution.
+    """
+    from pynput import mouse
+
+    from src.clicker import AutoClicker
+    from src.utils import cps_to_seconds
+
+    delivered: list[float] = []
+
+    def on_click(x: int, y: int, button: Any, pressed: bool) -> None:
+        if pressed:
+            delivered.append(time.perf_counter())
+
+    recorder = RecordingMouse(backend)
+    clicker = AutoClicker(mouse=recorder)
+    clicker.set_interval(cps_to_seconds(cps))
+
+    listener = mouse.Listener(on_click=on_click)
+    listener.start()
+    listener.wait()
+    try:
+        clicker.start()
+        time.sleep(seconds)
+        clicker.stop()
+        time.sleep(MATCH_WINDOW)  # Let in-flight clicks arrive
+    finally:
+        listener.stop()
+
+    latencies, lost = match_clicks(recorder.injected, delivered)
+    return {
+        "target_cps": cps,
+        "injected": len(recorder.injected),
+        "delivered": len(latencies),
+        "lost": lost,
+        "delivered_cps": len(latencies) / seconds,
+        "latency_ms": latency_summary(latencies),
+    }
+
+
+def injection_rate(backend: Any, clicks: int) -> dict[str, Any]:
+    """
+    Measure the raw cost of injecting clicks, without a click loop or delivery.
+
+    Args:
+        backend (Any): Mouse backend to inject with.
+        clicks (int): Number of clicks to inject back to back.
+
+    Returns:
+        dict[str, Any]: Clicks, clicks per second and microseconds per click.
+    """
+    from src.backends import resolve_button
+
+    button = resolve_button(backend, "left")
+    click = backend.click
+    start = time.perf_counter()
+    for _ in range(clicks):
+        click(button, 1)
+    elapsed = time.perf_counter() - start
+    return {"clicks": clicks, "clicks_per_second": clicks / elapsed, "us_per_click": elapsed / clicks * 1e6}
+
+
+def run_benchmark(backend_name: str, rates: list[float], seconds: float) -> dict[str, Any]:
+    """
+    Run the loopback benchmark for each target rate.
+
+    Args:
+        backend_name (str): Backend name accepted by create_backend().
+        rates (list[float]): Target CPS values.
+        seconds (float): Clicking time per rate.
+
+    Returns:
+        dict[str, Any]: JSON-serializable report.
+    """
+    from src.backends import create_backend
+
+    backend = create_backend(backend_name)
+    return {
+        "backend": backend_name,
+        "display": os.environ.get("DISPLAY"),
+        "seconds_per_rate": seconds,
+        "results": [run_rate(backend, cps, seconds) for cps in rates],
+    }
+
+
+def launch_xvfb(display: str | None = None, timeout: float = 5.0) -> tuple[subprocess.Popen, str]:
+    """
+    Start a virtual X server and wait until it accepts connections.
+
+    Xvfb reports the display it actually bound through -displayfd once it
+    is ready, so a stale socket or another server on the same display is
+    never mistaken for it.
+
+    Args:
+        display (str | None): Display name to use; None lets Xvfb pick a free one.
+        timeout (float): Seconds to wait for the server.
+
+    Returns:
+        tuple[subprocess.Popen, str]: The Xvfb process (terminate it when
+        done) and its display name.
+
+    Raises:
+        RuntimeError: If Xvfb is not installed or does not come up.
+    """
+    if shutil.which("Xvfb") is None:
+        raise RuntimeError("Xvfb is not installed")
+    read_fd, write_fd = os.pipe()
+    try:
+        process = subprocess.Popen(
+            ["Xvfb", *([display] if display else []), "-displayfd", str(write_fd),
+             "-screen", "0", "1024x768x24", "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            pass_fds=(write_fd,),
+        )
+        os.close(write_fd)
+        write_fd = -1
+        output = b""
+        deadline = time.monotonic() + timeout
+        while not output.endswith(b"\n"):
+            remaining = deadline - time.monotonic()
+            ready, _, _ = select.select([read_fd], [], [], max(remaining, 0))
+            chunk = os.read(read_fd, 64) if ready else b""
+            if not chunk:  # Timed out, or Xvfb exited (e.g. "server already active")
+                process.kill()
+                process.wait()
+                raise RuntimeError(f"Xvfb failed to start on {display or 'a free display'}")
+            output += chunk
+    finally:
+        os.close(read_fd)
+        if write_fd >= 0:
+            os.close(write_fd)
+    return process, f":{int(output)}"
+
+
+def start_xvfb(display: str | None = None) -> subprocess.Popen:
+    """
+    Start a virtual X server and point DISPLAY at it.
+
+    Args:
+        display (str | None): Display name to use; None lets Xvfb pick a free one.
+
+    Returns:
+        subprocess.Popen: The Xvfb process; terminate it when done.
+
+    Raises:
+        RuntimeError: If Xvfb is not installed or does not come up.
+    """
+    process, name = launch_xvfb(display)
+    os.environ["DISPLAY"] = name
+    return process
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point: print a JSON latency report."""
+    from src.backends import BACKEND_NAMES
+
+    parser = argparse.ArgumentParser(description="Measure click injection-to-delivery latency.")
+    parser.add_argument("--backend", choices=BACKEND_NAMES, default="pynput")
+    parser.add_argument("--rates", type=float, nargs="+", default=list(DEFAULT_RATES))
+    parser.add_argument("--seconds", type=float, default=DEFAULT_SECONDS)
+    parser.add_argument("--xvfb", action="store_true", help="start a private Xvfb display")
+    parser.add_argument("--output", help="write the report here instead of stdout")
+    parser.add_argument("--inject-only", type=int, metavar="CLICKS", help="only time injecting this many clicks")
+    args = parser.parse_args(argv)
+
+    xvfb = start_xvfb() if args.xvfb else None
+    try:
+        if args.inject_only:
+            from src.backends import create_backend
+
+            report = {"backend": args.backend, **injection_rate(create_backend(args.backend), args.inject_only)}
+        else:
+            report = run_benchmark(args.backend, args.rates, args.seconds)
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,130 @@
 
 """Main GUI application for MC Clicker using tkinter."""
 
-import json
+import time
+
+IMPORTS_STARTED = time.perf_counter()
+
 import os
+import threading
 import tkinter as tk
 from tkinter import ttk
+from typing import Any
 
+# pynput and keyboard are not imported here: the clicker and hotkey manager
+# load them after the window is shown (see MCClickerApp.finish_startup)
+from src.budget import SharedBudget
+from src.calibration import reliable_cps
 from src.clicker import AutoClicker
+from src.config import DEFAULT_CONFIG_FILE, ConfigStore
+from src.graph import DEFAULT_PERIOD, RateGraph, RateSampler
 from src.hotkey import HotkeyManager
+from src.instance import CommandServer
+from src.profiles import Profile, ProfileManager
+from src.scheduler import SessionScheduler, parse_rule
+from src.session_log import SessionLog
+from src.startup import PROFILE_ENV_VAR, StartupProfiler
+from src.trigger import TRIGGER_NAMES, HoldTrigger
 from src.utils import (
     cps_to_seconds,
     seconds_to_cps,
     validate_cps,
     validate_seconds,
 )
+from src.watcher import ConfigWatcher
+
+IMPORTS_DONE = time.perf_counter()
 
 
-CONFIG_FILE = os.path.join(os.path.dirname(__file__), "config.json")
+CONFIG_FILE = DEFAULT_CONFIG_FILE
+SESSION_LOG_FILE = os.path.join(os.path.dirname(__file__), "sessions.log")
+TRACE_ENV_VAR = "MCCLICKER_TRACE"  # Set to a file path to record a Chrome trace
+METRICS_ENV_VAR = "MCCLICKER_METRICS_PORT"  # Set to a port to serve /metrics on localhost
 
 
 class MCClickerApp:
     """Main application controller."""
 
-    def __init__(self, root: tk.Tk) -> None:
-        """Initialize the application."""
+    def __init__(self, root: tk.Tk, profiler: StartupProfiler | None = None) -> None:
+        """
+        Initialize the application.
+
+        Args:
+            root (tk.Tk): Root window.
+            profiler (StartupProfiler | None): Receives the startup phase timings.
+        """
         self.root = root
+        self.profiler = profiler if profiler is not None else StartupProfiler()
         self.root.title("MC Clicker")
-        self.root.geometry("300x320")  # Compact, modern size
+        self.root.geometry("300x470")  # Compact, modern size
         self.root.resizable(False, False)
 
         # Configure style
-        self.style = ttk.Style()
-        self.style.theme_use("clam")
-        self.setup_dark_theme()
-
-        self.clicker = AutoClicker()
-        self.hotkey_manager = HotkeyManager()
-
-        # Settings
-        self.cps: float = 1.6  # Changed from 10.0 to 1.6 (Minecraft friendly)
-        self.button_type: str = "left"
-
-        # Load saved hotkey
-        saved_hotkey = self.load_hotkey()
-        if saved_hotkey:
-            self.hotkey_manager.set_hotkey(saved_hotkey)
+        with self.profiler.phase("theme"):
+            self.style = ttk.Style()
+            self.style.theme_use("clam")
+            self.setup_dark_theme()
+
+        with self.profiler.phase("settings"):
+            # The mouse backend is created on first use or by finish_startup()
+            self.clicker = AutoClicker()
+            self.session_log = SessionLog(SESSION_LOG_FILE)
+            self.clicker.set_session_log(self.session_log)
+            self.trace_path = os.environ.get(TRACE_ENV_VAR)
+            if self.trace_path:
+                from src.tracing import ClickTracer
+
+                self.clicker.set_tracer(ClickTracer())
+            self.hotkey_manager = HotkeyManager()
+
+            # Load saved settings
+            self.config = ConfigStore(CONFIG_FILE)
+            self.settings = self.config.load()
+            self.cps: float = self.settings["cps"]  # Default 1.6 (Minecraft friendly)
+            self.button_type: str = self.settings["button"]
+            self.hotkey_manager.set_hotkey(self.settings["hotkey"])
+            # Highest rate this host sustained in `python -m src.calibration`, if calibrated
+            self.max_reliable_cps = reliable_cps()
+
+            # Validate and cache all profiles once, so switching never touches disk
+            self.profile_manager = ProfileManager(self.clicker, self.config)
+            self.profile_manager.load()
 
         # Create GUI
-        self.create_widgets()
+        with self.profiler.phase("widgets"):
+            self.create_widgets()
 
-        # Set initial clicker interval from CPS (FIX: Apply default CPS to clicker)
+        # Apply loaded settings to the clicker
         self.clicker.set_interval(cps_to_seconds(self.cps))
+        self.clicker.set_mode(self.settings["mode"])
+        self.clicker.set_button(self.button_type)
+        self.on_timer_change()
+        self.clicker.set_click_limit(self.settings["click_limit"] or None)
+        self.set_cps_budget(self.settings["cps_budget"])
+
+        # Hold-to-click replaces start/stop when a trigger is configured
+        self.hold_trigger: HoldTrigger | None = None
+        self.set_trigger(self.settings["trigger"])
 
-        # Register hotkey callback
+        # Show runs that end by themselves (timer, click limit, backend error) right away
+        self.clicker.set_stop_callback(self.on_clicker_stopped)
+
+        # Register hotkey callbacks; the keyboard hook itself is installed by finish_startup()
         self.hotkey_manager.register_callback(self.toggle_clicker)
-        self.hotkey_manager.start_listening()
+        self.bind_profile_hotkeys()
+
+        self.metrics_server = None
+        self.command_server: CommandServer | None = None
+        self.scheduler: SessionScheduler | None = None
+        self.focus_guard: Any = None  # FocusGuard, imported on first use
+        self.config_watcher = ConfigWatcher(CONFIG_FILE, self.on_config_file_changed)
+        self.warmup_thread: threading.Thread | None = None
+
+        # Paint the window before anything slow happens
+        with self.profiler.phase("first_paint"):
+            self.root.update_idletasks()
+            self.root.update()
+        self.finish_startup()
 
         # Update status periodically
         self.update_status()
@@ -62,9 +132,115 @@ class MCClickerApp:
         # Start the countdown update loop
         self.update_countdown()
 
-        # Save hotkey on close
+        # Draw the graph only while the window is shown
+        self.root.bind("<Map>", lambda e: self.on_visibility_change(e, True), add="+")
+        self.root.bind("<Unmap>", lambda e: self.on_visibility_change(e, False), add="+")
+        self.update_graph()
+
+        # Save settings on close
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
+    def finish_startup(self) -> None:
+        """Start the services that are not needed to show the window."""
+        # Optional monitoring endpoint
+        metrics_port = os.environ.get(METRICS_ENV_VAR)
+        if metrics_port:
+            from src.metrics import MetricsServer
+
+            try:
+                self.metrics_server = MetricsServer(self.clicker, self.hotkey_manager, port=int(metrics_port))
+                self.metrics_server.start()
+            except (ValueError, OSError) as e:
+                print(f"Error starting metrics server on port {metrics_port}: {e}")
+                self.metrics_server = None
+
+        # Click sessions at set times of day
+        self.set_schedule(self.settings["schedule"])
+
+        # Pause while the game does not have focus
+        if self.settings["focus_pause"]:
+            self.set_focus_pause(True)
+
+        # Apply edits made to the config file by other tools
+        self.config_watcher.start()
+
+        self.warmup_thread = threading.Thread(target=self.warm_up, daemon=True)
+        self.warmup_thread.start()
+
+    def warm_up(self) -> None:
+        """Install the keyboard hook and create the mouse backend (runs on a background thread)."""
+        with self.profiler.phase("hotkeys"):
+            self.hotkey_manager.start_listening()
+        with self.profiler.phase("backend"):
+            try:
+                self.clicker.ensure_backend()
+            except Exception as e:
+                print(f"Mouse backend error: {e}")
+        if os.environ.get(PROFILE_ENV_VAR):
+            print(self.profiler.report())
+
+    def set_schedule(self, rules: list[str]) -> None:
+        """
+        Follow a new list of session rules.
+
+        Args:
+            rules (list[str]): Validated rule strings; empty to stop scheduling.
+        """
+        if not rules:
+            if self.scheduler is not None:
+                self.scheduler.close()
+                self.scheduler = None
+            return
+        parsed = [parse_rule(rule) for rule in rules]
+        if self.scheduler is None:
+            self.scheduler = SessionScheduler(self.clicker, parsed)
+            self.scheduler.start()
+        else:
+            self.scheduler.set_rules(parsed)
+
+    def set_cps_budget(self, ceiling: float) -> None:
+        """
+        Share a host-wide CPS ceiling with the other instances on this machine.
+
+        Args:
+            ceiling (float): Clicks per second for all instances together; 0 for no ceiling.
+        """
+        if not ceiling:
+            self.clicker.set_budget(None)
+            return
+        try:
+            self.clicker.set_budget(SharedBudget(ceiling))
+        except OSError as e:
+            print(f"Error joining the shared CPS budget: {e}")
+
+    def set_focus_pause(self, enabled: bool) -> bool:
+        """
+        Turn pausing while the game is unfocused on or off.
+
+        Args:
+            enabled (bool): Whether to watch focus changes.
+
+        Returns:
+            bool: Whether the guard is now running; False if the display has no X11.
+        """
+        if not enabled:
+            if self.focus_guard is not None:
+                self.focus_guard.stop()
+                self.focus_guard = None
+            return False
+        if self.focus_guard is not None:
+            return True
+        from src.focus import FocusGuard
+
+        guard = FocusGuard(self.clicker)
+        try:
+            guard.start()
+        except OSError as e:
+            print(f"Error watching window focus: {e}")
+            return False
+        self.focus_guard = guard  # Targets a window from the next start, not this window
+        return True
+
     def setup_dark_theme(self) -> None:
         """Configure dark theme colors."""
         dark_bg = "#1e1e1e"
@@ -187,12 +363,16 @@ class MCClickerApp:
         self.seconds_entry.pack(side=tk.LEFT)
         self.seconds_entry.bind("<KeyRelease>", self.on_seconds_change)
 
+        self.cps_warning_label = ttk.Label(speed_frame, text="", font=("Arial", 8), foreground="#ff9900")
+        self.cps_warning_label.pack(side=tk.LEFT, padx=(6, 0))
+        self.update_cps_warning()
+
         # Click Mode + Button: Single row
         mode_button_frame = ttk.Frame(main)
         mode_button_frame.pack(fill=tk.X, pady=4)
 
         ttk.Label(mode_button_frame, text="Mode:", font=("Arial", 9)).pack(side=tk.LEFT, padx=(0, 4))
-        self.mode_var = tk.StringVar(value="click")
+        self.mode_var = tk.StringVar(value=self.settings["mode"])
         ttk.Combobox(
             mode_button_frame,
             textvariable=self.mode_var,
@@ -203,7 +383,7 @@ class MCClickerApp:
         self.mode_var.trace("w", lambda *_: self.on_mode_change())
 
         ttk.Label(mode_button_frame, text="Button:", font=("Arial", 9)).pack(side=tk.LEFT, padx=(0, 4))
-        self.button_var = tk.StringVar(value="left")
+        self.button_var = tk.StringVar(value=self.settings["button"])
         ttk.Combobox(
             mode_button_frame,
             textvariable=self.button_var,
@@ -213,11 +393,41 @@ class MCClickerApp:
         ).pack(side=tk.LEFT)
         self.button_var.trace("w", lambda *_: self.on_button_change())
 
+        # Trigger: Toggle via hotkey, or click only while a button/key is held
+        trigger_frame = ttk.Frame(main)
+        trigger_frame.pack(fill=tk.X, pady=4)
+        ttk.Label(trigger_frame, text="Trigger:", font=("Arial", 9)).pack(side=tk.LEFT, padx=(0, 4))
+        self.trigger_var = tk.StringVar(value=self.settings["trigger"])
+        ttk.Combobox(
+            trigger_frame,
+            textvariable=self.trigger_var,
+            values=list(TRIGGER_NAMES),
+            state="readonly",
+            width=8,
+        ).pack(side=tk.LEFT, padx=(0, 12))
+        self.trigger_var.trace("w", lambda *_: self.on_trigger_change())
+
+        ttk.Label(trigger_frame, text="Clicks:", font=("Arial", 9)).pack(side=tk.LEFT, padx=(0, 4))
+        limit = self.settings["click_limit"]
+        self.click_limit_var = tk.StringVar(value=str(limit) if limit else "")
+        ttk.Entry(trigger_frame, textvariable=self.click_limit_var, width=6).pack(side=tk.LEFT)
+        self.click_limit_var.trace("w", lambda *_: self.on_click_limit_change())
+
+        # Target: Focused window, or one picked window that receives clicks in the background
+        target_frame = ttk.Frame(main)
+        target_frame.pack(fill=tk.X, pady=4)
+        ttk.Label(target_frame, text="Target:", font=("Arial", 9)).pack(side=tk.LEFT, padx=(0, 4))
+        self.target_label = ttk.Label(target_frame, text="Focused window", font=("Arial", 9), width=14)
+        self.target_label.pack(side=tk.LEFT, padx=(0, 4))
+        self.pick_button = ttk.Button(target_frame, text="Pick", command=self.pick_target_window, width=5)
+        self.pick_button.pack(side=tk.LEFT, padx=(0, 4))
+        ttk.Button(target_frame, text="Clear", command=self.clear_target_window, width=5).pack(side=tk.LEFT)
+
         # Timer: Compact
         timer_frame = ttk.Frame(main)
         timer_frame.pack(fill=tk.X, pady=4)
 
-        self.timer_enabled_var = tk.BooleanVar(value=False)
+        self.timer_enabled_var = tk.BooleanVar(value=self.settings["timer_enabled"])
         ttk.Checkbutton(
             timer_frame,
             text="Timer:",
@@ -225,19 +435,20 @@ class MCClickerApp:
             command=self.on_timer_toggle,
         ).pack(side=tk.LEFT, padx=(0, 4))
 
-        self.timer_hours_var = tk.StringVar(value="0")
+        self.timer_hours_var = tk.StringVar(value=str(self.settings["timer_hours"]))
         ttk.Entry(timer_frame, textvariable=self.timer_hours_var, width=2).pack(side=tk.LEFT)
         ttk.Label(timer_frame, text="h", font=("Arial", 8)).pack(side=tk.LEFT, padx=(0, 3))
         self.timer_hours_var.trace("w", self.on_timer_change)
 
-        self.timer_minutes_var = tk.StringVar(value="0")
+        self.timer_minutes_var = tk.StringVar(value=str(self.settings["timer_minutes"]))
         ttk.Entry(timer_frame, textvariable=self.timer_minutes_var, width=2).pack(side=tk.LEFT)
         ttk.Label(timer_frame, text="m", font=("Arial", 8)).pack(side=tk.LEFT, padx=(0, 3))
         self.timer_minutes_var.trace("w", self.on_timer_change)
 
-        self.timer_seconds_var = tk.StringVar(value="0")
+        self.timer_seconds_var = tk.StringVar(value=str(self.settings["timer_seconds"]))
         ttk.Entry(timer_frame, textvariable=self.timer_seconds_var, width=2).pack(side=tk.LEFT)
         ttk.Label(timer_frame, text="s", font=("Arial", 8)).pack(side=tk.LEFT)
+        self.timer_seconds_var.trace("w", self.on_timer_change)
 
         # Hotkey: Compact
         hotkey_frame = ttk.Frame(main)
@@ -268,9 +479,39 @@ class MCClickerApp:
         )
         self.recording_label.pack(side=tk.LEFT)
 
+        # Profiles: Compact
+        profile_frame = ttk.Frame(main)
+        profile_frame.pack(fill=tk.X, pady=4)
+
+        ttk.Label(profile_frame, text="Profile:", font=("Arial", 9)).pack(side=tk.LEFT, padx=(0, 4))
+        self.profile_var = tk.StringVar(value="")
+        self.profile_combo = ttk.Combobox(
+            profile_frame,
+            textvariable=self.profile_var,
+            values=self.profile_manager.names(),
+            width=10,
+        )
+        self.profile_combo.pack(side=tk.LEFT, padx=(0, 4))
+        self.profile_combo.bind("<<ComboboxSelected>>", lambda _: self.apply_profile(self.profile_var.get()))
+        ttk.Button(profile_frame, text="Save", command=self.save_profile, width=5).pack(side=tk.LEFT, padx=(0, 4))
+        ttk.Button(profile_frame, text="Del", command=self.delete_profile, width=4).pack(side=tk.LEFT)
+
+        # Live achieved CPS (green) and interval error (orange)
+        graph_canvas = tk.Canvas(main, width=276, height=52, bg="#161616", highlightthickness=0)
+        graph_canvas.pack(fill=tk.X, pady=(8, 0))
+        self.rate_graph = RateGraph(graph_canvas, RateSampler(self.clicker.stats), width=276, height=52)
+        self.rate_graph.set_target(self.cps)
+
         # Footer
         footer = ttk.Frame(main)
         footer.pack(fill=tk.X, pady=(8, 0))
+        self.focus_pause_var = tk.BooleanVar(value=self.settings["focus_pause"])
+        ttk.Checkbutton(
+            footer,
+            text="Pause unfocused",
+            variable=self.focus_pause_var,
+            command=self.on_focus_pause_toggle,
+        ).pack(side=tk.LEFT)
         ttk.Button(footer, text="Exit", command=self.exit_app, width=10).pack(side=tk.RIGHT)
 
     def on_cps_change(self, event: tk.Event = None) -> None:
@@ -280,7 +521,11 @@ class MCClickerApp:
             if validate_cps(cps):
                 self.cps = cps
                 self.clicker.set_interval(cps_to_seconds(cps))
+                self.clicker.set_interval_sampler(None)  # A typed rate replaces a profile's cadence
                 self.seconds_var.set(f"{cps_to_seconds(cps):.2f}")
+                self.config.update(cps=cps)
+                self.update_cps_warning()
+                self.rate_graph.set_target(cps)
         except ValueError:
             pass
 
@@ -292,20 +537,98 @@ class MCClickerApp:
                 cps = seconds_to_cps(seconds)
                 self.cps = cps
                 self.clicker.set_interval(seconds)
+                self.clicker.set_interval_sampler(None)
                 self.cps_var.set(f"{cps:.1f}")
+                self.config.update(cps=cps)
+                self.update_cps_warning()
+                self.rate_graph.set_target(cps)
         except ValueError:
             pass
 
+    def update_cps_warning(self) -> None:
+        """Warn when the CPS is above what this host achieved reliably during calibration."""
+        if self.max_reliable_cps is not None and self.cps > self.max_reliable_cps:
+            self.cps_warning_label.config(text=f"max {self.max_reliable_cps:g}!")
+        else:
+            self.cps_warning_label.config(text="")
+
     def on_button_change(self) -> None:
         """Handle click button change."""
         button = self.button_var.get().lower()
         self.button_type = button
         self.clicker.set_button(button)
+        self.config.update(button=button)
 
     def on_mode_change(self) -> None:
         """Handle click mode change."""
         mode = self.mode_var.get().lower()
         self.clicker.set_mode(mode)
+        self.config.update(mode=mode)
+
+    def on_trigger_change(self) -> None:
+        """Handle trigger selection change."""
+        trigger = self.trigger_var.get().strip().lower()
+        if not trigger or trigger == (self.hold_trigger.trigger if self.hold_trigger else "toggle"):
+            return
+        self.set_trigger(trigger)
+        self.config.update(trigger=trigger)
+
+    def set_trigger(self, trigger: str) -> None:
+        """
+        Switch between hotkey toggling and hold-to-click.
+
+        Args:
+            trigger (str): "toggle", or the mouse button or key to hold.
+        """
+        was_armed = False
+        if self.hold_trigger is not None:
+            was_armed = self.hold_trigger.is_armed
+            self.hold_trigger.disarm()
+            self.hold_trigger = None
+        if trigger != "toggle":
+            self.hold_trigger = HoldTrigger(self.clicker, trigger)
+            if was_armed:
+                self.hold_trigger.arm()
+
+    def on_click_limit_change(self) -> None:
+        """Handle click limit input change; empty or 0 means unlimited."""
+        try:
+            limit = int(self.click_limit_var.get() or "0")
+        except ValueError:
+            return
+        if limit < 0:
+            return
+        self.clicker.set_click_limit(limit or None)
+        self.config.update(click_limit=limit)
+
+    def pick_target_window(self) -> None:
+        """Let the user click the window to send clicks to (X11 only)."""
+        self.stop_clicker()
+        self.pick_button.config(state=tk.DISABLED)
+        self.target_label.config(text="Click a window...")
+        threading.Thread(target=self._pick_target_window, daemon=True).start()
+
+    def _pick_target_window(self) -> None:
+        """Wait for the pick on a background thread and hand the result to the GUI thread."""
+        from src.xwindow import WindowMouse, pick_window
+
+        try:
+            mouse = WindowMouse(pick_window())
+        except OSError as e:
+            print(f"Error picking target window: {e}")
+            mouse = None
+        self.root.after(0, self.set_target_window, mouse)
+
+    def set_target_window(self, mouse: Any) -> None:
+        """Click into a picked window (a WindowMouse), or into the focused window if None."""
+        self.stop_clicker()
+        self.clicker.set_mouse(mouse)
+        self.pick_button.config(state=tk.NORMAL)
+        self.target_label.config(text=f"Window {mouse.window:#x}" if mouse is not None else "Focused window")
+
+    def clear_target_window(self) -> None:
+        """Go back to clicking wherever the focus is."""
+        self.set_target_window(None)
 
     def on_timer_change(self, *args) -> None:
         """Handle timer input change (hours/minutes/seconds)."""
@@ -317,6 +640,8 @@ class MCClickerApp:
             hours = int(self.timer_hours_var.get() or "0")
             minutes = int(self.timer_minutes_var.get() or "0")
             seconds = int(self.timer_seconds_var.get() or "0")
+            if min(hours, minutes, seconds) >= 0:
+                self.config.update(timer_hours=hours, timer_minutes=minutes, timer_seconds=seconds)
 
             total_seconds = hours * 3600 + minutes * 60 + seconds
 
@@ -327,8 +652,15 @@ class MCClickerApp:
         except ValueError:
             self.clicker.set_duration(None)
 
+    def on_focus_pause_toggle(self) -> None:
+        """Handle the pause-when-unfocused checkbox."""
+        enabled = self.set_focus_pause(self.focus_pause_var.get())
+        self.focus_pause_var.set(enabled)
+        self.config.update(focus_pause=enabled)
+
     def on_timer_toggle(self) -> None:
         """Handle timer enable/disable checkbox."""
+        self.config.update(timer_enabled=self.timer_enabled_var.get())
         if self.timer_enabled_var.get():
             # Timer enabled, apply the values
             self.on_timer_change()
@@ -337,37 +669,173 @@ class MCClickerApp:
             self.clicker.set_duration(None)
             self.countdown_label.config(text="")
 
+    def apply_profile(self, name: str) -> None:
+        """Switch to a cached profile and reflect it in the widgets."""
+        profile = self.profile_manager.get(name)
+        if profile is None:
+            return
+        self.profile_manager.apply(name)
+        self.show_profile(profile)
+
+    def on_profile_hotkey(self, name: str) -> None:
+        """Switch profile from a hotkey (runs on the keyboard thread)."""
+        profile = self.profile_manager.apply(name)
+        # Only the widget refresh waits for the Tk thread
+        self.root.after(0, self.show_profile, profile)
+
+    def show_profile(self, profile: Profile) -> None:
+        """Update the widgets to show an applied profile."""
+        self.profile_var.set(profile.name)
+        self.cps = profile.cps
+        self.cps_var.set(f"{profile.cps:.1f}")
+        self.seconds_var.set(f"{profile.interval:.2f}")
+        self.config.update(cps=profile.cps)
+        self.update_cps_warning()
+        self.rate_graph.set_target(profile.cps)
+        self.mode_var.set(profile.mode)
+        self.button_var.set(profile.button)
+
+        if profile.duration is None:
+            self.timer_enabled_var.set(False)
+        else:
+            total = int(profile.duration)
+            self.timer_enabled_var.set(True)
+            self.timer_hours_var.set(str(total // 3600))
+            self.timer_minutes_var.set(str(total % 3600 // 60))
+            self.timer_seconds_var.set(str(total % 60))
+        self.on_timer_toggle()
+
+    def save_profile(self) -> None:
+        """Save the current settings as the profile named in the profile box."""
+        name = self.profile_var.get().strip()
+        if not name:
+            return
+
+        existing = self.profile_manager.get(name)
+        profile = Profile(
+            name=name,
+            cps=self.cps,
+            interval=cps_to_seconds(self.cps),
+            mode=self.clicker.mode,
+            button=self.button_type,
+            duration=self.clicker.duration,
+            hotkey=existing.hotkey if existing else None,
+            # Keep a measured cadence only while it is still what the clicker uses
+            cadence=existing.cadence if existing and self.clicker.interval_sampler is not None else None,
+            jitter=existing.jitter if existing else 0.0,
+        )
+        self.profile_manager.save(profile)
+        self.profile_manager.active = name
+        self.profile_combo.config(values=self.profile_manager.names())
+
+    def delete_profile(self) -> None:
+        """Delete the profile named in the profile box."""
+        name = self.profile_var.get().strip()
+        profile = self.profile_manager.get(name)
+        if profile is None:
+            return
+        if profile.hotkey:
+            self.hotkey_manager.unbind(profile.hotkey)
+        self.profile_manager.delete(name)
+        self.profile_var.set("")
+        self.profile_combo.config(values=self.profile_manager.names())
+
+    def bind_profile_hotkeys(self) -> None:
+        """Register the hotkeys of all profiles that define one."""
+        for name in self.profile_manager.names():
+            profile = self.profile_manager.get(name)
+            if profile.hotkey:
+                self.hotkey_manager.bind(profile.hotkey, lambda n=name: self.on_profile_hotkey(n))
+
     def update_countdown(self) -> None:
-        """Update countdown display if timer is running."""
+        """Update countdown display if the timer or click limit is running."""
+        parts = []
         remaining = self.clicker.get_remaining_time()
-
         if remaining is not None and self.timer_enabled_var.get():
             # Format remaining time
             hours = int(remaining // 3600)
             remaining %= 3600
             minutes = int(remaining // 60)
             seconds = int(remaining % 60)
+            parts.append(f"Timer: {hours:02d}:{minutes:02d}:{seconds:02d}")
 
-            countdown_text = f"Timer: {hours:02d}:{minutes:02d}:{seconds:02d}"
-            self.countdown_label.config(text=countdown_text)
-        else:
-            self.countdown_label.config(text="")
+        clicks_left = self.clicker.get_remaining_clicks()
+        if clicks_left is not None:
+            parts.append(f"Clicks left: {clicks_left}")
+        if self.clicker.stop_reason == "error":
+            parts.append(f"Error: {self.clicker.stats.last_error}")
+
+        self.countdown_label.config(text="   ".join(parts))
 
         # Schedule next update
         self.root.after(100, self.update_countdown)
 
+    def update_graph(self) -> None:
+        """Add the latest sample to the CPS graph."""
+        self.rate_graph.update()
+
+        # Schedule next update
+        self.root.after(int(DEFAULT_PERIOD * 1000), self.update_graph)
+
+    def on_visibility_change(self, event: tk.Event, visible: bool) -> None:
+        """Pause graph drawing while the window is minimized or withdrawn."""
+        if event.widget is self.root:
+            self.rate_graph.set_visible(visible)
+
+    def on_remote_command(self, command: str, argument: str | None) -> None:
+        """
+        Run a command forwarded by a second launch (runs on the command server thread).
+
+        Args:
+            command (str): One of instance.COMMANDS.
+            argument (str | None): Profile name for 'profile'.
+
+        Raises:
+            KeyError: If the profile does not exist.
+        """
+        # Clicker commands take effect here, like hotkeys; widgets wait for the Tk thread
+        if command == "toggle":
+            self.toggle_clicker()
+        elif command == "start":
+            self.start_clicker()
+        elif command == "stop":
+            self.stop_clicker()
+        elif command == "profile":
+            self.on_profile_hotkey(argument)
+        else:
+            self.root.after(0, self.show_window)
+
+    def show_window(self) -> None:
+        """Bring the window to the front."""
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
+
     def toggle_clicker(self) -> None:
-        """Toggle the clicker on/off."""
-        if self.clicker.is_running:
+        """Toggle the clicker on/off, or arm/disarm the hold trigger."""
+        if self.hold_trigger is not None:
+            if self.hold_trigger.is_armed:
+                self.hold_trigger.disarm()
+            else:
+                self.track_focus()
+                self.hold_trigger.arm()
+        elif self.clicker.is_running:
             self.clicker.stop()
         else:
+            self.track_focus()
             self.clicker.start()
 
     def start_clicker(self) -> None:
         """Start the clicker."""
         if not self.clicker.is_running:
+            self.track_focus()
             self.clicker.start()
 
+    def track_focus(self) -> None:
+        """Make the window focused right now (the game, when started by hotkey) the one to click in."""
+        if self.focus_guard is not None:
+            self.focus_guard.track()
+
     def stop_clicker(self) -> None:
         """Stop the clicker."""
         if self.clicker.is_running:
@@ -375,19 +843,53 @@ class MCClickerApp:
 
     def exit_app(self) -> None:
         """Exit the application."""
+        if self.command_server is not None:
+            self.command_server.stop()
+        if self.scheduler is not None:
+            self.scheduler.close()  # Before stopping the clicker, so no session restarts it
+        self.set_focus_pause(False)
+        if self.hold_trigger is not None:
+            self.hold_trigger.disarm()
         self.clicker.stop()
+        self.clicker.set_budget(None)  # Free the slot for other instances
+        if self.warmup_thread is not None:
+            self.warmup_thread.join(timeout=1)  # Do not unhook while the hook is being installed
         self.hotkey_manager.stop_listening()
+        self.config_watcher.stop()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        self.config.flush()
+        self.session_log.close()
+        if self.trace_path and self.clicker.tracer is not None:
+            self.clicker.tracer.export_chrome_trace(self.trace_path)
         self.root.destroy()
 
     def update_status(self) -> None:
         """Update status display periodically."""
-        if self.clicker.is_running:
+        self.refresh_status()
+
+        # Schedule next update
+        self.root.after(100, self.update_status)
+
+    def refresh_status(self) -> None:
+        """Show the clicker's state in the status label."""
+        if self.clicker.is_running and self.clicker.is_paused:
+            self.status_label.config(text="ARMED", foreground="#ffcc00")
+        elif self.clicker.is_running:
             self.status_label.config(text="RUNNING", foreground="#51cf66")
+        elif self.clicker.stop_reason == "error":
+            self.status_label.config(text="ERROR", foreground="#ff6b6b")
         else:
             self.status_label.config(text="STOPPED", foreground="#ff6b6b")
 
-        # Schedule next update
-        self.root.after(100, self.update_status)
+    def on_clicker_stopped(self, reason: str) -> None:
+        """
+        Handle a run that ended by itself (runs on the click thread).
+
+        Args:
+            reason (str): "duration", "click_limit" or "error".
+        """
+        self.root.after(0, self.refresh_status)
 
     def start_recording_hotkey(self) -> None:
         """Start the hotkey recording process."""
@@ -457,6 +959,7 @@ class MCClickerApp:
 
         # Set new hotkey
         self.hotkey_manager.set_hotkey(HotkeyManager.parse_hotkey_input(new_hotkey))
+        self.config.update(hotkey=self.hotkey_manager.hotkey)
 
         # Start new listener
         self.hotkey_manager.start_listening()
@@ -476,40 +979,124 @@ class MCClickerApp:
         """Finish the hotkey recording process (kept for compatibility)."""
         pass
 
-    def load_hotkey(self) -> str | None:
-        """Load the hotkey from a config file."""
-        if not os.path.exists(CONFIG_FILE):
-            return None
-
-        try:
-            with open(CONFIG_FILE, "r") as f:
-                data = json.load(f)
-                return HotkeyManager.parse_hotkey_input(data.get("hotkey", ""))
-        except json.JSONDecodeError:
-            print(f"Error decoding JSON from {CONFIG_FILE}")
-            return None
-        except Exception as e:
-            print(f"Error loading hotkey from {CONFIG_FILE}: {e}")
-            return None
+    def on_config_file_changed(self) -> None:
+        """Hand a change on disk to the Tk thread (runs on the watcher thread)."""
+        self.root.after(0, self.apply_config_file)
+
+    def apply_config_file(self) -> None:
+        """
+        Apply settings changed on disk.
+
+        Runs on the Tk thread, like the widget handlers, so an edit made in
+        the window cannot interleave with it.
+        """
+        changes = self.config.reload()
+        if not changes:
+            return  # Our own write, unsaved edits of ours, or an edit that changed nothing
+
+        # Engine and hotkey changes take effect here, without a restart
+        if "cps" in changes:
+            self.clicker.set_interval(cps_to_seconds(changes["cps"]))
+        if "mode" in changes:
+            self.clicker.set_mode(changes["mode"])
+        if "button" in changes:
+            self.clicker.set_button(changes["button"])
+        if changes.keys() & {"timer_enabled", "timer_hours", "timer_minutes", "timer_seconds"}:
+            settings = self.config.settings
+            total = settings["timer_hours"] * 3600 + settings["timer_minutes"] * 60 + settings["timer_seconds"]
+            self.clicker.set_duration(total if settings["timer_enabled"] and total > 0 else None)
+        if "click_limit" in changes:
+            self.clicker.set_click_limit(changes["click_limit"] or None)
+        if "schedule" in changes:
+            self.set_schedule(changes["schedule"])
+        if "focus_pause" in changes:
+            self.set_focus_pause(changes["focus_pause"])
+        if "cps_budget" in changes:
+            self.set_cps_budget(changes["cps_budget"])
+        if "hotkey" in changes:
+            self.hotkey_manager.change_hotkey(changes["hotkey"])
+        if "trigger" in changes:
+            self.set_trigger(changes["trigger"])
+        if "profiles" in changes:
+            for name in self.profile_manager.names():
+                hotkey = self.profile_manager.get(name).hotkey
+                if hotkey:
+                    self.hotkey_manager.unbind(hotkey)
+            self.profile_manager.load()
+            self.bind_profile_hotkeys()
+
+        self.show_settings(changes)
+
+    def show_settings(self, changes: dict) -> None:
+        """Update the widgets for settings changed on disk."""
+        if "cps" in changes:
+            self.cps = changes["cps"]
+            self.cps_var.set(f"{self.cps:.1f}")
+            self.seconds_var.set(f"{cps_to_seconds(self.cps):.2f}")
+            self.update_cps_warning()
+            self.rate_graph.set_target(self.cps)
+        if "mode" in changes:
+            self.mode_var.set(changes["mode"])
+        if "button" in changes:
+            self.button_type = changes["button"]
+            self.button_var.set(changes["button"])
+        if "hotkey" in changes:
+            self.hotkey_label.config(text=self.hotkey_manager.get_hotkey_display())
+        if "trigger" in changes:
+            self.trigger_var.set(changes["trigger"])
+        if "click_limit" in changes:
+            self.click_limit_var.set(str(changes["click_limit"]) if changes["click_limit"] else "")
+        if "profiles" in changes:
+            self.profile_combo.config(values=self.profile_manager.names())
+        if "timer_hours" in changes:
+            self.timer_hours_var.set(str(changes["timer_hours"]))
+        if "timer_minutes" in changes:
+            self.timer_minutes_var.set(str(changes["timer_minutes"]))
+        if "timer_seconds" in changes:
+            self.timer_seconds_var.set(str(changes["timer_seconds"]))
+        if "timer_enabled" in changes:
+            self.timer_enabled_var.set(changes["timer_enabled"])
+            self.on_timer_toggle()
+        if "focus_pause" in changes:
+            self.focus_pause_var.set(self.focus_guard is not None)
 
     def on_close(self) -> None:
-        """Save hotkey and exit."""
-        self.save_hotkey()
+        """Save settings and exit."""
         self.exit_app()
 
-    def save_hotkey(self) -> None:
-        """Save the current hotkey to a config file."""
-        try:
-            with open(CONFIG_FILE, "w") as f:
-                json.dump({"hotkey": self.hotkey_manager.get_hotkey_display()}, f)
-        except Exception as e:
-            print(f"Error saving hotkey to {CONFIG_FILE}: {e}")
-
 
-def main() -> None:
-    """Entry point for the application."""
-    root = tk.Tk()
-    app = MCClickerApp(root)
+def main(command: str = "show", argument: str | None = None) -> None:
+    """
+    Entry point for the application.
+
+    Args:
+        command (str): Command from the command line (see instance.parse_command).
+        argument (str | None): Its argument.
+    """
+    # Later launches forward their command here instead of starting a second app.
+    # Listen right away; commands arriving during startup wait for the window.
+    pending = [(command, argument)] if command != "show" else []
+    command_server: CommandServer | None = CommandServer(lambda c, a: pending.append((c, a)))
+    try:
+        command_server.start()
+    except OSError as e:
+        print(f"Error starting command server: {e}")
+        command_server = None
+
+    profiler = StartupProfiler(origin=IMPORTS_STARTED)
+    profiler.record("imports", IMPORTS_STARTED, IMPORTS_DONE)
+    with profiler.phase("tk_root"):
+        root = tk.Tk()
+    app = MCClickerApp(root, profiler)
+
+    app.command_server = command_server
+    if command_server is not None:
+        command_server.handler = app.on_remote_command
+    for queued in pending:
+        try:
+            app.on_remote_command(*queued)
+        except KeyError as e:
+            print(f"Unknown profile: {e}")
     root.mainloop()
 
 
@@ -0,0 +1,154 @@
+"""Prometheus-style metrics endpoint for MC Clicker."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.clicker import AutoClicker
+from src.hotkey import HotkeyManager
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9477
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way the Prometheus text format expects."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def configured_cps(clicker: AutoClicker) -> float:
+    """
+    Get the click rate the clicker is set to.
+
+    Args:
+        clicker (AutoClicker): Clicker to read.
+
+    Returns:
+        float: 0 in hold mode; otherwise from the interval sampler's mean when
+        it publishes one (e.g. an IntervalSchedule), else from the fixed interval.
+    """
+    if clicker.mode == "hold":
+        return 0.0
+    mean = getattr(clicker.interval_sampler, "mean", None)
+    if isinstance(mean, (int, float)) and mean > 0:
+        return 1.0 / mean
+    return 1.0 / clicker.interval
+
+
+def render_metrics(clicker: AutoClicker, hotkey_manager: HotkeyManager | None = None) -> str:
+    """
+    Render the clicker's counters in Prometheus text exposition format.
+
+    Only reads counters the click thread has already aggregated.
+
+    Args:
+        clicker (AutoClicker): Clicker to report on.
+        hotkey_manager (HotkeyManager | None): Hotkey manager for dispatch latency.
+
+    Returns:
+        str: Metrics text.
+    """
+    stats = clicker.stats
+    lines = []
+
+    def metric(name: str, kind: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for suffix, value in samples:
+            lines.append(f"{name}{suffix} {_format_value(value)}")
+
+    metric("mcclicker_clicks_total", "counter", "Clicks performed since startup.",
+           [("", stats.clicks_total)])
+    metric("mcclicker_achieved_cps", "gauge", "Clicks per second achieved in the current or last run.",
+           [("", stats.achieved_cps())])
+    metric("mcclicker_configured_cps", "gauge", "Configured clicks per second; 0 while holding a button.",
+           [("", configured_cps(clicker))])
+    metric("mcclicker_missed_deadlines_total", "counter", "Click slots skipped because the loop fell behind.",
+           [("", stats.missed_deadlines)])
+
+    metric("mcclicker_backend_errors_total", "counter", "Mouse backend errors, by whether they were retried.",
+           [('{kind="transient"}', stats.transient_errors), ('{kind="fatal"}', stats.fatal_errors)])
+
+    histogram = stats.error_histogram()
+    buckets = [(f'_bucket{{le="{_format_value(bound)}"}}', count) for bound, count in histogram]
+    metric("mcclicker_interval_error_seconds", "histogram", "Lateness of each click relative to its schedule.",
+           buckets + [("_sum", stats.error_sum), ("_count", histogram[-1][1])])
+
+    metric("mcclicker_running", "gauge", "1 if the clicker is running.",
+           [("", int(clicker.is_running))])
+    metric("mcclicker_holding", "gauge", "1 if a button is currently held down.",
+           [("", int(clicker.is_holding))])
+
+    if hotkey_manager is not None:
+        metric("mcclicker_hotkey_dispatch_seconds", "summary", "Time spent dispatching toggle hotkey presses.",
+               [("_sum", hotkey_manager.dispatch_seconds_total), ("_count", hotkey_manager.dispatch_count)])
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serves /metrics on localhost from a background thread."""
+
+    def __init__(
+        self,
+        clicker: AutoClicker,
+        hotkey_manager: HotkeyManager | None = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+    ) -> None:
+        """
+        Initialize the MetricsServer.
+
+        Args:
+            clicker (AutoClicker): Clicker to report on.
+            hotkey_manager (HotkeyManager | None): Hotkey manager for dispatch latency.
+            host (str): Address to bind; localhost by default.
+            port (int): Port to bind; 0 picks a free port.
+        """
+        self.clicker = clicker
+        self.hotkey_manager = hotkey_manager
+        self.host = host
+        self.port = port
+        self.server: ThreadingHTTPServer | None = None
+        self.server_thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start serving; `port` is updated to the bound port."""
+        if self.server is not None:
+            return
+
+        metrics_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render_metrics(metrics_server.clicker, metrics_server.hotkey_manager).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass  # Scrapes are too frequent to log
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self.server is None:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
+        if self.server_thread:
+            self.server_thread.join(timeout=1)
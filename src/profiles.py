@@ -0,0 +1,221 @@
+"""Named click profiles for MC Clicker."""
+
+from typing import Any, Literal, NamedTuple
+
+from src.cadence import Cadence, cadence_from_dict, cadence_to_dict
+from src.clicker import AutoClicker
+from src.config import ConfigStore
+from src.hotkey import HotkeyManager
+from src.utils import cps_to_seconds, validate_cps
+
+
+class Profile(NamedTuple):
+    """A validated, ready-to-apply set of clicker settings."""
+
+    name: str
+    cps: float
+    interval: float
+    mode: Literal["click", "hold"]
+    button: Literal["left", "right"]
+    duration: float | None
+    hotkey: str | None
+    cadence: Cadence | None = None  # Measured human cadence to reproduce
+    jitter: float = 0.0  # Interval stdev as a fraction of the interval (log-normal); 0 = regular
+
+
+def profile_from_dict(name: str, data: Any) -> Profile:
+    """
+    Build a Profile from its stored form.
+
+    Args:
+        name (str): Profile name.
+        data (Any): Stored profile dict.
+
+    Returns:
+        Profile: The validated profile.
+
+    Raises:
+        ValueError: If any field is missing or invalid.
+    """
+    if not name:
+        raise ValueError("Profile name must not be empty")
+    if not isinstance(data, dict):
+        raise ValueError(f"Profile '{name}' must be an object")
+
+    cps = data.get("cps")
+    if isinstance(cps, bool) or not isinstance(cps, (int, float)) or not validate_cps(cps):
+        raise ValueError(f"Profile '{name}' has invalid cps: {cps!r}")
+    mode = data.get("mode", "click")
+    if mode not in ("click", "hold"):
+        raise ValueError(f"Profile '{name}' has invalid mode: {mode!r}")
+    button = data.get("button", "left")
+    if button not in ("left", "right"):
+        raise ValueError(f"Profile '{name}' has invalid button: {button!r}")
+    duration = data.get("duration")
+    if duration is not None and (
+        isinstance(duration, bool) or not isinstance(duration, (int, float)) or duration <= 0
+    ):
+        raise ValueError(f"Profile '{name}' has invalid duration: {duration!r}")
+    hotkey = data.get("hotkey")
+    if hotkey is not None:
+        if not isinstance(hotkey, str):
+            raise ValueError(f"Profile '{name}' has invalid hotkey: {hotkey!r}")
+        hotkey = HotkeyManager.parse_hotkey_input(hotkey)
+    cadence = data.get("cadence")
+    if cadence is not None:
+        try:
+            cadence = cadence_from_dict(cadence)
+        except ValueError as e:
+            raise ValueError(f"Profile '{name}' has invalid cadence: {e}") from e
+    jitter = data.get("jitter", 0.0)
+    if isinstance(jitter, bool) or not isinstance(jitter, (int, float)) or not 0 <= jitter < 1:
+        raise ValueError(f"Profile '{name}' has invalid jitter: {jitter!r}")
+
+    return Profile(name, float(cps), cps_to_seconds(cps), mode, button, duration, hotkey, cadence, float(jitter))
+
+
+def profile_to_dict(profile: Profile) -> dict[str, Any]:
+    """
+    Convert a Profile to its stored form.
+
+    Args:
+        profile (Profile): Profile to convert.
+
+    Returns:
+        dict[str, Any]: JSON-serializable profile data (name excluded).
+    """
+    data = {
+        "cps": profile.cps,
+        "mode": profile.mode,
+        "button": profile.button,
+        "duration": profile.duration,
+        "hotkey": profile.hotkey,
+    }
+    if profile.cadence is not None:
+        data["cadence"] = cadence_to_dict(profile.cadence)
+    if profile.jitter:
+        data["jitter"] = profile.jitter
+    return data
+
+
+class ProfileManager:
+    """Caches validated profiles and switches the clicker between them."""
+
+    def __init__(self, clicker: AutoClicker, config: ConfigStore) -> None:
+        """
+        Initialize the ProfileManager.
+
+        Args:
+            clicker (AutoClicker): Clicker that profiles are applied to.
+            config (ConfigStore): Store the profiles are persisted in.
+        """
+        self.clicker = clicker
+        self.config = config
+        self.profiles: dict[str, Profile] = {}
+        self.active: str | None = None
+        self._samplers: dict[str, Any] = {}  # Profile name -> interval sampler, built on first apply
+
+    def load(self) -> None:
+        """Validate every stored profile into the in-memory cache, skipping bad ones."""
+        profiles = {}
+        for name, data in self.config.get("profiles").items():
+            try:
+                profiles[name] = profile_from_dict(name, data)
+            except ValueError as e:
+                print(f"Skipping profile: {e}")
+        self.profiles = profiles
+        for name in list(self._samplers):
+            self._drop_sampler(name)
+
+    def names(self) -> list[str]:
+        """
+        Get the names of all cached profiles.
+
+        Returns:
+            list[str]: Profile names in sorted order.
+        """
+        return sorted(self.profiles)
+
+    def get(self, name: str) -> Profile | None:
+        """
+        Get a cached profile.
+
+        Args:
+            name (str): Profile name.
+
+        Returns:
+            Profile | None: The profile, or None if it does not exist.
+        """
+        return self.profiles.get(name)
+
+    def apply(self, name: str) -> Profile:
+        """
+        Switch the clicker to a cached profile.
+
+        No file I/O and no thread restart; a running clicker picks up the
+        new settings on its next iteration. A profile's interval schedule is
+        built on its first apply and reused by every later one.
+
+        Args:
+            name (str): Profile name.
+
+        Returns:
+            Profile: The applied profile.
+
+        Raises:
+            KeyError: If the profile does not exist.
+        """
+        profile = self.profiles[name]
+        sampler = self._samplers.get(name)
+        if sampler is None and (profile.cadence is not None or profile.jitter):
+            # Deferred: schedules pull in numpy, which plain profiles and startup never need
+            from src.schedule import IntervalSchedule
+
+            if profile.cadence is not None:
+                sampler = IntervalSchedule.empirical(profile.cadence)
+            else:
+                sampler = IntervalSchedule("lognormal", profile.interval, profile.interval * profile.jitter)
+            self._samplers[name] = sampler
+        self.clicker.apply_settings(
+            profile.interval, profile.button, profile.mode, profile.duration, sampler, sampler_owned=False
+        )
+        self.active = name
+        return profile
+
+    def save(self, profile: Profile) -> None:
+        """
+        Add or replace a profile and persist it.
+
+        Args:
+            profile (Profile): Profile to store.
+        """
+        self.profiles[profile.name] = profile
+        self._drop_sampler(profile.name)
+        self._persist()
+
+    def delete(self, name: str) -> None:
+        """
+        Delete a profile and persist the change.
+
+        Args:
+            name (str): Profile name; missing names are ignored.
+        """
+        if self.profiles.pop(name, None) is not None:
+            if self.active == name:
+                self.active = None
+            self._drop_sampler(name)
+            self._persist()
+
+    def _drop_sampler(self, name: str) -> None:
+        """Forget a profile's cached sampler, stopping its refill thread unless the clicker still draws from it."""
+        sampler = self._samplers.pop(name, None)
+        if sampler is None:
+            return
+        if self.clicker.interval_sampler is sampler:
+            self.clicker.set_interval_sampler(sampler)  # Hand it over: closed once the clicker replaces it
+        else:
+            sampler.close()
+
+    def _persist(self) -> None:
+        """Hand the current profiles to the config store for a debounced write."""
+        self.config.update(profiles={name: profile_to_dict(p) for name, p in self.profiles.items()})
@@ -0,0 +1,349 @@
+"""GUI responsiveness harness for MC Clicker (run under Xvfb)."""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, NamedTuple
+
+from src.backends import NullMouse
+from src.loopback import latency_summary, start_xvfb
+from src.stats import ERROR_BUCKETS
+from src.utils import cps_to_seconds
+
+DEFAULT_CPS = 100.0  # Highest rate the GUI accepts
+DEFAULT_SECONDS = 3.0  # Length of the quiet phase and of the active phase
+DEFAULT_EVENT_PERIOD = 0.02  # Seconds between scripted events in the active phase
+WARMUP = 0.2  # Seconds of clicking before the quiet phase is measured
+SETTLE = 0.1  # Seconds left for outstanding render probes after the last event
+
+
+class Scenario(NamedTuple):
+    """A scripted edit made through one widget, alternating between values."""
+
+    name: str
+    values: tuple[str, str]
+    inject: Callable[[Any, str], None]  # Makes the edit the way the widget does, on the Tk thread
+    effect: Callable[[Any, str], bool]  # Whether the clicker now reflects the value
+
+
+def _type_cps(app: Any, value: str) -> None:
+    """Replace the CPS entry's text and release the last key, as typing does."""
+    app.cps_var.set(value)
+    app.cps_entry.event_generate("<KeyRelease>")
+
+
+def _type_seconds(app: Any, value: str) -> None:
+    """Replace the interval entry's text and release the last key, as typing does."""
+    app.seconds_var.set(value)
+    app.seconds_entry.event_generate("<KeyRelease>")
+
+
+# Mode is left out: switching to hold stops clicking, which would hide any timing disturbance
+SCENARIOS = (
+    Scenario(
+        "cps",
+        ("100.0", "80.0"),
+        _type_cps,
+        lambda app, value: app.clicker.interval == cps_to_seconds(float(value)),
+    ),
+    Scenario(
+        "interval",
+        ("0.01", "0.0125"),
+        _type_seconds,
+        lambda app, value: app.clicker.interval == float(value),
+    ),
+    Scenario(
+        "button",
+        ("Right", "Left"),
+        lambda app, value: app.button_var.set(value),  # What selecting in the combobox does
+        lambda app, value: app.clicker.button_type == value.lower(),
+    ),
+    Scenario(
+        "click_limit",
+        ("1000000", "2000000"),
+        lambda app, value: app.click_limit_var.set(value),
+        lambda app, value: app.clicker.click_limit == int(value),
+    ),
+)
+
+
+class StatsSnapshot(NamedTuple):
+    """Click-engine counters at one moment."""
+
+    t: float
+    clicks: int
+    missed: int
+    error_counts: tuple[int, ...]
+    error_sum: float
+
+
+def take_snapshot(stats: Any) -> StatsSnapshot:
+    """
+    Copy the counters of a ClickStats.
+
+    Args:
+        stats (Any): ClickStats to read.
+
+    Returns:
+        StatsSnapshot: The counters now.
+    """
+    return StatsSnapshot(
+        time.perf_counter(),
+        stats.clicks_total,
+        stats.missed_deadlines,
+        tuple(stats.error_counts),
+        stats.error_sum,
+    )
+
+
+def timing_between(before: StatsSnapshot, after: StatsSnapshot) -> dict[str, Any]:
+    """
+    Summarize click timing between two snapshots.
+
+    Percentiles come from the stats histogram, so they are reported as the
+    upper bound of the bucket they fall in (None for the overflow bucket).
+
+    Args:
+        before (StatsSnapshot): Start of the window.
+        after (StatsSnapshot): End of the window.
+
+    Returns:
+        dict[str, Any]: Clicks, achieved CPS, missed deadlines, mean error and
+        p50/p99 error bounds in milliseconds.
+    """
+    clicks = after.clicks - before.clicks
+    counts = [b - a for a, b in zip(before.error_counts, after.error_counts)]
+    elapsed = after.t - before.t
+
+    def percentile(p: float) -> float | None:
+        if not clicks:
+            return None
+        rank = p / 100 * clicks
+        running = 0
+        for bound, count in zip((*ERROR_BUCKETS, None), counts):
+            running += count
+            if running >= rank:
+                return bound * 1000 if bound is not None else None
+        return None
+
+    return {
+        "clicks": clicks,
+        "achieved_cps": clicks / elapsed if elapsed > 0 else 0.0,
+        "missed_deadlines": after.missed - before.missed,
+        "mean_error_ms": (after.error_sum - before.error_sum) / clicks * 1000 if clicks else None,
+        "p50_error_ms": percentile(50),
+        "p99_error_ms": percentile(99),
+    }
+
+
+class ResponsivenessHarness:
+    """
+    Drives a running MCClickerApp with scripted widget edits.
+
+    The clicker runs at a high rate throughout. A quiet phase measures click
+    timing with the GUI idle; an active phase then queues one edit every
+    `period` seconds, cycling through the scenarios. For each edit it times:
+
+    - state: from queuing the edit until the clicker reflects it (handlers
+      call into the clicker synchronously, so this includes queueing delay
+      and the handler itself);
+    - render: until Tk has redrawn the window and the X server has answered
+      a round trip, so the drawing requests have been processed.
+
+    Everything except the click thread runs on the Tk thread, from the
+    mainloop.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        scenarios: tuple[Scenario, ...] = SCENARIOS,
+        seconds: float = DEFAULT_SECONDS,
+        period: float = DEFAULT_EVENT_PERIOD,
+    ) -> None:
+        """
+        Initialize the ResponsivenessHarness.
+
+        Args:
+            app (Any): MCClickerApp whose clicker has a fast, side-effect-free backend.
+            scenarios (tuple[Scenario, ...]): Edits to cycle through.
+            seconds (float): Length of each phase.
+            period (float): Seconds between edits in the active phase.
+        """
+        self.app = app
+        self.root = app.root
+        self.scenarios = scenarios
+        self.seconds = seconds
+        self.period = period
+        self.state_latencies: dict[str, list[float]] = {s.name: [] for s in scenarios}
+        self.render_latencies: dict[str, list[float]] = {s.name: [] for s in scenarios}
+        self.failures: dict[str, int] = {s.name: 0 for s in scenarios}
+        self.snapshots: list[StatsSnapshot] = []
+        self._events = 0
+        self._deadline = 0.0
+
+    def run(self) -> dict[str, Any]:
+        """
+        Run both phases inside the Tk mainloop.
+
+        Returns:
+            dict[str, Any]: JSON-serializable report.
+        """
+        self.app.clicker.start()
+        self.root.after(int(WARMUP * 1000), self._begin_quiet)
+        self.root.mainloop()
+        self.app.clicker.stop()
+        return self.report()
+
+    def _snapshot(self) -> None:
+        """Record the click counters."""
+        self.snapshots.append(take_snapshot(self.app.clicker.stats))
+
+    def _begin_quiet(self) -> None:
+        """Start measuring with no scripted activity."""
+        self._snapshot()
+        self.root.after(int(self.seconds * 1000), self._begin_active)
+
+    def _begin_active(self) -> None:
+        """Close the quiet phase and start scripted edits."""
+        self._snapshot()
+        self._deadline = time.perf_counter() + self.seconds
+        self._inject()
+
+    def _inject(self) -> None:
+        """Queue the next edit, then schedule the one after it."""
+        if time.perf_counter() >= self._deadline:
+            self._snapshot()
+            self.root.after(int(SETTLE * 1000), self.root.quit)
+            return
+        scenario = self.scenarios[self._events % len(self.scenarios)]
+        value = scenario.values[(self._events // len(self.scenarios)) % 2]
+        self._events += 1
+        queued = time.perf_counter()
+        self.root.after(0, lambda: self._apply(scenario, value, queued))
+        self.root.after(int(self.period * 1000), self._inject)
+
+    def _apply(self, scenario: Scenario, value: str, queued: float) -> None:
+        """Make one edit and time its effect on the clicker."""
+        scenario.inject(self.app, value)
+        applied = time.perf_counter()
+        if scenario.effect(self.app, value):
+            self.state_latencies[scenario.name].append(applied - queued)
+        else:
+            self.failures[scenario.name] += 1
+        # Redraws were scheduled as idle handlers by the edit; this one runs after them
+        self.root.after_idle(lambda: self._rendered(scenario.name, queued))
+
+    def _rendered(self, name: str, queued: float) -> None:
+        """Time the redraw, including an X server round trip."""
+        self.root.winfo_pointerxy()
+        self.render_latencies[name].append(time.perf_counter() - queued)
+
+    def report(self) -> dict[str, Any]:
+        """
+        Summarize the latencies and the click timing of both phases.
+
+        Returns:
+            dict[str, Any]: JSON-serializable report.
+        """
+        quiet = timing_between(self.snapshots[0], self.snapshots[1]) if len(self.snapshots) >= 2 else None
+        active = timing_between(self.snapshots[1], self.snapshots[2]) if len(self.snapshots) >= 3 else None
+        disturbance = None
+        if quiet and active and quiet["mean_error_ms"] is not None and active["mean_error_ms"] is not None:
+            disturbance = {
+                "mean_error_increase_ms": active["mean_error_ms"] - quiet["mean_error_ms"],
+                "extra_missed_deadlines": active["missed_deadlines"] - quiet["missed_deadlines"],
+            }
+        return {
+            "events": self._events,
+            "period_s": self.period,
+            "scenarios": {
+                name: {
+                    "state_latency_ms": latency_summary(self.state_latencies[name]),
+                    "render_latency_ms": latency_summary(self.render_latencies[name]),
+                    "failed": self.failures[name],
+                }
+                for name in self.state_latencies
+            },
+            "click_timing": {"quiet": quiet, "active": active},
+            "disturbance": disturbance,
+        }
+
+
+def run_harness(
+    cps: float = DEFAULT_CPS,
+    seconds: float = DEFAULT_SECONDS,
+    period: float = DEFAULT_EVENT_PERIOD,
+) -> dict[str, Any]:
+    """
+    Start MCClickerApp against throwaway settings and run the harness on it.
+
+    The app gets a NullMouse instead of a real backend and no keyboard
+    hook, so nothing outside the window is clicked or hooked.
+
+    Args:
+        cps (float): Clicking rate while measuring.
+        seconds (float): Length of each phase.
+        period (float): Seconds between edits in the active phase.
+
+    Returns:
+        dict[str, Any]: JSON-serializable report.
+    """
+    import tkinter as tk
+
+    import src.main as app_module
+
+    class HarnessApp(app_module.MCClickerApp):
+        """MCClickerApp with a counting backend and no keyboard hook."""
+
+        def warm_up(self) -> None:
+            """Install the NullMouse."""
+            self.clicker.set_mouse(NullMouse())
+
+    saved = app_module.CONFIG_FILE, app_module.SESSION_LOG_FILE
+    with tempfile.TemporaryDirectory() as directory:
+        app_module.CONFIG_FILE = os.path.join(directory, "config.json")
+        app_module.SESSION_LOG_FILE = os.path.join(directory, "sessions.log")
+        try:
+            app = HarnessApp(tk.Tk())
+            app.warmup_thread.join()
+            app.cps_var.set(f"{cps:.1f}")
+            app.on_cps_change()
+            report = ResponsivenessHarness(app, seconds=seconds, period=period).run()
+            app.exit_app()
+        finally:
+            app_module.CONFIG_FILE, app_module.SESSION_LOG_FILE = saved
+    return {"display": os.environ.get("DISPLAY"), "cps": cps, "seconds_per_phase": seconds, **report}
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point: print a JSON responsiveness report."""
+    parser = argparse.ArgumentParser(description="Measure GUI input-to-effect latency while clicking.")
+    parser.add_argument("--cps", type=float, default=DEFAULT_CPS)
+    parser.add_argument("--seconds", type=float, default=DEFAULT_SECONDS)
+    parser.add_argument("--period", type=float, default=DEFAULT_EVENT_PERIOD, help="seconds between edits")
+    parser.add_argument("--xvfb", action="store_true", help="start a private Xvfb display")
+    parser.add_argument("--output", help="write the report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    xvfb = start_xvfb() if args.xvfb else None
+    try:
+        report = run_harness(args.cps, args.seconds, args.period)
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
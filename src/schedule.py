@@ -0,0 +1,193 @@
+"""Precomputed, humanized click interval schedules for MC Clicker."""
+
+import math
+import random
+import threading
+from array import array
+from typing import Literal
+
+from src.cadence import Cadence
+
+try:
+    import numpy as np
+except ImportError:  # Optional: batches are then generated with the random module
+    np = None
+
+DEFAULT_BATCH_SIZE = 4096  # Intervals per buffer; one refill per this many clicks
+MIN_FRACTION = 0.1  # Normal draws are clipped to this fraction of the mean, so intervals stay positive
+
+Kind = Literal["normal", "lognormal", "empirical"]
+
+
+class IntervalSchedule:
+    """
+    Serves random click intervals from precomputed batches.
+
+    Two buffers alternate: the click loop reads one with a plain index while a
+    background thread refills the other, so a draw costs one array lookup. Use
+    the instance itself as AutoClicker's interval sampler.
+    """
+
+    def __init__(
+        self,
+        kind: Kind,
+        mean: float = 0.1,
+        stdev: float = 0.0,
+        cadence: Cadence | None = None,
+        seed: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """
+        Initialize the IntervalSchedule.
+
+        Args:
+            kind (Kind): "normal" or "lognormal" around mean/stdev, or "empirical" from a cadence.
+            mean (float): Mean interval in seconds; taken from the cadence for "empirical".
+            stdev (float): Standard deviation of the interval in seconds.
+            cadence (Cadence | None): Measured distribution, required for "empirical".
+            seed (int | None): Seed for a reproducible sequence.
+            batch_size (int): Intervals generated per refill.
+
+        Raises:
+            ValueError: If the parameters do not describe a valid distribution.
+        """
+        if kind not in ("normal", "lognormal", "empirical"):
+            raise ValueError(f"Invalid distribution: {kind}")
+        if kind == "empirical" and cadence is None:
+            raise ValueError("Empirical schedules need a cadence")
+        if kind != "empirical" and (mean <= 0 or stdev < 0):
+            raise ValueError("Mean must be positive and stdev non-negative")
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+        self.kind = kind
+        self.mean = cadence.mean() if kind == "empirical" else mean  # Mean of the intervals served
+        self.stdev = stdev
+        self.cadence = cadence
+        self.batch_size = batch_size
+        self.drawn: int = 0  # Intervals handed out
+        self.refills: int = 0
+        self.stalls: int = 0  # Swaps that had to wait for the refill thread
+        self._rng = np.random.default_rng(seed) if np is not None else random.Random(seed)
+        self._current = array("d", bytes(8 * batch_size))
+        self._spare = array("d", bytes(8 * batch_size))
+        self._fill(self._current)
+        self._pos = 0
+        self._ready = threading.Event()  # Spare buffer holds fresh intervals
+        self._refill = threading.Event()  # Spare buffer was handed back for refilling
+        self._closed = False
+        self._refill_thread = threading.Thread(target=self._refill_loop, daemon=True)
+        self._refill.set()
+        self._refill_thread.start()
+
+    @classmethod
+    def empirical(cls, cadence: Cadence, seed: int | None = None) -> "IntervalSchedule":
+        """
+        Create a schedule that reproduces a measured cadence.
+
+        Args:
+            cadence (Cadence): Measured interval distribution.
+            seed (int | None): Seed for a reproducible sequence.
+
+        Returns:
+            IntervalSchedule: The schedule.
+        """
+        return cls("empirical", cadence=cadence, seed=seed)
+
+    def __call__(self) -> float:
+        """
+        Draw the next interval.
+
+        Returns:
+            float: Interval in seconds.
+        """
+        i = self._pos
+        if i == self.batch_size:
+            self._swap()
+            i = 0
+        self._pos = i + 1
+        self.drawn += 1
+        return self._current[i]
+
+    def close(self) -> None:
+        """Stop the refill thread."""
+        self._closed = True
+        self._refill.set()
+
+    def _swap(self) -> None:
+        """Switch to the refilled buffer and hand the used one back to the refill thread."""
+        if not self._ready.is_set():
+            self.stalls += 1
+            while not self._ready.wait(0.01):
+                if not self._refill_thread.is_alive():  # Closed: refill here instead
+                    self._fill(self._spare)
+                    break
+        self._ready.clear()
+        self._current, self._spare = self._spare, self._current
+        self._refill.set()
+
+    def _refill_loop(self) -> None:
+        """Fill the spare buffer whenever it is handed back."""
+        while True:
+            self._refill.wait()
+            self._refill.clear()
+            if self._closed:
+                return
+            self._fill(self._spare)
+            self._ready.set()
+
+    def _fill(self, buffer: array) -> None:
+        """
+        Generate one batch of intervals into a buffer in place.
+
+        Args:
+            buffer (array): Buffer of batch_size doubles.
+        """
+        self.refills += 1
+        rng = self._rng
+        if np is not None:
+            # A view of the array's memory: the batch is generated in place
+            out = np.frombuffer(buffer, dtype=np.float64)
+            if self.kind == "normal":
+                rng.standard_normal(out=out)
+                out *= self.stdev
+                out += self.mean
+                np.maximum(out, self.mean * MIN_FRACTION, out=out)
+            elif self.kind == "lognormal":
+                mu, sigma = _lognormal_params(self.mean, self.stdev)
+                rng.standard_normal(out=out)
+                out *= sigma
+                out += mu
+                np.exp(out, out=out)
+            else:
+                rng.random(out=out)
+                out[:] = np.interp(out, self.cadence.probs, self.cadence.intervals)
+            return
+
+        n = self.batch_size
+        if self.kind == "normal":
+            floor = self.mean * MIN_FRACTION
+            for i in range(n):
+                buffer[i] = max(floor, rng.gauss(self.mean, self.stdev))
+        elif self.kind == "lognormal":
+            mu, sigma = _lognormal_params(self.mean, self.stdev)
+            for i in range(n):
+                buffer[i] = rng.lognormvariate(mu, sigma)
+        else:
+            sample = self.cadence.sample
+            for i in range(n):
+                buffer[i] = sample(rng.random())
+
+
+def _lognormal_params(mean: float, stdev: float) -> tuple[float, float]:
+    """
+    Convert the mean and stdev of a log-normal variable to those of its logarithm.
+
+    Args:
+        mean (float): Desired mean.
+        stdev (float): Desired standard deviation.
+
+    Returns:
+        tuple[float, float]: (mu, sigma) of the underlying normal distribution.
+    """
+    sigma2 = math.log1p((stdev / mean) ** 2)
+    return math.log(mean) - sigma2 / 2, math.sqrt(sigma2)
@@ -0,0 +1,450 @@
+"""Calendar-style click sessions for MC Clicker."""
+
+import argparse
+import ctypes
+import heapq
+import itertools
+import math
+import os
+import re
+import select
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from datetime import time as dtime
+from typing import Any, Callable, Literal, NamedTuple
+
+from src.utils import cps_to_seconds, validate_cps
+
+# From <linux/time.h> and <sys/timerfd.h>
+CLOCK_REALTIME = 0
+TFD_CLOEXEC = 0o2000000
+TFD_NONBLOCK = 0o4000
+TFD_TIMER_ABSTIME = 1
+TFD_TIMER_CANCEL_ON_SET = 2
+
+MAX_FALLBACK_SLEEP = 60.0  # Without timerfd, re-check the wall clock at least this often
+
+RULE_PATTERN = re.compile(
+    r"^\s*(\d{1,2}:\d{2})\s*-\s*(\d{1,2}:\d{2})\s+every\s+(\d+(?:\.\d+)?[smh])\s+for\s+(\d+(?:\.\d+)?[smh])"
+    r"(?:\s+at\s+(\d+(?:\.\d+)?)\s*cps)?\s*$",
+    re.IGNORECASE,
+)
+UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600}
+
+WaitResult = Literal["expired", "clock_changed", "woken"]
+
+
+class SessionRule(NamedTuple):
+    """Sessions of `length` seconds starting every `every` seconds inside a daily window."""
+
+    start: dtime  # Window start, local time
+    end: dtime  # Window end; at or before start means the window runs past midnight
+    every: float  # Seconds between session starts
+    length: float  # Seconds per session, cut short at the window end
+    cps: float | None = None  # Rate to click at, None to keep the current one
+
+
+def _parse_duration(text: str) -> float:
+    """Convert '20m', '1.5h' or '30s' to seconds."""
+    return float(text[:-1]) * UNIT_SECONDS[text[-1].lower()]
+
+
+def parse_rule(text: str) -> SessionRule:
+    """
+    Parse a rule such as '02:00-06:00 every 60m for 20m' or '... at 12 cps'.
+
+    Args:
+        text (str): Rule in the form 'HH:MM-HH:MM every N[smh] for N[smh] [at N cps]'.
+
+    Returns:
+        SessionRule: The parsed rule.
+
+    Raises:
+        ValueError: If the text is malformed or describes an empty schedule.
+    """
+    match = RULE_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f"Invalid schedule rule: {text!r}")
+    start, end, every, length, cps = match.groups()
+    try:
+        rule = SessionRule(
+            dtime.fromisoformat(start.zfill(5)),
+            dtime.fromisoformat(end.zfill(5)),
+            _parse_duration(every),
+            _parse_duration(length),
+            float(cps) if cps is not None else None,
+        )
+    except ValueError:
+        raise ValueError(f"Invalid time in schedule rule: {text!r}") from None
+    if rule.every <= 0 or rule.length <= 0:
+        raise ValueError(f"Interval and length must be positive: {text!r}")
+    if rule.cps is not None and not validate_cps(rule.cps):
+        raise ValueError(f"Invalid CPS in schedule rule: {text!r}")
+    return rule
+
+
+def next_session(rule: SessionRule, now: datetime) -> tuple[datetime, datetime]:
+    """
+    Find the session in progress at `now`, or else the next one.
+
+    Args:
+        rule (SessionRule): Rule to expand.
+        now (datetime): Naive local time.
+
+    Returns:
+        tuple[datetime, datetime]: Session start and stop; start may be before `now`.
+    """
+    day = now.date() - timedelta(days=1)  # Yesterday's window may run past midnight
+    while True:
+        window_start = datetime.combine(day, rule.start)
+        window_end = datetime.combine(day, rule.end)
+        if window_end <= window_start:
+            window_end += timedelta(days=1)
+        k = max(0, math.floor((now - window_start).total_seconds() / rule.every))
+        while True:
+            start = window_start + timedelta(seconds=k * rule.every)
+            if start >= window_end:
+                break
+            stop = min(start + timedelta(seconds=rule.length), window_end)
+            if stop > now:
+                return start, stop
+            k += 1
+        day += timedelta(days=1)
+
+
+class TimerFd:
+    """
+    Sleeps until a wall-clock time with a Linux timerfd.
+
+    The timer is armed on CLOCK_REALTIME with an absolute expiry, so it
+    fires at the right local time after suspend/resume, and with
+    TFD_TIMER_CANCEL_ON_SET, so setting the clock wakes the sleeper to
+    reschedule. Nothing wakes it in between.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the TimerFd.
+
+        Raises:
+            OSError: If timerfd or eventfd is unavailable (not Linux).
+        """
+        if not hasattr(os, "eventfd"):
+            raise OSError("eventfd is not available")
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._create = libc.timerfd_create
+        self._settime = libc.timerfd_settime
+        self.fd = self._create(CLOCK_REALTIME, TFD_CLOEXEC | TFD_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "timerfd_create failed")
+        self._wake_fd = os.eventfd(0, os.EFD_CLOEXEC | os.EFD_NONBLOCK)
+
+    def _arm(self, when: float | None) -> None:
+        """Set the absolute expiry, or disarm the timer for None."""
+        seconds, nanoseconds = 0, 0
+        if when is not None:
+            when = max(when, 1e-9)  # All zeros would disarm it
+            seconds = int(when)
+            nanoseconds = int((when - seconds) * 1e9)
+        # struct itimerspec: it_interval (zero: one-shot), then it_value
+        spec = (ctypes.c_long * 4)(0, 0, seconds, nanoseconds)
+        if self._settime(self.fd, TFD_TIMER_ABSTIME | TFD_TIMER_CANCEL_ON_SET, spec, None) < 0:
+            raise OSError(ctypes.get_errno(), "timerfd_settime failed")
+
+    def wait_until(self, when: float | None) -> WaitResult:
+        """
+        Block until a Unix time, a clock change or wake().
+
+        Args:
+            when (float | None): Unix time to wake at; None to wait for wake() only.
+
+        Returns:
+            WaitResult: Why the wait ended.
+        """
+        self._arm(when)
+        ready, _, _ = select.select([self.fd, self._wake_fd], [], [])
+        if self._wake_fd in ready:
+            os.eventfd_read(self._wake_fd)
+            return "woken"
+        try:
+            os.read(self.fd, 8)
+        except BlockingIOError:
+            return "woken"
+        except OSError:  # ECANCELED: the clock was set
+            return "clock_changed"
+        return "expired"
+
+    def wake(self) -> None:
+        """Cut the current (or next) wait short."""
+        os.eventfd_write(self._wake_fd, 1)
+
+    def close(self) -> None:
+        """Close the descriptors."""
+        os.close(self.fd)
+        os.close(self._wake_fd)
+
+
+class EventTimer:
+    """
+    Portable fallback for TimerFd.
+
+    Waits on a monotonic clock, which may not advance during suspend and
+    does not see clock changes, so long waits are cut into pieces of at
+    most MAX_FALLBACK_SLEEP and the caller re-checks the wall clock.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        """
+        Initialize the EventTimer.
+
+        Args:
+            clock (Callable[[], float]): Wall clock in Unix seconds.
+        """
+        self.clock = clock
+        self._wake = threading.Event()
+
+    def wait_until(self, when: float | None) -> WaitResult:
+        """
+        Block until a Unix time or wake().
+
+        Args:
+            when (float | None): Unix time to wake at; None to wait for wake() only.
+
+        Returns:
+            WaitResult: Why the wait ended; "clock_changed" after a partial wait.
+        """
+        timeout = None if when is None else max(0.0, when - self.clock())
+        if timeout is not None and timeout > MAX_FALLBACK_SLEEP:
+            if self._wake.wait(MAX_FALLBACK_SLEEP):
+                self._wake.clear()
+                return "woken"
+            return "clock_changed"
+        if self._wake.wait(timeout):
+            self._wake.clear()
+            return "woken"
+        return "expired"
+
+    def wake(self) -> None:
+        """Cut the current (or next) wait short."""
+        self._wake.set()
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+def create_timer() -> Any:
+    """
+    Create the best available wall-clock timer.
+
+    Returns:
+        Any: A TimerFd on Linux, otherwise an EventTimer.
+    """
+    try:
+        return TimerFd()
+    except (OSError, AttributeError):
+        return EventTimer()
+
+
+class SessionScheduler:
+    """
+    Starts and stops an AutoClicker according to session rules.
+
+    Upcoming start and stop events sit in a priority queue ordered by wall
+    time. The scheduler thread sleeps until exactly the earliest one and
+    wakes for nothing else, except a clock change or a rule change. Both of
+    those rebuild the queue from the current time. A session missed
+    entirely (e.g. while suspended) is skipped; one still in progress is
+    joined for its remaining time.
+    """
+
+    def __init__(
+        self,
+        clicker: Any,
+        rules: list[SessionRule],
+        timer: Any = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the SessionScheduler.
+
+        Args:
+            clicker (Any): AutoClicker to drive.
+            rules (list[SessionRule]): Sessions to run.
+            timer (Any): Object with wait_until/wake/close; defaults to create_timer().
+            clock (Callable[[], float]): Wall clock in Unix seconds.
+        """
+        self.clicker = clicker
+        self.rules = list(rules)  # Only the scheduler thread replaces these, in _rebuild()
+        self.timer = timer if timer is not None else create_timer()
+        self.clock = clock
+        self.is_running: bool = False
+        self.wakeups: int = 0  # Times the scheduler thread woke up
+        self.sessions_started: int = 0
+        self.active: set[int] = set()  # Indexes of rules whose session is in progress
+        self._saved_interval: float | None = None  # Clicker's own interval while a rule's rate is applied
+        self._applied_interval: float | None = None  # Interval the scheduler set last
+        self._heap: list[tuple[float, int, str, int]] = []  # (Unix time, seq, "start"/"stop", rule index)
+        self._seq = itertools.count()
+        self._rules_lock = threading.Lock()  # Guards _pending_rules
+        self._pending_rules: list[SessionRule] | None = None  # Set by set_rules(), taken by _rebuild()
+        self._thread: threading.Thread | None = None
+
+    def set_rules(self, rules: list[SessionRule]) -> None:
+        """
+        Replace the rules; a running scheduler reschedules immediately.
+
+        The scheduler thread swaps them in between events, so an event
+        queued for an old rule never looks up a new one.
+
+        Args:
+            rules (list[SessionRule]): New rules.
+        """
+        with self._rules_lock:
+            self._pending_rules = list(rules)
+        self.timer.wake()
+
+    def next_event(self) -> tuple[float, str] | None:
+        """
+        Get the earliest pending event.
+
+        Returns:
+            tuple[float, str] | None: (Unix time, "start" or "stop"), or None if nothing is scheduled.
+        """
+        heap = self._heap
+        return (heap[0][0], heap[0][2]) if heap else None
+
+    def start(self) -> None:
+        """Start following the rules."""
+        if self.is_running:
+            return
+        self.is_running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop following the rules, ending any session the scheduler started."""
+        self.is_running = False
+        self.timer.wake()
+        if self._thread:
+            self._thread.join(timeout=1)
+        if self.active:
+            self.active.clear()
+            self._end_session()
+
+    def close(self) -> None:
+        """Stop and release the timer."""
+        self.stop()
+        self.timer.close()
+
+    def _push(self, when: float, kind: str, index: int) -> None:
+        """Queue one event."""
+        heapq.heappush(self._heap, (when, next(self._seq), kind, index))
+
+    def _schedule_rule(self, index: int, now: float) -> bool:
+        """
+        Queue a rule's next event.
+
+        Returns:
+            bool: True if one of its sessions is in progress at `now` (its stop was queued).
+        """
+        start, stop = next_session(self.rules[index], datetime.fromtimestamp(now))
+        if start.timestamp() <= now:
+            self._push(stop.timestamp(), "stop", index)
+            return True
+        self._push(start.timestamp(), "start", index)
+        return False
+
+    def _begin(self, index: int) -> None:
+        """Apply a rule's settings and make sure the clicker runs."""
+        cps = self.rules[index].cps
+        if cps is not None:
+            if self._saved_interval is None:
+                self._saved_interval = self.clicker.interval
+            self._applied_interval = cps_to_seconds(cps)
+            self.clicker.set_interval(self._applied_interval)
+        if not self.active:
+            self.clicker.start()
+            self.sessions_started += 1
+        self.active.add(index)
+
+    def _end_session(self) -> None:
+        """Stop the clicker and give it back the interval it had before the session's rate."""
+        self.clicker.stop()
+        saved, self._saved_interval = self._saved_interval, None
+        # Left alone if the user typed a new rate during the session
+        if saved is not None and self.clicker.interval == self._applied_interval:
+            self.clicker.set_interval(saved)
+        self._applied_interval = None
+
+    def _rebuild(self, now: float) -> None:
+        """Recompute every rule's next event from the current time, keeping sessions in progress running."""
+        with self._rules_lock:
+            if self._pending_rules is not None:
+                self.rules, self._pending_rules = self._pending_rules, None
+        self._heap.clear()
+        in_progress = [index for index in range(len(self.rules)) if self._schedule_rule(index, now)]
+        if self.active and not in_progress:
+            self._end_session()
+        self.active = {index for index in self.active if index in in_progress}
+        for index in in_progress:
+            self._begin(index)
+
+    def _fire(self, kind: str, index: int, now: float) -> None:
+        """Handle one due event."""
+        if kind == "start":
+            # Re-check against the clock: a session that ended while suspended is skipped
+            if self._schedule_rule(index, now):
+                self._begin(index)
+        else:
+            self.active.discard(index)
+            if not self.active:
+                self._end_session()
+            self._schedule_rule(index, now)
+
+    def _loop(self) -> None:
+        """Scheduler thread: sleep until the next event, fire it, repeat."""
+        self._rebuild(self.clock())
+        while self.is_running:
+            result = self.timer.wait_until(self._heap[0][0] if self._heap else None)
+            self.wakeups += 1
+            if not self.is_running:
+                break
+            now = self.clock()
+            if result == "clock_changed" or self._pending_rules is not None:
+                self._rebuild(now)
+                continue
+            while self._heap and self._heap[0][0] <= now:
+                _, _, kind, index = heapq.heappop(self._heap)
+                self._fire(kind, index, now)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point: click on a schedule until interrupted."""
+    parser = argparse.ArgumentParser(description="Click in sessions at set times of day.")
+    parser.add_argument("rules", nargs="+", metavar="RULE", help="e.g. '02:00-06:00 every 60m for 20m at 12 cps'")
+    args = parser.parse_args(argv)
+    try:
+        rules = [parse_rule(text) for text in args.rules]
+    except ValueError as e:
+        parser.error(str(e))
+
+    from src.clicker import AutoClicker
+
+    scheduler = SessionScheduler(AutoClicker(), rules)
+    scheduler.start()
+    try:
+        while True:
+            event = scheduler.next_event()
+            if event is not None:
+                print(f"Next {event[1]}: {datetime.fromtimestamp(event[0]):%Y-%m-%d %H:%M:%S}", file=sys.stderr)
+            time.sleep(MAX_FALLBACK_SLEEP)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.close()
+
+
+if __name__ == "__main__":
+    main()
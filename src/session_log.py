@@ -0,0 +1,300 @@
+"""Append-only binary session log for MC Clicker."""
+
+import argparse
+import mmap
+import os
+import queue
+import struct
+import threading
+from datetime import date, datetime, time as dt_time, timedelta
+
+# File header: magic, format version, record size
+HEADER = struct.Struct("<4sHH")
+MAGIC = b"MCSL"
+VERSION = 1
+
+# One session: start (epoch s), stop (epoch s), duration (s), configured CPS, clicks
+RECORD = struct.Struct("<dddfI")
+
+DEFAULT_MAX_BYTES = 1024 * 1024  # ~32k sessions per file
+DEFAULT_BACKUP_COUNT = 5
+
+_STOP = object()  # Sentinel telling the writer thread to exit
+
+
+class SessionLog:
+    """Records finished clicking sessions to a size-rotated binary log."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+    ) -> None:
+        """
+        Initialize the SessionLog.
+
+        Args:
+            path (str): Path of the active log file.
+            max_bytes (int): Size at which the active file is rotated.
+            backup_count (int): Number of rotated files to keep.
+        """
+        if max_bytes < HEADER.size + RECORD.size:
+            raise ValueError("max_bytes is too small to hold a record")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer_thread: threading.Thread | None = None
+        self._lock = threading.Lock()  # Guards writer thread startup/shutdown only
+
+    def record(
+        self,
+        start: float,
+        stop: float,
+        duration: float,
+        cps: float,
+        clicks: int,
+    ) -> None:
+        """
+        Queue a finished session for writing.
+
+        Never touches the disk; safe to call from the click thread.
+
+        Args:
+            start (float): Session start as a Unix timestamp.
+            stop (float): Session stop as a Unix timestamp.
+            duration (float): Measured session length in seconds.
+            cps (float): Configured clicks per second.
+            clicks (int): Clicks actually performed.
+        """
+        self._ensure_writer()
+        self._queue.put(RECORD.pack(start, stop, duration, cps, clicks))
+
+    def close(self) -> None:
+        """Flush queued sessions and stop the writer thread."""
+        with self._lock:
+            thread = self._writer_thread
+            self._writer_thread = None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _ensure_writer(self) -> None:
+        """Start the background writer thread if it is not running."""
+        if self._writer_thread is not None:
+            return
+        with self._lock:
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+                self._writer_thread.start()
+
+    def _writer_loop(self) -> None:
+        """Drain the queue to disk, batching whatever is pending."""
+        while True:
+            item = self._queue.get()
+            batch = []
+            stopping = item is _STOP
+            if not stopping:
+                batch.append(item)
+            # Coalesce everything already queued into one write
+            while not stopping:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+            if batch:
+                try:
+                    self._write(b"".join(batch))
+                except OSError as e:
+                    print(f"Error writing session log {self.path}: {e}")
+            if stopping:
+                return
+
+    def _write(self, data: bytes) -> None:
+        """Append packed records, rotating first if the file would overflow."""
+        size = self._usable_size()
+        if size and size + len(data) > self.max_bytes:
+            self._rotate()
+            size = 0
+        with open(self.path, "ab" if size else "wb") as f:
+            if size == 0:
+                f.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            f.write(data)
+
+    def _usable_size(self) -> int:
+        """
+        Check the active file before appending to it.
+
+        A partial trailing record left by a crash is cut off so new records
+        stay aligned, and a file with an unrecognized header is rotated away.
+
+        Returns:
+            int: Size of the valid part of the file; 0 if it must be started over.
+        """
+        if not os.path.exists(self.path):
+            return 0
+        size = os.path.getsize(self.path)
+        if size < HEADER.size:
+            return 0  # Empty, or the header itself was torn
+        with open(self.path, "rb") as f:
+            header = HEADER.unpack(f.read(HEADER.size))
+        if header != (MAGIC, VERSION, RECORD.size):
+            print(f"Rotating away unrecognized session log {self.path}")
+            self._rotate()
+            return 0
+        whole = HEADER.size + (size - HEADER.size) // RECORD.size * RECORD.size
+        if whole != size:
+            os.truncate(self.path, whole)
+        return whole
+
+    def _rotate(self) -> None:
+        """Shift log.N -> log.N+1 and move the active file to log.1."""
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+def log_files(path: str) -> list[str]:
+    """
+    List existing log files for a log path, oldest first.
+
+    Args:
+        path (str): Path of the active log file.
+
+    Returns:
+        list[str]: Rotated files followed by the active file.
+    """
+    files = []
+    i = 1
+    while os.path.exists(f"{path}.{i}"):
+        files.append(f"{path}.{i}")
+        i += 1
+    files.reverse()
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def iter_sessions(path: str):
+    """
+    Iterate over every session in a log and its rotated files.
+
+    The files are memory-mapped, and a trailing partial record left by a crash
+    is ignored.
+
+    Args:
+        path (str): Path of the active log file.
+
+    Yields:
+        tuple[float, float, float, float, int]: (start, stop, duration, cps, clicks).
+    """
+    for file_path in log_files(path):
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                continue
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, version, record_size = HEADER.unpack_from(mm, 0)
+                if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+                    print(f"Skipping unrecognized session log {file_path}")
+                    continue
+                count = (size - HEADER.size) // RECORD.size
+                end = HEADER.size + count * RECORD.size
+                with memoryview(mm) as view, view[HEADER.size:end] as records:
+                    yield from RECORD.iter_unpack(records)
+
+
+def summarize(path: str, since: float | None = None, bin_width: float = 1.0) -> dict:
+    """
+    Compute aggregate statistics over a session log.
+
+    Args:
+        path (str): Path of the active log file.
+        since (float | None): Only include sessions starting at or after this Unix timestamp.
+        bin_width (float): Width in CPS of each achieved-rate histogram bin.
+
+    Returns:
+        dict: Totals, clicks per local day, and a histogram of achieved CPS
+        keyed by each bin's lower edge.
+    """
+    if bin_width <= 0:
+        raise ValueError("bin_width must be greater than 0")
+
+    sessions = 0
+    total_clicks = 0
+    total_duration = 0.0
+    per_day: dict[str, int] = {}
+    histogram: dict[float, int] = {}
+
+    # Sessions are appended in time order, so the day of the previous record
+    # almost always matches; only recompute the local day when we leave it.
+    day_start = day_end = 0.0
+    day_key = ""
+
+    for start, _stop, duration, _cps, clicks in iter_sessions(path):
+        if since is not None and start < since:
+            continue
+        sessions += 1
+        total_clicks += clicks
+        total_duration += duration
+
+        if not day_start <= start < day_end:
+            day = datetime.fromtimestamp(start).date()
+            day_key = day.isoformat()
+            day_start = datetime.combine(day, dt_time.min).timestamp()
+            day_end = datetime.combine(day + timedelta(days=1), dt_time.min).timestamp()
+        per_day[day_key] = per_day.get(day_key, 0) + clicks
+
+        if duration > 0:
+            rate_bin = (clicks / duration) // bin_width * bin_width
+            histogram[rate_bin] = histogram.get(rate_bin, 0) + 1
+
+    return {
+        "sessions": sessions,
+        "total_clicks": total_clicks,
+        "total_duration": total_duration,
+        "per_day": per_day,
+        "rate_histogram": dict(sorted(histogram.items())),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point: print statistics for a session log."""
+    from src.utils import format_time_display
+
+    parser = argparse.ArgumentParser(description="Show MC Clicker session history.")
+    parser.add_argument("path", nargs="?", default=os.path.join(os.path.dirname(__file__), "sessions.log"))
+    parser.add_argument("--days", type=int, default=None, help="only the last N days")
+    parser.add_argument("--bin", type=float, default=1.0, help="CPS histogram bin width")
+    args = parser.parse_args(argv)
+
+    since = None
+    if args.days is not None:
+        since = datetime.combine(date.today() - timedelta(days=args.days - 1), dt_time.min).timestamp()
+
+    stats = summarize(args.path, since=since, bin_width=args.bin)
+    print(f"Sessions: {stats['sessions']}")
+    print(f"Clicks:   {stats['total_clicks']}")
+    print(f"Time:     {format_time_display(stats['total_duration'])}")
+    if stats["per_day"]:
+        print("\nClicks per day:")
+        for day, clicks in stats["per_day"].items():
+            print(f"  {day}  {clicks}")
+    if stats["rate_histogram"]:
+        print("\nAchieved CPS:")
+        for rate_bin, count in stats["rate_histogram"].items():
+            print(f"  {rate_bin:6.1f}+  {count}")
+
+
+if __name__ == "__main__":
+    main()
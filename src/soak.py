@@ -0,0 +1,298 @@
+"""Soak test for long sessions: resource growth under endless start/stop and settings churn."""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, NamedTuple
+
+from src.backends import NullMouse
+from src.clicker import AutoClicker
+from src.schedule import IntervalSchedule
+
+DEFAULT_CYCLES = 1_000_000
+DEFAULT_SAMPLES = 50  # Points in the time series
+DEFAULT_RUN_SECONDS = 0.05  # Length of the occasional long run
+LONG_RUN_EVERY = 1000  # Cycles between long runs
+WARMUP_FRACTION = 0.05  # Share of cycles run before the baseline is taken
+TOP_ALLOCATORS = 10
+
+
+class Budget(NamedTuple):
+    """Growth allowed between the baseline and the end of a soak run."""
+
+    rss_kb: int = 4096
+    threads: int = 0
+    fds: int = 0
+    traced_kb: int = 512
+
+
+DEFAULT_BUDGET = Budget()
+
+
+class ResourceSample(NamedTuple):
+    """Process resources at one point of a soak run."""
+
+    t: float  # Seconds since the run started
+    cycles: int
+    rss_kb: int | None  # None where /proc is unavailable
+    threads: int
+    fds: int | None
+    traced_kb: int
+
+
+def rss_kb() -> int | None:
+    """
+    Get the resident set size of this process.
+
+    Returns:
+        int | None: RSS in KiB, or None without /proc.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def open_fds() -> int | None:
+    """
+    Count this process's open file descriptors.
+
+    Returns:
+        int | None: Open descriptors, or None without /proc.
+    """
+    try:
+        return len(os.listdir("/proc/self/fd")) - 1  # Minus the one listdir itself holds
+    except OSError:
+        return None
+
+
+def take_sample(started: float, cycles: int) -> ResourceSample:
+    """
+    Measure the process's resources now.
+
+    Args:
+        started (float): perf_counter() when the run started.
+        cycles (int): Cycles done so far.
+
+    Returns:
+        ResourceSample: The measurement.
+    """
+    return ResourceSample(
+        t=time.perf_counter() - started,
+        cycles=cycles,
+        rss_kb=rss_kb(),
+        threads=threading.active_count(),
+        fds=open_fds(),
+        traced_kb=tracemalloc.get_traced_memory()[0] // 1024 if tracemalloc.is_tracing() else 0,
+    )
+
+
+def check_growth(baseline: ResourceSample, final: ResourceSample, budget: Budget) -> list[str]:
+    """
+    Compare the end of a run against its baseline.
+
+    Args:
+        baseline (ResourceSample): Sample taken after warm-up.
+        final (ResourceSample): Sample taken after the last cycle, once everything stopped.
+        budget (Budget): Allowed growth.
+
+    Returns:
+        list[str]: One message per resource that grew beyond its budget; empty if none did.
+    """
+    failures = []
+    for name in Budget._fields:
+        before, after = getattr(baseline, name), getattr(final, name)
+        if before is None or after is None:
+            continue
+        allowed = getattr(budget, name)
+        if after - before > allowed:
+            failures.append(f"{name} grew by {after - before} (budget {allowed}): {before} -> {after}")
+    return failures
+
+
+class SoakTest:
+    """
+    Drives an AutoClicker through many random start/stop/set_* cycles.
+
+    Runs against a NullMouse, with an occasional long run at a high rate,
+    and samples RSS, thread count, open descriptors and tracemalloc
+    throughout. The run fails if any of them ends higher than the baseline
+    taken after warm-up by more than the budget.
+    """
+
+    def __init__(
+        self,
+        cycles: int = DEFAULT_CYCLES,
+        samples: int = DEFAULT_SAMPLES,
+        budget: Budget = DEFAULT_BUDGET,
+        run_seconds: float = DEFAULT_RUN_SECONDS,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Initialize the SoakTest.
+
+        Args:
+            cycles (int): Operations to perform.
+            samples (int): Resource samples to take across the run.
+            budget (Budget): Allowed growth.
+            run_seconds (float): Length of each long run.
+            seed (int | None): Seed for a reproducible operation sequence.
+        """
+        if cycles < 1 or samples < 1:
+            raise ValueError("Cycles and samples must be at least 1")
+        self.cycles = cycles
+        self.samples = samples
+        self.budget = budget
+        self.run_seconds = run_seconds
+        self.rng = random.Random(seed)
+        self.mouse = NullMouse()
+        self.clicker = AutoClicker(mouse=self.mouse)
+        self.operations: list[Callable[[], None]] = [
+            self.toggle,
+            self.toggle,
+            self.toggle,
+            lambda: self.clicker.set_interval(self.rng.choice((0.0005, 0.001, 0.01))),
+            lambda: self.clicker.set_button(self.rng.choice(("left", "right"))),
+            lambda: self.clicker.set_mode(self.rng.choice(("click", "click", "hold"))),
+            lambda: self.clicker.set_duration(self.rng.choice((None, 0.001, 10.0))),
+            lambda: self.clicker.set_click_limit(self.rng.choice((None, 1, 1000))),
+            self.swap_sampler,
+            self.pause_or_resume,
+        ]
+
+    def toggle(self) -> None:
+        """Start the clicker if stopped, stop it if running."""
+        if self.clicker.is_running:
+            self.clicker.stop()
+        else:
+            self.clicker.start()
+
+    def swap_sampler(self) -> None:
+        """Replace the interval sampler, which starts or stops a refill thread."""
+        if self.rng.random() < 0.5:
+            self.clicker.set_interval_sampler(None)
+        else:
+            self.clicker.set_interval_sampler(IntervalSchedule("normal", 0.001, 0.0002, batch_size=64))
+
+    def pause_or_resume(self) -> None:
+        """Pause the clicker if clicking, resume it if paused."""
+        if self.clicker.is_paused:
+            self.clicker.resume()
+        else:
+            self.clicker.pause()
+
+    def long_run(self) -> None:
+        """Click continuously at a high rate for a while."""
+        clicker = self.clicker
+        clicker.stop()
+        clicker.resume()
+        clicker.apply_settings(0.0005, "left", "click", None)
+        clicker.set_click_limit(None)
+        clicker.start()
+        time.sleep(self.run_seconds)
+        clicker.stop()
+
+    def quiesce(self) -> None:
+        """Stop everything the cycles started, so only leaks remain."""
+        self.clicker.stop()
+        self.clicker.resume()
+        self.clicker.set_interval_sampler(None)
+        gc.collect()
+
+    def run(self) -> dict[str, Any]:
+        """
+        Run the soak test.
+
+        Returns:
+            dict[str, Any]: Report with the resource time series, growth
+            against the baseline, top allocators by growth, and the verdict.
+        """
+        owns_tracing = not tracemalloc.is_tracing()
+        if owns_tracing:
+            tracemalloc.start()
+        try:
+            return self._run()
+        finally:
+            if owns_tracing:
+                tracemalloc.stop()
+
+    def _run(self) -> dict[str, Any]:
+        """Run the cycles with tracemalloc active."""
+        started = time.perf_counter()
+        warmup = max(1, int(self.cycles * WARMUP_FRACTION))
+        sample_every = max(1, self.cycles // self.samples)
+        series = []
+        baseline = None
+        snapshot = None
+        operations = self.operations
+        choice = self.rng.choice
+
+        for cycle in range(1, self.cycles + 1):
+            choice(operations)()
+            if cycle % LONG_RUN_EVERY == 0:
+                self.long_run()
+            if cycle == warmup:
+                self.quiesce()
+                baseline = take_sample(started, cycle)
+                snapshot = tracemalloc.take_snapshot()
+                series.append(baseline)
+            elif cycle % sample_every == 0:
+                series.append(take_sample(started, cycle))
+
+        self.quiesce()
+        final = take_sample(started, self.cycles)
+        series.append(final)
+        growth = tracemalloc.take_snapshot().compare_to(snapshot, "lineno")
+        failures = check_growth(baseline, final, self.budget)
+        peak_threads = max(sample.threads for sample in series)
+
+        return {
+            "cycles": self.cycles,
+            "elapsed": final.t,
+            "clicks": self.mouse.clicks,
+            "budget": self.budget._asdict(),
+            "baseline": baseline._asdict(),
+            "final": final._asdict(),
+            "peak_threads": peak_threads,
+            "samples": [sample._asdict() for sample in series],
+            "top_allocators": [str(stat) for stat in growth[:TOP_ALLOCATORS]],
+            "failures": failures,
+            "passed": not failures,
+        }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point: run a soak test, print its JSON report and exit non-zero on growth."""
+    parser = argparse.ArgumentParser(description="Detect resource leaks over many start/stop/settings cycles.")
+    parser.add_argument("--cycles", type=int, default=DEFAULT_CYCLES)
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="points in the time series")
+    parser.add_argument("--run-seconds", type=float, default=DEFAULT_RUN_SECONDS, help="length of each long run")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--rss-kb", type=int, default=DEFAULT_BUDGET.rss_kb, help="allowed RSS growth")
+    parser.add_argument("--traced-kb", type=int, default=DEFAULT_BUDGET.traced_kb, help="allowed traced heap growth")
+    parser.add_argument("--output", help="write the report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    budget = Budget(rss_kb=args.rss_kb, traced_kb=args.traced_kb)
+    report = SoakTest(args.cycles, args.samples, budget, args.run_seconds, args.seed).run()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    if not report["passed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
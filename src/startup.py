@@ -0,0 +1,78 @@
+"""Startup phase timing for MC Clicker."""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+PROFILE_ENV_VAR = "MCCLICKER_PROFILE_STARTUP"  # Set to print the phase report once startup finishes
+
+
+class StartupProfiler:
+    """Records how long each named startup phase took."""
+
+    def __init__(self, origin: float | None = None) -> None:
+        """
+        Initialize the StartupProfiler.
+
+        Args:
+            origin (float | None): perf_counter() that startup is measured from,
+                e.g. taken before the first import. Defaults to now.
+        """
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.phases: dict[str, tuple[float, float]] = {}  # name -> (start, end), seconds since origin
+        self._lock = threading.Lock()  # Background phases finish on other threads
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time the enclosed block as one phase.
+
+        Args:
+            name (str): Phase name; reusing a name overwrites it.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def record(self, name: str, start: float, end: float) -> None:
+        """
+        Record a phase measured elsewhere.
+
+        Args:
+            name (str): Phase name.
+            start (float): perf_counter() at the start of the phase.
+            end (float): perf_counter() at the end of the phase.
+        """
+        with self._lock:
+            self.phases[name] = (start - self.origin, end - self.origin)
+
+    def duration(self, name: str) -> float | None:
+        """
+        Get the length of one phase.
+
+        Args:
+            name (str): Phase name.
+
+        Returns:
+            float | None: Seconds, or None if the phase was not recorded.
+        """
+        with self._lock:
+            span = self.phases.get(name)
+        return span[1] - span[0] if span is not None else None
+
+    def report(self) -> str:
+        """
+        Format the phases in the order they started.
+
+        Returns:
+            str: One line per phase with its duration and when it ended.
+        """
+        with self._lock:
+            phases = sorted(self.phases.items(), key=lambda item: item[1][0])
+        lines = [f"{'phase':<16}{'ms':>9}{'done at':>10}"]
+        for name, (start, end) in phases:
+            lines.append(f"{name:<16}{(end - start) * 1000:>9.1f}{end * 1000:>10.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,106 @@
+"""Pre-aggregated click-engine statistics for MC Clicker."""
+
+import time
+from bisect import bisect_left
+
+# Upper bounds (seconds) of the interval-error histogram buckets; a final +Inf bucket follows
+ERROR_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1)
+
+
+class ClickStats:
+    """
+    Counters updated by the click thread and read by monitoring.
+
+    Only the click thread writes; readers take plain attribute snapshots,
+    so no locks are involved on either side.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the ClickStats."""
+        self.clicks_total: int = 0
+        self.missed_deadlines: int = 0
+        self.error_counts: list[int] = [0] * (len(ERROR_BUCKETS) + 1)
+        self.error_sum: float = 0.0
+        self.run_clicks: int = 0
+        self.run_started: float | None = None  # perf_counter() at start of current run
+        self.run_stopped: float | None = None
+        self.last_click_time: float | None = None  # perf_counter() of the latest click
+        self.last_resume_latency: float | None = None  # resume() to first click, seconds
+        self.last_pause_overrun: float | None = None  # pause() to a click made after it, seconds
+        self.transient_errors: int = 0  # Backend errors that were retried
+        self.fatal_errors: int = 0  # Backend errors that ended a run
+        self.last_error: str | None = None
+        self.last_error_time: float | None = None  # perf_counter() of last_error
+
+    def start_run(self) -> None:
+        """Reset the per-run counters at the start of a session."""
+        self.run_clicks = 0
+        self.run_stopped = None
+        self.run_started = time.perf_counter()
+
+    def stop_run(self) -> None:
+        """Mark the end of the current session."""
+        self.run_stopped = time.perf_counter()
+
+    def record_click(self, t: float, scheduled: float) -> None:
+        """
+        Count a click and its lateness.
+
+        Args:
+            t (float): perf_counter() when the click was made.
+            scheduled (float): perf_counter() the click was scheduled for.
+        """
+        error = t - scheduled
+        self.last_click_time = t
+        self.clicks_total += 1
+        self.run_clicks += 1
+        self.error_sum += error
+        self.error_counts[bisect_left(ERROR_BUCKETS, error)] += 1
+
+    def record_missed(self) -> None:
+        """Count a deadline that passed before its click could be made."""
+        self.missed_deadlines += 1
+
+    def record_error(self, error: BaseException, fatal: bool) -> None:
+        """
+        Count a backend error.
+
+        Args:
+            error (BaseException): The exception raised.
+            fatal (bool): Whether it ended the run (not transient, or out of retries).
+        """
+        if fatal:
+            self.fatal_errors += 1
+        else:
+            self.transient_errors += 1
+        self.last_error = repr(error)
+        self.last_error_time = time.perf_counter()
+
+    def achieved_cps(self) -> float:
+        """
+        Get the click rate achieved in the current (or last) run.
+
+        Returns:
+            float: Clicks per second, 0.0 before the first run.
+        """
+        if self.run_started is None:
+            return 0.0
+        end = self.run_stopped if self.run_stopped is not None else time.perf_counter()
+        elapsed = end - self.run_started
+        return self.run_clicks / elapsed if elapsed > 0 else 0.0
+
+    def error_histogram(self) -> list[tuple[float, int]]:
+        """
+        Get the cumulative interval-error histogram.
+
+        Returns:
+            list[tuple[float, int]]: (upper bound, cumulative count) pairs,
+            ending with (inf, total).
+        """
+        result = []
+        running = 0
+        counts = list(self.error_counts)  # Snapshot so buckets stay consistent
+        for bound, count in zip((*ERROR_BUCKETS, float("inf")), counts):
+            running += count
+            result.append((bound, running))
+        return result
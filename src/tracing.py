@@ -0,0 +1,122 @@
+"""Per-click tracing for MC Clicker's click loop."""
+
+import json
+import os
+import threading
+import time
+from array import array
+
+# Span kinds recorded by the click loop
+SPAN_WAIT = 0
+SPAN_INJECT = 1
+SPAN_BOOKKEEPING = 2
+SPAN_NAMES = ("wait", "inject", "bookkeeping")
+
+DEFAULT_CAPACITY = 65536  # Spans kept; older spans are overwritten
+
+
+class ClickTracer:
+    """Records click-loop spans into a preallocated ring buffer."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """
+        Initialize the ClickTracer.
+
+        Args:
+            capacity (int): Number of spans kept before the oldest are overwritten.
+        """
+        if capacity <= 0:
+            raise ValueError("Capacity must be greater than 0")
+        self.capacity = capacity
+        # Allocated once; span() only stores into these
+        self.starts = array("d", bytes(8 * capacity))
+        self.durations = array("d", bytes(8 * capacity))
+        self.kinds = array("B", bytes(capacity))
+        self.count: int = 0  # Spans recorded since the last clear()
+        self.origin: float = time.perf_counter()
+        self.thread_id: int = 0
+
+    def span(self, kind: int, start: float, end: float) -> None:
+        """
+        Record one span. Constant time, no allocation.
+
+        Args:
+            kind (int): SPAN_WAIT, SPAN_INJECT or SPAN_BOOKKEEPING.
+            start (float): time.perf_counter() at the start of the span.
+            end (float): time.perf_counter() at the end of the span.
+        """
+        i = self.count % self.capacity
+        self.starts[i] = start
+        self.durations[i] = end - start
+        self.kinds[i] = kind
+        self.count += 1
+
+    def clear(self) -> None:
+        """Forget all recorded spans."""
+        self.count = 0
+        self.origin = time.perf_counter()
+
+    def spans(self) -> list[tuple[str, float, float]]:
+        """
+        Get the retained spans, oldest first.
+
+        Returns:
+            list[tuple[str, float, float]]: (name, start, duration) in seconds,
+            with start relative to the tracer's origin.
+        """
+        retained = min(self.count, self.capacity)
+        first = self.count - retained
+        result = []
+        for n in range(first, self.count):
+            i = n % self.capacity
+            result.append((SPAN_NAMES[self.kinds[i]], self.starts[i] - self.origin, self.durations[i]))
+        return result
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Get per-kind totals for the retained spans.
+
+        Returns:
+            dict[str, dict[str, float]]: For each span name, its count, total and max seconds.
+        """
+        result = {name: {"count": 0, "total": 0.0, "max": 0.0} for name in SPAN_NAMES}
+        for name, _start, duration in self.spans():
+            entry = result[name]
+            entry["count"] += 1
+            entry["total"] += duration
+            entry["max"] = max(entry["max"], duration)
+        return result
+
+    def to_chrome_trace(self) -> dict:
+        """
+        Convert the retained spans to Chrome trace-event format.
+
+        Returns:
+            dict: Trace with complete ("X") events in microseconds, viewable in Perfetto.
+        """
+        pid = os.getpid()
+        tid = self.thread_id or threading.get_ident()
+        events = [
+            {
+                "name": name,
+                "cat": "click",
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": duration * 1e6,
+                "pid": pid,
+                "tid": tid,
+            }
+            for name, start, duration in self.spans()
+        ]
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": "click loop"}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str) -> None:
+        """
+        Write the retained spans as a Chrome trace-event JSON file.
+
+        Args:
+            path (str): Output file path.
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
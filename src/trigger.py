@@ -0,0 +1,152 @@
+"""Hold-to-click activation for MC Clicker."""
+
+from collections import deque
+from typing import Any
+
+from src.clicker import AutoClicker
+
+MOUSE_TRIGGERS = ("middle", "x1", "x2")  # Left/right are the buttons being clicked
+TRIGGER_NAMES = ("toggle", *MOUSE_TRIGGERS)  # "toggle" means the hotkey starts/stops clicking
+# pynput names the side buttons x1/x2 on Windows and button8/button9 on X11
+BUTTON_NAMES = {"middle": ("middle",), "x1": ("x1", "button8"), "x2": ("x2", "button9")}
+
+DEFAULT_BUDGET = 0.005  # Seconds allowed from press to first click and release to last click
+LATENCY_HISTORY = 256  # Press/release latencies kept for the budget check
+PAUSE_REASON = "trigger"  # Pauses the clicker while the trigger is up
+
+
+def trigger_button(trigger: str, buttons: Any = None) -> Any:
+    """
+    Find the platform's mouse button for a trigger name.
+
+    Args:
+        trigger (str): One of MOUSE_TRIGGERS.
+        buttons (Any): Button enum to search; defaults to pynput's for this platform.
+
+    Returns:
+        Any: The Button member, or None if this platform has no such button.
+    """
+    if buttons is None:
+        from pynput.mouse import Button as buttons
+    for name in BUTTON_NAMES[trigger]:
+        button = getattr(buttons, name, None)
+        if button is not None:
+            return button
+    return None
+
+
+class HoldTrigger:
+    """Clicks only while a mouse button or key is held down."""
+
+    def __init__(self, clicker: AutoClicker, trigger: str, budget: float = DEFAULT_BUDGET) -> None:
+        """
+        Initialize the HoldTrigger.
+
+        Args:
+            clicker (AutoClicker): Clicker to drive.
+            trigger (str): One of MOUSE_TRIGGERS, or a key name for the keyboard library.
+            budget (float): Latency budget in seconds for within_budget().
+        """
+        if not trigger or trigger == "toggle":
+            raise ValueError(f"Invalid hold trigger: {trigger!r}")
+        self.clicker = clicker
+        self.trigger = trigger.lower()
+        self.budget = budget
+        self.is_armed: bool = False
+        self.is_pressed: bool = False
+        self.press_latencies: deque[float] = deque(maxlen=LATENCY_HISTORY)  # Press to first click
+        self.release_overruns: deque[float] = deque(maxlen=LATENCY_HISTORY)  # Release to last click
+        self._button: Any = None  # pynput Button for a mouse trigger, resolved when armed
+        self._listener: Any = None
+        self._hooks: list[Any] = []
+
+    def arm(self) -> None:
+        """Start listening; the clicker runs paused until the trigger is pressed."""
+        if self.is_armed:
+            return
+        if self.trigger in MOUSE_TRIGGERS:
+            from pynput import mouse
+
+            self._button = trigger_button(self.trigger, mouse.Button)
+            if self._button is None:
+                print(f"Invalid hold trigger '{self.trigger}': no such mouse button on this platform")
+                return
+            self._listener = mouse.Listener(on_click=self._on_mouse_click)
+            self._listener.start()
+        else:
+            import keyboard
+
+            try:
+                self._hooks.append(keyboard.on_press_key(self.trigger, lambda _: self.on_press()))
+                self._hooks.append(keyboard.on_release_key(self.trigger, lambda _: self.on_release()))
+            except ValueError as e:
+                print(f"Invalid hold trigger '{self.trigger}': {e}")
+                for hook in self._hooks:
+                    keyboard.unhook(hook)
+                self._hooks = []
+                return
+        # The click thread is already running when the trigger is pressed
+        self.clicker.pause(PAUSE_REASON)
+        self.clicker.start()
+        self.is_armed = True
+
+    def disarm(self) -> None:
+        """Stop listening and stop the clicker."""
+        if not self.is_armed:
+            return
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        if self._hooks:
+            import keyboard
+
+            for hook in self._hooks:
+                keyboard.unhook(hook)
+            self._hooks = []
+        self.is_armed = False
+        self.is_pressed = False
+        self.clicker.stop()
+        self.clicker.resume(PAUSE_REASON)  # Leave the clicker unpaused for toggle use
+
+    def _on_mouse_click(self, x: int, y: int, button: Any, pressed: bool) -> None:
+        """pynput listener callback."""
+        if button == self._button:
+            if pressed:
+                self.on_press()
+            else:
+                self.on_release()
+
+    def on_press(self) -> None:
+        """Start clicking; called on the listener thread."""
+        self._collect()
+        if self.is_pressed:
+            return  # Key auto-repeat
+        self.is_pressed = True
+        self.clicker.resume(PAUSE_REASON)
+
+    def on_release(self) -> None:
+        """Stop clicking; called on the listener thread."""
+        if not self.is_pressed:
+            return
+        self.is_pressed = False
+        self.clicker.pause(PAUSE_REASON)
+
+    def _collect(self) -> None:
+        """Move the latencies of the previous press/release cycle into the history."""
+        stats = self.clicker.stats
+        if stats.last_resume_latency is not None:
+            self.press_latencies.append(stats.last_resume_latency)
+            stats.last_resume_latency = None
+        if stats.last_pause_overrun is not None:
+            self.release_overruns.append(stats.last_pause_overrun)
+            stats.last_pause_overrun = None
+
+    def within_budget(self) -> bool:
+        """
+        Check the recorded press and release latencies against the budget.
+
+        Returns:
+            bool: True if every recorded latency is within budget.
+        """
+        self._collect()
+        return all(latency <= self.budget for latency in (*self.press_latencies, *self.release_overruns))
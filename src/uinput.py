@@ -0,0 +1,155 @@
+"""Linux uinput mouse backend for MC Clicker."""
+
+import fcntl
+import os
+import struct
+from typing import Any
+
+DEFAULT_DEVICE = "/dev/uinput"
+DEVICE_NAME = b"MC Clicker virtual mouse"
+
+# From <linux/input-event-codes.h>
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_REL = 0x02
+SYN_REPORT = 0
+REL_X = 0x00
+REL_Y = 0x01
+BTN_LEFT = 0x110
+BTN_RIGHT = 0x111
+BUS_VIRTUAL = 0x06
+
+# From <linux/uinput.h>: _IO/_IOW('U', nr[, size])
+UI_DEV_CREATE = 0x5501
+UI_DEV_DESTROY = 0x5502
+UI_DEV_SETUP = 0x405C5503  # struct uinput_setup is 92 bytes
+UI_SET_EVBIT = 0x40045564
+UI_SET_KEYBIT = 0x40045565
+UI_SET_RELBIT = 0x40045566
+
+INPUT_EVENT = struct.Struct("llHHi")  # struct input_event: timeval, type, code, value
+UINPUT_SETUP = struct.Struct("HHHH80sI")  # struct input_id, name, ff_effects_max
+
+
+def pack_events(events: list[tuple[int, int, int]]) -> bytes:
+    """
+    Pack events into input_event structs.
+
+    The timestamp is left zero; the kernel stamps events written to uinput.
+
+    Args:
+        events (list[tuple[int, int, int]]): (type, code, value) triples.
+
+    Returns:
+        bytes: The packed events, ready for one write().
+    """
+    return b"".join(INPUT_EVENT.pack(0, 0, ev_type, code, value) for ev_type, code, value in events)
+
+
+def unpack_events(data: bytes) -> list[tuple[int, int, int]]:
+    """
+    Decode packed input_event structs.
+
+    Args:
+        data (bytes): Whole events as written to the device.
+
+    Returns:
+        list[tuple[int, int, int]]: (type, code, value) triples.
+
+    Raises:
+        ValueError: If the data is not a whole number of events.
+    """
+    if len(data) % INPUT_EVENT.size:
+        raise ValueError(f"{len(data)} bytes is not a whole number of events")
+    return [(ev_type, code, value) for _, _, ev_type, code, value in INPUT_EVENT.iter_unpack(data)]
+
+
+class UinputMouse:
+    """
+    Mouse backend that writes events straight to a uinput device.
+
+    Each press, release or click, including its SYN_REPORTs, is prebuilt
+    once and goes out in a single write(), with no display server round trip.
+    Works under X11, Wayland and on the console alike.
+    """
+
+    buttons = {"left": BTN_LEFT, "right": BTN_RIGHT}
+
+    def __init__(self, fd: int, owns_device: bool = False) -> None:
+        """
+        Initialize the UinputMouse.
+
+        Args:
+            fd (int): Writable descriptor of a uinput device, or of a file or
+                pipe standing in for one.
+            owns_device (bool): Destroy the virtual device on close().
+        """
+        self.fd = fd
+        self.owns_device = owns_device
+        syn = (EV_SYN, SYN_REPORT, 0)
+        self._press = {code: pack_events([(EV_KEY, code, 1), syn]) for code in self.buttons.values()}
+        self._release = {code: pack_events([(EV_KEY, code, 0), syn]) for code in self.buttons.values()}
+        self._click = {code: self._press[code] + self._release[code] for code in self.buttons.values()}
+
+    @classmethod
+    def create(cls, path: str = DEFAULT_DEVICE, name: bytes = DEVICE_NAME) -> "UinputMouse":
+        """
+        Create a virtual mouse through the uinput device.
+
+        Args:
+            path (str): uinput device node.
+            name (bytes): Name the virtual device is listed under.
+
+        Returns:
+            UinputMouse: Backend owning the new device.
+
+        Raises:
+            OSError: If uinput is missing or not writable (usually needs root or the input group).
+        """
+        fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK | os.O_CLOEXEC)
+        try:
+            fcntl.ioctl(fd, UI_SET_EVBIT, EV_KEY)
+            fcntl.ioctl(fd, UI_SET_KEYBIT, BTN_LEFT)
+            fcntl.ioctl(fd, UI_SET_KEYBIT, BTN_RIGHT)
+            # Relative axes make libinput and X treat the device as a mouse
+            fcntl.ioctl(fd, UI_SET_EVBIT, EV_REL)
+            fcntl.ioctl(fd, UI_SET_RELBIT, REL_X)
+            fcntl.ioctl(fd, UI_SET_RELBIT, REL_Y)
+            fcntl.ioctl(fd, UI_DEV_SETUP, UINPUT_SETUP.pack(BUS_VIRTUAL, 0x1234, 0x5678, 1, name, 0))
+            fcntl.ioctl(fd, UI_DEV_CREATE)
+        except OSError:
+            os.close(fd)
+            raise
+        return cls(fd, owns_device=True)
+
+    def _write(self, data: bytes) -> None:
+        """Write all of data; uinput takes it whole, pipes may take it in parts."""
+        written = os.write(self.fd, data)
+        if written != len(data):
+            view = memoryview(data)[written:]
+            while view:
+                view = view[os.write(self.fd, view):]
+
+    def press(self, button: Any) -> None:
+        """Press a button (BTN_* code)."""
+        self._write(self._press[button])
+
+    def release(self, button: Any) -> None:
+        """Release a button (BTN_* code)."""
+        self._write(self._release[button])
+
+    def click(self, button: Any, count: int = 1) -> None:
+        """Click a button `count` times in one write."""
+        self._write(self._click[button] if count == 1 else self._click[button] * count)
+
+    def close(self) -> None:
+        """Destroy the virtual device (if owned) and close the descriptor."""
+        if self.fd < 0:
+            return
+        if self.owns_device:
+            try:
+                fcntl.ioctl(self.fd, UI_DEV_DESTROY)
+            except OSError:
+                pass
+        os.close(self.fd)
+        self.fd = -1
@@ -0,0 +1,184 @@
+"""File change notifications for MC Clicker (inotify on Linux)."""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable
+
+# From <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+DEFAULT_COALESCE = 0.05  # Seconds of quiet that end a burst of edit events
+
+_libc = None
+
+
+def _load_libc():
+    """Load libc with the inotify functions, or return None."""
+    global _libc
+    if _libc is None and sys.platform.startswith("linux"):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            _libc = libc
+        except (OSError, AttributeError):
+            _libc = False
+    return _libc or None
+
+
+class ConfigWatcher:
+    """Calls back when a file is changed, coalescing bursts of edits."""
+
+    def __init__(
+        self,
+        path: str,
+        callback: Callable[[], None],
+        coalesce: float = DEFAULT_COALESCE,
+    ) -> None:
+        """
+        Initialize the ConfigWatcher.
+
+        Args:
+            path (str): File to watch. Its directory is watched so that
+                atomic replace-by-rename is seen too.
+            callback (Callable[[], None]): Called on the watcher thread after a burst of changes.
+            coalesce (float): Seconds without further events before the callback fires.
+        """
+        self.path = os.path.abspath(path)
+        self.callback = callback
+        self.coalesce = coalesce
+        self.is_watching: bool = False
+        self.watch_thread: threading.Thread | None = None
+        self.last_latency: float | None = None  # File write to callback done, seconds
+        self.max_latency: float = 0.0
+        self.reload_count: int = 0
+        self._fd: int = -1
+        self._wake_r: int = -1
+        self._wake_w: int = -1
+
+    @staticmethod
+    def is_supported() -> bool:
+        """
+        Check whether inotify is available on this platform.
+
+        Returns:
+            bool: True on Linux with a usable libc.
+        """
+        return _load_libc() is not None
+
+    def start(self) -> bool:
+        """
+        Start watching.
+
+        Returns:
+            bool: True if watching, False if inotify is unavailable or the watch failed.
+        """
+        if self.is_watching:
+            return True
+        libc = _load_libc()
+        if libc is None:
+            return False
+
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            print(f"inotify_init1 failed: {os.strerror(ctypes.get_errno())}")
+            return False
+        directory = os.path.dirname(self.path).encode()
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+        if libc.inotify_add_watch(fd, directory, mask) < 0:
+            print(f"Cannot watch {self.path}: {os.strerror(ctypes.get_errno())}")
+            os.close(fd)
+            return False
+
+        self._fd = fd
+        self._wake_r, self._wake_w = os.pipe()
+        self.is_watching = True
+        self.watch_thread = threading.Thread(target=self._watch_loop, daemon=True)
+        self.watch_thread.start()
+        return True
+
+    def stop(self) -> None:
+        """Stop watching and release the inotify descriptor."""
+        if not self.is_watching:
+            return
+        self.is_watching = False
+        os.write(self._wake_w, b"x")
+        if self.watch_thread:
+            self.watch_thread.join(timeout=1)
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            os.close(fd)
+        self._fd = self._wake_r = self._wake_w = -1
+
+    def _watch_loop(self) -> None:
+        """Block on inotify, then fire the callback once per burst."""
+        name = os.path.basename(self.path).encode()
+        while self.is_watching:
+            # No timeout: the thread sleeps until the kernel reports an event
+            readable, _, _ = select.select([self._fd, self._wake_r], [], [])
+            if self._wake_r in readable:
+                return
+            if not self._read_matches(name):
+                continue
+
+            # Swallow the rest of the burst (editors often write several times)
+            while self.is_watching:
+                readable, _, _ = select.select([self._fd, self._wake_r], [], [], self.coalesce)
+                if self._wake_r in readable:
+                    return
+                if not readable:
+                    break
+                self._read_matches(name)
+
+            try:
+                self.callback()
+            except Exception as e:
+                print(f"Config reload error: {e}")
+            self._record_latency()
+
+    def _read_matches(self, name: bytes) -> bool:
+        """
+        Drain pending inotify events.
+
+        Args:
+            name (bytes): Basename of the watched file.
+
+        Returns:
+            bool: True if any event concerned the watched file.
+        """
+        matched = False
+        while True:
+            try:
+                data = os.read(self._fd, 4096)
+            except BlockingIOError:
+                return matched
+            offset = 0
+            while offset < len(data):
+                _wd, _mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                if data[offset:offset + length].rstrip(b"\0") == name:
+                    matched = True
+                offset += length
+
+    def _record_latency(self) -> None:
+        """Measure the time from the file's last write to the applied reload."""
+        self.reload_count += 1
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return
+        latency = max(0.0, (time.time_ns() - mtime_ns) / 1e9)
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
@@ -0,0 +1,586 @@
+"""X11 backend that clicks into one window without focus or pointer changes."""
+
+import argparse
+import ctypes
+import ctypes.util
+from typing import Any
+
+# From <X11/X.h>
+BUTTON_PRESS = 4
+BUTTON_RELEASE = 5
+PROPERTY_NOTIFY = 28
+BUTTON_PRESS_MASK = 1 << 2
+BUTTON_RELEASE_MASK = 1 << 3
+PROPERTY_CHANGE_MASK = 1 << 22
+BUTTON_MASKS = {1: 1 << 8, 2: 1 << 9, 3: 1 << 10}  # State of a button while it is down
+GRAB_MODE_ASYNC = 1
+GRAB_SUCCESS = 0
+CURRENT_TIME = 0
+ANY_PROPERTY_TYPE = 0
+XC_CROSSHAIR = 34  # From <X11/cursorfont.h>
+XA_WINDOW = 33  # From <X11/Xatom.h>
+PROP_MODE_REPLACE = 0
+
+Window = ctypes.c_ulong
+
+
+class XButtonEvent(ctypes.Structure):
+    """Xlib's XButtonEvent."""
+
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("serial", ctypes.c_ulong),
+        ("send_event", ctypes.c_int),
+        ("display", ctypes.c_void_p),
+        ("window", Window),
+        ("root", Window),
+        ("subwindow", Window),
+        ("time", ctypes.c_ulong),
+        ("x", ctypes.c_int),
+        ("y", ctypes.c_int),
+        ("x_root", ctypes.c_int),
+        ("y_root", ctypes.c_int),
+        ("state", ctypes.c_uint),
+        ("button", ctypes.c_uint),
+        ("same_screen", ctypes.c_int),
+    ]
+
+
+class XPropertyEvent(ctypes.Structure):
+    """Xlib's XPropertyEvent."""
+
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("serial", ctypes.c_ulong),
+        ("send_event", ctypes.c_int),
+        ("display", ctypes.c_void_p),
+        ("window", Window),
+        ("atom", ctypes.c_ulong),
+        ("time", ctypes.c_ulong),
+        ("state", ctypes.c_int),
+    ]
+
+
+class XEvent(ctypes.Union):
+    """Xlib's XEvent, with only the members used here."""
+
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("xbutton", XButtonEvent),
+        ("xproperty", XPropertyEvent),
+        ("pad", ctypes.c_long * 24),
+    ]
+
+
+class XErrorEvent(ctypes.Structure):
+    """Xlib's XErrorEvent."""
+
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("display", ctypes.c_void_p),
+        ("resourceid", ctypes.c_ulong),
+        ("serial", ctypes.c_ulong),
+        ("error_code", ctypes.c_ubyte),
+        ("request_code", ctypes.c_ubyte),
+        ("minor_code", ctypes.c_ubyte),
+    ]
+
+
+ERROR_HANDLER = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(XErrorEvent))
+
+_xlib: Any = None
+_displays: set[int] = set()  # Display pointers opened by open_display() and not yet closed
+_errors: dict[int, int] = {}  # Display pointer -> error code of the latest X error on it
+_previous_handler: Any = None  # Error handler installed before ours, e.g. Tk's
+
+
+@ERROR_HANDLER
+def _on_x_error(display: int, event: Any) -> int:
+    """
+    Record X errors on our own displays instead of letting Xlib's default handler exit the process.
+
+    The handler is process-wide, so errors on any other connection (Tk's
+    above all) go to the handler that was installed before this one.
+    """
+    if display in _displays:
+        _errors[display] = event.contents.error_code
+        return 0
+    if _previous_handler is not None:
+        return _previous_handler(display, event)
+    return 0
+
+
+def load_xlib() -> Any:
+    """
+    Load libX11 and declare the functions used here.
+
+    Returns:
+        Any: The ctypes library.
+
+    Raises:
+        OSError: If libX11 is not installed.
+    """
+    global _xlib
+    if _xlib is not None:
+        return _xlib
+    path = ctypes.util.find_library("X11")
+    if path is None:
+        raise OSError("libX11 not found")
+    lib = ctypes.CDLL(path)
+    display, window, pointer = ctypes.c_void_p, Window, ctypes.POINTER
+    for name, restype, argtypes in (
+        ("XOpenDisplay", display, [ctypes.c_char_p]),
+        ("XCloseDisplay", ctypes.c_int, [display]),
+        ("XDefaultRootWindow", window, [display]),
+        ("XFlush", ctypes.c_int, [display]),
+        ("XSync", ctypes.c_int, [display, ctypes.c_int]),
+        ("XPending", ctypes.c_int, [display]),
+        ("XFree", ctypes.c_int, [ctypes.c_void_p]),
+        ("XSetErrorHandler", ctypes.c_void_p, [ERROR_HANDLER]),
+        ("XSendEvent", ctypes.c_int, [display, window, ctypes.c_int, ctypes.c_long, pointer(XEvent)]),
+        ("XNextEvent", ctypes.c_int, [display, pointer(XEvent)]),
+        ("XSelectInput", ctypes.c_int, [display, window, ctypes.c_long]),
+        ("XConnectionNumber", ctypes.c_int, [display]),
+        (
+            "XGetGeometry",
+            ctypes.c_int,
+            [display, window, pointer(Window)]
+            + [pointer(ctypes.c_int)] * 2
+            + [pointer(ctypes.c_uint)] * 4,
+        ),
+        (
+            "XTranslateCoordinates",
+            ctypes.c_int,
+            [display, window, window, ctypes.c_int, ctypes.c_int]
+            + [pointer(ctypes.c_int)] * 2
+            + [pointer(Window)],
+        ),
+        (
+            "XQueryTree",
+            ctypes.c_int,
+            [display, window, pointer(Window), pointer(Window), pointer(pointer(Window)), pointer(ctypes.c_uint)],
+        ),
+        ("XInternAtom", ctypes.c_ulong, [display, ctypes.c_char_p, ctypes.c_int]),
+        (
+            "XGetWindowProperty",
+            ctypes.c_int,
+            [display, window, ctypes.c_ulong, ctypes.c_long, ctypes.c_long, ctypes.c_int, ctypes.c_ulong]
+            + [pointer(ctypes.c_ulong), pointer(ctypes.c_int), pointer(ctypes.c_ulong), pointer(ctypes.c_ulong)]
+            + [pointer(ctypes.c_void_p)],
+        ),
+        (
+            "XChangeProperty",
+            ctypes.c_int,
+            [display, window, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+            + [ctypes.c_int],
+        ),
+        ("XFetchName", ctypes.c_int, [display, window, pointer(ctypes.c_char_p)]),
+        ("XCreateFontCursor", ctypes.c_ulong, [display, ctypes.c_uint]),
+        (
+            "XGrabPointer",
+            ctypes.c_int,
+            [display, window, ctypes.c_int, ctypes.c_uint, ctypes.c_int, ctypes.c_int, window, ctypes.c_ulong]
+            + [ctypes.c_ulong],
+        ),
+        ("XUngrabPointer", ctypes.c_int, [display, ctypes.c_ulong]),
+    ):
+        func = getattr(lib, name)
+        func.restype = restype
+        func.argtypes = argtypes
+    global _previous_handler
+    previous = lib.XSetErrorHandler(_on_x_error)
+    _previous_handler = ERROR_HANDLER(previous) if previous else None
+    _xlib = lib
+    return lib
+
+
+def open_display(name: str | None = None) -> int:
+    """
+    Open a connection to an X server.
+
+    Args:
+        name (str | None): Display name such as ':0'; defaults to $DISPLAY.
+
+    Returns:
+        int: Display pointer.
+
+    Raises:
+        OSError: If libX11 is missing or the display cannot be opened.
+    """
+    display = load_xlib().XOpenDisplay(name.encode() if name else None)
+    if not display:
+        raise OSError(f"Cannot open X display {name or '(from $DISPLAY)'}")
+    _displays.add(display)
+    return display
+
+
+def close_display(display: int) -> None:
+    """
+    Close a connection opened by open_display().
+
+    Args:
+        display (int): Display pointer.
+    """
+    load_xlib().XCloseDisplay(display)
+    _displays.discard(display)  # Xlib may hand the same pointer to the next connection
+    _errors.pop(display, None)
+
+
+def button_event(
+    kind: int, display: int, window: int, root: int, button: int, x: int, y: int, x_root: int, y_root: int
+) -> XEvent:
+    """
+    Build a synthetic button event.
+
+    Args:
+        kind (int): BUTTON_PRESS or BUTTON_RELEASE.
+        display (int): Display pointer.
+        window (int): Window the event is for.
+        root (int): Root window of the window's screen.
+        button (int): X button number (1 = left, 3 = right).
+        x (int): Pointer x relative to the window.
+        y (int): Pointer y relative to the window.
+        x_root (int): Pointer x on the screen.
+        y_root (int): Pointer y on the screen.
+
+    Returns:
+        XEvent: The event, ready for XSendEvent.
+    """
+    event = XEvent()
+    b = event.xbutton
+    b.type = kind
+    b.send_event = True
+    b.display = display
+    b.window = window
+    b.root = root
+    b.time = CURRENT_TIME
+    b.x, b.y, b.x_root, b.y_root = x, y, x_root, y_root
+    b.state = 0 if kind == BUTTON_PRESS else BUTTON_MASKS[button]  # A release reports the button as down
+    b.button = button
+    b.same_screen = True
+    return event
+
+
+class WindowMouse:
+    """
+    Mouse backend that sends button events straight to one X window.
+
+    Events go out with XSendEvent on a private display connection, so
+    neither the pointer nor the keyboard focus moves and the machine stays
+    usable while it clicks. The window's geometry and every event are
+    built once (and again on refresh()), so a click costs two XSendEvent
+    calls and one flush. Applications that ignore synthetic events (the
+    send_event flag) will not react.
+    """
+
+    buttons = {"left": 1, "right": 3}
+
+    def __init__(
+        self, window: int, display_name: str | None = None, x: int | None = None, y: int | None = None
+    ) -> None:
+        """
+        Initialize the WindowMouse.
+
+        Args:
+            window (int): Target X window id.
+            display_name (str | None): Display the window is on; defaults to $DISPLAY.
+            x (int | None): Click x relative to the window; defaults to its center.
+            y (int | None): Click y relative to the window; defaults to its center.
+
+        Raises:
+            OSError: If the display cannot be opened or the window does not exist.
+        """
+        self.xlib = load_xlib()
+        self.display = open_display(display_name)
+        self.window = window
+        self.root = self.xlib.XDefaultRootWindow(self.display)
+        self.x = x
+        self.y = y
+        self.width = 0
+        self.height = 0
+        self._press: dict[int, XEvent] = {}
+        self._release: dict[int, XEvent] = {}
+        try:
+            self.refresh()
+        except OSError:
+            self.close()
+            raise
+
+    def refresh(self) -> None:
+        """
+        Re-read the window's geometry and rebuild the cached events, e.g. after it moved.
+
+        Raises:
+            OSError: If the window no longer exists.
+        """
+        xlib, display = self.xlib, self.display
+        root = Window()
+        x, y = ctypes.c_int(), ctypes.c_int()
+        width, height, border, depth = ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint()
+        x_root, y_root = ctypes.c_int(), ctypes.c_int()
+        child = Window()
+        _errors.pop(display, None)
+        ok = xlib.XGetGeometry(display, self.window, root, x, y, width, height, border, depth)
+        if ok:
+            xlib.XTranslateCoordinates(display, self.window, root.value, 0, 0, x_root, y_root, child)
+        xlib.XSync(display, False)
+        if not ok or display in _errors:
+            raise OSError(f"No such window: {self.window:#x}")
+
+        self.root = root.value
+        self.width, self.height = width.value, height.value
+        cx = self.x if self.x is not None else self.width // 2
+        cy = self.y if self.y is not None else self.height // 2
+        args = (display, self.window, self.root)
+        point = (cx, cy, x_root.value + cx, y_root.value + cy)
+        for button in self.buttons.values():
+            self._press[button] = button_event(BUTTON_PRESS, *args, button, *point)
+            self._release[button] = button_event(BUTTON_RELEASE, *args, button, *point)
+
+    def _send(self, event: XEvent, mask: int) -> None:
+        """Queue one event for the target window."""
+        self.xlib.XSendEvent(self.display, self.window, True, mask, ctypes.byref(event))
+
+    def _flush(self) -> None:
+        """
+        Flush queued events and pick up errors from earlier ones.
+
+        XPending flushes and reads without blocking, so a closed window is
+        noticed a few clicks later without a round trip per click.
+
+        Raises:
+            OSError: If the server reported an error, e.g. the window is gone.
+        """
+        self.xlib.XPending(self.display)
+        code = _errors.pop(self.display, None)
+        if code is not None:
+            raise OSError(f"X error {code} sending to window {self.window:#x}")
+
+    def press(self, button: Any) -> None:
+        """Press a button (X button number)."""
+        self._send(self._press[button], BUTTON_PRESS_MASK)
+        self._flush()
+
+    def release(self, button: Any) -> None:
+        """Release a button (X button number)."""
+        self._send(self._release[button], BUTTON_RELEASE_MASK)
+        self._flush()
+
+    def click(self, button: Any, count: int = 1) -> None:
+        """Click a button `count` times with a single flush."""
+        press, release = self._press[button], self._release[button]
+        for _ in range(count):
+            self._send(press, BUTTON_PRESS_MASK)
+            self._send(release, BUTTON_RELEASE_MASK)
+        self._flush()
+
+    def close(self) -> None:
+        """Close the display connection."""
+        if self.display:
+            close_display(self.display)
+            self.display = None
+
+
+def _has_property(xlib: Any, display: int, window: int, atom: int) -> bool:
+    """Check whether a window has a property."""
+    actual_type, actual_format = ctypes.c_ulong(), ctypes.c_int()
+    nitems, after, data = ctypes.c_ulong(), ctypes.c_ulong(), ctypes.c_void_p()
+    xlib.XGetWindowProperty(
+        display, window, atom, 0, 0, False, ANY_PROPERTY_TYPE, actual_type, actual_format, nitems, after, data
+    )
+    if data:
+        xlib.XFree(data)
+    return actual_type.value != 0
+
+
+def _children(xlib: Any, display: int, window: int) -> list[int]:
+    """List a window's children, bottom to top."""
+    root, parent = Window(), Window()
+    children, count = ctypes.POINTER(Window)(), ctypes.c_uint()
+    if not xlib.XQueryTree(display, window, root, parent, children, count):
+        return []
+    result = [children[i] for i in range(count.value)]
+    if children:
+        xlib.XFree(children)
+    return result
+
+
+def client_window(display: int, window: int) -> int:
+    """
+    Find the application window inside a window manager frame.
+
+    Args:
+        display (int): Display pointer.
+        window (int): Top-level window, possibly a WM frame.
+
+    Returns:
+        int: The nearest window with WM_STATE (the client), or `window` if there is none.
+    """
+    xlib = load_xlib()
+    wm_state = xlib.XInternAtom(display, b"WM_STATE", True)
+    if not wm_state:
+        return window  # No window manager running
+    queue = [window]
+    while queue:
+        current = queue.pop(0)
+        if _has_property(xlib, display, current, wm_state):
+            return current
+        queue.extend(_children(xlib, display, current))
+    return window
+
+
+def active_window(display: int, atom: int | None = None) -> int | None:
+    """
+    Get the window that has focus, as the window manager reports it.
+
+    Args:
+        display (int): Display pointer.
+        atom (int | None): The _NET_ACTIVE_WINDOW atom, if already interned.
+
+    Returns:
+        int | None: Window id from _NET_ACTIVE_WINDOW (0 when nothing is
+        active), or None if the property is not set, e.g. without an EWMH
+        window manager.
+    """
+    xlib = load_xlib()
+    if atom is None:
+        atom = xlib.XInternAtom(display, b"_NET_ACTIVE_WINDOW", False)
+    actual_type, actual_format = ctypes.c_ulong(), ctypes.c_int()
+    nitems, after, data = ctypes.c_ulong(), ctypes.c_ulong(), ctypes.c_void_p()
+    xlib.XGetWindowProperty(
+        display,
+        xlib.XDefaultRootWindow(display),
+        atom,
+        0,
+        1,
+        False,
+        XA_WINDOW,
+        actual_type,
+        actual_format,
+        nitems,
+        after,
+        data,
+    )
+    if not data:
+        return None
+    window = ctypes.cast(data, ctypes.POINTER(ctypes.c_ulong))[0] if nitems.value else None
+    xlib.XFree(data)
+    return window
+
+
+def window_name(display: int, window: int) -> str:
+    """
+    Get a window's title.
+
+    Args:
+        display (int): Display pointer.
+        window (int): Window id.
+
+    Returns:
+        str: WM_NAME, or an empty string if unset.
+    """
+    xlib = load_xlib()
+    name = ctypes.c_char_p()
+    if not xlib.XFetchName(display, window, ctypes.byref(name)) or not name.value:
+        return ""
+    text = name.value.decode(errors="replace")
+    xlib.XFree(name)
+    return text
+
+
+def list_windows(display_name: str | None = None) -> list[tuple[int, str]]:
+    """
+    List the application windows the window manager knows about.
+
+    Args:
+        display_name (str | None): Display to query; defaults to $DISPLAY.
+
+    Returns:
+        list[tuple[int, str]]: (window id, title) from _NET_CLIENT_LIST;
+        empty without an EWMH window manager.
+    """
+    xlib = load_xlib()
+    display = open_display(display_name)
+    try:
+        root = xlib.XDefaultRootWindow(display)
+        atom = xlib.XInternAtom(display, b"_NET_CLIENT_LIST", True)
+        if not atom:
+            return []
+        actual_type, actual_format = ctypes.c_ulong(), ctypes.c_int()
+        nitems, after, data = ctypes.c_ulong(), ctypes.c_ulong(), ctypes.c_void_p()
+        xlib.XGetWindowProperty(
+            display, root, atom, 0, 1 << 16, False, ANY_PROPERTY_TYPE, actual_type, actual_format, nitems, after, data
+        )
+        if not data:
+            return []
+        ids = ctypes.cast(data, ctypes.POINTER(ctypes.c_ulong))  # Format 32 properties are longs in Xlib
+        windows = [ids[i] for i in range(nitems.value)]
+        xlib.XFree(data)
+        return [(window, window_name(display, window)) for window in windows]
+    finally:
+        close_display(display)
+
+
+def pick_window(display_name: str | None = None) -> int:
+    """
+    Let the user click the window to target.
+
+    Grabs the pointer with a crosshair cursor and blocks until a button is
+    pressed; the click itself is swallowed.
+
+    Args:
+        display_name (str | None): Display to pick on; defaults to $DISPLAY.
+
+    Returns:
+        int: The clicked application window, or the root window if the desktop was clicked.
+
+    Raises:
+        OSError: If the display cannot be opened or the pointer is already grabbed.
+    """
+    xlib = load_xlib()
+    display = open_display(display_name)
+    try:
+        root = xlib.XDefaultRootWindow(display)
+        cursor = xlib.XCreateFontCursor(display, XC_CROSSHAIR)
+        status = xlib.XGrabPointer(
+            display, root, False, BUTTON_PRESS_MASK, GRAB_MODE_ASYNC, GRAB_MODE_ASYNC, 0, cursor, CURRENT_TIME
+        )
+        if status != GRAB_SUCCESS:
+            raise OSError("Cannot grab the pointer")
+        event = XEvent()
+        try:
+            while True:
+                xlib.XNextEvent(display, event)
+                if event.type == BUTTON_PRESS:
+                    break
+        finally:
+            xlib.XUngrabPointer(display, CURRENT_TIME)
+            xlib.XSync(display, False)
+        target = event.xbutton.subwindow
+        return client_window(display, target) if target else root
+    finally:
+        close_display(display)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point: list windows or pick one, printing ids for WindowMouse."""
+    parser = argparse.ArgumentParser(description="Find the X window to click into.")
+    parser.add_argument("command", choices=("list", "pick"))
+    parser.add_argument("--display", default=None, help="X display, default $DISPLAY")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for window, name in list_windows(args.display):
+            print(f"{window:#x}  {name}")
+    else:
+        print("Click the window to target...")
+        window = pick_window(args.display)
+        display = open_display(args.display)
+        try:
+            print(f"{window:#x}  {window_name(display, window)}")
+        finally:
+            close_display(display)
+
+
+if __name__ == "__main__":
+    main()
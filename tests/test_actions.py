@@ -0,0 +1,163 @@
+"""Unit tests for actions module."""
+
+import threading
+import time
+
+import pytest
+
+from src.actions import Action, parse_action, validate_action
+from src.backends import NullKeyboard, NullMouse
+from src.clicker import PRIMARY_ACTION, AutoClicker
+
+
+def make_clicker() -> tuple[AutoClicker, NullMouse, NullKeyboard]:
+    """Create a clicker with counting backends and no primary click."""
+    mouse = NullMouse()
+    keyboard = NullKeyboard()
+    clicker = AutoClicker(mouse=mouse, keyboard=keyboard)
+    clicker.remove_action(PRIMARY_ACTION)
+    return clicker, mouse, keyboard
+
+
+class TestValidation:
+    """Tests for action validation and parsing."""
+
+    def test_invalid_actions(self) -> None:
+        """Test that invalid fields raise ValueError."""
+        for action in (
+            Action("pad", "a"),
+            Action("mouse", "middle"),
+            Action("key", ""),
+            Action("key", "a", "spam"),
+            Action("key", "a", "click", 0),
+            Action("key", "a", "click", 0.1, -1),
+        ):
+            with pytest.raises(ValueError):
+                validate_action(action)
+
+    def test_hold_needs_no_interval(self) -> None:
+        """Test that holds accept any interval."""
+        validate_action(Action("key", "w", "hold", 0))
+
+    def test_parse_action(self) -> None:
+        """Test parsing command-line action specs."""
+        assert parse_action("Space:0.5:0.1", "key", "click") == Action("key", "space", "click", 0.5, 0.1)
+        assert parse_action("left", "mouse", "click").interval == 0.1
+        with pytest.raises(ValueError):
+            parse_action("a:1:2:3", "key", "click")
+
+
+class TestActionStreams:
+    """Tests for running mixed action streams in the click loop."""
+
+    def test_mixed_rates(self) -> None:
+        """Test that clicks and taps keep their own rates on one thread."""
+        clicker, mouse, keyboard = make_clicker()
+        clicker.add_action(Action("mouse", "left", "click", 0.01))
+        clicker.add_action(Action("key", "space", "click", 0.05))
+        threads = threading.active_count()
+        clicker.start()
+        assert threading.active_count() == threads + 1
+        time.sleep(1.0)
+        clicker.stop()
+        assert 95 <= mouse.clicks <= 102
+        assert 19 <= keyboard.presses <= 21
+        assert keyboard.releases == keyboard.presses
+        assert clicker.click_count == mouse.clicks + keyboard.presses
+        assert clicker.stats.missed_deadlines <= 1  # One OS scheduling hiccup is not the loop's fault
+
+    def test_many_streams_one_thread(self) -> None:
+        """Test that fifty streams are sustained without falling behind."""
+        clicker, _, keyboard = make_clicker()
+        for i in range(50):
+            clicker.add_action(Action("key", f"k{i}", "click", 0.02, offset=i * 0.0004))
+        threads = threading.active_count()
+        clicker.start()
+        assert threading.active_count() == threads + 1
+        time.sleep(1.0)
+        clicker.stop()
+        assert keyboard.presses >= 50 * 48
+        assert clicker.stats.missed_deadlines <= 1  # One OS scheduling hiccup is not the loop's fault
+
+    def test_holds_pressed_and_released(self) -> None:
+        """Test that holds are pressed for the whole run and released on stop."""
+        clicker, mouse, keyboard = make_clicker()
+        clicker.add_action(Action("mouse", "right", "hold"))
+        clicker.add_action(Action("key", "w", "hold"))
+        clicker.start()
+        time.sleep(0.05)
+        assert (mouse.presses, keyboard.presses) == (1, 1)
+        assert (mouse.releases, keyboard.releases) == (0, 0)
+        clicker.stop()
+        assert (mouse.releases, keyboard.releases) == (1, 1)
+
+    def test_add_and_remove_while_running(self) -> None:
+        """Test that actions can be changed without restarting the click thread."""
+        clicker, mouse, keyboard = make_clicker()
+        clicker.start()
+        thread = clicker.click_thread
+        tap = clicker.add_action(Action("key", "e", "click", 0.01))
+        hold = clicker.add_action(Action("mouse", "left", "hold"))
+        time.sleep(0.1)
+        clicker.remove_action(tap)
+        clicker.remove_action(hold)
+        time.sleep(0.02)
+        presses = keyboard.presses
+        time.sleep(0.1)
+        assert keyboard.presses == presses
+        assert presses >= 8
+        assert mouse.releases == 1
+        assert clicker.click_thread is thread
+        clicker.stop()
+
+    def test_offset_delays_first_action(self) -> None:
+        """Test that an offset delays an action's first tap."""
+        clicker, _, keyboard = make_clicker()
+        clicker.add_action(Action("key", "q", "click", 1.0, offset=0.1))
+        clicker.start()
+        time.sleep(0.05)
+        assert keyboard.presses == 0
+        time.sleep(0.1)
+        clicker.stop()
+        assert keyboard.presses == 1
+
+    def test_duration_stops_run(self) -> None:
+        """Test that the run stops itself and releases holds after its duration."""
+        clicker, mouse, _ = make_clicker()
+        clicker.add_action(Action("mouse", "left", "hold"))
+        clicker.set_duration(0.1)
+        clicker.start()
+        assert clicker.get_remaining_time() is not None
+        time.sleep(0.2)
+        assert clicker.is_running is False
+        assert mouse.releases == 1
+        assert clicker.get_remaining_time() is None
+
+    def test_idle_clicker_waits_for_actions(self) -> None:
+        """Test that a clicker without actions performs nothing until one is added."""
+        clicker, mouse, _ = make_clicker()
+        clicker.start()
+        time.sleep(0.05)
+        clicker.add_action(Action("mouse", "left", "click", 1.0))
+        time.sleep(0.02)
+        clicker.stop()
+        assert mouse.clicks == 1
+
+    def test_primary_click_alongside_tap(self) -> None:
+        """Test that the click settings run as one stream next to added actions."""
+        mouse = NullMouse()
+        keyboard = NullKeyboard()
+        clicker = AutoClicker(mouse=mouse, keyboard=keyboard)
+        clicker.set_interval(0.02)
+        clicker.add_action(Action("key", "space", "click", 0.05))
+        clicker.start()
+        time.sleep(0.5)
+        clicker.set_mode("hold")
+        time.sleep(0.05)
+        assert clicker.is_holding is True
+        clicks = mouse.clicks
+        clicker.stop()
+        assert 23 <= clicks <= 27
+        assert 9 <= keyboard.presses <= 12
+        assert mouse.releases == 1
+        assert clicker.is_holding is False
@@ -0,0 +1,192 @@
+"""Unit tests for budget module."""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.backends import NullMouse
+from src.budget import (
+    BURST,
+    FILE_SIZE,
+    HEADER,
+    MAX_SLOTS,
+    SharedBudget,
+    _pid_alive,
+    fair_shares,
+    measure_sharing,
+)
+from src.clicker import AutoClicker
+
+
+@pytest.fixture
+def path(tmp_path):
+    """Path of a private budget file."""
+    return str(tmp_path / "budget")
+
+
+def drain(budget: SharedBudget, start: float, seconds: float, step: float = 0.001) -> int:
+    """Ask for a token every `step` seconds of simulated time and count the grants."""
+    granted = 0
+    for i in range(int(seconds / step)):
+        granted += budget.try_acquire(start + i * step, step)
+    return granted
+
+
+class TestFairShares:
+    """Tests for max-min fair splitting."""
+
+    def test_equal_split(self) -> None:
+        """Test that greedy instances split the ceiling equally."""
+        assert fair_shares([100.0, 100.0, float("inf")], 60.0) == [20.0, 20.0, 20.0]
+
+    def test_small_demand_satisfied(self) -> None:
+        """Test that an instance asking for less gets it and the rest is split."""
+        assert fair_shares([100.0, 10.0, 100.0], 60.0) == [25.0, 10.0, 25.0]
+
+    def test_under_ceiling(self) -> None:
+        """Test that demands under the ceiling are granted in full."""
+        assert fair_shares([5.0, 10.0], 60.0) == [5.0, 10.0]
+        assert fair_shares([], 60.0) == []
+
+
+class TestPidAlive:
+    """Tests for telling live slot owners from vanished ones."""
+
+    def test_own_process_alive(self) -> None:
+        """Test that a running process counts as alive."""
+        assert _pid_alive(os.getpid())
+
+    def test_exited_process_dead(self) -> None:
+        """Test that a process that exited and was reaped counts as gone."""
+        child = subprocess.Popen([sys.executable, "-c", "pass"])
+        child.wait()
+        assert not _pid_alive(child.pid)
+
+
+class TestSharedBudget:
+    """Tests for the token bucket."""
+
+    def test_invalid_ceiling_raises_error(self, path) -> None:
+        """Test that a non-positive ceiling raises ValueError."""
+        with pytest.raises(ValueError):
+            SharedBudget(0, path)
+
+    def test_rate_limited(self, path) -> None:
+        """Test that one instance gets its ceiling plus at most the burst."""
+        budget = SharedBudget(50.0, path)
+        start = time.perf_counter()
+        granted = drain(budget, start, 1.0)
+        budget.close()
+        assert 50 <= granted <= 50 + BURST
+        assert budget.denied > 0
+
+    def test_next_token_at(self, path) -> None:
+        """Test that a denied caller is told when to come back."""
+        budget = SharedBudget(10.0, path)
+        now = time.perf_counter()
+        while budget.try_acquire(now, 0.001):
+            pass
+        assert budget.next_token_at() == pytest.approx(now + 0.1, abs=0.1)
+        assert budget.try_acquire(budget.next_token_at() + 1e-9, 0.001)
+        budget.close()
+
+    def test_instances_share(self, path) -> None:
+        """Test that two instances on one file each get half of the ceiling."""
+        first, second = SharedBudget(60.0, path), SharedBudget(60.0, path)
+        assert first.slot != second.slot
+        now = time.perf_counter()
+        first.try_acquire(now, 0.001)
+        second.try_acquire(now, 0.001)
+        first.try_acquire(now + 1.0, 0.001)  # Refresh now that both have published
+        assert first.active_instances == 2
+        assert first.rate == pytest.approx(30.0)
+        first.close()
+        second.close()
+
+    def test_lowest_ceiling_wins(self, path) -> None:
+        """Test that every instance enforces the lowest published ceiling."""
+        strict, loose = SharedBudget(20.0, path), SharedBudget(100.0, path)
+        now = time.perf_counter()
+        strict.try_acquire(now, 0.001)
+        loose.try_acquire(now, 0.001)
+        assert loose.rate == pytest.approx(10.0)
+        strict.close()
+        loose.close()
+
+    def test_idle_instance_releases_share(self, path) -> None:
+        """Test that an instance that stopped clicking no longer counts."""
+        busy, idle = SharedBudget(60.0, path), SharedBudget(60.0, path)
+        idle.try_acquire(time.perf_counter(), 0.001)
+        busy.try_acquire(time.perf_counter(), 0.001)
+        assert busy.rate == pytest.approx(30.0)
+        time.sleep(0.3)
+        busy.try_acquire(time.perf_counter(), 0.001)
+        assert busy.rate == pytest.approx(60.0)
+        busy.close()
+        idle.close()
+
+    def test_slot_reused_after_close(self, path) -> None:
+        """Test that a closed instance's slot is free again."""
+        first = SharedBudget(60.0, path)
+        slot = first.slot
+        first.close()
+        first.close()  # Safe twice
+        second = SharedBudget(60.0, path)
+        assert second.slot == slot
+        second.close()
+
+    def test_all_slots_taken(self, path) -> None:
+        """Test that claiming a slot fails once all are in use."""
+        budgets = [SharedBudget(60.0, path) for _ in range(MAX_SLOTS)]
+        try:
+            with pytest.raises(OSError):
+                SharedBudget(60.0, path)
+        finally:
+            for budget in budgets:
+                budget.close()
+
+    def test_incompatible_file_raises_error(self, path) -> None:
+        """Test that a budget file from another version is not reused."""
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(b"MCTB", 99, MAX_SLOTS).ljust(FILE_SIZE, b"\0"))
+        with pytest.raises(OSError):
+            SharedBudget(60.0, path)
+
+
+class TestClickerBudget:
+    """Tests for the click loop drawing on a budget."""
+
+    def test_clicker_held_to_ceiling(self, path) -> None:
+        """Test that a fast clicker is held to the budget and its clicks stay evenly spaced."""
+        mouse = NullMouse()
+        clicker = AutoClicker(mouse=mouse)
+        clicker.set_interval(0.002)  # 500 CPS wanted
+        clicker.set_budget(SharedBudget(50.0, path))
+        clicker.start()
+        time.sleep(0.5)
+        clicker.stop()
+        assert 20 <= mouse.clicks <= 28
+        clicker.set_budget(None)
+
+
+class TestMultiProcess:
+    """Tests with one clicking process per instance."""
+
+    def test_aggregate_ceiling_and_fairness(self) -> None:
+        """Test that greedy processes stay under the ceiling together and share it equally."""
+        report = measure_sharing([100.0, 100.0, 100.0], 60.0, seconds=1.5)
+        assert 51 <= report["total_cps"] <= 66
+        rates = [instance["achieved_cps"] for instance in report["instances"]]
+        assert max(rates) - min(rates) <= 4
+
+    def test_small_demand_left_alone(self) -> None:
+        """Test that a slow process keeps its rate and the others split the rest."""
+        report = measure_sharing([10.0, 100.0, 100.0], 60.0, seconds=1.5)
+        slow, *fast = report["instances"]
+        assert slow["achieved_cps"] == pytest.approx(10.0, abs=1.5)
+        for instance in fast:
+            assert instance["achieved_cps"] == pytest.approx(25.0, abs=3)
+        assert report["total_cps"] <= 66
@@ -0,0 +1,174 @@
+"""Unit tests for cadence module."""
+
+import random
+import statistics
+import time
+
+import pytest
+
+from src.cadence import (
+    Cadence,
+    CadenceMeter,
+    P2Quantile,
+    StreamingStats,
+    cadence_from_dict,
+    cadence_to_dict,
+)
+
+
+class TestStreamingStats:
+    """Tests for Welford mean/variance."""
+
+    def test_matches_batch_statistics(self) -> None:
+        """Test that streaming results match the statistics module."""
+        rng = random.Random(1)
+        data = [rng.gauss(0.1, 0.02) for _ in range(1000)]
+        stats = StreamingStats()
+        for x in data:
+            stats.update(x)
+        assert stats.mean == pytest.approx(statistics.mean(data))
+        assert stats.variance == pytest.approx(statistics.variance(data))
+        assert stats.min == min(data)
+        assert stats.max == max(data)
+
+    def test_single_sample_variance_zero(self) -> None:
+        """Test that one sample has zero variance."""
+        stats = StreamingStats()
+        stats.update(5.0)
+        assert stats.variance == 0.0
+
+
+class TestP2Quantile:
+    """Tests for the P-squared quantile sketch."""
+
+    @pytest.mark.parametrize("p", [0.05, 0.5, 0.95])
+    def test_estimates_uniform_quantile(self, p) -> None:
+        """Test estimates on a uniform distribution."""
+        rng = random.Random(2)
+        sketch = P2Quantile(p)
+        for _ in range(20000):
+            sketch.update(rng.random())
+        assert sketch.value() == pytest.approx(p, abs=0.02)
+
+    def test_few_samples_exact(self) -> None:
+        """Test that fewer than five samples give an exact order statistic."""
+        sketch = P2Quantile(0.5)
+        for x in (3.0, 1.0, 2.0):
+            sketch.update(x)
+        assert sketch.value() == 2.0
+
+    def test_empty_is_none(self) -> None:
+        """Test that no samples give None."""
+        assert P2Quantile(0.5).value() is None
+
+    def test_invalid_quantile_raises_error(self) -> None:
+        """Test that quantiles outside (0, 1) raise ValueError."""
+        with pytest.raises(ValueError):
+            P2Quantile(1.0)
+
+
+class TestCadence:
+    """Tests for the empirical interval distribution."""
+
+    def test_sample_interpolates(self) -> None:
+        """Test inverse-CDF interpolation."""
+        cadence = Cadence((0.0, 0.5, 1.0), (0.1, 0.2, 0.4))
+        assert cadence.sample(0.0) == pytest.approx(0.1)
+        assert cadence.sample(0.25) == pytest.approx(0.15)
+        assert cadence.sample(0.75) == pytest.approx(0.3)
+
+    def test_mean(self) -> None:
+        """Test the distribution mean."""
+        cadence = Cadence((0.0, 0.5, 1.0), (0.1, 0.2, 0.4))
+        assert cadence.mean() == pytest.approx(0.5 * 0.15 + 0.5 * 0.3)
+
+    def test_round_trip(self) -> None:
+        """Test dict round-trip."""
+        cadence = Cadence((0.0, 0.5, 1.0), (0.1, 0.2, 0.4))
+        assert cadence_from_dict(cadence_to_dict(cadence)) == cadence
+
+    @pytest.mark.parametrize("data", [
+        {"probs": [0, 1], "intervals": [0.1]},
+        {"probs": [0.1, 1], "intervals": [0.1, 0.2]},
+        {"probs": [0, 0.5, 0.5, 1], "intervals": [0.1, 0.1, 0.2, 0.3]},
+        {"probs": [0, 1], "intervals": [0.2, 0.1]},
+        {"probs": [0, 1], "intervals": [0, 0.1]},
+        "nope",
+    ])
+    def test_invalid_raises_error(self, data) -> None:
+        """Test that malformed cadences raise ValueError."""
+        with pytest.raises(ValueError):
+            cadence_from_dict(data)
+
+
+class TestCadenceMeter:
+    """Tests for measuring clicks."""
+
+    def feed(self, meter: CadenceMeter, intervals: list[float]) -> None:
+        """Feed clicks separated by the given intervals."""
+        t = 100.0
+        meter.on_click(t)
+        for interval in intervals:
+            t += interval
+            meter.on_click(t)
+
+    def test_regular_clicks(self) -> None:
+        """Test live CPS and interval stats for a steady rate."""
+        meter = CadenceMeter()
+        self.feed(meter, [0.1] * 50)
+        assert meter.live_cps() == pytest.approx(10.0)
+        assert meter.intervals.mean == pytest.approx(0.1)
+        assert meter.intervals.stdev == pytest.approx(0.0, abs=1e-9)
+
+    def test_long_pause_not_an_interval(self) -> None:
+        """Test that pauses longer than max_gap are not counted."""
+        meter = CadenceMeter(max_gap=1.0)
+        self.feed(meter, [0.1, 5.0, 0.1])
+        assert meter.intervals.count == 2
+
+    def test_live_cps_drops_when_idle(self) -> None:
+        """Test that live CPS goes to zero once clicking stops."""
+        meter = CadenceMeter(max_gap=1.0)
+        self.feed(meter, [0.1] * 10)
+        assert meter.live_cps(now=meter.last_click + 2.0) == 0.0
+
+    def test_on_click_constant_time(self) -> None:
+        """Test that per-click cost does not grow with the number of clicks."""
+        meter = CadenceMeter()
+        clock = [0.0]
+
+        def cost(n: int) -> float:
+            start = time.perf_counter()
+            for i in range(n):
+                clock[0] += 0.05 + (i % 7) * 0.01
+                meter.on_click(clock[0])
+            return (time.perf_counter() - start) / n
+
+        early = cost(2000)
+        cost(50000)
+        late = cost(2000)
+        assert late < early * 3
+        assert late < 100e-6  # Far below one frame of input lag
+
+    def test_profile_reproduces_cadence(self) -> None:
+        """Test that a saved profile's cadence matches the measured distribution."""
+        rng = random.Random(4)
+        intervals = [rng.uniform(0.08, 0.12) for _ in range(5000)]
+        meter = CadenceMeter()
+        self.feed(meter, intervals)
+
+        profile = meter.to_profile()
+        assert profile["cps"] == pytest.approx(10.0, rel=0.02)
+        cadence = cadence_from_dict(profile["cadence"])
+        samples = [cadence.sample(rng.random()) for _ in range(20000)]
+        assert statistics.mean(samples) == pytest.approx(0.1, rel=0.02)
+        assert statistics.median(samples) == pytest.approx(statistics.median(intervals), rel=0.02)
+        assert min(samples) >= min(intervals)
+        assert max(samples) <= max(intervals)
+
+    def test_profile_needs_clicks(self) -> None:
+        """Test that too few clicks raise ValueError."""
+        meter = CadenceMeter()
+        self.feed(meter, [0.1])
+        with pytest.raises(ValueError):
+            meter.to_profile()
@@ -0,0 +1,87 @@
+"""Unit tests for calibration module."""
+
+import time
+
+import pytest
+
+from src.backends import NullMouse
+from src.calibration import (
+    capability_key,
+    load_capabilities,
+    measure_rate,
+    reliable_cps,
+    save_capability,
+    sweep,
+)
+
+
+class SlowMouse(NullMouse):
+    """Null backend whose clicks take 20 ms, capping it near 50 CPS."""
+
+    def click(self, button, count: int = 1) -> None:
+        """Count a click after a delay."""
+        time.sleep(0.02)
+        super().click(button, count)
+
+
+class TestMeasureRate:
+    """Tests for measuring one target rate."""
+
+    def test_reachable_rate(self) -> None:
+        """Test that an easy rate is achieved and reliable."""
+        point = measure_rate(NullMouse(), 50.0, 0.5)
+        assert point["achieved_cps"] == pytest.approx(50.0, rel=0.05)
+        assert point["reliable"] is True
+
+    def test_unreachable_rate(self) -> None:
+        """Test that a rate the backend cannot sustain is flagged."""
+        point = measure_rate(SlowMouse(), 100.0, 0.5)
+        assert point["achieved_cps"] < 55
+        assert point["missed"] > 0
+        assert point["reliable"] is False
+
+
+class TestSweep:
+    """Tests for the calibration sweep."""
+
+    def test_within_budget(self) -> None:
+        """Test that the sweep finishes within its time budget."""
+        start = time.perf_counter()
+        curve = sweep(NullMouse(), [10, 20, 50, 100], budget=2.0)
+        assert time.perf_counter() - start < 2.5
+        assert len(curve["points"]) == 4
+        assert curve["max_reliable_cps"] == 100
+
+    def test_finds_backend_limit(self) -> None:
+        """Test that the sweep stops past the backend's limit and reports the last reliable rate."""
+        curve = sweep(SlowMouse(), [10, 20, 30, 60, 80, 100], budget=3.0)
+        assert curve["max_reliable_cps"] == 30
+        assert len(curve["points"]) == 5  # Gave up after two failures
+        assert [p["reliable"] for p in curve["points"]] == [True, True, True, False, False]
+
+
+class TestCapabilityStore:
+    """Tests for storing per-host curves."""
+
+    def test_round_trip(self, tmp_path) -> None:
+        """Test that a saved curve's reliable rate can be read back."""
+        path = str(tmp_path / "capability.json")
+        save_capability({"points": [], "max_reliable_cps": 42.0}, "null", path)
+        assert reliable_cps("null", path) == 42.0
+        assert reliable_cps("pynput", path) is None
+
+    def test_other_hosts_kept(self, tmp_path) -> None:
+        """Test that saving keeps other hosts' curves."""
+        path = tmp_path / "capability.json"
+        path.write_text('{"otherhost/null": {"max_reliable_cps": 10}}')
+        save_capability({"max_reliable_cps": 20}, "null", str(path))
+        data = load_capabilities(str(path))
+        assert data["otherhost/null"]["max_reliable_cps"] == 10
+        assert data[capability_key("null")]["max_reliable_cps"] == 20
+
+    def test_missing_or_corrupt_file(self, tmp_path) -> None:
+        """Test that an unreadable file means not calibrated."""
+        path = tmp_path / "capability.json"
+        assert reliable_cps("null", str(path)) is None
+        path.write_text("{not json")
+        assert reliable_cps("null", str(path)) is None
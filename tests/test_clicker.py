@@ -1,11 +1,14 @@
 
 """Unit tests for clicker module."""
 
+import threading
 import time
 
 import pytest
 
-from src.clicker import AutoClicker
+from src.backends import NullMouse
+from src.clicker import RETRY_BUDGET, AutoClicker, is_transient
+from src.session_log import SessionLog, iter_sessions
 
 
 class TestAutoClickerInitialization:
@@ -69,18 +72,23 @@ class TestSetButton:
 
 
 class TestStartStop:
-    """Tests for start/stop functionality."""
+    """
+    Tests for start/stop functionality.
+
+    These use a NullMouse: a bare AutoClicker creates its pynput backend on the
+    click thread, and without a display that fails and ends the run by itself.
+    """
 
     def test_start_sets_running(self) -> None:
         """Test that start() sets is_running to True."""
-        clicker = AutoClicker()
+        clicker = AutoClicker(mouse=NullMouse())
         clicker.start()
         assert clicker.is_running is True
         clicker.stop()
 
     def test_stop_clears_running(self) -> None:
         """Test that stop() sets is_running to False."""
-        clicker = AutoClicker()
+        clicker = AutoClicker(mouse=NullMouse())
         clicker.start()
         assert clicker.is_running is True
         clicker.stop()
@@ -89,7 +97,7 @@ class TestStartStop:
 
     def test_double_start_safe(self) -> None:
         """Test that calling start twice is safe."""
-        clicker = AutoClicker()
+        clicker = AutoClicker(mouse=NullMouse())
         clicker.start()
         thread1 = clicker.click_thread
         clicker.start()
@@ -103,3 +111,419 @@ class TestStartStop:
         clicker = AutoClicker()
         clicker.stop()  # Should not raise exception
 
+
+
+class TestSessionLogging:
+    """Tests for session recording."""
+
+    def test_finished_session_recorded(self, tmp_path) -> None:
+        """Test that a timed session is recorded when it ends."""
+        path = str(tmp_path / "sessions.log")
+        log = SessionLog(path)
+        clicker = AutoClicker(mouse=NullMouse())
+        clicker.set_session_log(log)
+        clicker.set_duration(0.3)
+        clicker.start()
+        time.sleep(0.6)
+        log.close()
+
+        sessions = list(iter_sessions(path))
+        assert len(sessions) == 1
+        start, stop, duration, cps, clicks = sessions[0]
+        assert duration == pytest.approx(0.3, abs=0.15)
+        assert cps == pytest.approx(10.0)
+        assert clicks == clicker.click_count
+
+
+class TestApplySettings:
+    """Tests for swapping all settings at once."""
+
+    def test_apply_settings(self) -> None:
+        """Test that apply_settings sets every field."""
+        clicker = AutoClicker()
+        clicker.apply_settings(0.05, "right", "hold", 30)
+        assert clicker.interval == 0.05
+        assert clicker.mode == "hold"
+        assert clicker.duration == 30
+
+    def test_apply_settings_invalid_raises_error(self) -> None:
+        """Test that invalid values raise ValueError."""
+        clicker = AutoClicker()
+        with pytest.raises(ValueError):
+            clicker.apply_settings(0.1, "middle", "click", None)
+
+    def test_switch_hold_to_click_releases(self) -> None:
+        """Test that switching from hold to click while running releases the button."""
+        clicker = AutoClicker(mouse=NullMouse())
+        clicker.set_mode("hold")
+        clicker.start()
+        time.sleep(0.1)
+        assert clicker.is_holding is True
+        clicker.apply_settings(0.1, "left", "click", None)
+        time.sleep(0.1)
+        assert clicker.is_holding is False
+        clicker.stop()
+
+
+class TestScheduling:
+    """Tests for deadline-based click scheduling."""
+
+    def test_rate_does_not_drift(self) -> None:
+        """Test that the achieved rate matches the configured rate."""
+        mouse = NullMouse()
+        clicker = AutoClicker(mouse=mouse)
+        clicker.set_interval(0.02)  # 50 CPS
+        clicker.start()
+        time.sleep(1.0)
+        clicker.stop()
+        assert 48 <= mouse.clicks <= 52
+        assert clicker.stats.missed_deadlines == 0
+
+    def test_stats_count_clicks(self) -> None:
+        """Test that every click is recorded in the stats."""
+        mouse = NullMouse()
+        clicker = AutoClicker(mouse=mouse)
+        clicker.set_interval(0.01)
+        clicker.start()
+        time.sleep(0.2)
+        clicker.stop()
+        assert clicker.stats.clicks_total == mouse.clicks
+
+    def test_interval_sampler_used(self) -> None:
+        """Test that an interval sampler overrides the fixed interval."""
+        mouse = NullMouse()
+        clicker = AutoClicker(mouse=mouse)
+        clicker.set_interval(1.0)
+        clicker.set_interval_sampler(lambda: 0.02)
+        clicker.start()
+        time.sleep(0.5)
+        clicker.stop()
+        assert 20 <= mouse.clicks <= 27
+
+
+class TestPauseResume:
+    """Tests for pausing and resuming a running clicker."""
+
+    def test_pause_stops_clicks(self) -> None:
+        """Test that no clicks are made while paused."""
+        mouse = NullMouse()
+        clicker = AutoClicker(mouse=mouse)
+        clicker.set_interval(0.01)
+        clicker.start()
+        time.sleep(0.05)
+        clicker.pause()
+        time.sleep(0.02)
+        clicks = mouse.clicks
+        time.sleep(0.1)
+        assert mouse.clicks == clicks
+        assert clicker.is_running is True
+        clicker.stop()
+
+    def test_resume_clicks_immediately(self) -> None:
+        """Test that the first click follows resume() without waiting out the interval."""
+        mouse = NullMouse()
+        clicker = AutoClicker(mouse=mouse)
+        clicker.set_interval(1.0)
+        clicker.pause()
+        clicker.start()
+        time.sleep(0.05)
+        assert mouse.clicks == 0
+        clicker.resume()
+        time.sleep(0.05)
+        clicker.stop()
+        assert mouse.clicks == 1
+        assert clicker.stats.last_resume_latency < 0.005
+
+    def test_pause_releases_hold(self) -> None:
+        """Test that pausing releases a held button and resuming presses it again."""
+        mouse = NullMouse()
+        clicker = AutoClicker(mouse=mouse)
+        clicker.set_mode("hold")
+        clicker.start()
+        time.sleep(0.05)
+        clicker.pause()
+        time.sleep(0.05)
+        assert mouse.releases == 1
+        assert clicker.is_holding is False
+        clicker.resume()
+        time.sleep(0.05)
+        clicker.stop()
+        assert mouse.presses == 2
+
+    def test_stop_while_paused(self) -> None:
+        """Test that stop() ends a paused click thread promptly."""
+        clicker = AutoClicker(mouse=NullMouse())
+        clicker.pause()
+        clicker.start()
+        time.sleep(0.02)
+        start = time.perf_counter()
+        clicker.stop()
+        assert time.perf_counter() - start < 0.1
+        assert not clicker.click_thread.is_alive()
+
+    def test_pause_reasons_lifted_separately(self) -> None:
+        """Test that the clicker stays paused until every reason that paused it resumes."""
+        clicker = AutoClicker(mouse=NullMouse())
+        clicker.pause("focus")
+        clicker.pause("trigger")
+        clicker.resume("focus")
+        assert clicker.is_paused
+        clicker.resume("focus")  # Lifting a reason twice changes nothing
+        assert clicker.pause_reasons == {"trigger"}
+        clicker.resume("trigger")
+        assert not clicker.is_paused
+
+
+class TestClickLimit:
+    """Tests for stopping after an exact number of clicks."""
+
+    def test_invalid_limit_raises_error(self) -> None:
+        """Test that a non-positive click limit raises ValueError."""
+        clicker = AutoClicker(mouse=NullMouse())
+        with pytest.raises(ValueError):
+            clicker.set_click_limit(0)
+
+    def test_exact_count_at_high_rate(self) -> None:
+        """Test that a fast run stops after exactly the budgeted clicks."""
+        for limit in (1, 7, 500):
+            mouse = NullMouse()
+            clicker = AutoClicker(mouse=mouse)
+            clicker.set_interval(0.0001)  # Far faster than the loop can go
+            clicker.set_click_limit(limit)
+            clicker.start()
+            clicker.click_thread.join(timeout=5)
+            assert clicker.is_running is False
+            assert mouse.clicks == limit
+            assert clicker.stats.run_clicks == limit
+
+    def test_deadline_first(self) -> None:
+        """Test that a duration ending before the budget stops the run."""
+        mouse = NullMouse()
+        clicker = AutoClicker(mouse=mouse)
+        clicker.set_interval(0.01)
+        clicker.set_click_limit(1000)
+        clicker.set_duration(0.1)
+        clicker.start()
+        clicker.click_thread.join(timeout=1)
+        assert clicker.is_running is False
+        assert 9 <= mouse.clicks <= 11
+
+    def test_duration_stops_on_time_while_waiting(self) -> None:
+        """Test that the run ends at its duration even in the middle of a long interval."""
+        clicker = AutoClicker(mouse=NullMouse())
+        clicker.set_interval(10.0)
+        clicker.set_duration(0.1)
+        start = time.perf_counter()
+        clicker.start()
+        clicker.click_thread.join(timeout=1)
+        assert time.perf_counter() - start < 0.15
+        assert clicker.is_running is False
+
+    def test_remaining_clicks(self) -> None:
+        """Test the clicks-remaining countdown."""
+        clicker = AutoClicker(mouse=NullMouse())
+        assert clicker.get_remaining_clicks() is None
+        clicker.set_interval(0.05)
+        clicker.set_click_limit(100)
+        clicker.start()
+        time.sleep(0.12)
+        remaining = clicker.get_remaining_clicks()
+        clicker.stop()
+        assert remaining == 100 - clicker.click_count
+        assert 96 <= remaining <= 98
+
+
+class TestStuckBackend:
+    """Tests for restarting while a backend call outlives stop()'s join."""
+
+    def test_no_thread_pile_up(self) -> None:
+        """Test that a loop abandoned by stop() exits instead of clicking alongside the new one."""
+        unblock = threading.Event()
+
+        class StuckMouse(NullMouse):
+            def click(self, button, count: int = 1) -> None:
+                """Hang on the first click until released."""
+                if self.clicks == 0:
+                    unblock.wait()
+                super().click(button, count)
+
+        mouse = StuckMouse()
+        clicker = AutoClicker(mouse=mouse)
+        clicker.set_interval(0.01)
+        clicker.start()
+        time.sleep(0.05)
+        old_thread = clicker.click_thread
+        clicker.stop()  # Gives up after its join timeout
+        assert old_thread.is_alive()
+
+        clicker.start()
+        unblock.set()
+        old_thread.join(timeout=1)
+        assert not old_thread.is_alive()
+        time.sleep(0.1)
+        clicker.stop()
+        assert not clicker.click_thread.is_alive()
+        assert clicker.stats.run_clicks == clicker.click_count  # Counters belong to the new run
+
+
+class FlakyMouse(NullMouse):
+    """Raises the given errors on chosen click attempts and timestamps the clicks that succeed."""
+
+    def __init__(self, errors: dict[int, Exception] | None = None, always: Exception | None = None) -> None:
+        """Initialize the FlakyMouse with errors keyed by attempt number."""
+        super().__init__()
+        self.errors = errors or {}
+        self.always = always
+        self.attempts = 0
+        self.times: list[float] = []
+
+    def click(self, button, count: int = 1) -> None:
+        """Fail or count the click."""
+        attempt = self.attempts
+        self.attempts += 1
+        if self.always is not None:
+            raise self.always
+        if attempt in self.errors:
+            raise self.errors[attempt]
+        self.times.append(time.perf_counter())
+        super().click(button, count)
+
+
+class TestErrorHandling:
+    """Tests for backend errors in the click loop."""
+
+    def test_classification(self) -> None:
+        """Test which errors count as transient."""
+        assert is_transient(BlockingIOError())
+        assert is_transient(TimeoutError())
+        assert is_transient(OSError(16, "Device or resource busy"))
+        assert not is_transient(OSError("No such window: 0x400001"))
+        assert not is_transient(PermissionError(13, "Permission denied"))
+        assert not is_transient(RuntimeError("bug"))
+        marked = RuntimeError("display reconnecting")
+        marked.transient = True
+        assert is_transient(marked)
+
+    def test_fatal_error_stops_run(self) -> None:
+        """Test that a fatal error ends the run, is recorded, and is reported at once."""
+        stopped = []
+        mouse = FlakyMouse({2: OSError("No such window: 0x400001")})
+        clicker = AutoClicker(mouse=mouse)
+        clicker.set_interval(0.01)
+        clicker.set_stop_callback(lambda reason: stopped.append((reason, clicker.is_running)))
+        clicker.start()
+        clicker.click_thread.join(timeout=1)
+        assert clicker.is_running is False
+        assert clicker.stop_reason == "error"
+        assert stopped == [("error", False)]
+        assert clicker.stats.fatal_errors == 1
+        assert "No such window" in clicker.stats.last_error
+        assert mouse.clicks == 2
+
+    def test_transient_errors_retried(self) -> None:
+        """Test that transient errors are retried and the run goes on."""
+        errors = {n: BlockingIOError(11, "Resource temporarily unavailable") for n in range(3, 40, 6)}
+        mouse = FlakyMouse(errors)
+        clicker = AutoClicker(mouse=mouse)
+        clicker.set_interval(0.01)
+        clicker.start()
+        time.sleep(0.5)
+        assert clicker.is_running is True
+        clicker.stop()
+        assert clicker.stop_reason == "stopped"
+        assert clicker.stats.transient_errors == len(errors)
+        assert clicker.stats.fatal_errors == 0
+        assert 48 <= mouse.clicks <= 52  # No slot was lost
+
+    def test_retry_keeps_phase(self) -> None:
+        """Test that clicks after a retried one stay on the original schedule."""
+        # Three failed tries back off 1 + 2 + 4 ms before the click goes out
+        mouse = FlakyMouse({n: InterruptedError(4, "Interrupted system call") for n in (3, 4, 5)})
+        clicker = AutoClicker(mouse=mouse)
+        clicker.set_interval(0.02)
+        clicker.start()
+        time.sleep(0.25)
+        clicker.stop()
+        start = mouse.times[0]
+        # Lateness only ever adds, so the smallest offset shows the schedule's phase
+        offsets = [t - start - k * 0.02 for k, t in enumerate(mouse.times[4:], start=4)]
+        assert len(offsets) >= 5
+        assert abs(min(offsets)) < 0.003
+
+    def test_hold_press_backs_off(self) -> None:
+        """Test that a failed hold press is retried after the backoff, not at once."""
+
+        class BusyMouse(NullMouse):
+            """Fails the first three presses as busy."""
+
+            def __init__(self) -> None:
+                super().__init__()
+                self.times: list[float] = []
+
+            def press(self, button) -> None:
+                self.times.append(time.perf_counter())
+                if len(self.times) <= 3:
+                    raise BlockingIOError(11, "Resource temporarily unavailable")
+                super().press(button)
+
+        mouse = BusyMouse()
+        clicker = AutoClicker(mouse=mouse)
+        clicker.set_mode("hold")
+        clicker.start()
+        time.sleep(0.1)
+        assert clicker.is_running is True
+        assert clicker.is_holding is True
+        clicker.stop()
+        assert clicker.stats.transient_errors == 3
+        gaps = [b - a for a, b in zip(mouse.times, mouse.times[1:])]
+        assert len(gaps) == 3
+        for gap, backoff in zip(gaps, (0.001, 0.002, 0.004)):  # Doubling from RETRY_BACKOFF
+            assert gap >= backoff * 0.9
+
+    def test_retry_budget_exhausted(self) -> None:
+        """Test that a backend that keeps failing transiently ends the run."""
+        stopped = []
+        clicker = AutoClicker(mouse=FlakyMouse(always=BlockingIOError(11, "Resource temporarily unavailable")))
+        clicker.set_interval(0.001)
+        clicker.set_stop_callback(stopped.append)
+        clicker.start()
+        clicker.click_thread.join(timeout=2)
+        assert clicker.is_running is False
+        assert stopped == ["error"]
+        assert clicker.stats.transient_errors == RETRY_BUDGET
+        assert clicker.stats.fatal_errors == 1
+
+    def test_backend_creation_error(self) -> None:
+        """Test that a backend that cannot be created is reported like a fatal error."""
+        stopped = []
+        clicker = AutoClicker()
+
+        def fail() -> None:
+            raise OSError("no display")
+
+        clicker.ensure_backend = fail
+        clicker.set_stop_callback(stopped.append)
+        clicker.start()
+        clicker.click_thread.join(timeout=1)
+        assert clicker.is_running is False
+        assert stopped == ["error"]
+        assert clicker.stats.fatal_errors == 1
+
+    def test_stop_reasons(self) -> None:
+        """Test that timer and click-limit stops are reported and stop() is not."""
+        stopped = []
+        clicker = AutoClicker(mouse=NullMouse())
+        clicker.set_interval(0.001)
+        clicker.set_stop_callback(stopped.append)
+        clicker.set_click_limit(5)
+        clicker.start()
+        clicker.click_thread.join(timeout=1)
+        clicker.set_click_limit(None)
+        clicker.set_duration(0.05)
+        clicker.start()
+        clicker.click_thread.join(timeout=1)
+        clicker.set_duration(None)
+        clicker.start()
+        clicker.stop()
+        assert stopped == ["click_limit", "duration"]
+        assert clicker.stop_reason == "stopped"
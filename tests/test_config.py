@@ -0,0 +1,217 @@
+"""Unit tests for config module."""
+
+import json
+import os
+import time
+
+import pytest
+
+from src.config import (
+    CONFIG_VERSION,
+    DEFAULT_SETTINGS,
+    ConfigStore,
+    diff_settings,
+    validate_settings,
+    write_json_atomic,
+)
+
+
+class TestValidateSettings:
+    """Tests for settings validation."""
+
+    def test_non_dict_gives_defaults(self) -> None:
+        """Test that non-dict data yields the defaults."""
+        assert validate_settings(["not", "a", "dict"]) == DEFAULT_SETTINGS
+        assert validate_settings(None) == DEFAULT_SETTINGS
+
+    def test_valid_values_kept(self) -> None:
+        """Test that valid values are kept."""
+        data = {"version": 1, "cps": 12.5, "mode": "hold", "button": "right", "timer_minutes": 5}
+        settings = validate_settings(data)
+        assert settings["cps"] == 12.5
+        assert settings["mode"] == "hold"
+        assert settings["button"] == "right"
+        assert settings["timer_minutes"] == 5
+
+    def test_invalid_values_fall_back(self) -> None:
+        """Test that invalid values are replaced by defaults individually."""
+        data = {"version": 1, "cps": 500, "mode": "spam", "button": "right", "timer_hours": -1}
+        settings = validate_settings(data)
+        assert settings["cps"] == DEFAULT_SETTINGS["cps"]
+        assert settings["mode"] == DEFAULT_SETTINGS["mode"]
+        assert settings["timer_hours"] == DEFAULT_SETTINGS["timer_hours"]
+        assert settings["button"] == "right"
+
+    def test_bool_not_accepted_as_number(self) -> None:
+        """Test that booleans are not accepted for numeric settings."""
+        assert validate_settings({"version": 1, "cps": True})["cps"] == DEFAULT_SETTINGS["cps"]
+
+    def test_profiles_must_be_dict(self) -> None:
+        """Test that a non-dict profiles value falls back to no profiles."""
+        assert validate_settings({"version": 1, "profiles": ["pvp"]})["profiles"] == {}
+
+    def test_schedule_rules_validated(self) -> None:
+        """Test that a schedule with any malformed rule falls back to no schedule."""
+        rules = ["02:00-06:00 every 60m for 20m"]
+        assert validate_settings({"version": 1, "schedule": rules})["schedule"] == rules
+        assert validate_settings({"version": 1, "schedule": rules + ["nightly"]})["schedule"] == []
+
+    def test_cps_budget_validated(self) -> None:
+        """Test that the shared CPS ceiling must be a non-negative number."""
+        assert validate_settings({"version": 1, "cps_budget": 120.5})["cps_budget"] == 120.5
+        assert validate_settings({"version": 1, "cps_budget": -1})["cps_budget"] == 0
+
+    def test_focus_pause_must_be_bool(self) -> None:
+        """Test that focus_pause only accepts a boolean."""
+        assert validate_settings({"version": 1, "focus_pause": True})["focus_pause"] is True
+        assert validate_settings({"version": 1, "focus_pause": 1})["focus_pause"] is False
+
+    def test_legacy_display_hotkey_migrated(self) -> None:
+        """Test that an unversioned display-form hotkey is normalized."""
+        assert validate_settings({"hotkey": "CTRL + F6"})["hotkey"] == "ctrl+f6"
+
+
+class TestConfigStoreLoad:
+    """Tests for loading settings."""
+
+    def test_missing_file_gives_defaults(self, tmp_path) -> None:
+        """Test that a missing file loads defaults."""
+        store = ConfigStore(str(tmp_path / "config.json"))
+        assert store.load() == DEFAULT_SETTINGS
+
+    def test_corrupt_file_gives_defaults(self, tmp_path) -> None:
+        """Test that a corrupt file loads defaults instead of raising."""
+        path = tmp_path / "config.json"
+        path.write_text('{"cps": 5, ')
+        store = ConfigStore(str(path))
+        assert store.load() == DEFAULT_SETTINGS
+
+    def test_load_returns_copy(self, tmp_path) -> None:
+        """Test that mutating the loaded dict does not change the store."""
+        store = ConfigStore(str(tmp_path / "config.json"))
+        settings = store.load()
+        settings["cps"] = 99
+        assert store.get("cps") == DEFAULT_SETTINGS["cps"]
+
+
+class TestConfigStoreWrite:
+    """Tests for debounced writes."""
+
+    def test_update_is_debounced(self, tmp_path) -> None:
+        """Test that rapid updates produce no write until the delay passes."""
+        path = str(tmp_path / "config.json")
+        store = ConfigStore(path, write_delay=0.2)
+        for cps in (1.0, 12.0, 12.5):
+            store.update(cps=cps)
+        assert not os.path.exists(path)
+
+        time.sleep(0.5)
+        with open(path) as f:
+            data = json.load(f)
+        assert data["cps"] == 12.5
+        assert data["version"] == CONFIG_VERSION
+        store.flush()
+
+    def test_update_returns_quickly(self, tmp_path) -> None:
+        """Test that update() does no disk I/O on the calling thread."""
+        store = ConfigStore(str(tmp_path / "config.json"), write_delay=10)
+        start = time.perf_counter()
+        for i in range(1000):
+            store.update(cps=1.0 + i / 100)
+        assert time.perf_counter() - start < 0.5
+        store.flush()
+
+    def test_flush_writes_pending(self, tmp_path) -> None:
+        """Test that flush() writes pending changes immediately."""
+        path = str(tmp_path / "config.json")
+        store = ConfigStore(path, write_delay=10)
+        store.update(hotkey="ctrl+f7", mode="hold")
+        store.flush()
+
+        reloaded = ConfigStore(path).load()
+        assert reloaded["hotkey"] == "ctrl+f7"
+        assert reloaded["mode"] == "hold"
+
+    def test_flush_without_changes_writes_nothing(self, tmp_path) -> None:
+        """Test that flush() with nothing pending leaves no file."""
+        path = str(tmp_path / "config.json")
+        ConfigStore(path).flush()
+        assert not os.path.exists(path)
+
+    def test_unknown_setting_raises_error(self, tmp_path) -> None:
+        """Test that updating an unknown key raises KeyError."""
+        store = ConfigStore(str(tmp_path / "config.json"))
+        with pytest.raises(KeyError):
+            store.update(volume=3)
+
+
+class TestReload:
+    """Tests for re-reading changed files."""
+
+    def test_diff_settings(self) -> None:
+        """Test that only changed keys are reported."""
+        assert diff_settings({"cps": 1, "mode": "click"}, {"cps": 2, "mode": "click"}) == {"cps": 2}
+
+    def test_reload_reports_external_change(self, tmp_path) -> None:
+        """Test that reload() returns only the settings edited on disk."""
+        path = tmp_path / "config.json"
+        store = ConfigStore(str(path))
+        store.load()
+        write_json_atomic(str(path), {"version": CONFIG_VERSION, **DEFAULT_SETTINGS, "cps": 7.0})
+        assert store.reload() == {"cps": 7.0}
+        assert store.get("cps") == 7.0
+
+    def test_reload_after_own_write_is_empty(self, tmp_path) -> None:
+        """Test that our own writes produce no changes on reload."""
+        store = ConfigStore(str(tmp_path / "config.json"))
+        store.load()
+        store.update(mode="hold")
+        store.flush()
+        assert store.reload() == {}
+
+    def test_reload_keeps_unwritten_edit(self, tmp_path) -> None:
+        """Test that reload() does not revert an edit that is still waiting to be written."""
+        path = tmp_path / "config.json"
+        store = ConfigStore(str(path), write_delay=10)
+        store.load()
+        store.update(mode="hold")
+        store.flush()
+        store.update(cps=9.0)  # Made after our own write, before the watcher reloads
+        assert store.reload() == {}
+        assert store.get("cps") == 9.0
+        store.flush()
+        assert json.loads(path.read_text())["cps"] == 9.0
+
+    def test_reload_skipped_during_write(self, tmp_path) -> None:
+        """Test that reload() ignores the file while a snapshot is being written."""
+        path = tmp_path / "config.json"
+        store = ConfigStore(str(path))
+        store.load()
+        store.update(cps=9.0)
+        with store._cond:
+            snapshot = store._take_snapshot()  # Taken, but not yet on disk
+        assert store.reload() == {}
+        assert store.get("cps") == 9.0
+        store._write(snapshot)
+        assert store.reload() == {}
+
+
+class TestWriteJsonAtomic:
+    """Tests for atomic file replacement."""
+
+    def test_replaces_file_and_leaves_no_temp(self, tmp_path) -> None:
+        """Test that the file is replaced and no temp file remains."""
+        path = tmp_path / "config.json"
+        path.write_text("old")
+        write_json_atomic(str(path), {"a": 1})
+        assert json.loads(path.read_text()) == {"a": 1}
+        assert os.listdir(tmp_path) == ["config.json"]
+
+    def test_failed_write_keeps_old_file(self, tmp_path) -> None:
+        """Test that a serialization failure leaves the old file intact."""
+        path = tmp_path / "config.json"
+        path.write_text('{"a": 1}')
+        with pytest.raises(TypeError):
+            write_json_atomic(str(path), {"a": object()})
+        assert json.loads(path.read_text()) == {"a": 1}
+        assert os.listdir(tmp_path) == ["config.json"]
@@ -0,0 +1,170 @@
+"""Unit tests for coordination module."""
+
+import json
+import socket
+import time
+
+import pytest
+
+from src.backends import NullMouse
+from src.clicker import AutoClicker
+from src.coordination import DEFAULT_HOST, ClickAgent, Coordinator, run_session, seal, unseal
+
+SECRET = b"test secret"
+
+
+@pytest.fixture
+def agents():
+    """Three null-backend agents on localhost, whose clocks are off by different amounts."""
+    started = []
+    for skew in (0.0, 2.5, -1.25):
+        clicker = AutoClicker(mouse=NullMouse())
+        clicker.set_interval(0.01)
+        agent = ClickAgent(clicker, SECRET, port=0, clock=lambda s=skew: time.time() + s)
+        agent.start()
+        started.append(agent)
+    yield started
+    for agent in started:
+        agent.stop()
+
+
+class TestCoordinator:
+    """Tests for clock sync and coordinated starts."""
+
+    def test_sync_estimates_offsets(self, agents) -> None:
+        """Test that clock offsets are recovered to well under a millisecond on localhost."""
+        coordinator = Coordinator([("127.0.0.1", a.port) for a in agents], SECRET)
+        try:
+            offsets = list(coordinator.sync().values())
+        finally:
+            coordinator.close()
+        assert offsets == pytest.approx([0.0, 2.5, -1.25], abs=0.001)
+
+    def test_start_skew(self, agents) -> None:
+        """Test that agents with skewed clocks start within a few milliseconds of each other."""
+        coordinator = Coordinator([("127.0.0.1", a.port) for a in agents], SECRET)
+        try:
+            report = run_session(coordinator, lead=0.2, seconds=0.2)
+        finally:
+            coordinator.close()
+        print(f"start skew: {report['start_skew_ms']:.3f} ms")
+        assert report["start_skew_ms"] is not None
+        assert report["start_skew_ms"] < 5.0
+        for agent, entry in zip(agents, report["agents"]):
+            assert entry["clicks"] >= 10
+            assert agent.clicker.is_running is False
+
+    def test_start_waits_for_time(self, agents) -> None:
+        """Test that no agent clicks before the scheduled start."""
+        coordinator = Coordinator([("127.0.0.1", a.port) for a in agents], SECRET)
+        try:
+            coordinator.sync()
+            coordinator.start_at(coordinator.clock() + 0.2)
+            time.sleep(0.1)
+            assert all(a.clicker.stats.clicks_total == 0 for a in agents)
+            time.sleep(0.2)
+            assert all(a.clicker.stats.clicks_total > 0 for a in agents)
+        finally:
+            coordinator.close()
+
+    def test_unknown_command(self, agents) -> None:
+        """Test that agents reject unknown commands."""
+        coordinator = Coordinator([("127.0.0.1", agents[0].port)], SECRET)
+        try:
+            with pytest.raises(RuntimeError):
+                coordinator._request(coordinator.agents[0], {"cmd": "explode"})
+        finally:
+            coordinator.close()
+
+    def test_unreachable_agent(self) -> None:
+        """Test that a silent agent raises TimeoutError."""
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as silent:
+            silent.bind(("127.0.0.1", 0))
+            coordinator = Coordinator([silent.getsockname()], SECRET)
+            coordinator._sock.settimeout(0.05)
+            try:
+                with pytest.raises(TimeoutError):
+                    coordinator.sync(rounds=1)
+            finally:
+                coordinator.close()
+
+
+def exchange(port: int, data: bytes, timeout: float = 0.2) -> dict | None:
+    """Send one raw datagram to an agent and return its unsealed reply, or None if it stays silent."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.settimeout(timeout)
+        sock.sendto(data, ("127.0.0.1", port))
+        try:
+            reply, _ = sock.recvfrom(4096)
+        except socket.timeout:
+            return None
+    return unseal(SECRET, reply)
+
+
+class TestAuthentication:
+    """Tests for rejecting forged, replayed and duplicated commands."""
+
+    def test_default_host_is_loopback(self) -> None:
+        """Test that agents only listen on localhost unless told otherwise."""
+        assert DEFAULT_HOST == "127.0.0.1"
+
+    def test_secret_required(self) -> None:
+        """Test that an agent or coordinator without a secret is refused."""
+        with pytest.raises(ValueError):
+            ClickAgent(AutoClicker(mouse=NullMouse()), b"")
+        with pytest.raises(ValueError):
+            Coordinator([("127.0.0.1", 1)], b"")
+
+    def test_seal_round_trip(self) -> None:
+        """Test that a sealed message opens with the same secret only."""
+        data = seal(SECRET, {"cmd": "sync"})
+        assert unseal(SECRET, data) == {"cmd": "sync"}
+        assert unseal(b"other secret", data) is None
+        assert unseal(SECRET, data[:-1] + b" ") is None
+
+    def test_unauthenticated_start_ignored(self, agents) -> None:
+        """Test that a start without a valid tag gets no reply and does not click."""
+        agent = agents[0]
+        forged = json.dumps({"cmd": "start", "at": time.time(), "session": "x", "seq": 0, "nonce": agent.nonce})
+        assert exchange(agent.port, forged.encode()) is None
+        assert exchange(agent.port, seal(b"wrong secret", json.loads(forged))) is None
+        time.sleep(0.05)
+        assert agent.rejected == 2
+        assert agent.clicker.is_running is False
+
+    def test_wrong_secret_coordinator_times_out(self, agents) -> None:
+        """Test that a coordinator with the wrong secret gets no answers."""
+        coordinator = Coordinator([("127.0.0.1", agents[0].port)], b"wrong secret")
+        coordinator._sock.settimeout(0.05)
+        try:
+            with pytest.raises(TimeoutError):
+                coordinator.sync(rounds=1)
+        finally:
+            coordinator.close()
+
+    def test_retransmitted_start_runs_once(self, agents) -> None:
+        """Test that a duplicate start datagram is answered from the cache, not scheduled again."""
+        agent = agents[0]
+        start = seal(SECRET, {"cmd": "start", "at": agent.clock() + 0.1, "session": "s", "seq": 1, "nonce": agent.nonce})
+        first = exchange(agent.port, start)
+        second = exchange(agent.port, start)
+        assert first is not None and first.get("ok") is True
+        assert second == first
+        assert agent.duplicates == 1
+        assert len(agent._timers) == 1
+        agent.clicker.stop()
+
+    def test_replayed_start_rejected(self, agents) -> None:
+        """Test that a recorded start cannot be replayed after a later command."""
+        agent = agents[0]
+        start = seal(SECRET, {"cmd": "start", "at": agent.clock(), "session": "s", "seq": 1, "nonce": agent.nonce})
+        nonce = exchange(agent.port, start)["nonce"]
+        stop = seal(SECRET, {"cmd": "stop", "at": agent.clock(), "session": "s", "seq": 2, "nonce": nonce})
+        assert exchange(agent.port, stop).get("ok") is True
+        time.sleep(0.05)
+        assert agent.clicker.is_running is False
+
+        replay = exchange(agent.port, start)
+        assert "error" in replay
+        time.sleep(0.05)
+        assert agent.clicker.is_running is False
@@ -0,0 +1,194 @@
+"""Unit tests for focus module."""
+
+import ctypes
+import shutil
+import threading
+import time
+
+import pytest
+
+from src.backends import NullMouse
+from src.clicker import AutoClicker
+from src.focus import FocusGuard, measure_switch_latency, set_active_window
+from src.loopback import launch_xvfb
+from src.trigger import PAUSE_REASON, HoldTrigger
+from src.xwindow import XPropertyEvent, active_window, close_display, load_xlib, open_display
+
+try:
+    load_xlib()
+    HAVE_XLIB = True
+except OSError:
+    HAVE_XLIB = False
+
+GAME, OTHER = 0x400001, 0x500001
+
+
+@pytest.fixture
+def guard():
+    """A FocusGuard fed focus changes by hand, with the game focused and tracked."""
+    guard = FocusGuard(AutoClicker(mouse=NullMouse()))
+    guard.set_active(GAME)
+    guard.track()
+    yield guard
+    guard.clicker.stop()
+
+
+class TestFocusGuard:
+    """Tests for pausing on focus changes."""
+
+    def test_track_defaults_to_focused_window(self, guard) -> None:
+        """Test that the window focused when tracking starts becomes the target."""
+        assert guard.target == GAME
+        assert guard.focused
+
+    def test_pause_and_resume(self, guard) -> None:
+        """Test that losing focus pauses and regaining it resumes."""
+        changes = []
+        guard.on_change = changes.append
+        guard.set_active(OTHER)
+        assert guard.clicker.is_paused
+        guard.set_active(GAME)
+        assert not guard.clicker.is_paused
+        assert changes == [False, True]
+        assert guard.focus_changes == 2
+
+    def test_leaves_other_pauses_alone(self, guard) -> None:
+        """Test that a pause made by someone else is not undone."""
+        guard.clicker.pause()
+        guard.set_active(OTHER)
+        guard.set_active(GAME)
+        assert guard.clicker.is_paused
+
+    def test_unknown_focus_never_pauses(self, guard) -> None:
+        """Test that nothing is paused when the focused window is unknown."""
+        guard.set_active(None)
+        assert not guard.clicker.is_paused
+
+    def test_retrack_resumes(self, guard) -> None:
+        """Test that tracking the newly focused window lifts the guard's pause."""
+        guard.set_active(OTHER)
+        guard.track()
+        assert guard.target == OTHER
+        assert not guard.clicker.is_paused
+
+    def test_stop_resumes(self, guard) -> None:
+        """Test that stopping the guard lifts its pause."""
+        guard.set_active(OTHER)
+        guard.stop()
+        assert not guard.clicker.is_paused
+
+    def test_starts_paused_while_unfocused(self, guard) -> None:
+        """Test that a clicker started while the target is away waits for focus."""
+        guard.set_active(OTHER)
+        guard.clicker.set_interval(0.01)
+        guard.clicker.start()
+        time.sleep(0.05)
+        assert guard.clicker.mouse.clicks == 0
+        guard.set_active(GAME)
+        time.sleep(0.05)
+        assert guard.clicker.mouse.clicks > 0
+
+    def test_interleaves_with_hold_trigger(self, guard) -> None:
+        """Test that clicks need both focus and the held trigger, whichever changes first."""
+        clicker = guard.clicker
+        clicker.set_interval(0.005)
+        trigger = HoldTrigger(clicker, "x1")
+        clicker.pause(PAUSE_REASON)  # As arm() leaves it, without hooking real input
+        clicker.start()
+
+        def clicking() -> bool:
+            clicks = clicker.mouse.clicks
+            time.sleep(0.05)
+            return clicker.mouse.clicks > clicks
+
+        guard.set_active(OTHER)
+        trigger.on_press()
+        assert clicker.is_paused and not clicking()  # Held, but the window is away
+        guard.set_active(GAME)
+        assert clicking()
+        trigger.on_release()
+        time.sleep(0.01)
+        assert not clicking()
+        guard.set_active(OTHER)
+        guard.set_active(GAME)
+        assert clicker.is_paused and not clicking()  # Focus back, but the trigger is up
+        trigger.on_press()
+        assert clicking()
+
+
+class TestPropertyEvent:
+    """Tests for the PropertyNotify struct."""
+
+    def test_struct_layout(self) -> None:
+        """Test that the struct matches Xlib's 64-bit size."""
+        assert ctypes.sizeof(XPropertyEvent) == 64
+
+
+@pytest.mark.skipif(not HAVE_XLIB, reason="libX11 not installed")
+class TestNoDisplay:
+    """Tests for failing cleanly without an X server."""
+
+    def test_start_missing_display_raises_error(self) -> None:
+        """Test that starting without a display raises OSError."""
+        guard = FocusGuard(AutoClicker(mouse=NullMouse()), display_name=":987")
+        with pytest.raises(OSError):
+            guard.start()
+
+
+@pytest.fixture
+def xvfb():
+    """Run a private Xvfb server and yield its display name."""
+    if not HAVE_XLIB or shutil.which("Xvfb") is None:
+        pytest.skip("Xvfb not installed")
+    try:
+        server, name = launch_xvfb()
+    except RuntimeError:
+        pytest.skip("Xvfb did not start")
+    try:
+        yield name
+    finally:
+        server.terminate()
+        server.wait()
+
+
+class TestXvfb:
+    """Tests against a real X server, with the test playing the window manager."""
+
+    def test_active_window_property(self, xvfb: str) -> None:
+        """Test reading back what the window manager set."""
+        display = open_display(xvfb)
+        try:
+            assert active_window(display) is None
+            set_active_window(display, GAME)
+            assert active_window(display) == GAME
+        finally:
+            close_display(display)
+
+    def test_switch_pauses(self, xvfb: str) -> None:
+        """Test that focus switches reported by the server pause and resume the clicker."""
+        wm = open_display(xvfb)
+        changed = threading.Event()
+        clicker = AutoClicker(mouse=NullMouse())
+        guard = FocusGuard(clicker, xvfb, on_change=lambda focused: changed.set())
+        try:
+            set_active_window(wm, GAME)
+            guard.start()
+            guard.track()
+            assert guard.target == GAME
+            set_active_window(wm, OTHER)
+            assert changed.wait(1)
+            assert clicker.is_paused
+            changed.clear()
+            set_active_window(wm, GAME)
+            assert changed.wait(1)
+            assert not clicker.is_paused
+        finally:
+            guard.stop()
+            close_display(wm)
+
+    def test_latency_report(self, xvfb: str) -> None:
+        """Test that switches pause the clicker within a few milliseconds."""
+        report = measure_switch_latency(10, xvfb)
+        assert report["missed"] == 0
+        assert report["switch_to_pause_ms"]["p50"] < 10
+        assert report["switch_to_first_click_ms"]["p50"] < 10
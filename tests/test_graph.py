@@ -0,0 +1,213 @@
+"""Unit tests for graph module."""
+
+import threading
+import time
+
+import pytest
+
+from src.backends import NullMouse
+from src.clicker import AutoClicker
+from src.graph import RateGraph, RateSampler
+from src.stats import ClickStats
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Initialize the FakeClock."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+class FakeCanvas:
+    """Records the item calls a tkinter Canvas would receive."""
+
+    def __init__(self) -> None:
+        """Initialize the FakeCanvas."""
+        self.items: dict[int, tuple] = {}
+        self.created = 0
+        self.moves = 0
+        self._next = 1
+
+    def _create(self, kind: str, *coords: float, **options) -> int:
+        """Store a new item and return its id."""
+        item = self._next
+        self._next += 1
+        self.items[item] = (kind, coords, options)
+        self.created += 1
+        return item
+
+    def create_line(self, *coords: float, **options) -> int:
+        """Create a line item."""
+        return self._create("line", *coords, **options)
+
+    def create_text(self, *coords: float, **options) -> int:
+        """Create a text item."""
+        return self._create("text", *coords, **options)
+
+    def itemconfigure(self, item: int, **options) -> None:
+        """Change an item's options."""
+        kind, coords, old = self.items[item]
+        self.items[item] = (kind, coords, {**old, **options})
+
+    def move(self, tag: str, dx: float, dy: float) -> None:
+        """Shift the tagged items."""
+        self.moves += 1
+        for item, (kind, coords, options) in self.items.items():
+            if tag in options.get("tags", ()):
+                shifted = tuple(c + (dx if i % 2 == 0 else dy) for i, c in enumerate(coords))
+                self.items[item] = (kind, shifted, options)
+
+    def delete(self, tag_or_item) -> None:
+        """Delete an item or every item with a tag."""
+        for item in [i for i, (_, _, o) in self.items.items() if i == tag_or_item or tag_or_item in o.get("tags", ())]:
+            del self.items[item]
+
+    def tag_lower(self, item: int) -> None:
+        """Lower an item below the others."""
+
+    def series(self) -> list[int]:
+        """Get the ids of the plotted segments."""
+        return [i for i, (_, _, o) in self.items.items() if "rate_series" in o.get("tags", ())]
+
+
+def make_graph(buckets: int = 5) -> tuple[RateGraph, ClickStats, FakeClock, FakeCanvas]:
+    """Create a graph over fake stats, clock and canvas."""
+    stats = ClickStats()
+    clock = FakeClock()
+    canvas = FakeCanvas()
+    graph = RateGraph(canvas, RateSampler(stats, buckets=buckets, clock=clock), width=100, height=50)
+    return graph, stats, clock, canvas
+
+
+def advance(stats: ClickStats, clock: FakeClock, clicks: int, error: float = 0.0, seconds: float = 1.0) -> None:
+    """Record clicks spread over a period."""
+    for _ in range(clicks):
+        stats.record_click(error, 0.0)
+    clock.now += seconds
+
+
+class TestRateSampler:
+    """Tests for downsampling counters into buckets."""
+
+    def test_too_few_buckets_raises_error(self) -> None:
+        """Test that a sampler needs at least two buckets."""
+        with pytest.raises(ValueError):
+            RateSampler(ClickStats(), buckets=1)
+
+    def test_sample_rate_and_error(self) -> None:
+        """Test that a sample covers only the clicks since the previous one."""
+        stats = ClickStats()
+        clock = FakeClock()
+        sampler = RateSampler(stats, clock=clock)
+        advance(stats, clock, 20, error=0.002, seconds=2.0)
+        assert sampler.sample() == pytest.approx((10.0, 2.0))
+        advance(stats, clock, 5, error=0.001, seconds=0.5)
+        assert sampler.sample() == pytest.approx((10.0, 1.0))
+        clock.now += 1.0
+        assert sampler.sample() == (0.0, 0.0)
+
+    def test_fixed_number_of_buckets(self) -> None:
+        """Test that only the newest samples are kept."""
+        stats = ClickStats()
+        clock = FakeClock()
+        sampler = RateSampler(stats, buckets=3, clock=clock)
+        for clicks in (1, 2, 3, 4):
+            advance(stats, clock, clicks)
+            sampler.sample()
+        assert [cps for cps, _ in sampler.samples] == [2.0, 3.0, 4.0]
+
+    def test_set_stats(self) -> None:
+        """Test that switching engines does not count the new engine's history."""
+        stats = ClickStats()
+        clock = FakeClock()
+        sampler = RateSampler(ClickStats(), clock=clock)
+        advance(stats, clock, 50)
+        sampler.set_stats(stats)
+        advance(stats, clock, 3)
+        assert sampler.sample()[0] == pytest.approx(1.5)
+
+
+class TestRateGraph:
+    """Tests for incremental graph drawing."""
+
+    def test_one_segment_per_series_per_update(self) -> None:
+        """Test that an update creates exactly the newest segments."""
+        graph, stats, clock, canvas = make_graph()
+        graph.set_target(10.0)
+        for _ in range(3):
+            advance(stats, clock, 10)
+            graph.update()
+        created = canvas.created
+        redraws = graph.redraws
+        advance(stats, clock, 10)
+        graph.update()
+        assert canvas.created == created + 2  # One CPS and one error segment
+        assert graph.redraws == redraws
+
+    def test_segment_count_is_bounded(self) -> None:
+        """Test that segments scrolled off the left edge are deleted."""
+        graph, stats, clock, canvas = make_graph(buckets=5)
+        graph.set_target(10.0)
+        for _ in range(50):
+            advance(stats, clock, 10)
+            graph.update()
+        assert len(canvas.series()) == 2 * 4
+        xs = [x for item in canvas.series() for x in canvas.items[item][1][::2]]
+        assert min(xs) == pytest.approx(0.0)
+        assert max(xs) == pytest.approx(100.0)
+
+    def test_scale_grows_with_redraw(self) -> None:
+        """Test that a rate above the scale triggers one full redraw."""
+        graph, stats, clock, canvas = make_graph()
+        graph.set_target(10.0)
+        redraws = graph.redraws
+        advance(stats, clock, 100)
+        graph.update()
+        assert graph.redraws == redraws + 1
+        assert graph.cps_scale >= 100.0
+        ys = [y for item in canvas.series() for y in canvas.items[item][1][1::2]]
+        assert all(0 <= y <= 50 for y in ys)
+
+    def test_hidden_graph_does_not_draw(self) -> None:
+        """Test that samples are collected but not drawn while hidden."""
+        graph, stats, clock, canvas = make_graph()
+        graph.set_target(10.0)
+        graph.set_visible(False)
+        created = canvas.created
+        for _ in range(4):
+            advance(stats, clock, 10)
+            graph.update()
+        assert canvas.created == created
+        assert canvas.moves == 0
+        assert len(graph.sampler.samples) == 4
+
+        graph.set_visible(True)
+        assert len(canvas.series()) == 2 * 3
+
+    def test_sampling_does_not_disturb_clicking(self) -> None:
+        """Test that drawing at a high frame rate does not make a fast clicker miss deadlines."""
+        clicker = AutoClicker(mouse=NullMouse())
+        clicker.set_interval(0.005)
+        graph = RateGraph(FakeCanvas(), RateSampler(clicker.stats), width=276, height=52)
+        graph.set_target(200.0)
+        stop = threading.Event()
+
+        def draw() -> None:
+            while not stop.is_set():
+                graph.update()
+                time.sleep(0.01)
+
+        drawer = threading.Thread(target=draw)
+        clicker.start()
+        drawer.start()
+        time.sleep(0.5)
+        stop.set()
+        drawer.join()
+        clicker.stop()
+        assert clicker.stats.missed_deadlines <= 1
+        assert max(cps for cps, _ in graph.sampler.samples) > 100
@@ -78,6 +78,42 @@ class TestRegisterCallback:
         assert manager.callback is callback2
 
 
+class TestChangeHotkey:
+    """Tests for replacing the toggle hotkey."""
+
+    def test_change_hotkey_not_listening(self) -> None:
+        """Test changing the hotkey while not listening."""
+        manager = HotkeyManager()
+        manager.change_hotkey("CTRL+F7")
+        assert manager.hotkey == "ctrl+f7"
+
+
+class TestBindings:
+    """Tests for extra hotkey bindings."""
+
+    def test_bind_adds_lowercase(self) -> None:
+        """Test that bind stores the hotkey lowercased."""
+        manager = HotkeyManager()
+
+        def callback() -> None:
+            pass
+
+        manager.bind("CTRL+1", callback)
+        assert manager.bindings == {"ctrl+1": callback}
+
+    def test_unbind_removes(self) -> None:
+        """Test that unbind removes a binding."""
+        manager = HotkeyManager()
+        manager.bind("ctrl+1", lambda: None)
+        manager.unbind("ctrl+1")
+        assert manager.bindings == {}
+
+    def test_unbind_unknown_safe(self) -> None:
+        """Test that unbinding an unknown hotkey is safe."""
+        manager = HotkeyManager()
+        manager.unbind("ctrl+9")  # Should not raise exception
+
+
 class TestGetHotkeyDisplay:
     """Tests for display formatting."""
 
@@ -129,6 +165,24 @@ class TestParseHotkeyInput:
         assert result == "f6"
 
 
+class TestDispatchLatency:
+    """Tests for hotkey dispatch timing."""
+
+    def test_dispatch_recorded(self) -> None:
+        """Test that dispatching the hotkey records its latency."""
+        manager = HotkeyManager()
+        manager.register_callback(lambda: None)
+        manager._on_hotkey_press()
+        assert manager.dispatch_count == 1
+        assert manager.last_dispatch_latency is not None
+
+    def test_no_callback_not_recorded(self) -> None:
+        """Test that a press without a callback records nothing."""
+        manager = HotkeyManager()
+        manager._on_hotkey_press()
+        assert manager.dispatch_count == 0
+
+
 class TestListening:
     """Tests for listener control."""
 
@@ -0,0 +1,181 @@
+"""Unit tests for instance module."""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.instance import (
+    INFO_FILE_NAME,
+    INSTANCE_DIR_ENV_VAR,
+    LOCK_FILE_NAME,
+    CommandServer,
+    InstanceLock,
+    benchmark,
+    forward,
+    instance_dir,
+    parse_command,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Run a CommandServer recording the commands it receives."""
+    received = []
+
+    def handler(command: str, argument: str | None) -> None:
+        if argument == "missing":
+            raise KeyError(argument)
+        received.append((command, argument))
+
+    server = CommandServer(handler, str(tmp_path / INFO_FILE_NAME))
+    server.received = received
+    server.start()
+    yield server
+    server.stop()
+
+
+class TestInstanceLock:
+    """Tests for the single-instance lock."""
+
+    def test_second_holder_refused(self, tmp_path) -> None:
+        """Test that only one holder gets the lock until it is released."""
+        path = str(tmp_path / LOCK_FILE_NAME)
+        first, second = InstanceLock(path), InstanceLock(path)
+        assert first.acquire()
+        assert first.acquire()  # Idempotent for the holder
+        assert not second.acquire()
+        first.release()
+        assert second.acquire()
+        second.release()
+
+
+    @pytest.mark.skipif(os.name == "nt", reason="uses XDG_RUNTIME_DIR")
+    def test_default_dir_per_user(self, tmp_path, monkeypatch) -> None:
+        """Test that the default directory is a fixed per-user one, created on first use."""
+        monkeypatch.delenv(INSTANCE_DIR_ENV_VAR, raising=False)
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        assert instance_dir() == str(tmp_path / "mcclicker")
+        assert os.path.isdir(tmp_path / "mcclicker")
+        assert instance_dir() == str(tmp_path / "mcclicker")  # Same for every launch
+
+    @pytest.mark.skipif(os.name == "nt", reason="uses HOME")
+    def test_default_dir_without_runtime_dir(self, tmp_path, monkeypatch) -> None:
+        """Test that ~/.cache is used where there is no XDG_RUNTIME_DIR."""
+        monkeypatch.delenv(INSTANCE_DIR_ENV_VAR, raising=False)
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+        monkeypatch.setenv("HOME", str(tmp_path))
+        assert instance_dir() == str(tmp_path / ".cache" / "mcclicker")
+
+
+class TestParseCommand:
+    """Tests for reading the command from the command line."""
+
+    def test_default_is_show(self) -> None:
+        """Test that a plain launch asks to show the window."""
+        assert parse_command([]) == ("show", None)
+
+    def test_commands(self) -> None:
+        """Test each option."""
+        assert parse_command(["--toggle"]) == ("toggle", None)
+        assert parse_command(["--stop"]) == ("stop", None)
+        assert parse_command(["--profile", "pvp"]) == ("profile", "pvp")
+
+    def test_conflicting_options_rejected(self) -> None:
+        """Test that only one command can be given."""
+        with pytest.raises(SystemExit):
+            parse_command(["--start", "--stop"])
+
+
+class TestForwarding:
+    """Tests for sending commands to a running instance."""
+
+    def test_command_reaches_handler(self, server) -> None:
+        """Test that forward() returns once the handler has run."""
+        forward("toggle", info_path=server.info_path)
+        forward("profile", "pvp", info_path=server.info_path)
+        assert server.received == [("toggle", None), ("profile", "pvp")]
+        assert server.commands_handled == 2
+
+    def test_info_file_private(self, server) -> None:
+        """Test that the port file is readable only by its owner."""
+        if os.name != "nt":
+            assert os.stat(server.info_path).st_mode & 0o077 == 0
+        with open(server.info_path) as f:
+            assert json.load(f)["port"] == server.port
+
+    def test_bad_token_rejected(self, server) -> None:
+        """Test that a request without the published token does nothing."""
+        with socket.create_connection(("127.0.0.1", server.port)) as sock:
+            sock.sendall(json.dumps({"token": "guess", "command": "toggle"}).encode() + b"\n")
+            assert sock.makefile("rb").readline() == b"error: bad token\n"
+        assert server.received == []
+
+    def test_errors_reported_to_sender(self, server) -> None:
+        """Test that unknown commands and failing handlers raise RuntimeError."""
+        with pytest.raises(RuntimeError):
+            forward("explode", info_path=server.info_path)
+        with pytest.raises(RuntimeError):
+            forward("profile", "missing", info_path=server.info_path)
+
+    def test_no_instance(self, tmp_path) -> None:
+        """Test that forwarding gives up after its timeout."""
+        start = time.monotonic()
+        with pytest.raises(ConnectionError):
+            forward("toggle", info_path=str(tmp_path / INFO_FILE_NAME), timeout=0.1)
+        assert time.monotonic() - start < 1
+
+    def test_stop_withdraws_info_file(self, server) -> None:
+        """Test that a stopped server removes its port file."""
+        server.stop()
+        assert not os.path.exists(server.info_path)
+
+
+class TestLauncher:
+    """Tests for a second launch."""
+
+    def test_second_launch_forwards_without_gui_imports(self, tmp_path, server) -> None:
+        """Test that a second launch forwards its command and never loads the GUI stack."""
+        lock = InstanceLock(str(tmp_path / LOCK_FILE_NAME))
+        assert lock.acquire()
+        script = (
+            "import sys\n"
+            "from src.launcher import main\n"
+            "main(['--profile', 'pvp'])\n"
+            "print(sorted(m for m in ('tkinter', 'pynput', 'keyboard') if m in sys.modules))\n"
+        )
+        env = {**os.environ, INSTANCE_DIR_ENV_VAR: str(tmp_path)}
+        try:
+            result = subprocess.run(
+                [sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True, text=True, timeout=10
+            )
+        finally:
+            lock.release()
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "[]"
+        assert server.received == [("profile", "pvp")]
+
+    def test_failed_forward_exits_non_zero(self, tmp_path) -> None:
+        """Test that a second launch reports a running instance that does not answer."""
+        lock = InstanceLock(str(tmp_path / LOCK_FILE_NAME))
+        assert lock.acquire()
+        env = {**os.environ, INSTANCE_DIR_ENV_VAR: str(tmp_path)}
+        try:
+            result = subprocess.run(
+                [sys.executable, "-m", "src.launcher", "--toggle"], cwd=ROOT, env=env, capture_output=True, timeout=10
+            )
+        finally:
+            lock.release()
+        assert result.returncode == 1
+
+    def test_benchmark(self) -> None:
+        """Test that the benchmark times both ways of forwarding."""
+        report = benchmark(runs=2)
+        assert report["forward"]["median_ms"] < 100
+        assert report["second_launch"]["median_ms"] > report["forward"]["median_ms"]
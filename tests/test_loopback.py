@@ -0,0 +1,137 @@
+"""Unit tests for loopback module."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from src.backends import NullMouse
+from src.loopback import RecordingMouse, launch_xvfb, latency_summary, match_clicks
+
+
+class TestMatchClicks:
+    """Tests for pairing injections with deliveries."""
+
+    def test_all_delivered(self) -> None:
+        """Test that in-order deliveries pair one-to-one."""
+        latencies, lost = match_clicks([1.0, 2.0, 3.0], [1.001, 2.002, 3.003])
+        assert latencies == pytest.approx([0.001, 0.002, 0.003])
+        assert lost == 0
+
+    def test_lost_click(self) -> None:
+        """Test that a missing delivery counts as lost, not as a huge latency."""
+        latencies, lost = match_clicks([1.0, 2.0, 3.0], [1.001, 3.001], window=0.5)
+        assert latencies == pytest.approx([0.001, 0.001])
+        assert lost == 1
+
+    def test_trailing_injections_lost(self) -> None:
+        """Test that injections after the last delivery are lost."""
+        latencies, lost = match_clicks([1.0, 2.0], [1.001])
+        assert len(latencies) == 1
+        assert lost == 1
+
+    def test_stray_delivery_ignored(self) -> None:
+        """Test that a delivery before any injection is ignored."""
+        latencies, lost = match_clicks([2.0], [1.0, 2.001])
+        assert latencies == pytest.approx([0.001])
+        assert lost == 0
+
+    def test_empty(self) -> None:
+        """Test empty inputs."""
+        assert match_clicks([], []) == ([], 0)
+
+
+class TestLatencySummary:
+    """Tests for latency distribution summaries."""
+
+    def test_summary_in_ms(self) -> None:
+        """Test percentiles are reported in milliseconds."""
+        summary = latency_summary([i / 1000 for i in range(1, 101)])
+        assert summary["p50"] == pytest.approx(51.0)
+        assert summary["p99"] == pytest.approx(100.0)
+        assert summary["max"] == pytest.approx(100.0)
+        assert summary["mean"] == pytest.approx(50.5)
+
+    def test_empty_summary(self) -> None:
+        """Test that no latencies give None values."""
+        assert latency_summary([])["p50"] is None
+
+
+class TestRecordingMouse:
+    """Tests for the timestamping backend wrapper."""
+
+    def test_records_and_forwards(self) -> None:
+        """Test that clicks are timestamped and passed through."""
+        inner = NullMouse()
+        mouse = RecordingMouse(inner)
+        mouse.click("left", 2)
+        mouse.press("left")
+        mouse.release("left")
+        assert len(mouse.injected) == 2
+        assert inner.clicks == 2
+        assert inner.presses == 1
+        assert inner.releases == 1
+
+
+def fake_xvfb(tmp_path, monkeypatch, script: str) -> None:
+    """Put an Xvfb stand-in first on PATH; `fd` is its -displayfd argument."""
+    path = tmp_path / "Xvfb"
+    path.write_text(
+        f"#!{sys.executable}\n"
+        "import os, sys, time\n"
+        "fd = int(sys.argv[sys.argv.index('-displayfd') + 1])\n"
+        + script
+    )
+    path.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Xvfb is POSIX-only")
+class TestLaunchXvfb:
+    """Tests for starting Xvfb, using a stand-in script."""
+
+    def test_reports_bound_display(self, tmp_path, monkeypatch) -> None:
+        """Test that the display comes from what the server writes to -displayfd."""
+        fake_xvfb(tmp_path, monkeypatch, "os.write(fd, b'42\\n')\ntime.sleep(30)\n")
+        process, display = launch_xvfb()
+        try:
+            assert display == ":42"
+            assert process.poll() is None
+        finally:
+            process.kill()
+            process.wait()
+
+    def test_server_that_exits_fails(self, tmp_path, monkeypatch) -> None:
+        """Test that a server exiting at startup (e.g. display already active) raises."""
+        fake_xvfb(tmp_path, monkeypatch, "sys.exit('server already active')\n")
+        with pytest.raises(RuntimeError):
+            launch_xvfb(":99")
+
+    def test_silent_server_times_out(self, tmp_path, monkeypatch) -> None:
+        """Test that a server that never reports ready is killed after the timeout."""
+        fake_xvfb(tmp_path, monkeypatch, "time.sleep(30)\n")
+        with pytest.raises(RuntimeError):
+            launch_xvfb(timeout=0.2)
+
+
+@pytest.mark.skipif(shutil.which("Xvfb") is None, reason="Xvfb not installed")
+class TestLoopbackUnderXvfb:
+    """End-to-end run on a virtual display."""
+
+    def test_report(self, tmp_path) -> None:
+        """Test that a short run delivers clicks and writes a JSON report."""
+        output = tmp_path / "report.json"
+        subprocess.run(
+            [sys.executable, "-m", "src.loopback", "--xvfb", "--rates", "20",
+             "--seconds", "1", "--output", str(output)],
+            check=True,
+            timeout=60,
+        )
+        report = json.loads(output.read_text())
+        result = report["results"][0]
+        assert result["target_cps"] == 20
+        assert result["delivered"] >= 15
+        assert result["latency_ms"]["p50"] < 50
@@ -0,0 +1,102 @@
+"""Unit tests for metrics module."""
+
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.backends import NullMouse
+from src.cadence import Cadence
+from src.clicker import AutoClicker
+from src.hotkey import HotkeyManager
+from src.metrics import MetricsServer, render_metrics
+from src.schedule import IntervalSchedule
+
+
+def parse_metrics(text: str) -> dict[str, float]:
+    """Parse sample lines of Prometheus text into a dict."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+class TestRenderMetrics:
+    """Tests for metrics rendering."""
+
+    def test_idle_clicker(self) -> None:
+        """Test metrics for a clicker that never ran."""
+        clicker = AutoClicker(mouse=NullMouse())
+        clicker.set_interval(0.1)
+        samples = parse_metrics(render_metrics(clicker))
+        assert samples["mcclicker_clicks_total"] == 0
+        assert samples["mcclicker_configured_cps"] == pytest.approx(10.0)
+        assert samples["mcclicker_running"] == 0
+        assert samples['mcclicker_interval_error_seconds_bucket{le="+Inf"}'] == 0
+        assert samples['mcclicker_backend_errors_total{kind="fatal"}'] == 0
+
+    def test_configured_cps_follows_sampler_and_mode(self) -> None:
+        """Test that the configured rate comes from an interval schedule's mean and is 0 while holding."""
+        clicker = AutoClicker(mouse=NullMouse())
+        clicker.set_interval(0.1)
+        clicker.set_interval_sampler(IntervalSchedule("lognormal", 0.05, 0.01))
+        assert parse_metrics(render_metrics(clicker))["mcclicker_configured_cps"] == pytest.approx(20.0)
+        clicker.set_interval_sampler(IntervalSchedule.empirical(Cadence((0.0, 1.0), (0.2, 0.3))))
+        assert parse_metrics(render_metrics(clicker))["mcclicker_configured_cps"] == pytest.approx(4.0)
+        clicker.set_mode("hold")
+        assert parse_metrics(render_metrics(clicker))["mcclicker_configured_cps"] == 0
+        clicker.set_interval_sampler(None)
+
+    def test_after_run(self) -> None:
+        """Test that counters reflect a run."""
+        clicker = AutoClicker(mouse=NullMouse())
+        clicker.set_interval(0.01)
+        clicker.start()
+        time.sleep(0.2)
+        samples = parse_metrics(render_metrics(clicker))
+        clicker.stop()
+
+        assert samples["mcclicker_running"] == 1
+        assert samples["mcclicker_clicks_total"] > 5
+        assert samples["mcclicker_interval_error_seconds_count"] == samples["mcclicker_clicks_total"]
+        assert 50 < samples["mcclicker_achieved_cps"] < 150
+
+    def test_hotkey_dispatch(self) -> None:
+        """Test hotkey dispatch latency metrics."""
+        clicker = AutoClicker(mouse=NullMouse())
+        manager = HotkeyManager()
+        manager.register_callback(lambda: None)
+        manager._on_hotkey_press()
+        samples = parse_metrics(render_metrics(clicker, manager))
+        assert samples["mcclicker_hotkey_dispatch_seconds_count"] == 1
+
+
+class TestMetricsServer:
+    """Tests for the HTTP endpoint."""
+
+    def test_scrape(self) -> None:
+        """Test scraping /metrics over HTTP."""
+        server = MetricsServer(AutoClicker(mouse=NullMouse()), port=0)
+        server.start()
+        try:
+            url = f"http://127.0.0.1:{server.port}/metrics"
+            with urllib.request.urlopen(url, timeout=2) as response:
+                assert response.status == 200
+                assert response.headers["Content-Type"].startswith("text/plain")
+                body = response.read().decode()
+            assert "mcclicker_clicks_total 0" in body
+        finally:
+            server.stop()
+
+    def test_unknown_path_404(self) -> None:
+        """Test that other paths return 404."""
+        server = MetricsServer(AutoClicker(mouse=NullMouse()), port=0)
+        server.start()
+        try:
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"http://127.0.0.1:{server.port}/", timeout=2)
+        finally:
+            server.stop()
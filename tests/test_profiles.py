@@ -0,0 +1,168 @@
+"""Unit tests for profiles module."""
+
+import time
+
+import pytest
+
+from src.backends import NullMouse
+from src.clicker import AutoClicker
+from src.config import ConfigStore
+from src.profiles import Profile, ProfileManager, profile_from_dict, profile_to_dict
+
+
+def make_manager(tmp_path, profiles: dict) -> ProfileManager:
+    """Create a ProfileManager whose store already holds `profiles`."""
+    store = ConfigStore(str(tmp_path / "config.json"), write_delay=10)
+    store.load()
+    store.settings["profiles"] = profiles
+    manager = ProfileManager(AutoClicker(mouse=NullMouse()), store)
+    manager.load()
+    return manager
+
+
+class TestProfileFromDict:
+    """Tests for profile validation."""
+
+    def test_valid_profile(self) -> None:
+        """Test that a valid profile is parsed with a precomputed interval."""
+        profile = profile_from_dict("pvp", {"cps": 10, "mode": "click", "button": "right", "hotkey": "CTRL + 1"})
+        assert profile.interval == 0.1
+        assert profile.button == "right"
+        assert profile.duration is None
+        assert profile.hotkey == "ctrl+1"
+
+    def test_defaults_for_optional_fields(self) -> None:
+        """Test that mode and button default to click/left."""
+        profile = profile_from_dict("afk", {"cps": 2})
+        assert profile.mode == "click"
+        assert profile.button == "left"
+
+    @pytest.mark.parametrize("data", [
+        {"cps": 0},
+        {"cps": "10"},
+        {"cps": 10, "mode": "spam"},
+        {"cps": 10, "button": "middle"},
+        {"cps": 10, "duration": -5},
+        {"cps": 10, "hotkey": 7},
+        "not a dict",
+    ])
+    def test_invalid_profile_raises_error(self, data) -> None:
+        """Test that invalid profiles raise ValueError."""
+        with pytest.raises(ValueError):
+            profile_from_dict("bad", data)
+
+    def test_cadence_parsed(self) -> None:
+        """Test that a stored cadence becomes a Cadence."""
+        profile = profile_from_dict("human", {"cps": 10, "cadence": {"probs": [0, 1], "intervals": [0.08, 0.12]}})
+        assert profile.cadence.mean() == pytest.approx(0.1)
+
+    def test_invalid_cadence_raises_error(self) -> None:
+        """Test that a bad cadence invalidates the profile."""
+        with pytest.raises(ValueError):
+            profile_from_dict("human", {"cps": 10, "cadence": {"probs": [0], "intervals": [0.1]}})
+
+    def test_round_trip(self) -> None:
+        """Test that to_dict/from_dict round-trips."""
+        profile = profile_from_dict("farm", {"cps": 5, "mode": "hold", "button": "left", "duration": 60})
+        assert profile_from_dict("farm", profile_to_dict(profile)) == profile
+
+
+class TestProfileManager:
+    """Tests for the profile cache."""
+
+    def test_load_skips_invalid(self, tmp_path) -> None:
+        """Test that invalid stored profiles are skipped, valid ones cached."""
+        manager = make_manager(tmp_path, {"good": {"cps": 5}, "bad": {"cps": 0}})
+        assert manager.names() == ["good"]
+
+    def test_apply_sets_clicker(self, tmp_path) -> None:
+        """Test that applying a profile swaps the clicker's settings."""
+        manager = make_manager(tmp_path, {"fast": {"cps": 20, "mode": "hold", "button": "right", "duration": 30}})
+        manager.apply("fast")
+        clicker = manager.clicker
+        assert clicker.interval == 0.05
+        assert clicker.mode == "hold"
+        assert clicker.duration == 30
+        assert manager.active == "fast"
+
+    def test_apply_cadence_sets_sampler(self, tmp_path) -> None:
+        """Test that a cadence profile installs an interval sampler, others clear it."""
+        cadence = {"probs": [0, 1], "intervals": [0.08, 0.12]}
+        manager = make_manager(tmp_path, {"human": {"cps": 10, "cadence": cadence}, "plain": {"cps": 10}})
+        manager.apply("human")
+        assert 0.08 <= manager.clicker.interval_sampler() <= 0.12
+        manager.apply("plain")
+        assert manager.clicker.interval_sampler is None
+
+    def test_apply_jitter_sets_schedule(self, tmp_path) -> None:
+        """Test that a jitter profile installs a log-normal schedule around its interval."""
+        manager = make_manager(tmp_path, {"jittery": {"cps": 10, "jitter": 0.2}})
+        manager.apply("jittery")
+        sampler = manager.clicker.interval_sampler
+        assert sampler.kind == "lognormal"
+        assert sampler.mean == pytest.approx(0.1)
+        assert sampler.stdev == pytest.approx(0.02)
+        manager.clicker.set_interval_sampler(None)
+
+    def test_invalid_jitter_raises_error(self) -> None:
+        """Test that jitter outside [0, 1) invalidates the profile."""
+        with pytest.raises(ValueError):
+            profile_from_dict("bad", {"cps": 10, "jitter": 1.5})
+
+    def test_apply_unknown_raises_error(self, tmp_path) -> None:
+        """Test that applying an unknown profile raises KeyError."""
+        manager = make_manager(tmp_path, {})
+        with pytest.raises(KeyError):
+            manager.apply("missing")
+
+    def test_apply_while_running_keeps_thread(self, tmp_path) -> None:
+        """Test that switching profiles while clicking does not restart the thread."""
+        manager = make_manager(tmp_path, {"a": {"cps": 10}, "b": {"cps": 20}})
+        clicker = manager.clicker
+        manager.apply("a")
+        clicker.start()
+        thread = clicker.click_thread
+        manager.apply("b")
+        time.sleep(0.2)
+        assert clicker.click_thread is thread
+        assert clicker.is_running is True
+        assert clicker.interval == 0.05
+        clicker.stop()
+
+    def test_switch_reuses_schedules(self, tmp_path) -> None:
+        """Test that switching back to a jitter profile reuses its schedule instead of building a new one."""
+        manager = make_manager(tmp_path, {"jittery": {"cps": 10, "jitter": 0.2}, "plain": {"cps": 20}})
+        clicker = manager.clicker
+        manager.apply("jittery")
+        sampler = clicker.interval_sampler
+        assert sampler._ready.wait(1)  # Spare buffer filled in the background
+        refills = sampler.refills
+        for _ in range(50):
+            manager.apply("plain")
+            manager.apply("jittery")
+        assert clicker.interval_sampler is sampler
+        assert sampler.refills == refills  # No batch fill per switch
+        assert sampler._refill_thread.is_alive()  # Not closed by being replaced
+        manager.load()  # Reloading drops the cache; the clicker still owns the schedule in use
+        clicker.set_interval_sampler(None)
+        sampler._refill_thread.join(timeout=1)
+        assert not sampler._refill_thread.is_alive()
+
+    def test_apply_does_no_file_io(self, tmp_path) -> None:
+        """Test that switching profiles does not read or write the config file."""
+        manager = make_manager(tmp_path, {"a": {"cps": 10}, "b": {"cps": 20}})
+        for _ in range(100):
+            manager.apply("a")
+            manager.apply("b")
+        assert not (tmp_path / "config.json").exists()
+
+    def test_save_and_delete_persist(self, tmp_path) -> None:
+        """Test that saved and deleted profiles reach the config store."""
+        manager = make_manager(tmp_path, {})
+        manager.save(Profile("new", 4.0, 0.25, "click", "left", None, None))
+        assert manager.config.get("profiles") == {
+            "new": {"cps": 4.0, "mode": "click", "button": "left", "duration": None, "hotkey": None},
+        }
+        manager.delete("new")
+        assert manager.config.get("profiles") == {}
+        manager.config.flush()
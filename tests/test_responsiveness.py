@@ -0,0 +1,147 @@
+"""Unit tests for responsiveness module."""
+
+import heapq
+import itertools
+import json
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.backends import NullMouse
+from src.clicker import AutoClicker
+from src.responsiveness import ResponsivenessHarness, Scenario, StatsSnapshot, timing_between
+from src.stats import ERROR_BUCKETS
+
+
+class FakeRoot:
+    """Single-threaded stand-in for the Tk event loop."""
+
+    def __init__(self) -> None:
+        """Initialize the FakeRoot."""
+        self._timers: list = []
+        self._idle: list = []
+        self._seq = itertools.count()
+        self._quit = False
+        self.round_trips = 0
+
+    def after(self, ms: int, callback) -> None:
+        """Run callback after ms milliseconds."""
+        heapq.heappush(self._timers, (time.perf_counter() + ms / 1000, next(self._seq), callback))
+
+    def after_idle(self, callback) -> None:
+        """Run callback when no timer is due."""
+        self._idle.append(callback)
+
+    def winfo_pointerxy(self) -> tuple[int, int]:
+        """Count a server round trip."""
+        self.round_trips += 1
+        return 0, 0
+
+    def quit(self) -> None:
+        """End mainloop()."""
+        self._quit = True
+
+    def mainloop(self) -> None:
+        """Dispatch timers and idle callbacks until quit()."""
+        while not self._quit:
+            if self._timers and self._timers[0][0] <= time.perf_counter():
+                heapq.heappop(self._timers)[2]()
+            elif self._idle:
+                self._idle.pop(0)()
+            else:
+                time.sleep(0.0005)
+
+
+class FakeApp:
+    """Just enough of MCClickerApp for the harness."""
+
+    def __init__(self) -> None:
+        """Initialize the FakeApp."""
+        self.root = FakeRoot()
+        self.clicker = AutoClicker(mouse=NullMouse())
+        self.clicker.set_interval(0.005)
+
+
+def snapshot(t: float, clicks: int, counts: list[int], error_sum: float = 0.0, missed: int = 0) -> StatsSnapshot:
+    """Build a snapshot with a full-length bucket list."""
+    return StatsSnapshot(t, clicks, missed, tuple(counts + [0] * (len(ERROR_BUCKETS) + 1 - len(counts))), error_sum)
+
+
+class TestTimingBetween:
+    """Tests for summarizing click timing between snapshots."""
+
+    def test_window(self) -> None:
+        """Test counts, rate, mean and bucket percentiles of one window."""
+        before = snapshot(10.0, 100, [50, 50], error_sum=0.05, missed=1)
+        after = snapshot(12.0, 300, [246, 52, 1, 1], error_sum=0.25, missed=3)
+        timing = timing_between(before, after)
+        assert timing["clicks"] == 200
+        assert timing["achieved_cps"] == pytest.approx(100)
+        assert timing["missed_deadlines"] == 2
+        assert timing["mean_error_ms"] == pytest.approx(1.0)
+        assert timing["p50_error_ms"] == pytest.approx(ERROR_BUCKETS[0] * 1000)
+        assert timing["p99_error_ms"] == pytest.approx(ERROR_BUCKETS[1] * 1000)
+
+    def test_overflow_and_empty(self) -> None:
+        """Test that overflow percentiles and empty windows have no value."""
+        overflow = [0] * len(ERROR_BUCKETS) + [5]
+        timing = timing_between(snapshot(0.0, 0, []), snapshot(1.0, 5, overflow))
+        assert timing["p50_error_ms"] is None
+        empty = timing_between(snapshot(0.0, 0, []), snapshot(1.0, 0, []))
+        assert empty["mean_error_ms"] is None
+        assert empty["p99_error_ms"] is None
+
+
+class TestHarness:
+    """Tests for driving an app through scripted edits."""
+
+    def test_run(self) -> None:
+        """Test that each scenario's edits are timed and both phases are measured."""
+        app = FakeApp()
+        scenarios = (
+            Scenario(
+                "interval",
+                ("0.005", "0.004"),
+                lambda a, v: a.clicker.set_interval(float(v)),
+                lambda a, v: a.clicker.interval == float(v),
+            ),
+            Scenario("broken", ("x", "y"), lambda a, v: None, lambda a, v: False),
+        )
+        harness = ResponsivenessHarness(app, scenarios, seconds=0.2, period=0.01)
+        report = harness.run()
+        assert app.clicker.is_running is False
+        assert report["events"] >= 10
+        interval = report["scenarios"]["interval"]
+        assert interval["failed"] == 0
+        assert interval["state_latency_ms"]["p50"] < 50
+        assert interval["render_latency_ms"]["p50"] >= interval["state_latency_ms"]["p50"]
+        assert report["scenarios"]["broken"]["failed"] == report["events"] // 2
+        assert app.root.round_trips == report["events"]
+        quiet = report["click_timing"]["quiet"]
+        assert quiet["clicks"] > 0
+        assert report["click_timing"]["active"]["clicks"] > 0
+        assert report["disturbance"] is not None
+        json.dumps(report)
+
+
+@pytest.mark.skipif(shutil.which("Xvfb") is None, reason="Xvfb not installed")
+class TestResponsivenessUnderXvfb:
+    """End-to-end run of the real GUI on a virtual display."""
+
+    def test_report(self, tmp_path) -> None:
+        """Test that every scripted edit reaches the clicker and a JSON report is written."""
+        output = tmp_path / "report.json"
+        subprocess.run(
+            [sys.executable, "-m", "src.responsiveness", "--xvfb", "--seconds", "1", "--output", str(output)],
+            check=True,
+            timeout=60,
+        )
+        report = json.loads(output.read_text())
+        for name, scenario in report["scenarios"].items():
+            assert scenario["failed"] == 0, name
+            assert scenario["state_latency_ms"]["p50"] < 50, name
+            assert scenario["render_latency_ms"]["p50"] < 100, name
+        assert report["click_timing"]["active"]["clicks"] > 50
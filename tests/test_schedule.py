@@ -0,0 +1,149 @@
+"""Unit tests for schedule module."""
+
+import math
+import statistics
+import time
+
+import pytest
+
+from src import schedule
+from src.backends import NullMouse
+from src.cadence import Cadence
+from src.clicker import AutoClicker
+from src.loopback import RecordingMouse
+from src.schedule import IntervalSchedule
+
+DRAWS = 100_000
+
+
+def draw(sched: IntervalSchedule, n: int = DRAWS) -> list[float]:
+    """Draw n intervals and close the schedule."""
+    values = [sched() for _ in range(n)]
+    sched.close()
+    return values
+
+
+@pytest.fixture(params=["numpy", "random"])
+def backend(request, monkeypatch):
+    """Run a test with NumPy batches and with the pure-Python fallback."""
+    if request.param == "numpy":
+        if schedule.np is None:
+            pytest.skip("NumPy not installed")
+    else:
+        monkeypatch.setattr(schedule, "np", None)
+    return request.param
+
+
+class TestDistributions:
+    """Tests that generated intervals follow the requested distribution."""
+
+    def test_normal(self, backend) -> None:
+        """Test mean and stdev of normal intervals."""
+        values = draw(IntervalSchedule("normal", 0.1, 0.01, seed=1))
+        assert statistics.fmean(values) == pytest.approx(0.1, rel=0.005)
+        assert statistics.stdev(values) == pytest.approx(0.01, rel=0.02)
+
+    def test_normal_clipped_positive(self, backend) -> None:
+        """Test that a wide normal distribution never yields tiny or negative intervals."""
+        values = draw(IntervalSchedule("normal", 0.1, 0.1, seed=1), 10_000)
+        assert min(values) >= 0.1 * schedule.MIN_FRACTION
+
+    def test_lognormal(self, backend) -> None:
+        """Test mean and stdev of log-normal intervals, and that they are right-skewed."""
+        values = draw(IntervalSchedule("lognormal", 0.1, 0.02, seed=2))
+        assert statistics.fmean(values) == pytest.approx(0.1, rel=0.005)
+        assert statistics.stdev(values) == pytest.approx(0.02, rel=0.03)
+        assert statistics.median(values) < statistics.fmean(values)
+        assert min(values) > 0
+
+    def test_empirical(self, backend) -> None:
+        """Test that empirical intervals reproduce the cadence's quantiles."""
+        cadence = Cadence((0.0, 0.5, 1.0), (0.05, 0.08, 0.2))
+        values = sorted(draw(IntervalSchedule.empirical(cadence, seed=3)))
+        assert values[0] >= 0.05
+        assert values[-1] <= 0.2
+        assert values[len(values) // 2] == pytest.approx(0.08, rel=0.01)
+        assert statistics.fmean(values) == pytest.approx(cadence.mean(), rel=0.01)
+
+    def test_zero_stdev_is_regular(self, backend) -> None:
+        """Test that stdev 0 gives the mean every time."""
+        assert set(draw(IntervalSchedule("normal", 0.1, 0.0, seed=1), 100)) == {0.1}
+
+    def test_invalid_parameters(self) -> None:
+        """Test that invalid distributions raise ValueError."""
+        with pytest.raises(ValueError):
+            IntervalSchedule("uniform")
+        with pytest.raises(ValueError):
+            IntervalSchedule("normal", mean=0)
+        with pytest.raises(ValueError):
+            IntervalSchedule("empirical")
+
+
+class TestBuffering:
+    """Tests for seeded, double-buffered generation."""
+
+    def test_seed_reproducible(self) -> None:
+        """Test that the same seed gives the same sequence across refills."""
+        a = draw(IntervalSchedule("lognormal", 0.1, 0.02, seed=7, batch_size=64), 1000)
+        b = draw(IntervalSchedule("lognormal", 0.1, 0.02, seed=7, batch_size=64), 1000)
+        assert a == b
+
+    def test_refilled_off_path(self) -> None:
+        """Test that refills keep up when the consumer draws at click rates."""
+        sched = IntervalSchedule("normal", 0.1, 0.01, seed=1, batch_size=256)
+        for _ in range(5):
+            for _ in range(256):
+                sched()
+            time.sleep(0.01)  # The click loop waits far longer than this between draws
+        sched.close()
+        assert sched.drawn == 1280
+        assert sched.stalls == 0
+        assert sched.refills >= 6
+
+    def test_draw_after_close(self) -> None:
+        """Test that a closed schedule still serves intervals by refilling inline."""
+        sched = IntervalSchedule("normal", 0.1, 0.01, seed=1, batch_size=16)
+        sched.close()
+        time.sleep(0.05)
+        values = [sched() for _ in range(100)]
+        assert len(values) == 100
+        assert all(v > 0 for v in values)
+
+    def test_draw_cost(self) -> None:
+        """Test that a draw costs about as much as an array lookup."""
+        sched = IntervalSchedule("lognormal", 0.1, 0.02, seed=1, batch_size=DRAWS)
+        time.sleep(0.05)
+        start = time.perf_counter()
+        for _ in range(DRAWS):
+            sched()
+        per_draw = (time.perf_counter() - start) / DRAWS
+        sched.close()
+        assert per_draw < 2e-6
+
+
+class TestWithClicker:
+    """Tests for schedules driving the click loop."""
+
+    def test_achieved_intervals(self) -> None:
+        """Test that the clicker's achieved intervals follow the schedule."""
+        mouse = RecordingMouse(NullMouse())
+        clicker = AutoClicker(mouse=mouse)
+        clicker.set_interval_sampler(IntervalSchedule("normal", 0.01, 0.002, seed=5))
+        clicker.start()
+        time.sleep(1.5)
+        clicker.stop()
+        clicker.set_interval_sampler(None)
+        gaps = [b - a for a, b in zip(mouse.injected, mouse.injected[1:])]
+        assert len(gaps) > 100
+        assert statistics.fmean(gaps) == pytest.approx(0.01, rel=0.05)
+        assert 0.001 < statistics.stdev(gaps) < 0.003
+
+    def test_replaced_schedule_closed(self) -> None:
+        """Test that replacing a schedule stops its refill thread."""
+        clicker = AutoClicker(mouse=NullMouse())
+        sched = IntervalSchedule("normal", 0.1, 0.01)
+        clicker.set_interval_sampler(sched)
+        clicker.set_interval_sampler(None)
+        sched._refill_thread.join(timeout=1)
+        assert not sched._refill_thread.is_alive()
+        assert not math.isnan(sched())
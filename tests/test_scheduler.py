@@ -0,0 +1,300 @@
+"""Unit tests for scheduler module."""
+
+import sys
+import time
+from datetime import datetime, timedelta
+from datetime import time as dtime
+
+import pytest
+
+from src.scheduler import SessionRule, SessionScheduler, TimerFd, next_session, parse_rule
+
+NIGHT = "02:00-06:00 every 60m for 20m"
+DAY = datetime(2026, 1, 5)
+
+
+def ts(hour: int, minute: int = 0, second: int = 0, day: int = 0) -> float:
+    """Unix time of a local time on the test day."""
+    return (DAY + timedelta(days=day, hours=hour, minutes=minute, seconds=second)).timestamp()
+
+
+class RecordingClicker:
+    """Stands in for AutoClicker and records what the scheduler asked of it."""
+
+    def __init__(self, clock=time.time) -> None:
+        """Initialize the RecordingClicker."""
+        self.clock = clock
+        self.calls: list[tuple[str, float]] = []
+        self.is_running = False
+        self.interval = 0.1
+
+    def start(self) -> None:
+        """Record a start."""
+        self.calls.append(("start", self.clock()))
+        self.is_running = True
+
+    def stop(self) -> None:
+        """Record a stop."""
+        self.calls.append(("stop", self.clock()))
+        self.is_running = False
+
+    def set_interval(self, interval: float) -> None:
+        """Record the interval."""
+        self.interval = interval
+
+
+class FakeClock:
+    """Manually set wall clock."""
+
+    def __init__(self, now: float) -> None:
+        """Initialize the FakeClock."""
+        self.now = now
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+class ScriptedTimer:
+    """Timer that jumps the fake clock to each requested time, with optional surprises."""
+
+    def __init__(self, clock: FakeClock, scheduler_ref: list, waits: int, jumps: dict | None = None) -> None:
+        """
+        Initialize the ScriptedTimer.
+
+        Args:
+            clock (FakeClock): Clock to advance.
+            scheduler_ref (list): Holds the scheduler once created, to end its loop.
+            waits (int): Waits to serve before stopping the scheduler.
+            jumps (dict | None): Wait number -> (new clock time, result) to simulate suspend or clock changes.
+        """
+        self.clock = clock
+        self.scheduler_ref = scheduler_ref
+        self.waits = waits
+        self.jumps = jumps or {}
+        self.requested: list[float | None] = []
+
+    def wait_until(self, when: float | None) -> str:
+        """Advance the clock instead of sleeping."""
+        self.requested.append(when)
+        number = len(self.requested)
+        if number > self.waits:
+            self.scheduler_ref[0].is_running = False
+            return "woken"
+        if number in self.jumps:
+            self.clock.now, result = self.jumps[number]
+            return result
+        self.clock.now = max(self.clock.now, when)
+        return "expired"
+
+    def wake(self) -> None:
+        """Nothing to wake."""
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+def run_scripted(rules: list[SessionRule], start: float, waits: int, jumps: dict | None = None):
+    """Run a scheduler's loop synchronously on a scripted timer."""
+    clock = FakeClock(start)
+    ref: list = []
+    timer = ScriptedTimer(clock, ref, waits, jumps)
+    clicker = RecordingClicker(clock)
+    scheduler = SessionScheduler(clicker, rules, timer=timer, clock=clock)
+    ref.append(scheduler)
+    scheduler.is_running = True
+    scheduler._loop()
+    return scheduler, clicker, timer
+
+
+class TestParseRule:
+    """Tests for parsing schedule rules."""
+
+    def test_parse(self) -> None:
+        """Test a rule with a rate."""
+        rule = parse_rule("2:00-06:30 every 1h for 20m at 12 cps")
+        assert rule == SessionRule(dtime(2, 0), dtime(6, 30), 3600.0, 1200.0, 12.0)
+
+    def test_parse_without_rate(self) -> None:
+        """Test that the rate is optional."""
+        assert parse_rule(NIGHT).cps is None
+
+    @pytest.mark.parametrize(
+        "text",
+        ["", "02:00 every 60m for 20m", "02:00-06:00 every 0m for 20m", "25:00-06:00 every 60m for 20m",
+         "02:00-06:00 every 60m for 20m at 0 cps", "02:00-06:00 every 60x for 20m"],
+    )
+    def test_invalid_rules_raise_error(self, text: str) -> None:
+        """Test that malformed rules raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_rule(text)
+
+
+class TestNextSession:
+    """Tests for expanding rules into sessions."""
+
+    def test_before_window(self) -> None:
+        """Test that the first session of the day comes next."""
+        start, stop = next_session(parse_rule(NIGHT), DAY + timedelta(hours=1))
+        assert (start, stop) == (DAY + timedelta(hours=2), DAY + timedelta(hours=2, minutes=20))
+
+    def test_in_session(self) -> None:
+        """Test that a session in progress is returned."""
+        start, _ = next_session(parse_rule(NIGHT), DAY + timedelta(hours=3, minutes=10))
+        assert start == DAY + timedelta(hours=3)
+
+    def test_between_sessions(self) -> None:
+        """Test the gap between two sessions."""
+        start, _ = next_session(parse_rule(NIGHT), DAY + timedelta(hours=3, minutes=30))
+        assert start == DAY + timedelta(hours=4)
+
+    def test_after_window(self) -> None:
+        """Test that the next day's window follows the last session."""
+        start, _ = next_session(parse_rule(NIGHT), DAY + timedelta(hours=5, minutes=20))
+        assert start == DAY + timedelta(days=1, hours=2)
+
+    def test_window_past_midnight(self) -> None:
+        """Test a window that starts in the evening and ends the next morning."""
+        rule = parse_rule("23:00-01:00 every 90m for 60m")
+        start, stop = next_session(rule, DAY - timedelta(minutes=30))
+        assert (start, stop) == (DAY - timedelta(hours=1), DAY)
+        start, stop = next_session(rule, DAY + timedelta(minutes=10))
+        assert (start, stop) == (DAY + timedelta(minutes=30), DAY + timedelta(hours=1))  # Cut at 01:00
+
+    def test_cut_at_window_end(self) -> None:
+        """Test that a session longer than what is left of the window ends with it."""
+        _, stop = next_session(parse_rule("02:00-03:00 every 45m for 30m"), DAY + timedelta(hours=2, minutes=50))
+        assert stop == DAY + timedelta(hours=3)
+
+
+class TestSessionScheduler:
+    """Tests for driving the clicker from the event queue."""
+
+    def test_sessions_follow_rules(self) -> None:
+        """Test that every start and stop fires at its time, one wakeup each."""
+        scheduler, clicker, timer = run_scripted([parse_rule(NIGHT)], ts(1), waits=8)
+        assert clicker.calls == [
+            ("start", ts(2)), ("stop", ts(2, 20)), ("start", ts(3)), ("stop", ts(3, 20)),
+            ("start", ts(4)), ("stop", ts(4, 20)), ("start", ts(5)), ("stop", ts(5, 20)),
+        ]
+        assert timer.requested[8] == ts(2, day=1)  # Then straight to tomorrow night
+        assert scheduler.wakeups == 9  # Eight events and the final stop; nothing in between
+
+    def test_joins_session_in_progress(self) -> None:
+        """Test that starting mid-session clicks for the rest of it."""
+        _, clicker, timer = run_scripted([parse_rule(NIGHT)], ts(3, 5), waits=1)
+        assert clicker.calls == [("start", ts(3, 5)), ("stop", ts(3, 20))]
+
+    def test_rate_applied(self) -> None:
+        """Test that a rule's rate is set before clicking."""
+        _, clicker, _ = run_scripted([parse_rule(NIGHT + " at 20 cps")], ts(1), waits=1)
+        assert clicker.interval == pytest.approx(0.05)
+
+    def test_rate_restored_after_session(self) -> None:
+        """Test that the clicker gets its own rate back once a rule's session ends."""
+        _, clicker, _ = run_scripted([parse_rule(NIGHT + " at 20 cps")], ts(1), waits=2)
+        assert clicker.calls == [("start", ts(2)), ("stop", ts(2, 20))]
+        assert clicker.interval == 0.1
+
+    def test_rate_changed_during_session_kept(self) -> None:
+        """Test that a rate set by hand during a session is not overwritten when it ends."""
+        clock = FakeClock(ts(1))
+        ref: list = []
+        clicker = RecordingClicker(clock)
+        timer = ScriptedTimer(clock, ref, waits=1)
+        scheduler = SessionScheduler(clicker, [parse_rule(NIGHT + " at 20 cps")], timer=timer, clock=clock)
+        ref.append(scheduler)
+        scheduler.is_running = True
+        scheduler._loop()  # Runs up to the 02:00 start
+        clicker.set_interval(0.25)
+        scheduler.stop()
+        assert clicker.interval == 0.25
+
+    def test_session_missed_during_suspend_is_skipped(self) -> None:
+        """Test that waking after a whole session passed does not click."""
+        # The machine sleeps from 01:00 until 02:30, past the 02:00 session's stop
+        _, clicker, timer = run_scripted([parse_rule(NIGHT)], ts(1), waits=2, jumps={1: (ts(2, 30), "expired")})
+        assert clicker.calls == [("start", ts(3))]
+        assert timer.requested[1] == ts(3)
+
+    def test_clock_change_reschedules(self) -> None:
+        """Test that setting the clock into a session starts it right away."""
+        _, clicker, timer = run_scripted(
+            [parse_rule(NIGHT)], ts(1), waits=2, jumps={1: (ts(4, 10), "clock_changed")}
+        )
+        assert clicker.calls == [("start", ts(4, 10)), ("stop", ts(4, 20))]
+
+    def test_overlapping_rules_share_one_session(self) -> None:
+        """Test that the clicker runs while any rule's session is in progress."""
+        rules = [parse_rule("02:00-03:00 every 60m for 20m"), parse_rule("02:10-03:00 every 60m for 20m")]
+        _, clicker, _ = run_scripted(rules, ts(1), waits=4)
+        assert clicker.calls == [("start", ts(2)), ("stop", ts(2, 30))]
+
+    def test_rules_replaced_between_events(self) -> None:
+        """Test that rules set while events are firing take effect at the next rebuild, not mid-batch."""
+        rules = [parse_rule(NIGHT), parse_rule(NIGHT + " at 20 cps")]
+        clock = FakeClock(ts(1))
+        ref: list = []
+        clicker = RecordingClicker(clock)
+        clicker.start = lambda: (RecordingClicker.start(clicker), ref[0].set_rules([]))  # Edited mid-batch
+        intervals: list[float] = []
+        set_interval = clicker.set_interval
+        clicker.set_interval = lambda interval: (intervals.append(interval), set_interval(interval))
+        scheduler = SessionScheduler(clicker, rules, timer=ScriptedTimer(clock, ref, waits=2), clock=clock)
+        ref.append(scheduler)
+        scheduler.is_running = True
+        scheduler._loop()
+        assert clicker.calls == [("start", ts(2)), ("stop", ts(2, 20))]
+        assert intervals == [pytest.approx(0.05), 0.1]  # The second rule's start still fired; its rate was undone
+        assert scheduler.rules == []
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="timerfd is Linux-only")
+class TestTimerFd:
+    """Tests against the real timerfd."""
+
+    def test_fires_on_time(self) -> None:
+        """Test that a wait ends at its wall-clock time."""
+        timer = TimerFd()
+        try:
+            when = time.time() + 0.05
+            assert timer.wait_until(when) == "expired"
+            assert 0 <= time.time() - when < 0.02
+        finally:
+            timer.close()
+
+    def test_wake(self) -> None:
+        """Test that wake() ends an open-ended wait."""
+        timer = TimerFd()
+        try:
+            timer.wake()
+            assert timer.wait_until(None) == "woken"
+        finally:
+            timer.close()
+
+    def test_no_idle_wakeups(self) -> None:
+        """Test that the scheduler thread sleeps through the gap before a distant session."""
+        later = datetime.now() + timedelta(hours=2)
+        rule = parse_rule(f"{later:%H:%M}-{later + timedelta(hours=1):%H:%M} every 60m for 20m")
+        clicker = RecordingClicker()
+        scheduler = SessionScheduler(clicker, [rule], timer=TimerFd())
+        scheduler.start()
+        time.sleep(0.3)
+        assert scheduler.wakeups == 0
+        assert scheduler.next_event()[1] == "start"
+        assert scheduler.next_event()[0] > time.time() + 3600
+        scheduler.close()
+        assert clicker.calls == []
+
+    def test_real_sessions(self) -> None:
+        """Test sub-second sessions end to end, each event costing one wakeup."""
+        clicker = RecordingClicker()
+        scheduler = SessionScheduler(clicker, [parse_rule("00:00-00:00 every 0.2s for 0.1s")], timer=TimerFd())
+        scheduler.start()
+        time.sleep(0.7)
+        scheduler.close()
+        starts = [t for kind, t in clicker.calls if kind == "start"]
+        assert len(starts) >= 3
+        for t in starts[1:]:
+            assert abs(t - round(t / 0.2) * 0.2) < 0.02  # On the 0.2 s grid
+        assert scheduler.wakeups <= len(clicker.calls) + 1
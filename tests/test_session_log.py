@@ -0,0 +1,161 @@
+"""Unit tests for session_log module."""
+
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from src.session_log import (
+    HEADER,
+    MAGIC,
+    RECORD,
+    VERSION,
+    SessionLog,
+    iter_sessions,
+    log_files,
+    summarize,
+)
+
+
+def write_raw_log(path: str, records: list[tuple]) -> None:
+    """Write a log file directly, bypassing the background writer."""
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        f.write(b"".join(RECORD.pack(*r) for r in records))
+
+
+class TestSessionLogWriting:
+    """Tests for recording sessions."""
+
+    def test_record_and_read_back(self, tmp_path) -> None:
+        """Test that recorded sessions are read back unchanged."""
+        path = str(tmp_path / "sessions.log")
+        log = SessionLog(path)
+        log.record(1000.0, 1010.0, 10.0, 5.0, 50)
+        log.record(2000.0, 2030.0, 30.0, 10.0, 299)
+        log.close()
+
+        sessions = list(iter_sessions(path))
+        assert sessions == [(1000.0, 1010.0, 10.0, 5.0, 50), (2000.0, 2030.0, 30.0, 10.0, 299)]
+
+    def test_record_does_not_block_on_disk(self, tmp_path) -> None:
+        """Test that record() returns before anything is written."""
+        path = str(tmp_path / "sessions.log")
+        log = SessionLog(path)
+        start = time.perf_counter()
+        for i in range(1000):
+            log.record(float(i), float(i) + 1, 1.0, 1.0, 1)
+        assert time.perf_counter() - start < 0.5
+        log.close()
+        assert len(list(iter_sessions(path))) == 1000
+
+    def test_rotation_keeps_backup_count(self, tmp_path) -> None:
+        """Test that the log rotates by size and keeps only backup_count files."""
+        path = str(tmp_path / "sessions.log")
+        log = SessionLog(path, max_bytes=HEADER.size + RECORD.size * 2, backup_count=2)
+        for i in range(7):
+            log.record(float(i), float(i) + 1, 1.0, 1.0, i)
+            log.close()  # Force each record into its own write
+
+        assert log_files(path) == [f"{path}.2", f"{path}.1", path]
+        clicks = [s[4] for s in iter_sessions(path)]
+        assert clicks == [2, 3, 4, 5, 6]
+
+    def test_append_after_partial_record(self, tmp_path) -> None:
+        """Test that a crash-truncated record is cut off before new records are appended."""
+        path = str(tmp_path / "sessions.log")
+        write_raw_log(path, [(1.0, 2.0, 1.0, 1.0, 1)])
+        with open(path, "ab") as f:
+            f.write(b"\xff" * (RECORD.size - 3))
+        log = SessionLog(path)
+        log.record(3.0, 4.0, 1.0, 1.0, 2)
+        log.close()
+
+        assert os.path.getsize(path) == HEADER.size + 2 * RECORD.size
+        assert list(iter_sessions(path)) == [(1.0, 2.0, 1.0, 1.0, 1), (3.0, 4.0, 1.0, 1.0, 2)]
+
+    def test_append_after_bad_header(self, tmp_path) -> None:
+        """Test that a file with an unknown header is rotated away instead of appended to."""
+        path = str(tmp_path / "sessions.log")
+        with open(path, "wb") as f:
+            f.write(b"JUNK" + b"\x00" * 64)
+        log = SessionLog(path)
+        log.record(3.0, 4.0, 1.0, 1.0, 2)
+        log.close()
+
+        assert log_files(path) == [f"{path}.1", path]
+        assert list(iter_sessions(path)) == [(3.0, 4.0, 1.0, 1.0, 2)]
+
+    def test_max_bytes_too_small_raises_error(self, tmp_path) -> None:
+        """Test that a max_bytes smaller than one record raises ValueError."""
+        with pytest.raises(ValueError):
+            SessionLog(str(tmp_path / "sessions.log"), max_bytes=RECORD.size)
+
+
+class TestSessionLogReading:
+    """Tests for reading and querying the log."""
+
+    def test_missing_log_is_empty(self, tmp_path) -> None:
+        """Test that a missing log yields no sessions."""
+        assert list(iter_sessions(str(tmp_path / "missing.log"))) == []
+
+    def test_partial_trailing_record_ignored(self, tmp_path) -> None:
+        """Test that a truncated final record is skipped."""
+        path = str(tmp_path / "sessions.log")
+        write_raw_log(path, [(1.0, 2.0, 1.0, 1.0, 1)])
+        with open(path, "ab") as f:
+            f.write(b"\x00" * (RECORD.size - 3))
+        assert len(list(iter_sessions(path))) == 1
+
+    def test_bad_header_skipped(self, tmp_path) -> None:
+        """Test that a file with an unknown header is skipped."""
+        path = str(tmp_path / "sessions.log")
+        with open(path, "wb") as f:
+            f.write(b"JUNK" + b"\x00" * 64)
+        assert list(iter_sessions(path)) == []
+
+    def test_summarize_totals_and_days(self, tmp_path) -> None:
+        """Test totals and per-day click counts."""
+        path = str(tmp_path / "sessions.log")
+        day1 = datetime(2024, 3, 1, 12).timestamp()
+        day2 = datetime(2024, 3, 2, 12).timestamp()
+        write_raw_log(path, [
+            (day1, day1 + 10, 10.0, 5.0, 50),
+            (day1 + 60, day1 + 80, 20.0, 5.0, 100),
+            (day2, day2 + 10, 10.0, 10.0, 95),
+        ])
+
+        stats = summarize(path)
+        assert stats["sessions"] == 3
+        assert stats["total_clicks"] == 245
+        assert stats["total_duration"] == 40.0
+        assert stats["per_day"] == {"2024-03-01": 150, "2024-03-02": 95}
+
+    def test_summarize_rate_histogram(self, tmp_path) -> None:
+        """Test achieved-rate histogram binning."""
+        path = str(tmp_path / "sessions.log")
+        write_raw_log(path, [
+            (1.0, 11.0, 10.0, 5.0, 50),   # 5.0 CPS
+            (20.0, 30.0, 10.0, 10.0, 95),  # 9.5 CPS
+            (40.0, 50.0, 10.0, 10.0, 99),  # 9.9 CPS
+        ])
+        assert summarize(path, bin_width=1.0)["rate_histogram"] == {5.0: 1, 9.0: 2}
+        assert summarize(path, bin_width=5.0)["rate_histogram"] == {5.0: 3}
+
+    def test_summarize_since(self, tmp_path) -> None:
+        """Test that sessions before `since` are excluded."""
+        path = str(tmp_path / "sessions.log")
+        write_raw_log(path, [(100.0, 110.0, 10.0, 1.0, 10), (200.0, 210.0, 10.0, 1.0, 10)])
+        assert summarize(path, since=150.0)["sessions"] == 1
+
+    def test_summarize_months_of_history_fast(self, tmp_path) -> None:
+        """Test that a year of minute-long sessions is summarized in under a second."""
+        path = str(tmp_path / "sessions.log")
+        base = datetime(2024, 1, 1).timestamp()
+        write_raw_log(path, [(base + i * 60, base + i * 60 + 30, 30.0, 10.0, 300) for i in range(250_000)])
+
+        start = time.perf_counter()
+        stats = summarize(path)
+        assert time.perf_counter() - start < 1.0
+        assert stats["sessions"] == 250_000
@@ -0,0 +1,74 @@
+"""Unit tests for soak module."""
+
+import threading
+
+import pytest
+
+from src.soak import Budget, ResourceSample, SoakTest, check_growth, take_sample
+
+
+def sample(**changes) -> ResourceSample:
+    """Build a sample with neutral defaults."""
+    values = {"t": 0.0, "cycles": 0, "rss_kb": 1000, "threads": 1, "fds": 3, "traced_kb": 100}
+    values.update(changes)
+    return ResourceSample(**values)
+
+
+class TestCheckGrowth:
+    """Tests for comparing a run's end against its baseline."""
+
+    def test_within_budget(self) -> None:
+        """Test that growth up to the budget passes."""
+        assert check_growth(sample(), sample(rss_kb=1000 + 4096, traced_kb=612), Budget()) == []
+
+    def test_each_resource_checked(self) -> None:
+        """Test that every resource over budget is reported."""
+        failures = check_growth(sample(), sample(rss_kb=9000, threads=2, fds=4, traced_kb=700), Budget())
+        assert [f.split()[0] for f in failures] == ["rss_kb", "threads", "fds", "traced_kb"]
+
+    def test_unavailable_resources_skipped(self) -> None:
+        """Test that resources without /proc data are not compared."""
+        assert check_growth(sample(rss_kb=None, fds=None), sample(rss_kb=None, fds=None), Budget()) == []
+
+
+class TestSoakTest:
+    """Tests for the soak driver."""
+
+    def test_invalid_cycles_raises_error(self) -> None:
+        """Test that a run needs at least one cycle."""
+        with pytest.raises(ValueError):
+            SoakTest(cycles=0)
+
+    def test_take_sample(self) -> None:
+        """Test that a sample sees this thread."""
+        assert take_sample(0.0, 5).threads >= 1
+
+    def test_short_run_passes(self) -> None:
+        """Test that the clicker survives a short soak without growth."""
+        report = SoakTest(cycles=3000, samples=10, run_seconds=0.01, seed=1).run()
+        assert report["passed"], report["failures"]
+        assert report["final"]["threads"] == report["baseline"]["threads"]
+        assert report["clicks"] > 0
+        assert [s["cycles"] for s in report["samples"]] == sorted(s["cycles"] for s in report["samples"])
+        assert len(report["samples"]) >= 10
+
+    def test_leak_detected(self) -> None:
+        """Test that an operation leaving threads and memory behind fails the run."""
+        blocker = threading.Event()
+        leaked = []
+
+        def leak() -> None:
+            leaked.append(bytearray(1024))
+            if len(leaked) % 50 == 0:
+                threading.Thread(target=blocker.wait, daemon=True).start()
+
+        soak = SoakTest(cycles=2000, samples=5, run_seconds=0.01, seed=2)
+        soak.operations = [leak]
+        try:
+            report = soak.run()
+        finally:
+            blocker.set()
+        assert not report["passed"]
+        failed = {f.split()[0] for f in report["failures"]}
+        assert {"threads", "traced_kb"} <= failed
+        assert any("test_soak.py" in line for line in report["top_allocators"])
@@ -0,0 +1,92 @@
+"""Unit tests for startup module."""
+
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.startup import StartupProfiler
+
+IMPORT_BUDGET = 0.5  # Seconds allowed to import the GUI module in a fresh interpreter
+
+
+def run_python(code: str) -> str:
+    """Run code in a fresh interpreter from the repository root and return its stdout."""
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        timeout=30,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+class TestStartupProfiler:
+    """Tests for phase timing."""
+
+    def test_phase_recorded(self) -> None:
+        """Test that a phase's duration is measured."""
+        profiler = StartupProfiler()
+        with profiler.phase("sleep"):
+            time.sleep(0.02)
+        assert profiler.duration("sleep") == pytest.approx(0.02, abs=0.015)
+
+    def test_missing_phase(self) -> None:
+        """Test that an unknown phase has no duration."""
+        assert StartupProfiler().duration("nope") is None
+
+    def test_phase_recorded_on_error(self) -> None:
+        """Test that a phase that raises is still recorded."""
+        profiler = StartupProfiler()
+        with pytest.raises(RuntimeError):
+            with profiler.phase("broken"):
+                raise RuntimeError
+        assert profiler.duration("broken") is not None
+
+    def test_report_in_start_order(self) -> None:
+        """Test that the report lists phases in the order they started."""
+        profiler = StartupProfiler(origin=0.0)
+        profiler.record("second", 2.0, 3.0)
+        profiler.record("first", 1.0, 1.5)
+        lines = profiler.report().splitlines()
+        assert lines[1].startswith("first")
+        assert lines[2].startswith("second")
+        assert "500.0" in lines[1]
+
+
+class TestLazyImports:
+    """Tests that slow dependencies stay out of the startup path."""
+
+    def test_gui_module_does_not_import_input_libraries(self) -> None:
+        """Test that importing the GUI module loads neither pynput nor keyboard."""
+        out = run_python("import sys, src.main; print('pynput' in sys.modules, 'keyboard' in sys.modules)")
+        assert out == "False False"
+
+    def test_gui_module_does_not_import_schedules(self) -> None:
+        """Test that importing the GUI module loads neither interval schedules nor numpy."""
+        out = run_python("import sys, src.main; print('src.schedule' in sys.modules, 'numpy' in sys.modules)")
+        assert out == "False False"
+
+    def test_clicker_backend_is_lazy(self) -> None:
+        """Test that constructing an AutoClicker does not create a pynput backend."""
+        out = run_python(
+            "import sys; from src.clicker import AutoClicker; c = AutoClicker(); "
+            "print(c._mouse is None, 'pynput' in sys.modules)"
+        )
+        assert out == "True False"
+
+    def test_null_backend_needs_no_pynput(self) -> None:
+        """Test that clicking through a backend that names its buttons never imports pynput."""
+        out = run_python(
+            "import sys, time; from src.backends import NullMouse; from src.clicker import AutoClicker; "
+            "m = NullMouse(); c = AutoClicker(mouse=m); c.set_button('right'); c.set_interval(0.01); "
+            "c.start(); time.sleep(0.05); c.stop(); print(m.clicks > 0, c.button, 'pynput' in sys.modules)"
+        )
+        assert out == "True right False"
+
+    def test_gui_import_time(self) -> None:
+        """Test that the GUI module imports within budget."""
+        out = run_python("import src.main as m; print(m.IMPORTS_DONE - m.IMPORTS_STARTED)")
+        assert float(out) < IMPORT_BUDGET
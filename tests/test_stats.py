@@ -0,0 +1,64 @@
+"""Unit tests for stats module."""
+
+import time
+
+from src.stats import ERROR_BUCKETS, ClickStats
+
+
+class TestClickStats:
+    """Tests for pre-aggregated click counters."""
+
+    def test_init_defaults(self) -> None:
+        """Test ClickStats initializes with zero counters."""
+        stats = ClickStats()
+        assert stats.clicks_total == 0
+        assert stats.missed_deadlines == 0
+        assert stats.achieved_cps() == 0.0
+
+    def test_record_click_buckets(self) -> None:
+        """Test that errors land in the right histogram bucket."""
+        stats = ClickStats()
+        stats.record_click(0.0001, 0.0)  # <= 0.5 ms
+        stats.record_click(0.003, 0.0)   # <= 5 ms
+        stats.record_click(1.0, 0.0)     # +Inf
+        histogram = dict(stats.error_histogram())
+        assert histogram[ERROR_BUCKETS[0]] == 1
+        assert histogram[0.005] == 2
+        assert histogram[float("inf")] == 3
+        assert stats.clicks_total == 3
+
+    def test_record_error(self) -> None:
+        """Test that errors are counted by kind and the latest one is kept."""
+        stats = ClickStats()
+        stats.record_error(BlockingIOError(11, "busy"), fatal=False)
+        stats.record_error(OSError("gone"), fatal=True)
+        assert (stats.transient_errors, stats.fatal_errors) == (1, 1)
+        assert stats.last_error == repr(OSError("gone"))
+        assert stats.last_error_time is not None
+
+    def test_histogram_is_cumulative(self) -> None:
+        """Test that bucket counts never decrease."""
+        stats = ClickStats()
+        for error in (0.0001, 0.002, 0.02, 0.2):
+            stats.record_click(error, 0.0)
+        counts = [count for _bound, count in stats.error_histogram()]
+        assert counts == sorted(counts)
+
+    def test_achieved_cps(self) -> None:
+        """Test achieved CPS over a finished run."""
+        stats = ClickStats()
+        stats.start_run()
+        for _ in range(10):
+            stats.record_click(0.0, 0.0)
+        time.sleep(0.1)
+        stats.stop_run()
+        assert 50 < stats.achieved_cps() <= 100
+
+    def test_start_run_resets_run_only(self) -> None:
+        """Test that a new run resets run clicks but keeps the totals."""
+        stats = ClickStats()
+        stats.start_run()
+        stats.record_click(0.0, 0.0)
+        stats.start_run()
+        assert stats.run_clicks == 0
+        assert stats.clicks_total == 1
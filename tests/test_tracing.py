@@ -0,0 +1,130 @@
+"""Unit tests for tracing module."""
+
+import json
+import time
+
+import pytest
+
+from src.backends import NullMouse
+from src.clicker import AutoClicker
+from src.tracing import SPAN_BOOKKEEPING, SPAN_INJECT, SPAN_WAIT, ClickTracer
+
+
+class TestClickTracer:
+    """Tests for the span ring buffer."""
+
+    def test_span_recorded(self) -> None:
+        """Test that a span is stored with its kind and duration."""
+        tracer = ClickTracer(capacity=4)
+        base = tracer.origin
+        tracer.span(SPAN_INJECT, base + 1.0, base + 1.5)
+        assert tracer.spans() == [("inject", 1.0, 0.5)]
+
+    def test_ring_buffer_keeps_newest(self) -> None:
+        """Test that the oldest spans are overwritten when full."""
+        tracer = ClickTracer(capacity=3)
+        base = tracer.origin
+        for i in range(5):
+            tracer.span(SPAN_WAIT, base + i, base + i + 0.25)
+        starts = [start for _name, start, _dur in tracer.spans()]
+        assert starts == [2.0, 3.0, 4.0]
+        assert tracer.count == 5
+
+    def test_summary(self) -> None:
+        """Test per-kind totals."""
+        tracer = ClickTracer()
+        base = tracer.origin
+        tracer.span(SPAN_WAIT, base, base + 0.25)
+        tracer.span(SPAN_WAIT, base + 1, base + 1.5)
+        tracer.span(SPAN_BOOKKEEPING, base + 2, base + 2.125)
+        summary = tracer.summary()
+        assert summary["wait"] == {"count": 2, "total": 0.75, "max": 0.5}
+        assert summary["bookkeeping"]["count"] == 1
+        assert summary["inject"]["count"] == 0
+
+    def test_clear(self) -> None:
+        """Test that clear() forgets spans."""
+        tracer = ClickTracer()
+        tracer.span(SPAN_WAIT, 0.0, 1.0)
+        tracer.clear()
+        assert tracer.spans() == []
+
+    def test_invalid_capacity_raises_error(self) -> None:
+        """Test that a zero capacity raises ValueError."""
+        with pytest.raises(ValueError):
+            ClickTracer(capacity=0)
+
+    def test_export_chrome_trace(self, tmp_path) -> None:
+        """Test that the export is valid Chrome trace-event JSON."""
+        tracer = ClickTracer()
+        base = tracer.origin
+        tracer.span(SPAN_INJECT, base + 0.001, base + 0.0015)
+        path = tmp_path / "trace.json"
+        tracer.export_chrome_trace(str(path))
+
+        trace = json.loads(path.read_text())
+        event = trace["traceEvents"][0]
+        assert event["name"] == "inject"
+        assert event["ph"] == "X"
+        assert event["ts"] == pytest.approx(1000.0)
+        assert event["dur"] == pytest.approx(500.0)
+
+
+class TestClickLoopTracing:
+    """Tests for tracing inside AutoClicker's loop."""
+
+    def test_loop_records_all_span_kinds(self) -> None:
+        """Test that a traced run records wait, inject and bookkeeping spans."""
+        tracer = ClickTracer()
+        clicker = AutoClicker(mouse=NullMouse())
+        clicker.set_interval(0.01)
+        clicker.set_tracer(tracer)
+        clicker.start()
+        time.sleep(0.2)
+        clicker.stop()
+
+        summary = tracer.summary()
+        assert summary["inject"]["count"] == clicker.click_count
+        assert summary["wait"]["count"] >= clicker.click_count - 1
+        assert summary["bookkeeping"]["count"] == clicker.click_count
+        assert summary["wait"]["total"] > summary["inject"]["total"]
+
+
+class TestTracingOverhead:
+    """Benchmark: disabled tracing must cost effectively nothing per click."""
+
+    INTERVAL = 1e-6  # Shorter than one iteration, so the loop never sleeps and overhead is not hidden
+
+    def loop_cost(self, tracer: ClickTracer | None, seconds: float = 0.3) -> float:
+        """Mean seconds per click of the real click loop."""
+        mouse = NullMouse()
+        clicker = AutoClicker(mouse=mouse)
+        clicker.set_interval(self.INTERVAL)
+        clicker.set_tracer(tracer)
+        clicker.start()
+        time.sleep(seconds)
+        clicker.stop()
+        return seconds / mouse.clicks
+
+    def reference_cost(self, seconds: float = 0.3) -> float:
+        """Mean seconds per iteration of a bare clicking loop with no scheduling or tracing."""
+        mouse = NullMouse()
+        end = time.perf_counter() + seconds
+        n = 0
+        while time.perf_counter() < end:
+            mouse.click(None, 1)
+            n += 1
+        return seconds / n
+
+    def test_disabled_overhead_negligible(self) -> None:
+        """Test that the full loop with tracing disabled is within 10 us/click of a bare loop."""
+        reference = min(self.reference_cost() for _ in range(3))
+        disabled = min(self.loop_cost(None) for _ in range(3))
+        # 10 us is 0.1% of the shortest supported interval (100 CPS)
+        assert disabled - reference < 10e-6
+
+    def test_enabled_overhead_bounded(self) -> None:
+        """Test that enabled tracing adds less than 20 us/click."""
+        disabled = min(self.loop_cost(None) for _ in range(3))
+        enabled = min(self.loop_cost(ClickTracer()) for _ in range(3))
+        assert enabled - disabled < 20e-6
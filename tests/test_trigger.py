@@ -0,0 +1,131 @@
+"""Unit tests for trigger module."""
+
+import enum
+import time
+
+import pytest
+
+from src.backends import NullMouse
+from src.clicker import AutoClicker
+from src.trigger import PAUSE_REASON, HoldTrigger, trigger_button
+
+
+def make_trigger(budget: float = 0.005) -> tuple[HoldTrigger, NullMouse]:
+    """Create a trigger driving a running, paused clicker without hooking real input."""
+    mouse = NullMouse()
+    clicker = AutoClicker(mouse=mouse)
+    clicker.set_interval(0.01)
+    clicker.pause(PAUSE_REASON)  # As arm() leaves it
+    clicker.start()
+    return HoldTrigger(clicker, "x1", budget=budget), mouse
+
+
+class WindowsButton(enum.Enum):
+    """pynput's Button as on Windows."""
+
+    left = 1
+    middle = 2
+    right = 3
+    x1 = 4
+    x2 = 5
+
+
+class XorgButton(enum.Enum):
+    """pynput's Button as on X11 (side buttons are plain numbered buttons)."""
+
+    left = 1
+    middle = 2
+    right = 3
+    button8 = 8
+    button9 = 9
+
+
+class DarwinButton(enum.Enum):
+    """pynput's Button as on macOS (no side buttons)."""
+
+    left = 1
+    middle = 2
+    right = 3
+
+
+class TestTriggerButton:
+    """Tests for mapping trigger names to platform buttons."""
+
+    @pytest.mark.parametrize("buttons,trigger,expected", [
+        (WindowsButton, "x1", WindowsButton.x1),
+        (WindowsButton, "x2", WindowsButton.x2),
+        (XorgButton, "x1", XorgButton.button8),
+        (XorgButton, "x2", XorgButton.button9),
+        (XorgButton, "middle", XorgButton.middle),
+        (DarwinButton, "x1", None),
+    ])
+    def test_platform_names(self, buttons, trigger, expected) -> None:
+        """Test that side buttons resolve to each platform's own Button member."""
+        assert trigger_button(trigger, buttons) is expected
+
+    def test_side_button_fires_on_x11(self) -> None:
+        """Test that an X11 button8 press and release drive an x1 trigger."""
+        trigger, mouse = make_trigger()
+        trigger._button = trigger_button("x1", XorgButton)
+        trigger._on_mouse_click(0, 0, XorgButton.button9, True)
+        assert trigger.is_pressed is False
+        trigger._on_mouse_click(0, 0, XorgButton.button8, True)
+        assert trigger.is_pressed is True
+        trigger._on_mouse_click(0, 0, XorgButton.button8, False)
+        assert trigger.is_pressed is False
+        trigger.clicker.stop()
+
+
+class TestHoldTrigger:
+    """Tests for hold-to-click activation."""
+
+    def test_toggle_is_not_a_hold_trigger(self) -> None:
+        """Test that "toggle" is rejected as a trigger."""
+        with pytest.raises(ValueError):
+            HoldTrigger(AutoClicker(mouse=NullMouse()), "toggle")
+
+    def test_clicks_only_while_held(self) -> None:
+        """Test that clicks happen between press and release only."""
+        trigger, mouse = make_trigger()
+        time.sleep(0.05)
+        assert mouse.clicks == 0
+        trigger.on_press()
+        time.sleep(0.1)
+        trigger.on_release()
+        time.sleep(0.02)
+        clicks = mouse.clicks
+        assert clicks >= 5
+        time.sleep(0.1)
+        assert mouse.clicks == clicks
+        trigger.clicker.stop()
+
+    def test_auto_repeat_ignored(self) -> None:
+        """Test that repeated press events while held do not restart the schedule."""
+        trigger, mouse = make_trigger()
+        trigger.on_press()
+        for _ in range(10):
+            trigger.on_press()
+            time.sleep(0.01)
+        trigger.on_release()
+        trigger.clicker.stop()
+        assert mouse.clicks <= 12
+
+    def test_latency_within_budget(self) -> None:
+        """Test press-to-first-click and release-to-last-click latency over many cycles."""
+        trigger, _ = make_trigger(budget=0.005)
+        for _ in range(20):
+            trigger.on_press()
+            time.sleep(0.015)
+            trigger.on_release()
+            time.sleep(0.01)
+        trigger.clicker.stop()
+        assert len(trigger.press_latencies) >= 19
+        assert len(trigger.release_overruns) >= 19
+        assert trigger.within_budget(), (max(trigger.press_latencies), max(trigger.release_overruns))
+
+    def test_budget_exceeded_detected(self) -> None:
+        """Test that a latency over budget is reported."""
+        trigger, _ = make_trigger(budget=0.0)
+        trigger.press_latencies.append(0.001)
+        assert trigger.within_budget() is False
+        trigger.clicker.stop()
@@ -0,0 +1,137 @@
+"""Unit tests for uinput module."""
+
+import os
+import sys
+import threading
+
+import pytest
+
+from src.clicker import AutoClicker
+from src.loopback import injection_rate
+
+pytest.importorskip("fcntl", reason="uinput is Linux-only")  # src.uinput imports fcntl at module level
+
+from src.uinput import (
+    BTN_LEFT,
+    BTN_RIGHT,
+    EV_KEY,
+    EV_SYN,
+    INPUT_EVENT,
+    SYN_REPORT,
+    UinputMouse,
+    pack_events,
+    unpack_events,
+)
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="uinput is Linux-only")
+
+SYN = (EV_SYN, SYN_REPORT, 0)
+
+
+class TestEventPacking:
+    """Tests for input_event encoding."""
+
+    def test_struct_layout(self) -> None:
+        """Test that events have the kernel's 64-bit input_event size."""
+        assert INPUT_EVENT.size == 24
+
+    def test_round_trip(self) -> None:
+        """Test that packed events decode to the same triples."""
+        events = [(EV_KEY, BTN_LEFT, 1), SYN, (EV_KEY, BTN_LEFT, 0), SYN]
+        assert unpack_events(pack_events(events)) == events
+
+    def test_partial_event_rejected(self) -> None:
+        """Test that a truncated event is an error."""
+        with pytest.raises(ValueError):
+            unpack_events(b"\0" * 30)
+
+
+class TestUinputMouse:
+    """Tests against a file standing in for the uinput device."""
+
+    def write_and_read(self, tmp_path, action) -> bytes:
+        """Run an action against a file-backed mouse and return the bytes written."""
+        path = tmp_path / "uinput"
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT)
+        mouse = UinputMouse(fd)
+        action(mouse)
+        mouse.close()
+        return path.read_bytes()
+
+    def test_click_bytes(self, tmp_path) -> None:
+        """Test that a click is press, sync, release, sync."""
+        data = self.write_and_read(tmp_path, lambda m: m.click(BTN_LEFT))
+        assert unpack_events(data) == [(EV_KEY, BTN_LEFT, 1), SYN, (EV_KEY, BTN_LEFT, 0), SYN]
+        assert data == pack_events([(EV_KEY, BTN_LEFT, 1), SYN, (EV_KEY, BTN_LEFT, 0), SYN])
+
+    def test_press_release_bytes(self, tmp_path) -> None:
+        """Test that press and release each carry their own SYN_REPORT."""
+        data = self.write_and_read(tmp_path, lambda m: (m.press(BTN_RIGHT), m.release(BTN_RIGHT)))
+        assert unpack_events(data) == [(EV_KEY, BTN_RIGHT, 1), SYN, (EV_KEY, BTN_RIGHT, 0), SYN]
+
+    def test_multi_click_single_write(self, tmp_path) -> None:
+        """Test that click(count=n) writes n clicks."""
+        data = self.write_and_read(tmp_path, lambda m: m.click(BTN_LEFT, 3))
+        assert unpack_events(data) == [(EV_KEY, BTN_LEFT, 1), SYN, (EV_KEY, BTN_LEFT, 0), SYN] * 3
+
+    def test_one_write_per_click(self) -> None:
+        """Test that each click reaches the device as one write of four events."""
+        r, w = os.pipe()
+        mouse = UinputMouse(w)
+        mouse.click(BTN_LEFT)
+        mouse.click(BTN_LEFT)
+        data = os.read(r, 4096)
+        mouse.close()
+        os.close(r)
+        assert len(data) == 2 * 4 * INPUT_EVENT.size
+
+    def test_partial_pipe_writes_completed(self) -> None:
+        """Test that a write larger than the pipe buffer is completed, not truncated."""
+        r, w = os.pipe()
+        mouse = UinputMouse(w)
+        chunks = []
+        reader = threading.Thread(target=lambda: chunks.extend(iter(lambda: os.read(r, 65536), b"")))
+        reader.start()
+        mouse.click(BTN_LEFT, 10000)  # 960 kB, far beyond the 64 kB pipe buffer
+        mouse.close()
+        reader.join(timeout=5)
+        os.close(r)
+        events = unpack_events(b"".join(chunks))
+        assert len(events) == 40000
+        assert events[-2:] == [(EV_KEY, BTN_LEFT, 0), SYN]
+
+    def test_drives_autoclicker(self, tmp_path) -> None:
+        """Test that AutoClicker resolves button names through the backend."""
+        path = tmp_path / "uinput"
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT)
+        mouse = UinputMouse(fd)
+        clicker = AutoClicker(mouse=mouse)
+        clicker.set_button("right")
+        clicker.set_interval(0.01)
+        clicker.start()
+        threading.Event().wait(0.1)
+        clicker.stop()
+        mouse.close()
+        events = unpack_events(path.read_bytes())
+        assert len(events) == 4 * clicker.click_count
+        assert {code for ev_type, code, _ in events if ev_type == EV_KEY} == {BTN_RIGHT}
+
+    def test_close_idempotent(self, tmp_path) -> None:
+        """Test that closing twice is safe."""
+        mouse = UinputMouse(os.open(tmp_path / "uinput", os.O_WRONLY | os.O_CREAT))
+        mouse.close()
+        mouse.close()
+        assert mouse.fd == -1
+
+
+class TestThroughput:
+    """Benchmark of raw injection cost."""
+
+    def test_injection_rate(self) -> None:
+        """Test that injecting into /dev/null sustains far more than any click rate needs."""
+        fd = os.open(os.devnull, os.O_WRONLY)
+        mouse = UinputMouse(fd)
+        result = injection_rate(mouse, 50000)
+        mouse.close()
+        print(f"uinput injection: {result['us_per_click']:.2f} us/click")
+        assert result["clicks_per_second"] > 50000
@@ -0,0 +1,92 @@
+"""Unit tests for watcher module."""
+
+import threading
+import time
+
+import pytest
+
+from src.config import write_json_atomic
+from src.watcher import ConfigWatcher
+
+pytestmark = pytest.mark.skipif(not ConfigWatcher.is_supported(), reason="inotify not available")
+
+
+class Counter:
+    """Callback that counts calls and signals each one."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.event = threading.Event()
+
+    def __call__(self) -> None:
+        self.calls += 1
+        self.event.set()
+
+
+@pytest.fixture
+def watched(tmp_path):
+    """Yield (path, counter, watcher) for a watched config file."""
+    path = tmp_path / "config.json"
+    path.write_text("{}")
+    counter = Counter()
+    watcher = ConfigWatcher(str(path), counter, coalesce=0.05)
+    assert watcher.start() is True
+    yield path, counter, watcher
+    watcher.stop()
+
+
+class TestConfigWatcher:
+    """Tests for inotify-based change detection."""
+
+    def test_write_triggers_callback(self, watched) -> None:
+        """Test that writing the file fires the callback."""
+        path, counter, watcher = watched
+        path.write_text('{"cps": 5}')
+        assert counter.event.wait(1.0)
+        assert counter.calls == 1
+
+    def test_atomic_replace_triggers_callback(self, watched) -> None:
+        """Test that replace-by-rename is detected."""
+        path, counter, watcher = watched
+        write_json_atomic(str(path), {"cps": 5})
+        assert counter.event.wait(1.0)
+
+    def test_burst_is_coalesced(self, watched) -> None:
+        """Test that a burst of writes fires the callback once."""
+        path, counter, watcher = watched
+        for i in range(10):
+            path.write_text(f'{{"cps": {i + 1}}}')
+        assert counter.event.wait(1.0)
+        time.sleep(0.2)
+        assert counter.calls == 1
+
+    def test_other_files_ignored(self, watched, tmp_path) -> None:
+        """Test that changes to other files in the directory are ignored."""
+        path, counter, watcher = watched
+        (tmp_path / "other.json").write_text("{}")
+        assert not counter.event.wait(0.2)
+
+    def test_latency_measured(self, watched) -> None:
+        """Test that write-to-apply latency is recorded and small."""
+        path, counter, watcher = watched
+        path.write_text('{"cps": 5}')
+        assert counter.event.wait(1.0)
+        time.sleep(0.05)
+        assert watcher.reload_count == 1
+        assert watcher.last_latency is not None
+        assert watcher.last_latency < 0.5
+
+    def test_no_wakeups_while_idle(self, watched) -> None:
+        """Test that nothing fires without file changes (no polling)."""
+        path, counter, watcher = watched
+        time.sleep(0.3)
+        assert counter.calls == 0
+        assert watcher.reload_count == 0
+
+    def test_stop_joins_thread(self, tmp_path) -> None:
+        """Test that stop() ends the watcher thread."""
+        watcher = ConfigWatcher(str(tmp_path / "config.json"), lambda: None)
+        watcher.start()
+        watcher.stop()
+        assert watcher.is_watching is False
+        assert not watcher.watch_thread.is_alive()
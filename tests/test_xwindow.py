@@ -0,0 +1,273 @@
+"""Unit tests for xwindow module."""
+
+import ctypes
+import os
+import shutil
+import subprocess
+import time
+
+import pytest
+
+from src import xwindow
+from src.backends import NullMouse
+from src.clicker import AutoClicker
+from src.xwindow import (
+    BUTTON_MASKS,
+    BUTTON_PRESS,
+    BUTTON_PRESS_MASK,
+    BUTTON_RELEASE,
+    BUTTON_RELEASE_MASK,
+    ERROR_HANDLER,
+    Window,
+    WindowMouse,
+    XButtonEvent,
+    XErrorEvent,
+    XEvent,
+    button_event,
+    close_display,
+    load_xlib,
+    open_display,
+)
+
+try:
+    load_xlib()
+    HAVE_XLIB = True
+except OSError:
+    HAVE_XLIB = False
+
+needs_xlib = pytest.mark.skipif(not HAVE_XLIB, reason="libX11 not installed")
+
+
+class TestButtonEvent:
+    """Tests for building synthetic events."""
+
+    def test_struct_layout(self) -> None:
+        """Test that the structs match Xlib's 64-bit sizes."""
+        assert ctypes.sizeof(XButtonEvent) == 96
+        assert ctypes.sizeof(XEvent) == 192
+
+    def test_press_fields(self) -> None:
+        """Test a press event's fields."""
+        event = button_event(BUTTON_PRESS, 0, 0x400001, 0x100, 1, 10, 20, 110, 220)
+        b = event.xbutton
+        assert event.type == BUTTON_PRESS
+        assert b.send_event
+        assert (b.window, b.root, b.button) == (0x400001, 0x100, 1)
+        assert (b.x, b.y, b.x_root, b.y_root) == (10, 20, 110, 220)
+        assert b.state == 0
+
+    def test_release_reports_button_down(self) -> None:
+        """Test that a release carries the button's state mask, as a real one does."""
+        event = button_event(BUTTON_RELEASE, 0, 1, 1, 3, 0, 0, 0, 0)
+        assert event.xbutton.state == BUTTON_MASKS[3]
+
+
+class TestErrorHandler:
+    """Tests for sharing the process-wide X error handler."""
+
+    def test_own_display_errors_recorded(self, monkeypatch) -> None:
+        """Test that errors on displays opened here are recorded, not passed on."""
+        passed = []
+        monkeypatch.setattr(xwindow, "_previous_handler", ERROR_HANDLER(lambda d, e: passed.append(d) or 0))
+        monkeypatch.setattr(xwindow, "_displays", {0x1000})
+        monkeypatch.setattr(xwindow, "_errors", {})
+        xwindow._on_x_error(0x1000, ctypes.pointer(XErrorEvent(error_code=3)))
+        assert xwindow._errors == {0x1000: 3}
+        assert passed == []
+
+    def test_other_display_errors_chained(self, monkeypatch) -> None:
+        """Test that errors on other connections, e.g. Tk's, reach the previous handler."""
+        passed = []
+        monkeypatch.setattr(xwindow, "_previous_handler", ERROR_HANDLER(lambda d, e: passed.append(d) or 7))
+        monkeypatch.setattr(xwindow, "_displays", {0x1000})
+        monkeypatch.setattr(xwindow, "_errors", {})
+        assert xwindow._on_x_error(0x2000, ctypes.pointer(XErrorEvent(error_code=3))) == 7
+        assert passed == [0x2000]
+        assert xwindow._errors == {}
+
+
+@needs_xlib
+class TestNoDisplay:
+    """Tests for failing cleanly without an X server."""
+
+    def test_open_missing_display_raises_error(self) -> None:
+        """Test that an unreachable display raises OSError instead of crashing."""
+        with pytest.raises(OSError):
+            open_display(":987")
+
+    def test_window_mouse_missing_display_raises_error(self) -> None:
+        """Test that a WindowMouse cannot be created without a display."""
+        with pytest.raises(OSError):
+            WindowMouse(0x400001, display_name=":987")
+
+
+class TestSetMouse:
+    """Tests for swapping the clicker's backend."""
+
+    def test_set_mouse_resolves_button_and_closes_old(self) -> None:
+        """Test that a new backend is used and the old one is closed."""
+
+        class ClosingMouse(NullMouse):
+            closed = False
+
+            def close(self) -> None:
+                """Record closing."""
+                self.closed = True
+
+        old, new = ClosingMouse(), NullMouse()
+        clicker = AutoClicker(mouse=old)
+        clicker.set_button("right")
+        clicker.set_mouse(new)
+        assert old.closed
+        assert clicker.mouse is new
+        assert clicker.button == "right"
+
+    def test_set_mouse_none_restores_default(self) -> None:
+        """Test that None goes back to creating the default backend on demand."""
+        clicker = AutoClicker(mouse=NullMouse())
+        clicker.set_mouse(None)
+        assert clicker._mouse is None
+        assert clicker.button is None
+
+
+class DummyClient:
+    """An X client window that counts the button events it receives."""
+
+    def __init__(self, display_name: str) -> None:
+        """Create and map a 200x100 window at (50, 40)."""
+        xlib = load_xlib()
+        d, w, p = ctypes.c_void_p, Window, ctypes.POINTER
+        xlib.XCreateSimpleWindow.restype = w
+        xlib.XCreateSimpleWindow.argtypes = [d, w] + [ctypes.c_int] * 2 + [ctypes.c_uint] * 3 + [ctypes.c_ulong] * 2
+        xlib.XSelectInput.argtypes = [d, w, ctypes.c_long]
+        xlib.XMapWindow.argtypes = [d, w]
+        xlib.XDestroyWindow.argtypes = [d, w]
+        xlib.XQueryPointer.argtypes = [d, w, p(w), p(w)] + [p(ctypes.c_int)] * 4 + [p(ctypes.c_uint)]
+        self.xlib = xlib
+        self.display = open_display(display_name)
+        root = xlib.XDefaultRootWindow(self.display)
+        self.window = xlib.XCreateSimpleWindow(self.display, root, 50, 40, 200, 100, 0, 0, 0)
+        xlib.XSelectInput(self.display, self.window, BUTTON_PRESS_MASK | BUTTON_RELEASE_MASK)
+        xlib.XMapWindow(self.display, self.window)
+        xlib.XSync(self.display, False)
+        self.presses: list[tuple[int, int, int]] = []  # (button, x, y)
+        self.releases = 0
+
+    def pump(self, expected: int, timeout: float = 5.0) -> None:
+        """Read events until `expected` presses and releases arrived or the timeout passes."""
+        event = XEvent()
+        end = time.monotonic() + timeout
+        while (len(self.presses) < expected or self.releases < expected) and time.monotonic() < end:
+            if not self.xlib.XPending(self.display):
+                time.sleep(0.001)
+                continue
+            self.xlib.XNextEvent(self.display, event)
+            if event.type == BUTTON_PRESS:
+                b = event.xbutton
+                self.presses.append((b.button, b.x, b.y))
+            elif event.type == BUTTON_RELEASE:
+                self.releases += 1
+
+    def pointer(self) -> tuple[int, int]:
+        """Get the pointer position on the screen."""
+        root, child = Window(), Window()
+        x, y, wx, wy, mask = ctypes.c_int(), ctypes.c_int(), ctypes.c_int(), ctypes.c_int(), ctypes.c_uint()
+        self.xlib.XQueryPointer(self.display, self.window, root, child, x, y, wx, wy, mask)
+        return x.value, y.value
+
+    def close(self) -> None:
+        """Destroy the window and disconnect."""
+        self.xlib.XDestroyWindow(self.display, self.window)
+        close_display(self.display)
+
+
+@pytest.fixture
+def xvfb():
+    """Run a private Xvfb server and yield its display name."""
+    if not HAVE_XLIB or shutil.which("Xvfb") is None:
+        pytest.skip("Xvfb not installed")
+    number = 90 + os.getpid() % 100
+    name = f":{number}"
+    server = subprocess.Popen(
+        ["Xvfb", name, "-screen", "0", "640x480x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(100):
+            if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+                break
+            time.sleep(0.05)
+        else:
+            pytest.skip("Xvfb did not start")
+        yield name
+    finally:
+        server.terminate()
+        server.wait()
+
+
+class TestXvfb:
+    """Tests against a real X server and a dummy client window."""
+
+    def test_clicks_reach_window(self, xvfb: str) -> None:
+        """Test that every click arrives at the window's center."""
+        client = DummyClient(xvfb)
+        mouse = WindowMouse(client.window, display_name=xvfb)
+        try:
+            assert (mouse.width, mouse.height) == (200, 100)
+            mouse.click(mouse.buttons["left"], 1)
+            mouse.click(mouse.buttons["right"], 2)
+            client.pump(3)
+            assert client.presses == [(1, 100, 50), (3, 100, 50), (3, 100, 50)]
+            assert client.releases == 3
+        finally:
+            mouse.close()
+            client.close()
+
+    def test_pointer_does_not_move(self, xvfb: str) -> None:
+        """Test that clicking leaves the pointer where it was."""
+        client = DummyClient(xvfb)
+        mouse = WindowMouse(client.window, display_name=xvfb, x=5, y=5)
+        try:
+            before = client.pointer()
+            mouse.click(mouse.buttons["left"], 10)
+            client.pump(10)
+            assert client.pointer() == before
+            assert client.presses[0] == (1, 5, 5)
+        finally:
+            mouse.close()
+            client.close()
+
+    def test_clicker_drives_window(self, xvfb: str) -> None:
+        """Test that an AutoClicker clicks into the window at its rate."""
+        client = DummyClient(xvfb)
+        clicker = AutoClicker(mouse=WindowMouse(client.window, display_name=xvfb))
+        try:
+            clicker.set_interval(0.01)
+            clicker.set_click_limit(50)
+            clicker.start()
+            clicker.click_thread.join(timeout=5)
+            client.pump(50)
+            assert len(client.presses) == 50
+            assert client.releases == 50
+        finally:
+            clicker.set_mouse(None)
+            client.close()
+
+    def test_missing_window_raises_error(self, xvfb: str) -> None:
+        """Test that targeting a window that does not exist raises OSError."""
+        with pytest.raises(OSError):
+            WindowMouse(0x7FFFFF, display_name=xvfb)
+
+    def test_destroyed_window_stops_clicking(self, xvfb: str) -> None:
+        """Test that clicks into a window that went away raise OSError."""
+        client = DummyClient(xvfb)
+        mouse = WindowMouse(client.window, display_name=xvfb)
+        client.close()
+        try:
+            with pytest.raises(OSError):
+                for _ in range(100):
+                    mouse.click(mouse.buttons["left"], 1)
+                    time.sleep(0.01)
+        finally:
+            mouse.close()